@@ -0,0 +1,122 @@
+import socket
+import struct
+import sys
+from unittest import mock
+
+sys.path.append('../')
+import tunnel_packet_handler
+from tunnel_packet_handler import TunnelPacketCapture, icmp_checksum, TPACKET2_HDR, SOCKADDR_LL
+
+
+SELF_IP = '10.1.0.32'
+PEER_IP = '10.1.0.33'
+
+ETH_HEADER = bytes.fromhex('00aabbccddee' '001122334455' '0800')
+# IPinIP from 10.1.0.33 to 10.1.0.32, inner packet is UDP from 192.168.0.2 to 192.168.0.10
+IPINIP_PACKET = bytes.fromhex(
+    '4500003c000040004004267c0a0100210a010020'
+    '45000028000040004011b968c0a80002c0a8000a'
+    '00350035001400000000000000000000')
+# IPv6inIP from 10.1.0.33 to 10.1.0.32, inner packet is UDP from fc02:1000::2 to fc02:1000::10
+IPV6INIP_PACKET = bytes.fromhex(
+    '45000044000040004029264f0a0100210a010020'
+    '6000000000081140'
+    'fc021000000000000000000000000002'
+    'fc021000000000000000000000000010'
+    '0035003500080000')
+
+
+def run_filter(program, frame):
+    """ Runs the classic BPF program built by build_filter() on a frame, returns the accepted length """
+    insns = [struct.unpack('=HBBI', program[i:i + 8]) for i in range(0, len(program), 8)]
+    acc = 0
+    pc = 0
+    while True:
+        code, jt, jf, k = insns[pc]
+        pc += 1
+        if code == 0x30:
+            acc = frame[k]
+        elif code == 0x20:
+            acc = struct.unpack('!I', frame[k:k + 4])[0]
+        elif code == 0x15:
+            pc += jt if acc == k else jf
+        elif code == 0x06:
+            return k
+        else:
+            assert False, "unexpected instruction {:#x}".format(code)
+
+
+def with_addresses(packet, src, dst):
+    return packet[:12] + socket.inet_aton(src) + socket.inet_aton(dst) + packet[20:]
+
+
+class TestTunnelPacketCapture(object):
+    def setup_method(self):
+        self.capture = TunnelPacketCapture(SELF_IP, PEER_IP, mock.MagicMock())
+
+    def put_frame(self, packet, ifindex=5, pkttype=0, snaplen=None):
+        """ Puts a frame at the start of the ring, laid out as the kernel does for TPACKET_V2 """
+        mac = 64
+        net = mac + len(ETH_HEADER)
+        frame = ETH_HEADER + packet
+        if snaplen is None:
+            snaplen = len(frame)
+        ring = bytearray(net + len(packet))
+        TPACKET2_HDR.pack_into(ring, 0, 1, len(frame), snaplen, mac, net, 0, 0, 0, 0)
+        SOCKADDR_LL.pack_into(ring, TPACKET2_HDR.size, socket.AF_PACKET, 0x0800, ifindex, 1, pkttype)
+        ring[mac:net + len(packet)] = frame
+        self.capture.ring = ring
+
+    def test_build_filter(self):
+        program = self.capture.build_filter()
+        assert len(program) == 9 * 8
+
+        for packet in (IPINIP_PACKET, IPV6INIP_PACKET):
+            assert run_filter(program, ETH_HEADER + packet) == tunnel_packet_handler.CAPTURE_SNAPLEN
+        # Packets from another peer, to another address or of another protocol are dropped
+        assert run_filter(program, ETH_HEADER + with_addresses(IPINIP_PACKET, '10.1.0.34', SELF_IP)) == 0
+        assert run_filter(program, ETH_HEADER + with_addresses(IPINIP_PACKET, PEER_IP, '10.1.0.34')) == 0
+        udp_packet = IPINIP_PACKET[:9] + b'\x11' + IPINIP_PACKET[10:]
+        assert run_filter(program, ETH_HEADER + udp_packet) == 0
+
+    def test_parse_frame_ipinip(self):
+        self.put_frame(IPINIP_PACKET)
+        inner_dsts = set()
+        assert self.capture.parse_frame(0, {5}, inner_dsts)
+        assert inner_dsts == {(socket.AF_INET, '192.168.0.10')}
+
+    def test_parse_frame_ipv6inip(self):
+        self.put_frame(IPV6INIP_PACKET)
+        inner_dsts = set()
+        assert self.capture.parse_frame(0, {5}, inner_dsts)
+        assert inner_dsts == {(socket.AF_INET6, 'fc02:1000::10')}
+
+    def test_parse_frame_ignored(self):
+        inner_dsts = set()
+        # Another interface
+        self.put_frame(IPINIP_PACKET, ifindex=6)
+        assert not self.capture.parse_frame(0, {5}, inner_dsts)
+        # Sent by this device
+        self.put_frame(IPINIP_PACKET, pkttype=tunnel_packet_handler.PACKET_OUTGOING)
+        assert not self.capture.parse_frame(0, {5}, inner_dsts)
+        # Another peer
+        self.put_frame(with_addresses(IPINIP_PACKET, '10.1.0.34', SELF_IP))
+        assert not self.capture.parse_frame(0, {5}, inner_dsts)
+        # Inner header truncated by the snaplen
+        self.put_frame(IPINIP_PACKET, snaplen=len(ETH_HEADER) + 30)
+        assert not self.capture.parse_frame(0, {5}, inner_dsts)
+        # Outer header truncated
+        self.put_frame(IPINIP_PACKET, snaplen=len(ETH_HEADER) + 10)
+        assert not self.capture.parse_frame(0, {5}, inner_dsts)
+        assert inner_dsts == set()
+
+
+def test_icmp_checksum():
+    # Example from RFC 1071
+    assert icmp_checksum(bytes.fromhex('0001f203f4f5f6f7')) == 0x220d
+    # Echo request from ping, id 0x1234, seq 1, payload of odd length
+    message = bytes.fromhex('0800000012340001') + b'abcdefghi'
+    checksum = icmp_checksum(message)
+    assert checksum == 0xeb34
+    # A message with its checksum sums to zero
+    assert icmp_checksum(message[:2] + struct.pack('!H', checksum) + message[4:]) == 0
@@ -6,13 +6,23 @@ When receiving tunnel packets, if the hardware doesn't contain neighbor
 information for the inner packet's destination IP, the entire encapsulated
 packet is trapped to the CPU. In this case, we should ping the inner
 destination IP to trigger the process of obtaining neighbor information
+
+Trapped packets are captured by an AF_PACKET socket with a classic BPF
+filter and a TPACKET_V2 mmap ring, only the outer and inner IP headers
+are parsed. The inner destination is probed with an ICMP/ICMPv6 echo sent
+from a raw socket, which triggers ARP/NDP resolution in the kernel.
 """
-import subprocess
+import ctypes
+import mmap
+import os
+import select
+import socket
+import struct
 import sys
 import time
 from datetime import datetime
-from ipaddress import ip_interface
-from queue import Queue
+from ipaddress import ip_address, ip_interface
+from queue import Empty, Queue
 from threading import Lock, Event, Thread
 
 from swsscommon.swsscommon import ConfigDBConnector, SonicV2Connector, \
@@ -21,9 +31,6 @@ from sonic_py_common import logger as log
 
 from pyroute2 import IPRoute
 from pyroute2.netlink.exceptions import NetlinkError
-from scapy.layers.inet import IP
-from scapy.layers.inet6 import IPv6
-from scapy.sendrecv import AsyncSniffer
 
 
 logger = log.Logger()
@@ -47,6 +54,39 @@ IPINIP_TUNNEL = 'ipinip'
 RTM_NEWLINK = 'RTM_NEWLINK'
 SELECT_TIMEOUT = 1000
 
+# Linux packet socket constants
+ETH_P_IP = 0x0800
+ETH_HLEN = 14
+SOL_PACKET = 263
+SO_ATTACH_FILTER = 26
+PACKET_RX_RING = 5
+PACKET_VERSION = 10
+TPACKET_V2 = 1
+TP_STATUS_KERNEL = 0
+TP_STATUS_USER = 1
+PACKET_OUTGOING = 4
+# tp_status, tp_len, tp_snaplen, tp_mac, tp_net, tp_sec, tp_nsec, tp_vlan_tci, tp_vlan_tpid
+TPACKET2_HDR = struct.Struct('=IIIHHIIHH4x')
+# sockaddr_ll follows tpacket2_hdr, only sll_ifindex and sll_pkttype are needed
+SOCKADDR_LL = struct.Struct('=HHiHB')
+IPPROTO_IPIP = 4
+IPPROTO_IPV6 = 41
+# Outer ethernet + IPv4 header with options + inner IPv6 header
+CAPTURE_SNAPLEN = 128
+RING_FRAME_SIZE = 256
+RING_BLOCK_SIZE = mmap.PAGESIZE
+RING_BLOCK_NR = 256
+CAPTURE_POLL_TIMEOUT = 1000
+
+# Neighbor probe constants
+SOL_RAW = 255
+ICMP_FILTER = 1
+ICMP6_FILTER = 1
+ICMP_ECHO_REQUEST = 8
+ICMPV6_ECHO_REQUEST = 128
+MAX_PROBE_BATCH = 100
+COUNTER_FLUSH_INTERVAL = 1
+
 nl_msgs = Queue()
 portchannel_intfs = None
 
@@ -62,6 +102,244 @@ def add_msg_to_queue(target, msg):
     if msg.get_attr('IFLA_IFNAME') in portchannel_intfs:
         nl_msgs.put(msg)
 
+def icmp_checksum(data):
+    """
+    Computes the internet checksum of an ICMP message
+
+    Args:
+        data: (bytes) ICMP message with the checksum field set to zero
+    Returns:
+        (int) The checksum
+    """
+    if len(data) % 2:
+        data += b'\x00'
+    total = sum(struct.unpack('!{}H'.format(len(data) // 2), data))
+    total = (total >> 16) + (total & 0xffff)
+    total += total >> 16
+    return ~total & 0xffff
+
+
+class TunnelPacketCapture(object):
+    """
+    Captures IPinIP packets sent from the peer to this device
+
+    Packets are filtered in the kernel, and read from an mmap ring shared
+    with the kernel so that a burst of packets costs a single poll().
+    The socket is not bound to an interface, the set of interfaces to
+    accept packets from can be changed without recreating the socket and
+    losing queued packets.
+    """
+
+    def __init__(self, self_ip, peer_ip, callback):
+        """
+        Args:
+            self_ip: (str) Outer destination IP, the local tunnel address
+            peer_ip: (str) Outer source IP, the peer tunnel address
+            callback: Called for each batch of packets with a set of
+                      inner destination IPs (str) and the number of packets
+        """
+        self.self_ip = ip_address(self_ip).packed
+        self.peer_ip = ip_address(peer_ip).packed
+        self.callback = callback
+        self.ifindexes = frozenset()
+        self.sock = None
+        self.ring = None
+        # The filter program must stay allocated while it is attached
+        self.bpf_buf = None
+        self.frame_nr = RING_BLOCK_SIZE // RING_FRAME_SIZE * RING_BLOCK_NR
+        self.running = Event()
+        self.thread = None
+
+    def build_filter(self):
+        """
+        Compiles the classic BPF program accepting IPinIP/IPv6inIP packets
+        from the peer to this device, truncated to CAPTURE_SNAPLEN
+
+        Returns:
+            (bytes) The sock_filter instructions
+        """
+        ldb_abs = 0x30
+        ld_abs = 0x20
+        jeq_k = 0x15
+        ret_k = 0x06
+        offset = ETH_HLEN
+        insns = [
+            (ldb_abs, 0, 0, offset + 9),
+            (jeq_k, 1, 0, IPPROTO_IPIP),
+            (jeq_k, 0, 5, IPPROTO_IPV6),
+            (ld_abs, 0, 0, offset + 12),
+            (jeq_k, 0, 3, struct.unpack('!I', self.peer_ip)[0]),
+            (ld_abs, 0, 0, offset + 16),
+            (jeq_k, 0, 1, struct.unpack('!I', self.self_ip)[0]),
+            (ret_k, 0, 0, CAPTURE_SNAPLEN),
+            (ret_k, 0, 0, 0),
+        ]
+        return b''.join(struct.pack('=HBBI', *insn) for insn in insns)
+
+    def open(self):
+        """
+        Creates the packet socket and maps its receive ring
+        """
+        sock = socket.socket(socket.AF_PACKET, socket.SOCK_RAW, socket.htons(ETH_P_IP))
+        bpf = self.build_filter()
+        self.bpf_buf = ctypes.create_string_buffer(bpf)
+        fprog = struct.pack('HL', len(bpf) // 8, ctypes.addressof(self.bpf_buf))
+        sock.setsockopt(socket.SOL_SOCKET, SO_ATTACH_FILTER, fprog)
+        sock.setsockopt(SOL_PACKET, PACKET_VERSION, TPACKET_V2)
+        sock.setsockopt(SOL_PACKET, PACKET_RX_RING,
+                        struct.pack('IIII', RING_BLOCK_SIZE, RING_BLOCK_NR, RING_FRAME_SIZE, self.frame_nr))
+        self.ring = mmap.mmap(sock.fileno(), RING_BLOCK_SIZE * RING_BLOCK_NR)
+        self.sock = sock
+
+    def set_interfaces(self, intfs):
+        """
+        Sets the interfaces to accept packets from
+
+        Args:
+            intfs: Iterable of interface names
+        """
+        ifindexes = set()
+        for intf in intfs:
+            try:
+                ifindexes.add(socket.if_nametoindex(intf))
+            except OSError:
+                logger.log_notice("Skipping non-existent interface {}".format(intf))
+        self.ifindexes = frozenset(ifindexes)
+
+    def parse_frame(self, offset, ifindexes, inner_dsts):
+        """
+        Parses a frame in the ring
+
+        Args:
+            offset: Offset of the frame in the ring
+            ifindexes: Indexes of interfaces to accept packets from
+            inner_dsts: Set to add the inner destination IP to
+        Returns:
+            (bool) True if the frame is a tunnel packet to handle
+        """
+        ring = self.ring
+        _, _, snaplen, mac, net, _, _, _, _ = TPACKET2_HDR.unpack_from(ring, offset)
+        _, _, ifindex, _, pkttype = SOCKADDR_LL.unpack_from(ring, offset + TPACKET2_HDR.size)
+        if ifindex not in ifindexes or pkttype == PACKET_OUTGOING:
+            return False
+        ip_start = offset + net
+        ip_len = mac + snaplen - net
+        if ip_len < 20:
+            return False
+        ihl = (ring[ip_start] & 0x0f) * 4
+        proto = ring[ip_start + 9]
+        # The filter already checked the addresses, check them again in case
+        # packets are queued before the filter is attached
+        if ring[ip_start + 12:ip_start + 16] != self.peer_ip or ring[ip_start + 16:ip_start + 20] != self.self_ip:
+            return False
+        inner = ip_start + ihl
+        if proto == IPPROTO_IPIP and ihl + 20 <= ip_len:
+            inner_dsts.add((socket.AF_INET, socket.inet_ntop(socket.AF_INET, ring[inner + 16:inner + 20])))
+        elif proto == IPPROTO_IPV6 and ihl + 40 <= ip_len:
+            inner_dsts.add((socket.AF_INET6, socket.inet_ntop(socket.AF_INET6, ring[inner + 24:inner + 40])))
+        else:
+            return False
+        return True
+
+    def read_ring(self, frame_idx):
+        """
+        Reads all frames handed over to user space
+
+        Args:
+            frame_idx: Index of the first frame to check
+        Returns:
+            (int) Index of the next frame to check
+        """
+        ring = self.ring
+        ifindexes = self.ifindexes
+        inner_dsts = set()
+        pkt_count = 0
+        while True:
+            offset = frame_idx * RING_FRAME_SIZE
+            if not TPACKET2_HDR.unpack_from(ring, offset)[0] & TP_STATUS_USER:
+                break
+            if self.parse_frame(offset, ifindexes, inner_dsts):
+                pkt_count += 1
+            # Hand the frame back to the kernel
+            struct.pack_into('=I', ring, offset, TP_STATUS_KERNEL)
+            frame_idx = (frame_idx + 1) % self.frame_nr
+        if pkt_count:
+            self.callback(inner_dsts, pkt_count)
+        return frame_idx
+
+    def capture(self):
+        """
+        Waits for packets in the ring until stopped
+        """
+        poller = select.poll()
+        poller.register(self.sock, select.POLLIN | select.POLLERR)
+        frame_idx = 0
+        while self.running.is_set():
+            frame_idx = self.read_ring(frame_idx)
+            poller.poll(CAPTURE_POLL_TIMEOUT)
+
+    def start(self):
+        """
+        Starts capturing packets in a thread
+        """
+        self.open()
+        self.running.set()
+        self.thread = Thread(target=self.capture, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        Stops capturing packets and releases the ring
+        """
+        self.running.clear()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self.ring.close()
+        self.sock.close()
+
+
+class NeighborProber(object):
+    """
+    Triggers neighbor resolution by sending an ICMP/ICMPv6 echo request
+    to the destination, like ping does
+    """
+
+    def __init__(self):
+        self.ident = os.getpid() & 0xffff
+        self.seq = 0
+        self.socks = {}
+        sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+        # Replies are not needed, drop all ICMP types on receive
+        sock.setsockopt(SOL_RAW, ICMP_FILTER, struct.pack('I', 0xffffffff))
+        self.socks[socket.AF_INET] = sock
+        sock = socket.socket(socket.AF_INET6, socket.SOCK_RAW, socket.IPPROTO_ICMPV6)
+        sock.setsockopt(socket.IPPROTO_ICMPV6, ICMP6_FILTER, struct.pack('8I', *([0xffffffff] * 8)))
+        self.socks[socket.AF_INET6] = sock
+        for sock in self.socks.values():
+            sock.setblocking(False)
+
+    def probe(self, family, dst_ip):
+        """
+        Sends an echo request to a destination
+
+        Args:
+            family: socket.AF_INET or socket.AF_INET6
+            dst_ip: (str) The destination IP
+        """
+        self.seq = (self.seq + 1) & 0xffff
+        if family == socket.AF_INET:
+            header = struct.pack('!BBHHH', ICMP_ECHO_REQUEST, 0, 0, self.ident, self.seq)
+            header = struct.pack('!BBHHH', ICMP_ECHO_REQUEST, 0, icmp_checksum(header), self.ident, self.seq)
+        else:
+            # The kernel fills the checksum of ICMPv6 messages
+            header = struct.pack('!BBHHH', ICMPV6_ECHO_REQUEST, 0, 0, self.ident, self.seq)
+        try:
+            self.socks[family].sendto(header, (dst_ip, 0))
+        except OSError as error:
+            logger.log_info("Failed to probe {}: {}".format(dst_ip, error))
+
+
 class TunnelPacketHandler(object):
     """
     This class handles unroutable tunnel packets that are trapped
@@ -82,9 +360,9 @@ class TunnelPacketHandler(object):
         self.netlink_api = IPRoute()
         self.sniffer = None
         self.self_ip = ''
-        self.packet_filter = ''
         self.sniff_intfs = set()
-        self.pending_cmds = Queue()
+        self.pending_pkts = Queue()
+        self.prober = None
 
         global portchannel_intfs
         portchannel_intfs = [name for name, _ in self.portchannel_intfs]
@@ -245,24 +523,6 @@ class TunnelPacketHandler(object):
 
         return None, None
 
-    def get_inner_pkt_type(self, packet):
-        """
-        Get the type of an inner encapsulated packet
-
-        Returns:
-            (str)  'v4' if the inner packet is IPv4
-            (str)  'v6' if the inner packet is IPv6
-            (bool) False if `packet` is not an IPinIP packet
-        """
-        if packet.haslayer(IP):
-            # Determine inner packet type based on IP protocol number
-            # The outer packet type should always be IPv4
-            if packet[IP].proto == 4:
-                return IP
-            elif packet[IP].proto == 41:
-                return IPv6
-        return False
-
     def sniffer_restart_required(self, lag, fvs):
         """
         Determines if the packet sniffer needs to be restarted
@@ -288,10 +548,13 @@ class TunnelPacketHandler(object):
 
     def start_sniffer(self):
         """
-        Starts an AsyncSniffer and waits for it to inititalize fully
+        Starts capturing tunnel packets on the portchannels which are up
+
+        The capture socket is created once, later calls only update the
+        interfaces to accept packets from, so no packet is lost on restart
         """
         start = datetime.now()
-        
+
         self.sniff_intfs = self.get_up_portchannels()
 
         while not self.sniff_intfs:
@@ -302,54 +565,51 @@ class TunnelPacketHandler(object):
             self.sniff_intfs = self.get_up_portchannels()
             time.sleep(10)
 
-        self.sniffer = AsyncSniffer(
-            iface=list(self.sniff_intfs),
-            filter=self.packet_filter,
-            prn=self.ping_inner_dst,
-            store=0
-        )
-        self.sniffer.start()
+        self.sniffer.set_interfaces(self.sniff_intfs)
+        if self.sniffer.thread is None:
+            self.sniffer.start()
+
+    def handle_tunnel_pkts(self, inner_dsts, pkt_count):
+        """
+        Queues a batch of captured packets for neighbor probing and counting
 
-        while not hasattr(self.sniffer, 'stop_cb'):
-            time.sleep(0.1)
+        Args:
+            inner_dsts: set of (address family, inner destination IP)
+            pkt_count: number of packets in the batch
+        """
+        self.pending_pkts.put((inner_dsts, pkt_count))
 
     def write_count_to_db(self):
+        pkt_count = 0
+        last_flush = time.monotonic()
         while True:
-            # use a set to automatically deduplicate destination IPs
-            to_run = set()
-
-            to_run.add(tuple(self.pending_cmds.get()))
-            pkt_count = 1
-            while not self.pending_cmds.empty() and len(to_run) < 100:
-                to_run.add(tuple(self.pending_cmds.get()))
-                # we should always count each packet, but only ping for each unique IP
-                pkt_count += 1
-
-            for cmds in to_run:
-                logger.log_info("Running command '{}'".format(' '.join(cmds)))
-                subprocess.run(cmds, stdout=subprocess.DEVNULL)
             try:
-                curr_count = int(self.counters_db.get(COUNTERS_DB, self.tunnel_counter_table, COUNTER_KEY))
-            except TypeError:
-                curr_count = 0
-            self.counters_db.set(COUNTERS_DB, self.tunnel_counter_table, COUNTER_KEY, str(curr_count + pkt_count))
-
-    def ping_inner_dst(self, packet):
-        """
-        Pings the inner destination IP for an encapsulated packet
-
-        Args:
-            packet: The encapsulated packet received
-        """
-        inner_packet_type = self.get_inner_pkt_type(packet)
-        if inner_packet_type and packet[IP].dst == self.self_ip:
-            cmds = ['timeout', '0.2', 'ping', '-c1',
-                    '-W1', '-i0', '-n', '-q']
-            if inner_packet_type == IPv6:
-                cmds.append('-6')
-            dst_ip = packet[IP].payload[inner_packet_type].dst
-            cmds.append(dst_ip)
-            self.pending_cmds.put(cmds)
+                inner_dsts, count = self.pending_pkts.get(timeout=COUNTER_FLUSH_INTERVAL)
+            except Empty:
+                inner_dsts, count = set(), 0
+            # use a set to automatically deduplicate destination IPs
+            to_probe = set(inner_dsts)
+            pkt_count += count
+            while not self.pending_pkts.empty() and len(to_probe) < MAX_PROBE_BATCH:
+                inner_dsts, count = self.pending_pkts.get()
+                to_probe |= inner_dsts
+                # we should always count each packet, but only probe each unique IP
+                pkt_count += count
+
+            for family, dst_ip in to_probe:
+                logger.log_info("Probing neighbor {}".format(dst_ip))
+                self.prober.probe(family, dst_ip)
+
+            # Counter is updated at most once per interval during a packet storm
+            if pkt_count and time.monotonic() - last_flush >= COUNTER_FLUSH_INTERVAL:
+                try:
+                    curr_count = int(self.counters_db.get(COUNTERS_DB, self.tunnel_counter_table, COUNTER_KEY))
+                except TypeError:
+                    curr_count = 0
+                self.counters_db.set(COUNTERS_DB, self.tunnel_counter_table, COUNTER_KEY,
+                                     str(curr_count + pkt_count))
+                pkt_count = 0
+                last_flush = time.monotonic()
 
     def listen_for_tunnel_pkts(self):
         """
@@ -364,9 +624,9 @@ class TunnelPacketHandler(object):
                               'config DB, exiting...')
             return None
 
-        self.packet_filter = 'host {} and host {}'.format(self.self_ip, peer_ip)
-        logger.log_notice('Starting tunnel packet handler for {}'
-                          .format(self.packet_filter))
+        self.sniffer = TunnelPacketCapture(self.self_ip, peer_ip, self.handle_tunnel_pkts)
+        logger.log_notice('Starting tunnel packet handler for {} -> {}'
+                          .format(peer_ip, self.self_ip))
 
         app_db = DBConnector(APPL_DB, 0)
         lag_table = SubscriberStateTable(app_db, LAG_TABLE)
@@ -385,7 +645,6 @@ class TunnelPacketHandler(object):
             else:
                 lag, _, fvs = lag_table.pop()
                 if self.sniffer_restart_required(lag, fvs):
-                    self.sniffer.stop()
                     start = datetime.now()
                     # wait up to 3 seconds for the kernel interface to be synced with APPL_DB status
                     while (datetime.now() - start).seconds < 3:
@@ -402,6 +661,7 @@ class TunnelPacketHandler(object):
         Entry point for the TunnelPacketHandler class
         """
         self.wait_for_portchannels()
+        self.prober = NeighborProber()
         db_thread = Thread(target=self.write_count_to_db, daemon=True)
         db_thread.start()
         self.listen_for_tunnel_pkts()
@@ -1,5 +1,5 @@
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, mock_open
 import sys
 import subprocess
 
@@ -77,5 +77,91 @@ class TestMemoryChecker(unittest.TestCase):
         self.assertEqual(cm.exception.code, 3)
         mock_get_memory_usage.assert_called_once_with(container_name)
 
+    @patch('os.path.isdir')
+    @patch('os.path.exists')
+    def test_get_cgroup_memory_files(self, mock_exists, mock_isdir):
+        container_id = 'abc123'
+        mock_exists.return_value = False
+        self.assertEqual(memory_checker.get_cgroup_memory_files(container_id),
+                         ('/sys/fs/cgroup/memory/docker/abc123/memory.usage_in_bytes',
+                          '/sys/fs/cgroup/memory/docker/abc123/memory.stat', 'total_inactive_file'))
+
+        mock_exists.return_value = True
+        mock_isdir.side_effect = lambda path: path.startswith('/sys/fs/cgroup/docker/')
+        self.assertEqual(memory_checker.get_cgroup_memory_files(container_id),
+                         ('/sys/fs/cgroup/docker/abc123/memory.current',
+                          '/sys/fs/cgroup/docker/abc123/memory.stat', 'inactive_file'))
+
+    @patch('memory_checker.get_cgroup_memory_files',
+           return_value=('memory.current', 'memory.stat', 'inactive_file'))
+    def test_read_container_memory_usage(self, mock_get_cgroup_memory_files):
+        files = {'memory.current': '4096\n', 'memory.stat': 'active_file 100\ninactive_file 1024\n'}
+        with patch('builtins.open', side_effect=lambda path, mode: mock_open(read_data=files[path])()):
+            self.assertEqual(memory_checker.read_container_memory_usage('abc123'), 3072)
+
+    @patch('memory_checker.get_sampled_memory_usage', return_value=2048)
+    @patch('memory_checker.is_service_active')
+    @patch('memory_checker.publish_events')
+    def test_main_sampled(self, mock_publish_events, mock_is_service_active, mock_get_sampled_memory_usage):
+        with patch.object(sys, 'argv', ['memory_checker', 'snmp', '1024']):
+            with self.assertRaises(SystemExit) as cm:
+                memory_checker.main()
+        self.assertEqual(cm.exception.code, 3)
+        mock_is_service_active.assert_not_called()
+        mock_get_sampled_memory_usage.assert_called_once_with('snmp')
+
+        with patch.object(sys, 'argv', ['memory_checker', 'snmp', '4096']):
+            memory_checker.main()
+
+    @patch('memory_checker.swsscommon')
+    @patch('memory_checker.docker.DockerClient')
+    @patch('memory_checker.read_container_memory_usage')
+    def test_memory_sampler(self, mock_read_container_memory_usage, mock_docker_client, mock_swsscommon):
+        mock_swsscommon.FieldValuePairs = list
+        memory_table = mock_swsscommon.Table.return_value
+        sampler = memory_checker.MemorySampler(window_size=2)
+        sampler.handle_event({'Action': 'start', 'id': 'id1', 'Actor': {'Attributes': {'name': 'snmp'}}})
+        sampler.handle_event({'Action': 'start', 'id': 'id2', 'Actor': {'Attributes': {'name': 'gnmi'}}})
+        self.assertEqual(sampler.container_ids, {'snmp': 'id1', 'gnmi': 'id2'})
+
+        mock_read_container_memory_usage.side_effect = lambda container_id: {'id1': 100, 'id2': 200}[container_id]
+        for _ in range(3):
+            sampler.sample()
+        self.assertEqual(mock_read_container_memory_usage.call_count, 6)
+        name, fvs = memory_table.set.call_args_list[-2][0]
+        self.assertEqual(name, 'snmp')
+        self.assertEqual(dict(fvs)['samples'], '100,100')
+
+        # Samples of stopped container are removed
+        sampler.handle_event({'Action': 'die', 'id': 'id2', 'Actor': {'Attributes': {'name': 'gnmi'}}})
+        sampler.sample()
+        memory_table._del.assert_called_once_with('gnmi')
+        self.assertEqual(list(sampler.samples.keys()), ['snmp'])
+
+    @patch('memory_checker.threading.Thread')
+    @patch('memory_checker.time.sleep')
+    @patch('memory_checker.swsscommon')
+    @patch('memory_checker.docker.DockerClient')
+    def test_memory_sampler_docker_unavailable(self, mock_docker_client, mock_swsscommon, mock_sleep, mock_thread):
+        mock_swsscommon.Table.return_value.getKeys.return_value = []
+        container = MagicMock()
+        container.name = 'snmp'
+        container.id = 'id1'
+        mock_docker_client.return_value.containers.list.side_effect = [
+            memory_checker.docker.errors.DockerException('docker is not running'),
+            OSError('connection refused'),
+            [container],
+        ]
+        mock_sleep.side_effect = [None, None, None, StopIteration]
+        sampler = memory_checker.MemorySampler()
+        with patch.object(sampler, 'sample') as mock_sample:
+            with self.assertRaises(StopIteration):
+                sampler.run()
+        # The failures are retried on the next cycles, sampling goes on meanwhile
+        self.assertEqual(mock_docker_client.return_value.containers.list.call_count, 3)
+        self.assertEqual(mock_sample.call_count, 4)
+        self.assertEqual(sampler.container_ids, {'snmp': 'id1'})
+        mock_thread.return_value.start.assert_called_once()
+
 if __name__ == '__main__':
     unittest.main()
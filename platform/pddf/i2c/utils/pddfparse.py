@@ -1,13 +1,16 @@
 #!/usr/bin/env python
 import argparse
+import contextlib
 import glob
 import json
 import os
 import re
 import subprocess
 import sys
+import threading
 import time
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor
 from sonic_py_common import device_info
 
 bmc_cache = {}
@@ -15,6 +18,13 @@ cache = {}
 SONIC_CFGGEN_PATH = '/usr/local/bin/sonic-cfggen'
 HWSKU_KEY = 'DEVICE_METADATA.localhost.hwsku'
 PLATFORM_KEY = 'DEVICE_METADATA.localhost.platform'
+PDDF_DEVICES_SYSFS = '/sys/kernel/pddf/devices/'
+# Number of device subtrees brought up concurrently. Devices are created one by one unless
+# 'create_workers' in the PLATFORM object or --workers asks for more
+DEFAULT_CREATE_WORKERS = 1
+# Devices other devices refer to by name (CPLD registers, FPGA buses, GPIO lines). They are created
+# before their siblings so that the creation order never depends on the order of the JSON lists.
+PROVIDER_DEVICE_TYPES = ['CPLD', 'FPGAI2C', 'GPIO', 'FPGAPCIE', 'MULTIFPGAPCIE']
 
 dirname = os.path.dirname(os.path.realpath(__file__))
 
@@ -35,15 +45,97 @@ class PddfParse():
         self.data_sysfs_obj = {}
         self.sysfs_obj = {}
 
+        self.dry_run = False
+        self.create_stats = {}
+        self._job = threading.local()
+        self._stats_lock = threading.Lock()
+        self._staging_locks = {}
 
     ###################################################################################################################
     #   GENERIC DEFS
     ###################################################################################################################
-    def runcmd(self, cmd):
-        rc = os.system(cmd)
-        if rc != 0:
-            print("%s -- command failed" % cmd)
-        return rc
+    def write_sysfs(self, path, val):
+        # Same as "echo '<val>' > <path>" without forking a shell, the PDDF drivers expect the trailing newline
+        self.lock_staging_area(path)
+        start = time.monotonic()
+        ret = 0
+        if self.dry_run:
+            print("echo '%s' > %s" % (val, path))
+        else:
+            try:
+                with open(path, 'w') as f:
+                    f.write("%s\n" % val)
+            except (IOError, OSError) as e:
+                print("echo '%s' > %s -- command failed: %s" % (val, path, e))
+                ret = 1
+        self.account_job('writes', 1)
+        self.account_job('write_time', time.monotonic() - start)
+        return ret
+
+    def settle(self, secs):
+        # Give a driver time to register its devices; accounted for in the report, skipped in dry-run mode.
+        # The staging sequence is over by then, let the other devices of the class go ahead meanwhile.
+        self.release_staging_areas()
+        self.account_job('sleep', secs)
+        if not self.dry_run:
+            time.sleep(secs)
+
+    def new_i2c_device(self, dev):
+        topo = dev['i2c']['topo_info']
+        return self.write_sysfs("/sys/bus/i2c/devices/i2c-%d/new_device" % int(topo['parent_bus'], 0),
+                                "%s 0x%x" % (topo['dev_type'], int(topo['dev_addr'], 0)))
+
+    def delete_i2c_device(self, dev):
+        topo = dev['i2c']['topo_info']
+        return self.write_sysfs("/sys/bus/i2c/devices/i2c-%d/delete_device" % int(topo['parent_bus'], 0),
+                                "0x%x" % int(topo['dev_addr'], 0))
+
+    def lock_staging_area(self, path):
+        # The PDDF modules take a device through one staging directory per class (fill in the attributes,
+        # then 'add' to dev_ops), so a job owns the class directory from its first write until it ends.
+        held = getattr(self._job, 'locks', None)
+        if held is None or not path.startswith(PDDF_DEVICES_SYSFS):
+            return
+        key = path[len(PDDF_DEVICES_SYSFS):].split('/')[0]
+        if key in held:
+            return
+        with self._stats_lock:
+            lock = self._staging_locks.setdefault(key, threading.Lock())
+        lock.acquire()
+        held[key] = lock
+
+    def release_staging_areas(self):
+        held = getattr(self._job, 'locks', None)
+        if held:
+            for lock in held.values():
+                lock.release()
+            held.clear()
+
+    @contextlib.contextmanager
+    def device_job(self, name, device_type):
+        """
+        Run a unit of the device bring-up, accounting its sysfs writes and time to 'name' and
+        holding the staging directories it writes to until it is done.
+        """
+        self._job.name = name
+        self._job.locks = {}
+        with self._stats_lock:
+            self.create_stats[name] = {'type': device_type, 'writes': 0, 'write_time': 0.0, 'sleep': 0.0, 'time': 0.0}
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.account_job('time', time.monotonic() - start)
+            self.release_staging_areas()
+            self._job.name = None
+            self._job.locks = None
+
+    def account_job(self, key, val):
+        name = getattr(self._job, 'name', None)
+        if name is None:
+            return
+        with self._stats_lock:
+            self.create_stats[name][key] += val
 
     def get_dev_idx(self, dev, ops):
         parent = dev['dev_info']['virt_parent']
@@ -137,8 +229,7 @@ class PddfParse():
             else:
                 val = attr[key]
 
-            cmd = "echo '%s' > /sys/kernel/%s/%s" % (val, path, key)
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/%s/%s" % (path, key), val)
             if ret != 0:
                 return ret
         return ret
@@ -151,40 +242,34 @@ class PddfParse():
             ret = self.create_device(dev['i2c']['topo_info'], "pddf/devices/psu/i2c", ops)
             if ret != 0:
                 return create_ret.append(ret)
-            cmd = "echo '%s' > /sys/kernel/pddf/devices/psu/i2c/i2c_name" % (dev['dev_info']['device_name'])
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/pddf/devices/psu/i2c/i2c_name", dev['dev_info']['device_name'])
             if ret != 0:
                 return create_ret.append(ret)
-            cmd = "echo '%s'  > /sys/kernel/pddf/devices/psu/i2c/psu_idx" % (self.get_dev_idx(dev, ops))
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/pddf/devices/psu/i2c/psu_idx", self.get_dev_idx(dev, ops))
             if ret != 0:
                 return create_ret.append(ret)
-            cmd = "echo '%s' > /sys/kernel/pddf/devices/psu/i2c/psu_thermals" % (self.get_num_psu_thermals(dev['dev_info']['virt_parent']))
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/pddf/devices/psu/i2c/psu_thermals",
+                                   self.get_num_psu_thermals(dev['dev_info']['virt_parent']))
             if ret != 0:
                 return create_ret.append(ret)
-            cmd = "echo '%s' > /sys/kernel/pddf/devices/psu/i2c/psu_temp_high_thresh_bitmap" % (self.get_psu_temp_high_thresh_bitmap(dev['dev_info']['device_name'],
-                                                                                                    int(self.get_num_psu_thermals(dev['dev_info']['virt_parent']))))
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/pddf/devices/psu/i2c/psu_temp_high_thresh_bitmap",
+                                   self.get_psu_temp_high_thresh_bitmap(dev['dev_info']['device_name'],
+                                                                        int(self.get_num_psu_thermals(dev['dev_info']['virt_parent']))))
             if ret != 0:
                 return create_ret.append(ret)
             for attr in dev['i2c']['attr_list']:
                 ret = self.create_device(attr, "pddf/devices/psu/i2c", ops)
                 if ret != 0:
                     return create_ret.append(ret)
-                cmd = "echo 'add' > /sys/kernel/pddf/devices/psu/i2c/attr_ops"
-                ret = self.runcmd(cmd)
+                ret = self.write_sysfs("/sys/kernel/pddf/devices/psu/i2c/attr_ops", "add")
                 if ret != 0:
                     return create_ret.append(ret)
 
-            cmd = "echo 'add' > /sys/kernel/pddf/devices/psu/i2c/dev_ops"
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/pddf/devices/psu/i2c/dev_ops", "add")
             if ret != 0:
                 return create_ret.append(ret)
         else:
-            cmd = "echo %s 0x%x > /sys/bus/i2c/devices/i2c-%d/new_device" % (dev['i2c']['topo_info']['dev_type'],
-                    int(dev['i2c']['topo_info']['dev_addr'], 0), int(dev['i2c']['topo_info']['parent_bus'], 0))
-            ret = self.runcmd(cmd)
+            ret = self.new_i2c_device(dev)
             if ret != 0:
                 return create_ret.append(ret)
 
@@ -203,8 +288,7 @@ class PddfParse():
             ret = self.create_device(dev['i2c']['topo_info'], "pddf/devices/fan/i2c", ops)
             if ret != 0:
                 return create_ret.append(ret)
-            cmd = "echo '%s' > /sys/kernel/pddf/devices/fan/i2c/i2c_name" % (dev['dev_info']['device_name'])
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/pddf/devices/fan/i2c/i2c_name", dev['dev_info']['device_name'])
             if ret != 0:
                 return create_ret.append(ret)
             ret = self.create_device(dev['i2c']['dev_attr'], "pddf/devices/fan/i2c", ops)
@@ -214,19 +298,15 @@ class PddfParse():
                 ret = self.create_device(attr, "pddf/devices/fan/i2c", ops)
                 if ret != 0:
                     return create_ret.append(ret)
-                cmd = "echo 'add' > /sys/kernel/pddf/devices/fan/i2c/attr_ops"
-                ret = self.runcmd(cmd)
+                ret = self.write_sysfs("/sys/kernel/pddf/devices/fan/i2c/attr_ops", "add")
                 if ret != 0:
                     return create_ret.append(ret)
 
-            cmd = "echo 'add' > /sys/kernel/pddf/devices/fan/i2c/dev_ops"
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/pddf/devices/fan/i2c/dev_ops", "add")
             if ret != 0:
                 return create_ret.append(ret)
         else:
-            cmd = "echo %s 0x%x > /sys/bus/i2c/devices/i2c-%d/new_device" % (dev['i2c']['topo_info']['dev_type'],
-                    int(dev['i2c']['topo_info']['dev_addr'], 0), int(dev['i2c']['topo_info']['parent_bus'], 0))
-            ret = self.runcmd(cmd)
+            ret = self.new_i2c_device(dev)
             if ret != 0:
                 return create_ret.append(ret)
 
@@ -236,9 +316,7 @@ class PddfParse():
         # Create i2c devices for which a PDDF specific driver is not needed
         create_ret = []
         ret = 0
-        cmd = "echo %s 0x%x > /sys/bus/i2c/devices/i2c-%d/new_device" % (dev['i2c']['topo_info']['dev_type'],
-                int(dev['i2c']['topo_info']['dev_addr'], 0), int(dev['i2c']['topo_info']['parent_bus'], 0))
-        ret = self.runcmd(cmd)
+        ret = self.new_i2c_device(dev)
         return create_ret.append(ret)
 
     def create_temp_sensor_device(self, dev, ops):
@@ -262,19 +340,15 @@ class PddfParse():
             if ret != 0:
                 return create_ret.append(ret)
 
-            cmd = "echo '%s' > /sys/kernel/pddf/devices/cpld/i2c_name" % (dev['dev_info']['device_name'])
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/pddf/devices/cpld/i2c_name", dev['dev_info']['device_name'])
             if ret != 0:
                 return create_ret.append(ret)
             # TODO: If attributes are provided then, use 'self.create_device' for them too
-            cmd = "echo 'add' > /sys/kernel/pddf/devices/cpld/dev_ops"
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/pddf/devices/cpld/dev_ops", "add")
             if ret != 0:
                 return create_ret.append(ret)
         else:
-            cmd = "echo %s 0x%x > /sys/bus/i2c/devices/i2c-%d/new_device" % (dev['i2c']['topo_info']['dev_type'],
-                    int(dev['i2c']['topo_info']['dev_addr'], 0), int(dev['i2c']['topo_info']['parent_bus'], 0))
-            ret = self.runcmd(cmd)
+            ret = self.new_i2c_device(dev)
             if ret != 0:
                 return create_ret.append(ret)
 
@@ -288,17 +362,14 @@ class PddfParse():
             if ret!=0:
                 return create_ret.append(ret)
 
-            cmd= "echo '%s' > /sys/kernel/pddf/devices/fpgai2c/i2c_name"%(dev['dev_info']['device_name'])
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/pddf/devices/fpgai2c/i2c_name", dev['dev_info']['device_name'])
             if ret!=0:
                 return create_ret.append(ret)
-            cmd= "echo 'add' > /sys/kernel/pddf/devices/fpgai2c/dev_ops"
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/pddf/devices/fpgai2c/dev_ops", "add")
             if ret!=0:
                 return create_ret.append(ret)
         else:
-            cmd= "echo %s 0x%x > /sys/bus/i2c/devices/i2c-%d/new_device" % (dev['i2c']['topo_info']['dev_type'], int(dev['i2c']['topo_info']['dev_addr'], 0), int(dev['i2c']['topo_info']['parent_bus'], 0))
-            ret = self.runcmd(cmd)
+            ret = self.new_i2c_device(dev)
             if ret!=0:
                 return create_ret.append(ret)
 
@@ -310,21 +381,18 @@ class PddfParse():
         ret = self.create_device(dev['i2c']['topo_info'], "pddf/devices/cpldmux", ops)
         if ret != 0:
             return create_ret.append(ret)
-        cmd = "echo '%s' > /sys/kernel/pddf/devices/cpldmux/i2c_name" % (dev['dev_info']['device_name'])
-        ret = self.runcmd(cmd)
+        ret = self.write_sysfs("/sys/kernel/pddf/devices/cpldmux/i2c_name", dev['dev_info']['device_name'])
         if ret != 0:
             return create_ret.append(ret)
         self.create_device(dev['i2c']['dev_attr'], "pddf/devices/cpldmux", ops)
         # Parse channel info
         for chan in dev['i2c']['channel']:
             self.create_device(chan, "pddf/devices/cpldmux", ops)
-            cmd = "echo 'add' > /sys/kernel/pddf/devices/cpldmux/chan_ops"
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/pddf/devices/cpldmux/chan_ops", "add")
             if ret != 0:
                 return create_ret.append(ret)
 
-        cmd = "echo 'add' > /sys/kernel/pddf/devices/cpldmux/dev_ops"
-        ret = self.runcmd(cmd)
+        ret = self.write_sysfs("/sys/kernel/pddf/devices/cpldmux/dev_ops", "add")
         return create_ret.append(ret)
 
     def create_gpio_device(self, dev, ops):
@@ -333,41 +401,35 @@ class PddfParse():
         ret = self.create_device(dev['i2c']['topo_info'], "pddf/devices/gpio", ops)
         if ret != 0:
             return create_ret.append(ret)
-        cmd = "echo '%s' > /sys/kernel/pddf/devices/gpio/i2c_name" % (dev['dev_info']['device_name'])
-        ret = self.runcmd(cmd)
+        ret = self.write_sysfs("/sys/kernel/pddf/devices/gpio/i2c_name", dev['dev_info']['device_name'])
         if ret != 0:
             return create_ret.append(ret)
         ret = self.create_device(dev['i2c']['dev_attr'], "pddf/devices/gpio", ops)
         if ret != 0:
             return create_ret.append(ret)
-        cmd = "echo 'add' > /sys/kernel/pddf/devices/gpio/dev_ops"
-        ret = self.runcmd(cmd)
+        ret = self.write_sysfs("/sys/kernel/pddf/devices/gpio/dev_ops", "add")
         if ret != 0:
             return create_ret.append(ret)
 
-        time.sleep(2)
+        self.settle(2)
         base = dev['i2c']['dev_attr']['gpio_base']
         for inst in dev['i2c']['ports']:
             if inst['port_num'] != "":
                 port_no = int(base, 16) + int(inst['port_num'])
-                cmd = "echo %d > /sys/class/gpio/export" % port_no
-                ret = self.runcmd(cmd)
+                ret = self.write_sysfs("/sys/class/gpio/export", "%d" % port_no)
                 if ret != 0:
                     return create_ret.append(ret)
                 if inst['direction'] != "":
-                    cmd = "echo %s >/sys/class/gpio/gpio%d/direction" % (inst['direction'], port_no)
-                    ret = self.runcmd(cmd)
+                    ret = self.write_sysfs("/sys/class/gpio/gpio%d/direction" % port_no, inst['direction'])
                     if ret != 0:
                         return create_ret.append(ret)
                     if inst['active_low'] == "1" :
-                        cmd = "echo %s >/sys/class/gpio/gpio%d/active_low" % (inst['active_low'], port_no)
-                        ret = self.runcmd(cmd)
+                        ret = self.write_sysfs("/sys/class/gpio/gpio%d/active_low" % port_no, inst['active_low'])
                         if ret != 0:
                             return create_ret.append(ret)
                     if inst['value'] != "":
                         for i in inst['value'].split(','):
-                            cmd = "echo %s >/sys/class/gpio/gpio%d/value" % (i.rstrip(), port_no)
-                            ret = self.runcmd(cmd)
+                            ret = self.write_sysfs("/sys/class/gpio/gpio%d/value" % port_no, i.rstrip())
                             if ret != 0:
                                 return create_ret.append(ret)
 
@@ -379,21 +441,18 @@ class PddfParse():
         ret = self.create_device(dev['i2c']['topo_info'], "pddf/devices/mux", ops)
         if ret != 0:
             return create_ret.append(ret)
-        cmd = "echo '%s' > /sys/kernel/pddf/devices/mux/i2c_name" % (dev['dev_info']['device_name'])
-        ret = self.runcmd(cmd)
+        ret = self.write_sysfs("/sys/kernel/pddf/devices/mux/i2c_name", dev['dev_info']['device_name'])
         if ret != 0:
             return create_ret.append(ret)
-        cmd = "echo %s > /sys/kernel/pddf/devices/mux/virt_bus" % (dev['i2c']['dev_attr']['virt_bus'])
-        ret = self.runcmd(cmd)
+        ret = self.write_sysfs("/sys/kernel/pddf/devices/mux/virt_bus", dev['i2c']['dev_attr']['virt_bus'])
         if ret != 0:
             return create_ret.append(ret)
-        cmd = "echo 'add' > /sys/kernel/pddf/devices/mux/dev_ops"
-        ret = self.runcmd(cmd)
+        ret = self.write_sysfs("/sys/kernel/pddf/devices/mux/dev_ops", "add")
         # Check if the dev_attr array contain idle_state
         if 'idle_state' in dev['i2c']['dev_attr']:
-            cmd = "echo {} > /sys/bus/i2c/devices/{}-00{:02x}/idle_state".format(dev['i2c']['dev_attr']['idle_state'],
-                    int(dev['i2c']['topo_info']['parent_bus'],0), int(dev['i2c']['topo_info']['dev_addr'],0))
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/bus/i2c/devices/{}-00{:02x}/idle_state".format(
+                    int(dev['i2c']['topo_info']['parent_bus'],0), int(dev['i2c']['topo_info']['dev_addr'],0)),
+                    dev['i2c']['dev_attr']['idle_state'])
 
         return create_ret.append(ret)
 
@@ -405,29 +464,23 @@ class PddfParse():
             return create_ret.append(ret)
         if dev['i2c']['topo_info']['dev_type'] in self.data['PLATFORM']['pddf_dev_types']['PORT_MODULE']:
             self.create_device(dev['i2c']['topo_info'], "pddf/devices/xcvr/i2c", ops)
-            cmd = "echo '%s' > /sys/kernel/pddf/devices/xcvr/i2c/i2c_name" % (dev['dev_info']['device_name'])
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/pddf/devices/xcvr/i2c/i2c_name", dev['dev_info']['device_name'])
             if ret != 0:
                 return create_ret.append(ret)
-            cmd = "echo '%s'  > /sys/kernel/pddf/devices/xcvr/i2c/dev_idx" % (self.get_dev_idx(dev, ops))
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/pddf/devices/xcvr/i2c/dev_idx", self.get_dev_idx(dev, ops))
             if ret != 0:
                 return create_ret.append(ret)
             for attr in dev['i2c']['attr_list']:
                 self.create_device(attr, "pddf/devices/xcvr/i2c", ops)
-                cmd = "echo 'add' > /sys/kernel/pddf/devices/xcvr/i2c/attr_ops"
-                ret = self.runcmd(cmd)
+                ret = self.write_sysfs("/sys/kernel/pddf/devices/xcvr/i2c/attr_ops", "add")
                 if ret != 0:
                     return create_ret.append(ret)
 
-            cmd = "echo 'add' > /sys/kernel/pddf/devices/xcvr/i2c/dev_ops"
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/pddf/devices/xcvr/i2c/dev_ops", "add")
             if ret != 0:
                 return create_ret.append(ret)
         else:
-            cmd = "echo %s 0x%x > /sys/bus/i2c/devices/i2c-%d/new_device" % (dev['i2c']['topo_info']['dev_type'],
-                    int(dev['i2c']['topo_info']['dev_addr'], 0), int(dev['i2c']['topo_info']['parent_bus'], 0))
-            ret = self.runcmd(cmd)
+            ret = self.new_i2c_device(dev)
             # print("\n")
             if ret != 0:
                 return create_ret.append(ret)
@@ -436,10 +489,7 @@ class PddfParse():
                 int(dev['i2c']['topo_info']['parent_bus'], 0), int(dev['i2c']['topo_info']['dev_addr'], 0))
 
             if os.path.exists(port_name_sysfs):
-                cmd = "echo {} > /sys/bus/i2c/devices/{}-00{:02x}/port_name".format(
-                    dev['dev_info']['virt_parent'].lower(), int(dev['i2c']['topo_info']['parent_bus'], 0),
-                    int(dev['i2c']['topo_info']['dev_addr'], 0))
-                ret = self.runcmd(cmd)
+                ret = self.write_sysfs(port_name_sysfs, dev['dev_info']['virt_parent'].lower())
                 if ret != 0:
                     return create_ret.append(ret)
 
@@ -456,8 +506,7 @@ class PddfParse():
         ret = 0
         for attr in dev['attr_list']:
             self.create_device(attr, "pddf/devices/sysstatus", ops)
-            cmd = "echo 'add' > /sys/kernel/pddf/devices/sysstatus/attr_ops"
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/pddf/devices/sysstatus/attr_ops", "add")
             if ret != 0:
                 return create_ret.append(ret)
 
@@ -467,20 +516,16 @@ class PddfParse():
         if "EEPROM" in self.data['PLATFORM']['pddf_dev_types'] and \
                 dev['i2c']['topo_info']['dev_type'] in self.data['PLATFORM']['pddf_dev_types']['EEPROM']:
             self.create_device(dev['i2c']['topo_info'], "pddf/devices/eeprom/i2c", ops)
-            cmd = "echo '%s' > /sys/kernel/pddf/devices/eeprom/i2c/i2c_name" % (dev['dev_info']['device_name'])
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/pddf/devices/eeprom/i2c/i2c_name", dev['dev_info']['device_name'])
             if ret != 0:
                 return create_ret.append(ret)
             self.create_device(dev['i2c']['dev_attr'], "pddf/devices/eeprom/i2c", ops)
-            cmd = "echo 'add' > /sys/kernel/pddf/devices/eeprom/i2c/dev_ops"
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/pddf/devices/eeprom/i2c/dev_ops", "add")
             if ret != 0:
                 return create_ret.append(ret)
 
         else:
-            cmd = "echo %s 0x%x > /sys/bus/i2c/devices/i2c-%d/new_device" % (dev['i2c']['topo_info']['dev_type'],
-                    int(dev['i2c']['topo_info']['dev_addr'], 0), int(dev['i2c']['topo_info']['parent_bus'], 0))
-            ret = self.runcmd(cmd)
+            ret = self.new_i2c_device(dev)
             if ret != 0:
                 return create_ret.append(ret)
 
@@ -493,21 +538,18 @@ class PddfParse():
         if ret!=0:
             return create_ret.append(ret)
 
-        cmd = "echo 'fpgapci_init' > /sys/kernel/pddf/devices/fpgapci/dev_ops"
-        ret = self.runcmd(cmd)
+        ret = self.write_sysfs("/sys/kernel/pddf/devices/fpgapci/dev_ops", "fpgapci_init")
         return create_ret.append(ret)
 
     def create_multifpgapcisystem_device(self, dev, ops):
         create_ret = []
         ret = 0
         for i in dev['dev_attr']['PCI_DEVICE_IDS']:
-            cmd = "echo '{} {}' > /sys/kernel/pddf/devices/multifpgapci/register_pci_device_id".format(i['vendor'], i['device'])
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/pddf/devices/multifpgapci/register_pci_device_id", "{} {}".format(i['vendor'], i['device']))
             if ret != 0:
                 return create_ret.append(ret)
 
-        cmd = "echo 'multifpgapci_init' > /sys/kernel/pddf/devices/multifpgapci/dev_ops"
-        ret = self.runcmd(cmd)
+        ret = self.write_sysfs("/sys/kernel/pddf/devices/multifpgapci/dev_ops", "multifpgapci_init")
         return create_ret.append(ret)
 
     def create_multifpgapci_device(self, dev, ops):
@@ -521,8 +563,7 @@ class PddfParse():
             return create_ret.append(ret)
 
         # PDDF client data store
-        cmd = "echo '{}' > /sys/kernel/pddf/devices/multifpgapci/{}/i2c_name".format(dev['dev_info']['device_name'], bdf)
-        ret = self.runcmd(cmd)
+        ret = self.write_sysfs("/sys/kernel/pddf/devices/multifpgapci/{}/i2c_name".format(bdf), dev['dev_info']['device_name'])
         if ret != 0:
             return create_ret.append(ret)
 
@@ -533,14 +574,12 @@ class PddfParse():
         
         # TODO: add GPIO & SPI specific data stores
 
-        cmd = "echo 'fpgapci_init' > /sys/kernel/pddf/devices/multifpgapci/{}/dev_ops".format(bdf)
-        ret = self.runcmd(cmd)
+        ret = self.write_sysfs("/sys/kernel/pddf/devices/multifpgapci/{}/dev_ops".format(bdf), "fpgapci_init")
         if ret != 0:
             return create_ret.append(ret)
 
         for bus in range(int(dev['i2c']['dev_attr']['num_virt_ch'], 16)):
-            cmd = "echo {} > /sys/kernel/pddf/devices/multifpgapci/{}/i2c/new_i2c_adapter".format(bus, bdf)
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/pddf/devices/multifpgapci/{}/i2c/new_i2c_adapter".format(bdf), bus)
             if ret != 0:
                 return create_ret.append(ret)
 
@@ -552,14 +591,10 @@ class PddfParse():
     def delete_eeprom_device(self, dev, ops):
         if "EEPROM" in self.data['PLATFORM']['pddf_dev_types'] and \
                 dev['i2c']['topo_info']['dev_type'] in self.data['PLATFORM']['pddf_dev_types']['EEPROM']:
-            cmd = "echo '%s' > /sys/kernel/pddf/devices/eeprom/i2c/i2c_name" % (dev['dev_info']['device_name'])
-            self.runcmd(cmd)
-            cmd = "echo 'delete' > /sys/kernel/pddf/devices/eeprom/i2c/dev_ops"
-            self.runcmd(cmd)
+            self.write_sysfs("/sys/kernel/pddf/devices/eeprom/i2c/i2c_name", dev['dev_info']['device_name'])
+            self.write_sysfs("/sys/kernel/pddf/devices/eeprom/i2c/dev_ops", "delete")
         else:
-            cmd = "echo 0x%x > /sys/bus/i2c/devices/i2c-%d/delete_device" % (
-                    int(dev['i2c']['topo_info']['dev_addr'], 0), int(dev['i2c']['topo_info']['parent_bus'], 0))
-            self.runcmd(cmd)
+            self.delete_i2c_device(dev)
 
     def delete_sysstatus_device(self, dev, ops):
         # NOT A PHYSICAL DEVICE.... rmmod on module would remove all the artifacts
@@ -568,64 +603,45 @@ class PddfParse():
 
     def delete_xcvr_i2c_device(self, dev, ops):
         if dev['i2c']['topo_info']['dev_type'] in self.data['PLATFORM']['pddf_dev_types']['PORT_MODULE']:
-            cmd = "echo '%s' > /sys/kernel/pddf/devices/xcvr/i2c/i2c_name" % (dev['dev_info']['device_name'])
-            self.runcmd(cmd)
-            cmd = "echo 'delete' > /sys/kernel/pddf/devices/xcvr/i2c/dev_ops"
-            self.runcmd(cmd)
+            self.write_sysfs("/sys/kernel/pddf/devices/xcvr/i2c/i2c_name", dev['dev_info']['device_name'])
+            self.write_sysfs("/sys/kernel/pddf/devices/xcvr/i2c/dev_ops", "delete")
         else:
-            cmd = "echo 0x%x > /sys/bus/i2c/devices/i2c-%d/delete_device" % (
-                    int(dev['i2c']['topo_info']['dev_addr'], 0), int(dev['i2c']['topo_info']['parent_bus'], 0))
-            self.runcmd(cmd)
+            self.delete_i2c_device(dev)
 
     def delete_xcvr_device(self, dev, ops):
         self.delete_xcvr_i2c_device(dev, ops)
         return
 
     def delete_gpio_device(self, dev, ops):
-        cmd = "echo '%s' > /sys/kernel/pddf/devices/gpio/i2c_name" % (dev['dev_info']['device_name'])
-        self.runcmd(cmd)
-        cmd = "echo 'delete' > /sys/kernel/pddf/devices/gpio/dev_ops"
-        self.runcmd(cmd)
+        self.write_sysfs("/sys/kernel/pddf/devices/gpio/i2c_name", dev['dev_info']['device_name'])
+        self.write_sysfs("/sys/kernel/pddf/devices/gpio/dev_ops", "delete")
 
     def delete_mux_device(self, dev, ops):
-        cmd = "echo '%s' > /sys/kernel/pddf/devices/mux/i2c_name" % (dev['dev_info']['device_name'])
-        self.runcmd(cmd)
-        cmd = "echo 'delete' > /sys/kernel/pddf/devices/mux/dev_ops"
-        self.runcmd(cmd)
+        self.write_sysfs("/sys/kernel/pddf/devices/mux/i2c_name", dev['dev_info']['device_name'])
+        self.write_sysfs("/sys/kernel/pddf/devices/mux/dev_ops", "delete")
 
     def delete_cpld_device(self, dev, ops):
         if dev['i2c']['topo_info']['dev_type'] in self.data['PLATFORM']['pddf_dev_types']['CPLD']:
-            cmd = "echo '%s' > /sys/kernel/pddf/devices/cpld/i2c_name" % (dev['dev_info']['device_name'])
-            self.runcmd(cmd)
-            cmd = "echo 'delete' > /sys/kernel/pddf/devices/cpld/dev_ops"
-            self.runcmd(cmd)
+            self.write_sysfs("/sys/kernel/pddf/devices/cpld/i2c_name", dev['dev_info']['device_name'])
+            self.write_sysfs("/sys/kernel/pddf/devices/cpld/dev_ops", "delete")
         else:
-            cmd = "echo 0x%x > /sys/bus/i2c/devices/i2c-%d/delete_device" % (
-                    int(dev['i2c']['topo_info']['dev_addr'], 0), int(dev['i2c']['topo_info']['parent_bus'], 0))
-            self.runcmd(cmd)
+            self.delete_i2c_device(dev)
 
     def delete_fpgai2c_device(self, dev, ops):
         if dev['i2c']['topo_info']['dev_type'] in self.data['PLATFORM']['pddf_dev_types']['FPGAI2C']:
-            cmd= "echo '%s' > /sys/kernel/pddf/devices/fpgai2c/i2c_name"%(dev['dev_info']['device_name'])
-            self.runcmd(cmd)
-            cmd= "echo 'delete' > /sys/kernel/pddf/devices/fpgai2c/dev_ops"
-            self.runcmd(cmd)
+            self.write_sysfs("/sys/kernel/pddf/devices/fpgai2c/i2c_name", dev['dev_info']['device_name'])
+            self.write_sysfs("/sys/kernel/pddf/devices/fpgai2c/dev_ops", "delete")
         else:
-            cmd= "echo 0x%x > /sys/bus/i2c/devices/i2c-%d/delete_device" % (int(dev['i2c']['topo_info']['dev_addr'], 0), int(dev['i2c']['topo_info']['parent_bus'], 0))
-            self.runcmd(cmd)
+            self.delete_i2c_device(dev)
 
     def delete_cpldmux_device(self, dev, ops):
         if dev['i2c']['topo_info']['dev_type'] in self.data['PLATFORM']['pddf_dev_types']['CPLDMUX']:
-            cmd = "echo '%s' > /sys/kernel/pddf/devices/cpldmux/i2c_name" % (dev['dev_info']['device_name'])
-            self.runcmd(cmd)
-            cmd = "echo 'delete' > /sys/kernel/pddf/devices/cpldmux/dev_ops"
-            self.runcmd(cmd)
+            self.write_sysfs("/sys/kernel/pddf/devices/cpldmux/i2c_name", dev['dev_info']['device_name'])
+            self.write_sysfs("/sys/kernel/pddf/devices/cpldmux/dev_ops", "delete")
 
     def delete_non_pddf_i2c_device(self, dev, ops):
         # Delete i2c devices for which a PDDF specific driver is not needed
-        cmd = "echo 0x%x > /sys/bus/i2c/devices/i2c-%d/delete_device" % (
-                int(dev['i2c']['topo_info']['dev_addr'], 0), int(dev['i2c']['topo_info']['parent_bus'], 0))
-        self.runcmd(cmd)
+        self.delete_i2c_device(dev)
 
     def delete_temp_sensor_device(self, dev, ops):
         return self.delete_non_pddf_i2c_device(dev, ops)
@@ -642,26 +658,18 @@ class PddfParse():
 
     def delete_fan_device(self, dev, ops):
         if dev['i2c']['topo_info']['dev_type'] in self.data['PLATFORM']['pddf_dev_types']['FAN']:
-            cmd = "echo '%s' > /sys/kernel/pddf/devices/fan/i2c/i2c_name" % (dev['dev_info']['device_name'])
-            self.runcmd(cmd)
-            cmd = "echo 'delete' > /sys/kernel/pddf/devices/fan/i2c/dev_ops"
-            self.runcmd(cmd)
+            self.write_sysfs("/sys/kernel/pddf/devices/fan/i2c/i2c_name", dev['dev_info']['device_name'])
+            self.write_sysfs("/sys/kernel/pddf/devices/fan/i2c/dev_ops", "delete")
         else:
-            cmd = "echo 0x%x > /sys/bus/i2c/devices/i2c-%d/delete_device" % (
-                    int(dev['i2c']['topo_info']['dev_addr'], 0), int(dev['i2c']['topo_info']['parent_bus'], 0))
-            self.runcmd(cmd)
+            self.delete_i2c_device(dev)
 
 
     def delete_psu_i2c_device(self, dev, ops):
         if dev['i2c']['topo_info']['dev_type'] in self.data['PLATFORM']['pddf_dev_types']['PSU']:
-            cmd = "echo '%s' > /sys/kernel/pddf/devices/psu/i2c/i2c_name" % (dev['dev_info']['device_name'])
-            self.runcmd(cmd)
-            cmd = "echo 'delete' > /sys/kernel/pddf/devices/psu/i2c/dev_ops"
-            self.runcmd(cmd)
+            self.write_sysfs("/sys/kernel/pddf/devices/psu/i2c/i2c_name", dev['dev_info']['device_name'])
+            self.write_sysfs("/sys/kernel/pddf/devices/psu/i2c/dev_ops", "delete")
         else:
-            cmd = "echo 0x%x > /sys/bus/i2c/devices/i2c-%d/delete_device" % (
-                    int(dev['i2c']['topo_info']['dev_addr'], 0), int(dev['i2c']['topo_info']['parent_bus'], 0))
-            self.runcmd(cmd)
+            self.delete_i2c_device(dev)
 
     def delete_psu_device(self, dev, ops):
         self.delete_psu_i2c_device(dev, ops)
@@ -673,10 +681,8 @@ class PddfParse():
     def delete_multifpgapci_device(self, dev, ops):
         bdf = dev['dev_info']['device_bdf']
 
-        cmd = "echo '{}' > /sys/kernel/pddf/devices/multifpgapci/{}/i2c_name".format(dev['dev_info']['device_name'], bdf)
-        self.runcmd(cmd)
-        cmd = "echo 'fpgapci_deinit' > /sys/kernel/pddf/devices/multifpgapci/{}/dev_ops".format(bdf)
-        self.runcmd(cmd)
+        self.write_sysfs("/sys/kernel/pddf/devices/multifpgapci/{}/i2c_name".format(bdf), dev['dev_info']['device_name'])
+        self.write_sysfs("/sys/kernel/pddf/devices/multifpgapci/{}/dev_ops".format(bdf), "fpgapci_deinit")
 
     #################################################################################################################################
     #   SHOW ATTRIBIUTES DEFS
@@ -1365,8 +1371,7 @@ class PddfParse():
     def get_led_device(self, device_name):
         self.create_attr('device_name', self.data[device_name]['dev_info']['device_name'], "pddf/devices/led")
         self.create_attr('index', self.data[device_name]['dev_attr']['index'], "pddf/devices/led")
-        cmd = "echo 'verify'  > /sys/kernel/pddf/devices/led/dev_ops"
-        self.runcmd(cmd)
+        self.write_sysfs("/sys/kernel/pddf/devices/led/dev_ops", "verify")
 
     def validate_sysfs_creation(self, obj, validate_type):
         dir = '/sys/kernel/pddf/devices/'+validate_type
@@ -1920,8 +1925,7 @@ class PddfParse():
 
     def create_attr(self, key, value, path, exceptions=[]):
         if key not in exceptions:
-            cmd = "echo '%s' > /sys/kernel/%s/%s" % (value,  path, key)
-            self.runcmd(cmd)
+            self.write_sysfs("/sys/kernel/%s/%s" % (path, key), value)
 
     def create_led_platform_device(self, key, ops):
         if ops['attr'] == 'all' or ops['attr'] == 'PLATFORM':
@@ -1948,8 +1952,7 @@ class PddfParse():
                     elif attr_key not in ['attr_name', 'descr', 'state']:
                         state_path = path+'/state_attr'
                         self.create_attr(attr_key, attr[attr_key],state_path)
-                cmd="echo '"  + attr['attr_name']+"' > /sys/kernel/pddf/devices/led/dev_ops"
-                self.runcmd(cmd)
+                self.write_sysfs("/sys/kernel/pddf/devices/led/dev_ops", attr['attr_name'])
 
 
 
@@ -1970,24 +1973,169 @@ class PddfParse():
                     list.append(self.data[key])
 
 
-    def create_pddf_devices(self):
-        ret = self.multifpgapcisystem_parse({"cmd": "create", "target": "all", "attr": "all"})
+    def get_create_workers(self):
+        try:
+            return max(1, int(self.data['PLATFORM'].get('create_workers', DEFAULT_CREATE_WORKERS)))
+        except (TypeError, ValueError):
+            return DEFAULT_CREATE_WORKERS
+
+    def get_child_devices(self, dev):
+        dev_type = dev['dev_info']['device_type']
+        if dev_type == 'CPU':
+            return [d['dev'] for ctrl in dev['i2c']['CONTROLLERS'] for d in self.data[ctrl['dev']]['i2c']['DEVICES']]
+        if dev_type in ['MUX', 'FPGAPCIE', 'MULTIFPGAPCIE']:
+            return [ch['dev'] for ch in dev['i2c']['channel']]
+        if dev_type == 'CPLDMUX':
+            return [d for ch in dev['i2c']['channel'] for d in ch['dev']]
+        return []
+
+    def create_device_node(self, dev, ops):
+        # Create the device itself, its children are left to create_device_tree()
+        dev_type = dev['dev_info']['device_type']
+        if dev_type == 'CPU':
+            return 0
+        kind = {'MUX': 'mux', 'CPLDMUX': 'cpldmux', 'FPGAPCIE': 'fpgapci', 'MULTIFPGAPCIE': 'multifpgapci'}.get(dev_type)
+        if kind is None:
+            ret = self.dev_parse(dev, ops)
+        else:
+            ret = getattr(self, "create_%s_device" % kind)(dev, ops)
+        if ret and str(ret[0]).isdigit() and ret[0] != 0:
+            if kind is not None:
+                print("create_%s_device() cmd failed for %s" % (kind, dev['dev_info']['device_name']))
+            return ret[0]
+        return 0
+
+    def create_system_devices(self, ops, workers):
+        """
+        Bring up the i2c topology under SYSTEM. A device is created as soon as its parent (CPU controller,
+        mux or FPGA channel) is up, so independent subtrees are created concurrently by 'workers' threads.
+        Among siblings, the provider devices go first and the others follow once all of those are up.
+        """
+        failed = []
+        pending = [0]
+        done = threading.Condition()
+        executor = ThreadPoolExecutor(max_workers=workers)
+
+        def schedule(names, on_created=None):
+            with done:
+                pending[0] += len(names)
+            for name in names:
+                executor.submit(run, name, on_created)
+
+        def schedule_children(children):
+            providers = [c for c in children if self.get_device_type(c) in PROVIDER_DEVICE_TYPES]
+            others = [c for c in children if c not in providers]
+            if not providers:
+                schedule(others)
+                return
+            remaining = [len(providers)]
+
+            def provider_created():
+                with done:
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last:
+                    schedule(others)
+            schedule(providers, provider_created)
+
+        def run(name, on_created):
+            try:
+                if not failed:
+                    dev = self.data[name]
+                    with self.device_job(name, dev['dev_info']['device_type']):
+                        ret = self.create_device_node(dev, ops)
+                    if ret != 0:
+                        failed.append(ret)
+                    else:
+                        schedule_children(self.get_child_devices(dev))
+            except Exception as e:
+                print("Failed to create %s: %s" % (name, str(e)))
+                failed.append(1)
+            finally:
+                if on_created is not None:
+                    on_created()
+                with done:
+                    pending[0] -= 1
+                    done.notify()
+
+        try:
+            schedule(['SYSTEM'])
+            with done:
+                while pending[0]:
+                    done.wait()
+        finally:
+            executor.shutdown()
+        if failed:
+            return failed[0]
+        return 0
+
+    def create_pddf_devices(self, workers=None):
+        if workers is None:
+            workers = self.get_create_workers()
+        self.create_stats = {}
+        self.create_workers = max(1, workers)
+        start = time.monotonic()
+        try:
+            return self._create_pddf_devices(self.create_workers)
+        finally:
+            self.create_time = time.monotonic() - start
+
+    def _create_pddf_devices(self, workers):
+        ops = {"cmd": "create", "target": "all", "attr": "all"}
+        with self.device_job('MULTIFPGAPCIESYSTEM0', 'MULTIFPGAPCIESYSTEM'):
+            ret = self.multifpgapcisystem_parse(ops)
         if ret:
             if ret[0] != 0:
                 return ret[0]
-        self.led_parse({"cmd": "create", "target": "all", "attr": "all"})
+        with self.device_job('LED', 'LED'):
+            self.led_parse(ops)
         create_ret = 0
-        ret = self.dev_parse(self.data['SYSTEM'], {"cmd": "create", "target": "all", "attr": "all"})
-        if ret:
-            if ret[0] != 0:
-                return ret[0]
+        if workers == 1:
+            # Same depth-first order as the sequential bring-up always had
+            with self.device_job('SYSTEM', 'SYSTEM'):
+                ret = self.dev_parse(self.data['SYSTEM'], ops)
+            if ret:
+                if ret[0] != 0:
+                    return ret[0]
+        else:
+            create_ret = self.create_system_devices(ops, workers)
+            if create_ret != 0:
+                return create_ret
         if 'SYSSTATUS' in self.data:
-            ret = self.dev_parse(self.data['SYSSTATUS'], {"cmd": "create", "target": "all", "attr": "all"})
+            with self.device_job('SYSSTATUS', 'SYSSTAT'):
+                ret = self.dev_parse(self.data['SYSSTATUS'], ops)
             if ret:
                 if ret[0] != 0:
                     return ret[0]
         return create_ret
 
+    def print_create_report(self, top=20):
+        stats = {k: v for k, v in self.create_stats.items() if v['writes'] or v['sleep']}
+        total_writes = sum(v['writes'] for v in stats.values())
+        print("PDDF device creation%s: %d devices, %d sysfs writes, %.1f ms wall time with %d workers" % (
+            " (dry-run)" if self.dry_run else "", len(stats), total_writes,
+            getattr(self, 'create_time', 0.0) * 1000, getattr(self, 'create_workers', 1)))
+
+        types = {}
+        for v in stats.values():
+            t = types.setdefault(v['type'] or '-', {'devices': 0, 'writes': 0, 'write_time': 0.0, 'sleep': 0.0, 'time': 0.0})
+            t['devices'] += 1
+            for key in ['writes', 'write_time', 'sleep', 'time']:
+                t[key] += v[key]
+
+        fmt = "%-24s %8s %8s %12s %10s %10s"
+        print("")
+        print(fmt % ("Device type", "Devices", "Writes", "Write (ms)", "Sleep (s)", "Time (ms)"))
+        for name, t in sorted(types.items(), key=lambda x: x[1]['time'], reverse=True):
+            print(fmt % (name, t['devices'], t['writes'], "%.1f" % (t['write_time'] * 1000), "%.1f" % t['sleep'],
+                         "%.1f" % (t['time'] * 1000)))
+
+        print("")
+        print(fmt % ("Device", "Type", "Writes", "Write (ms)", "Sleep (s)", "Time (ms)"))
+        for name, v in sorted(stats.items(), key=lambda x: x[1]['time'], reverse=True)[:top]:
+            print(fmt % (name, v['type'] or '-', v['writes'], "%.1f" % (v['write_time'] * 1000), "%.1f" % v['sleep'],
+                         "%.1f" % (v['time'] * 1000)))
+
 
     def delete_pddf_devices(self):
         self.dev_parse(self.data['SYSTEM'], {"cmd": "delete", "target": "all", "attr": "all"})
@@ -2230,6 +2378,9 @@ def main():
     parser.add_argument("--validate", action='store', help="Validate the device specific attribute data elements")
     parser.add_argument("--schema", action='store', nargs="+",  help="Schema Validation")
     parser.add_argument("--modules", action='store', nargs="+", help="Loaded modules validation")
+    parser.add_argument("--dry-run", action='store_true', help="Print the sysfs writes of --create/--delete instead of doing them")
+    parser.add_argument("--report", action='store_true', help="Print where the time of --create goes, per device type and device")
+    parser.add_argument("--workers", action='store', type=int, help="Number of device subtrees --create brings up concurrently")
 
     args = parser.parse_args()
 
@@ -2240,8 +2391,12 @@ def main():
         print("%s" % str(e))
         sys.exit()
 
+    pddf_obj.dry_run = args.dry_run
+
     if args.create:
-        pddf_obj.create_pddf_devices()
+        pddf_obj.create_pddf_devices(args.workers)
+        if args.report or args.dry_run:
+            pddf_obj.print_create_report()
 
     if args.sysfs:
         if args.sysfs[0] == 'all':
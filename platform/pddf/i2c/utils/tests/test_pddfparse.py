@@ -0,0 +1,142 @@
+import os
+import sys
+import threading
+from unittest import mock
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import pddfparse
+
+
+@pytest.fixture
+def sysfs(tmp_path):
+    devices = tmp_path / 'pddf' / 'devices'
+    for dev_class in ('cpld', 'led'):
+        (devices / dev_class).mkdir(parents=True)
+    with mock.patch('pddfparse.PDDF_DEVICES_SYSFS', str(devices) + '/'):
+        yield devices
+
+
+@pytest.fixture
+def parser():
+    # Skip __init__, it needs the platform directory of a device
+    parser = pddfparse.PddfParse.__new__(pddfparse.PddfParse)
+    parser.data = {'PLATFORM': {}}
+    parser.dry_run = False
+    parser.create_stats = {}
+    parser._job = threading.local()
+    parser._stats_lock = threading.Lock()
+    parser._staging_locks = {}
+    return parser
+
+
+def test_write_sysfs(parser, sysfs):
+    node = sysfs / 'cpld' / 'dev_ops'
+    assert parser.write_sysfs(str(node), 'add') == 0
+    # Same content as echo writes, the drivers expect the trailing newline
+    assert node.read_text() == 'add\n'
+
+    assert parser.write_sysfs(str(sysfs / 'missing' / 'dev_ops'), 'add') == 1
+
+
+def test_write_sysfs_dry_run(parser, sysfs, capsys):
+    parser.dry_run = True
+    node = sysfs / 'cpld' / 'dev_ops'
+    assert parser.write_sysfs(str(node), 'add') == 0
+    assert not node.exists()
+    assert capsys.readouterr().out == "echo 'add' > %s\n" % node
+
+
+def test_write_sysfs_accounting(parser, sysfs):
+    with parser.device_job('CPLD1', 'CPLD'):
+        parser.write_sysfs(str(sysfs / 'cpld' / 'dev_addr'), '0x60')
+        parser.write_sysfs(str(sysfs / 'cpld' / 'dev_ops'), 'add')
+        parser.settle(0)
+    assert parser.create_stats['CPLD1']['type'] == 'CPLD'
+    assert parser.create_stats['CPLD1']['writes'] == 2
+    # Writes outside of a job are not accounted
+    parser.write_sysfs(str(sysfs / 'cpld' / 'dev_ops'), 'add')
+    assert parser.create_stats['CPLD1']['writes'] == 2
+
+
+def test_staging_locks(parser, sysfs):
+    events = []
+    first_staged = threading.Event()
+    second_started = threading.Event()
+
+    def first():
+        with parser.device_job('CPLD1', 'CPLD'):
+            parser.write_sysfs(str(sysfs / 'cpld' / 'dev_addr'), '0x60')
+            first_staged.set()
+            second_started.wait(5)
+            # The other job can't stage a CPLD until this one is done
+            events.append('CPLD1 add')
+            parser.write_sysfs(str(sysfs / 'cpld' / 'dev_ops'), 'add')
+
+    def second():
+        first_staged.wait(5)
+        with parser.device_job('CPLD2', 'CPLD'):
+            second_started.set()
+            parser.write_sysfs(str(sysfs / 'cpld' / 'dev_addr'), '0x61')
+            events.append('CPLD2 staged')
+
+    threads = [threading.Thread(target=first), threading.Thread(target=second)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    assert events == ['CPLD1 add', 'CPLD2 staged']
+    assert all(not lock.locked() for lock in parser._staging_locks.values())
+
+
+def test_staging_locks_other_class(parser, sysfs):
+    with parser.device_job('CPLD1', 'CPLD'):
+        parser.write_sysfs(str(sysfs / 'cpld' / 'dev_addr'), '0x60')
+        assert parser._staging_locks['cpld'].locked()
+
+        # A device of another class goes ahead meanwhile
+        done = []
+
+        def other():
+            with parser.device_job('DIAG_LED', 'LED'):
+                done.append(parser.write_sysfs(str(sysfs / 'led' / 'device_name'), 'DIAG_LED'))
+
+        thread = threading.Thread(target=other)
+        thread.start()
+        thread.join(5)
+        assert done == [0]
+
+        # Settling releases the staging directories of the job
+        parser.settle(0)
+        assert not parser._staging_locks['cpld'].locked()
+    assert not parser._staging_locks['cpld'].locked()
+
+
+def test_create_workers(parser):
+    assert parser.get_create_workers() == 1
+    parser.data['PLATFORM']['create_workers'] = '4'
+    assert parser.get_create_workers() == 4
+    parser.data['PLATFORM']['create_workers'] = 'many'
+    assert parser.get_create_workers() == 1
+
+
+def test_create_pddf_devices_sequential(parser):
+    parser.data['SYSTEM'] = {'dev_info': {'device_type': 'CPU'}}
+    parser.multifpgapcisystem_parse = mock.MagicMock(return_value=None)
+    parser.led_parse = mock.MagicMock()
+    parser.dev_parse = mock.MagicMock(return_value=[0])
+    parser.create_system_devices = mock.MagicMock(return_value=0)
+
+    # A single worker walks SYSTEM depth first like the sequential bring-up
+    assert parser.create_pddf_devices(1) == 0
+    parser.dev_parse.assert_called_once_with(parser.data['SYSTEM'], {"cmd": "create", "target": "all", "attr": "all"})
+    parser.create_system_devices.assert_not_called()
+
+    parser.dev_parse.reset_mock()
+    assert parser.create_pddf_devices(4) == 0
+    parser.dev_parse.assert_not_called()
+    parser.create_system_devices.assert_called_once()
+
+    parser.dev_parse.return_value = [1]
+    assert parser.create_pddf_devices(1) == 1
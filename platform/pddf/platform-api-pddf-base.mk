@@ -10,6 +10,7 @@ ifeq ($(ENABLE_PY2_MODULES), y)
     $(PDDF_PLATFORM_API_BASE_PY2)_SRC_PATH = $(PLATFORM_PDDF_PATH)/platform-api-pddf-base
     $(PDDF_PLATFORM_API_BASE_PY2)_PYTHON_VERSION = 2
     $(PDDF_PLATFORM_API_BASE_PY2)_DEPENDS = $(SONIC_CONFIG_ENGINE)
+    $(PDDF_PLATFORM_API_BASE_PY2)_TEST = n
     SONIC_PYTHON_WHEELS += $(PDDF_PLATFORM_API_BASE_PY2)
 
     export pddf_platform_api_base_py2_wheel_path="$(addprefix $(PYTHON_WHEELS_PATH)/,$(PDDF_PLATFORM_API_BASE_PY2))"
@@ -19,13 +20,13 @@ endif
 PDDF_PLATFORM_API_BASE_PY3 = sonic_platform_pddf_common-$(PDDF_PLATFORM_API_BASE_VERSION)-py3-none-any.whl
 $(PDDF_PLATFORM_API_BASE_PY3)_SRC_PATH = $(PLATFORM_PDDF_PATH)/platform-api-pddf-base
 $(PDDF_PLATFORM_API_BASE_PY3)_PYTHON_VERSION = 3
-$(PDDF_PLATFORM_API_BASE_PY3)_DEPENDS = $(SONIC_CONFIG_ENGINE)
+$(PDDF_PLATFORM_API_BASE_PY3)_DEPENDS = $(SONIC_PY_COMMON_PY3) $(SONIC_CONFIG_ENGINE_PY3)
+$(PDDF_PLATFORM_API_BASE_PY3)_DEBS_DEPENDS = $(LIBSWSSCOMMON) $(PYTHON3_SWSSCOMMON)
 ifeq ($(ENABLE_PY2_MODULES), y)
     # Synthetic dependency to avoid building the Python 2 and 3 packages
     # simultaneously and any potential conflicts which may arise
     $(PDDF_PLATFORM_API_BASE_PY3)_DEPENDS += $(PDDF_PLATFORM_API_BASE_PY2)
 endif
-$(PDDF_PLATFORM_API_BASE_PY3)_TEST = n
 SONIC_PYTHON_WHEELS += $(PDDF_PLATFORM_API_BASE_PY3)
 
 export pddf_platform_api_base_py3_wheel_path="$(addprefix $(PYTHON_WHEELS_PATH)/,$(PDDF_PLATFORM_API_BASE_PY3))"
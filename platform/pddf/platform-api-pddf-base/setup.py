@@ -17,6 +17,13 @@ setup(
     install_requires=[
         'jsonschema==2.6.0'
     ],
+    setup_requires=[
+        'pytest-runner',
+        'wheel'
+    ],
+    tests_require=[
+        'pytest'
+    ],
     classifiers=[
         'Development Status :: 3 - Alpha',
         'Environment :: Plugins',
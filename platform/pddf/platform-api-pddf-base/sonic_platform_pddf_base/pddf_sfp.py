@@ -245,6 +245,7 @@ class PddfSfp(SfpOptoeBase):
         status = False
         device = 'PORT{}'.format(self.port_index)
         path = self.pddf_obj.get_path(device, 'xcvr_reset')
+        self.pddf_obj.clear_attr_cache(device, 'xcvr_reset')
         if path:
             try:
                 with open(path, 'r+') as f:
@@ -275,6 +276,7 @@ class PddfSfp(SfpOptoeBase):
         status = False
         device = 'PORT{}'.format(self.port_index)
         path = self.pddf_obj.get_path(device, 'xcvr_txdisable')
+        self.pddf_obj.clear_attr_cache(device, 'xcvr_txdisable')
 
         # TODO: put the optic based reset logic using EEPROM
         if path:
@@ -311,6 +313,7 @@ class PddfSfp(SfpOptoeBase):
         status = False
         device = 'PORT{}'.format(self.port_index)
         path = self.pddf_obj.get_path(device, 'xcvr_lpmode')
+        self.pddf_obj.clear_attr_cache(device, 'xcvr_lpmode')
 
         if path:
             try:
@@ -143,6 +143,7 @@ class PddfThermal(ThermalBase):
     def set_high_threshold(self, temperature):
         if not self.is_psu_thermal:
             node = self.pddf_obj.get_path(self.thermal_obj_name, "temp1_high_threshold")
+            self.pddf_obj.clear_attr_cache(self.thermal_obj_name, "temp1_high_threshold")
             if node is None:
                 print("ERROR %s does not exist" % node)
                 return None
@@ -159,6 +160,7 @@ class PddfThermal(ThermalBase):
     def set_low_threshold(self, temperature):
         if not self.is_psu_thermal:
             node = self.pddf_obj.get_path(self.thermal_obj_name, "temp1_low_threshold")
+            self.pddf_obj.clear_attr_cache(self.thermal_obj_name, "temp1_low_threshold")
             if node is None:
                 print("ERROR %s does not exist" % node)
                 return None
@@ -16,6 +16,7 @@ SONIC_CFGGEN_PATH = '/usr/local/bin/sonic-cfggen'
 LED_CTRL_LOCK_PATH = '/var/lock/pddf-api-led.lock'
 HWSKU_KEY = 'DEVICE_METADATA.localhost.hwsku'
 PLATFORM_KEY = 'DEVICE_METADATA.localhost.platform'
+ATTR_CACHE_KEY = 'attr_cache'
 
 dirname = os.path.dirname(os.path.realpath(__file__))
 
@@ -35,6 +36,11 @@ class PddfApi():
         self.data_sysfs_obj = {}
         self.sysfs_obj = {}
 
+        # (device_name, attr_name) -> (read time, output) for the attributes having a TTL
+        self.attr_cache = {}
+        self.attr_cache_stats = {}
+        self.attr_cache_default_ttl, self.attr_cache_ttl = self.load_attr_cache_config()
+
         os.makedirs(os.path.dirname(LED_CTRL_LOCK_PATH), exist_ok=True)
 
     def _acquire_led_ctrl_lock(self):
@@ -55,6 +61,16 @@ class PddfApi():
             print("%s -- command failed" % cmd)
         return rc
 
+    def write_sysfs(self, path, val):
+        # Same as "echo '<val>' > <path>" without forking a shell, the PDDF drivers expect the trailing newline
+        try:
+            with open(path, 'w') as f:
+                f.write("%s\n" % val)
+        except (IOError, OSError) as e:
+            print("echo '%s' > %s -- command failed: %s" % (val, path, e))
+            return 1
+        return 0
+
     def get_cmd_output(self, cmd):
         result = subprocess.run(['/bin/bash', '-c', cmd], capture_output=True)
         if result.returncode != 0:
@@ -221,10 +237,7 @@ class PddfApi():
                     offset = base_offset + i
                     attr_path = self.get_gpio_attr_path(self.data[attr['attr_devname']], hex(offset))
                     i += 1
-                    try:
-                        cmd = "echo {} > {}".format(_value, attr_path)
-                        self.runcmd(cmd)
-                    except Exception as e:
+                    if self.write_sysfs(attr_path, _value) != 0:
                         msg = "Invalid gpio path : " + attr_path
                         return (False, msg)
         return (True, "Success")
@@ -597,8 +610,7 @@ class PddfApi():
         try:
             self.create_attr('device_name', self.data[device_name]['dev_info']['device_name'], "pddf/devices/led")
             self.create_attr('index', self.data[device_name]['dev_attr']['index'], "pddf/devices/led")
-            cmd = "echo 'verify'  > /sys/kernel/pddf/devices/led/dev_ops"
-            self.runcmd(cmd)
+            self.write_sysfs("/sys/kernel/pddf/devices/led/dev_ops", "verify")
         finally:
             self._release_led_ctrl_lock()
 
@@ -941,8 +953,7 @@ class PddfApi():
             return self.multifpgapci_parse(dev, ops)
 
     def create_attr(self, key, value, path):
-        cmd = "echo '%s' > /sys/kernel/%s/%s" % (value,  path, key)
-        self.runcmd(cmd)
+        self.write_sysfs("/sys/kernel/%s/%s" % (path, key), value)
 
     def led_parse(self, ops):
         getattr(self, ops['cmd']+"_led_platform_device")("PLATFORM", ops)
@@ -1100,7 +1111,63 @@ class PddfApi():
                 return {}
         return None
 
-    def get_attr_name_output(self, device_name, attr_name):
+    ###################################################################################################################
+    #   ATTRIBUTE CACHE
+    ###################################################################################################################
+    def load_attr_cache_config(self):
+        """
+        Read the attribute cache settings from the PLATFORM object of pddf-device.json, e.g.
+            "attr_cache": {"default_ttl": "0", "ttl": {"xcvr_present": "1", "psu_present": "2"}}
+        TTLs are in seconds, 0 disables the cache for the attribute. Without the object nothing is cached.
+        """
+        default_ttl = 0.0
+        ttl = {}
+        try:
+            cfg = self.data['PLATFORM'].get(ATTR_CACHE_KEY, {})
+            default_ttl = float(cfg.get('default_ttl', 0))
+            for attr_name, val in cfg.get('ttl', {}).items():
+                ttl[attr_name] = float(val)
+        except (AttributeError, KeyError, TypeError, ValueError):
+            pass
+        return default_ttl, ttl
+
+    def get_attr_cache_ttl(self, attr_name):
+        return self.attr_cache_ttl.get(attr_name, self.attr_cache_default_ttl)
+
+    def get_attr_cache_stats(self):
+        """
+        Returns the per attribute hit/miss counters of the attribute cache. A miss is any read going to
+        the hardware, so attributes without a TTL show up with misses only.
+        """
+        stats = {'hits': 0, 'misses': 0, 'entries': len(self.attr_cache), 'attrs': {}}
+        for attr_name, (hits, misses) in self.attr_cache_stats.items():
+            stats['hits'] += hits
+            stats['misses'] += misses
+            stats['attrs'][attr_name] = {'hits': hits, 'misses': misses, 'ttl': self.get_attr_cache_ttl(attr_name)}
+        return stats
+
+    def clear_attr_cache(self, device_name=None, attr_name=None):
+        """
+        Drop the cached values, all of them or only the ones of a device and/or attribute.
+        Anything writing a sysfs node directly must call this for the attribute it changed.
+        """
+        for key in [k for k in self.attr_cache
+                    if (device_name is None or k[0] == device_name) and (attr_name is None or k[1] == attr_name)]:
+            del self.attr_cache[key]
+
+    def _count_attr_read(self, attr_name, hit):
+        hits, misses = self.attr_cache_stats.get(attr_name, (0, 0))
+        self.attr_cache_stats[attr_name] = (hits + 1, misses) if hit else (hits, misses + 1)
+
+    def _get_cached_attr_output(self, device_name, attr_name, ttl, now):
+        entry = self.attr_cache.get((device_name, attr_name))
+        if entry is None or now - entry[0] >= ttl:
+            return None
+        self._count_attr_read(attr_name, True)
+        # Callers strip the status in place, never hand out the cached dict itself
+        return dict(entry[1])
+
+    def _read_attr_name_output(self, device_name, attr_name, node_values=None):
         bmc_attr = self.check_bmc_based_attr(device_name, attr_name)
         output = {"mode": "", "status": ""}
 
@@ -1114,15 +1181,90 @@ class PddfApi():
             node = self.get_path(device_name, attr_name)
             if node is None:
                 return {}
-            try:
-                # Seen some errors in case of unencodable characters hence ignoring them in python3
-                with open(node, 'r', errors='ignore') as f:
-                    output['status'] = f.read()
-            except IOError:
+            if node_values is not None and node in node_values:
+                status = node_values[node]
+            else:
+                try:
+                    # Seen some errors in case of unencodable characters hence ignoring them in python3
+                    with open(node, 'r', errors='ignore') as f:
+                        status = f.read()
+                except IOError:
+                    status = None
+                if node_values is not None:
+                    node_values[node] = status
+            if status is None:
                 return {}
+            output['status'] = status
         return output
 
+    def get_attr_name_output(self, device_name, attr_name):
+        ttl = self.get_attr_cache_ttl(attr_name)
+        now = time.monotonic()
+        if ttl > 0:
+            output = self._get_cached_attr_output(device_name, attr_name, ttl, now)
+            if output is not None:
+                return output
+
+        self._count_attr_read(attr_name, False)
+        output = self._read_attr_name_output(device_name, attr_name)
+        if ttl > 0 and output:
+            self.attr_cache[(device_name, attr_name)] = (now, dict(output))
+        return output
+
+    def get_device_attr_names(self, device_name):
+        """
+        Returns the names of all the attributes of a device, including the ones of its interface
+        devices (e.g. PORT1 -> PORT1-CTRL) and the BMC based ones.
+        """
+        if device_name not in self.data:
+            return []
+        dev = self.data[device_name]
+        devs = [dev]
+        for itf in dev.get('i2c', {}).get('interface', []):
+            if itf.get('dev') in self.data:
+                devs.append(self.data[itf['dev']])
+
+        names = []
+        for d in devs:
+            attr_list = list(d.get('i2c', {}).get('attr_list', [])) + list(d.get('attr_list', []))
+            if 'bmc' in d and 'ipmitool' in d['bmc']:
+                attr_list.extend(d['bmc']['ipmitool'].get('attr_list', []))
+            for attr in attr_list:
+                name = attr.get('attr_name', '').strip()
+                if name and name not in names:
+                    names.append(name)
+        return names
+
+    def get_device_attr_output(self, device_name, attr_names=None):
+        """
+        Read a set of attributes of a device in one pass. Cached attributes are served from the cache,
+        the others are read once per sysfs node even if several attributes share it, and the results
+        are cached with a common timestamp.
+        Returns a dict of attr_name -> output in the get_attr_name_output() format, {} for unreadable ones.
+        """
+        if attr_names is None:
+            attr_names = self.get_device_attr_names(device_name)
+
+        now = time.monotonic()
+        node_values = {}
+        result = {}
+        for attr_name in attr_names:
+            ttl = self.get_attr_cache_ttl(attr_name)
+            if ttl > 0:
+                output = self._get_cached_attr_output(device_name, attr_name, ttl, now)
+                if output is not None:
+                    result[attr_name] = output
+                    continue
+
+            self._count_attr_read(attr_name, False)
+            output = self._read_attr_name_output(device_name, attr_name, node_values)
+            if ttl > 0 and output:
+                self.attr_cache[(device_name, attr_name)] = (now, dict(output))
+            result[attr_name] = output
+        return result
+
     def set_attr_name_output(self, device_name, attr_name, val):
+        self.clear_attr_cache(device_name, attr_name)
         bmc_attr = self.check_bmc_based_attr(device_name, attr_name)
         output = {"mode": "", "status": ""}
 
@@ -0,0 +1,144 @@
+import os
+from unittest import mock
+
+import pytest
+
+from sonic_platform_pddf_base import pddfapi
+
+
+@pytest.fixture
+def fake_sysfs(tmp_path):
+    nodes = {
+        ('PORT1', 'xcvr_present'): tmp_path / 'port1_present',
+        ('PORT2', 'xcvr_present'): tmp_path / 'port2_present',
+        ('PORT1', 'xcvr_reset'): tmp_path / 'port1_reset',
+    }
+    for node in nodes.values():
+        node.write_text('1\n')
+    return nodes
+
+
+def counted_open(api):
+    api.opened = []
+
+    def _open(path, *args, **kwargs):
+        api.opened.append(path)
+        return open(path, *args, **kwargs)
+    return _open
+
+
+@pytest.fixture
+def api(fake_sysfs):
+    # Skip __init__, it needs the platform directory of a device
+    api = pddfapi.PddfApi.__new__(pddfapi.PddfApi)
+    api.data = {'PLATFORM': {'attr_cache': {'default_ttl': '0', 'ttl': {'xcvr_present': '2'}}}}
+    api.attr_cache = {}
+    api.attr_cache_stats = {}
+    api.attr_cache_default_ttl, api.attr_cache_ttl = api.load_attr_cache_config()
+    with mock.patch.object(api, 'check_bmc_based_attr', return_value=None), \
+            mock.patch.object(api, 'get_path', side_effect=lambda dev, attr: str(fake_sysfs[(dev, attr)])), \
+            mock.patch('sonic_platform_pddf_base.pddfapi.open', side_effect=counted_open(api), create=True), \
+            mock.patch('sonic_platform_pddf_base.pddfapi.time.monotonic', return_value=100.0) as monotonic:
+        api.monotonic = monotonic
+        yield api
+
+
+def test_attr_cache_config(api):
+    assert api.get_attr_cache_ttl('xcvr_present') == 2.0
+    assert api.get_attr_cache_ttl('xcvr_reset') == 0.0
+
+    api.data = {'PLATFORM': {}}
+    assert api.load_attr_cache_config() == (0.0, {})
+    api.data = {'PLATFORM': {'attr_cache': {'default_ttl': 'bad'}}}
+    assert api.load_attr_cache_config() == (0.0, {})
+
+
+def test_attr_cache_ttl_expiry(api, fake_sysfs):
+    assert api.get_attr_name_output('PORT1', 'xcvr_present') == {'mode': 'i2c', 'status': '1\n'}
+    fake_sysfs[('PORT1', 'xcvr_present')].write_text('0\n')
+
+    # Served from the cache until the TTL expires
+    api.monotonic.return_value = 101.9
+    output = api.get_attr_name_output('PORT1', 'xcvr_present')
+    assert output['status'] == '1\n'
+    # The caller gets a copy of the cached output
+    output['status'] = output['status'].rstrip()
+    assert api.get_attr_name_output('PORT1', 'xcvr_present')['status'] == '1\n'
+
+    api.monotonic.return_value = 102.0
+    assert api.get_attr_name_output('PORT1', 'xcvr_present')['status'] == '0\n'
+
+
+def test_attr_cache_disabled(api, fake_sysfs):
+    assert api.get_attr_name_output('PORT1', 'xcvr_reset')['status'] == '1\n'
+    fake_sysfs[('PORT1', 'xcvr_reset')].write_text('0\n')
+    assert api.get_attr_name_output('PORT1', 'xcvr_reset')['status'] == '0\n'
+    assert api.attr_cache == {}
+
+
+def test_attr_cache_unreadable_node(api, fake_sysfs):
+    os.unlink(str(fake_sysfs[('PORT1', 'xcvr_present')]))
+    assert api.get_attr_name_output('PORT1', 'xcvr_present') == {}
+    assert api.attr_cache == {}
+
+
+def test_attr_cache_invalidation(api, fake_sysfs):
+    api.get_attr_name_output('PORT1', 'xcvr_present')
+    api.get_attr_name_output('PORT2', 'xcvr_present')
+
+    # A write through the API drops the entry of the attribute written
+    assert api.set_attr_name_output('PORT1', 'xcvr_present', '0') == {'mode': 'i2c', 'status': True}
+    assert api.get_attr_name_output('PORT1', 'xcvr_present')['status'] == '0'
+    assert api.get_attr_name_output('PORT2', 'xcvr_present')['status'] == '1\n'
+
+    fake_sysfs[('PORT2', 'xcvr_present')].write_text('0\n')
+    api.clear_attr_cache(device_name='PORT2')
+    assert set(api.attr_cache) == {('PORT1', 'xcvr_present')}
+    assert api.get_attr_name_output('PORT2', 'xcvr_present')['status'] == '0\n'
+
+    api.clear_attr_cache()
+    assert api.attr_cache == {}
+
+
+def test_attr_cache_stats(api):
+    for _ in range(3):
+        api.get_attr_name_output('PORT1', 'xcvr_present')
+    api.get_attr_name_output('PORT1', 'xcvr_reset')
+    stats = api.get_attr_cache_stats()
+    assert stats['hits'] == 2
+    assert stats['misses'] == 2
+    assert stats['entries'] == 1
+    assert stats['attrs']['xcvr_present'] == {'hits': 2, 'misses': 1, 'ttl': 2.0}
+    # Attributes without a TTL always go to the hardware
+    assert stats['attrs']['xcvr_reset'] == {'hits': 0, 'misses': 1, 'ttl': 0.0}
+
+
+def test_device_attr_names(api):
+    api.data.update({
+        'PORT1': {'i2c': {'interface': [{'itf': 'control', 'dev': 'PORT1-CTRL'}, {'itf': 'eeprom', 'dev': 'MISSING'}]}},
+        'PORT1-CTRL': {'i2c': {'attr_list': [{'attr_name': 'xcvr_present'}, {'attr_name': 'xcvr_reset'}]},
+                       'bmc': {'ipmitool': {'attr_list': [{'attr_name': 'xcvr_temp'}, {'attr_name': 'xcvr_present'}]}}},
+    })
+    assert api.get_device_attr_names('PORT1') == ['xcvr_present', 'xcvr_reset', 'xcvr_temp']
+    assert api.get_device_attr_names('PORT9') == []
+
+
+def test_device_attr_output(api, fake_sysfs):
+    api.get_attr_name_output('PORT1', 'xcvr_present')
+    api.opened = []
+    output = api.get_device_attr_output('PORT1', ['xcvr_present', 'xcvr_reset'])
+    assert output == {'xcvr_present': {'mode': 'i2c', 'status': '1\n'}, 'xcvr_reset': {'mode': 'i2c', 'status': '1\n'}}
+    # The cached attribute is not read again
+    assert api.opened == [str(fake_sysfs[('PORT1', 'xcvr_reset')])]
+
+    # Attributes backed by the same node are read once
+    api.clear_attr_cache()
+    api.opened = []
+    with mock.patch.object(api, 'get_path', return_value=str(fake_sysfs[('PORT1', 'xcvr_present')])):
+        output = api.get_device_attr_output('PORT1', ['xcvr_present', 'xcvr_reset'])
+    assert output['xcvr_present'] == output['xcvr_reset'] == {'mode': 'i2c', 'status': '1\n'}
+    assert len(api.opened) == 1
+    assert set(api.attr_cache) == {('PORT1', 'xcvr_present')}
+
+    os.unlink(str(fake_sysfs[('PORT1', 'xcvr_reset')]))
+    assert api.get_device_attr_output('PORT1', ['xcvr_reset']) == {'xcvr_reset': {}}
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Simulate bgpcfgd startup with a large number of BGP neighbors: the neighbor
+SETs arrive before the dependencies of the neighbor manager, then DEVICE_METADATA,
+loopback and interface entries are put into the Directory one by one.
+The events are processed in batches, as the Runner does: the queued SETs are
+replayed once per batch. Reports the time spent in Directory.put() and in the
+replay of the queued SETs.
+
+Example:
+    ./benchmarks/bench_directory.py -n 10000 -b 128
+"""
+
+import argparse
+import os
+import sys
+import time
+from unittest.mock import MagicMock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.modules["swsscommon"] = MagicMock()
+
+from bgpcfgd.directory import Directory
+from bgpcfgd.manager import Manager
+
+
+class NeighborMgr(Manager):
+    """ Neighbor manager with the dependencies of BGPPeerMgrBase. A neighbor is ready when its interface is set """
+    def __init__(self, common_objs):
+        deps = [
+            ("CONFIG_DB", "DEVICE_METADATA", "localhost/bgp_asn"),
+            ("CONFIG_DB", "DEVICE_METADATA", "localhost/type"),
+            ("CONFIG_DB", "LOOPBACK_INTERFACE", "Loopback0"),
+            ("LOCAL", "local_addresses", ""),
+            ("LOCAL", "interfaces", ""),
+        ]
+        super(NeighborMgr, self).__init__(common_objs, deps, "CONFIG_DB", "BGP_NEIGHBOR")
+        self.calls = 0
+
+    def set_handler(self, key, data):
+        self.calls += 1
+        return self.directory.path_exist("LOCAL", "interfaces", data["interface"])
+
+
+class InterfaceMgr(Manager):
+    """ Subscribes to the per-interface paths, like the managers which wait for one entry """
+    def __init__(self, common_objs, count):
+        deps = [("CONFIG_DB", "INTERFACE", "Ethernet%d" % i) for i in range(0, count, 100)]
+        super(InterfaceMgr, self).__init__(common_objs, deps, "CONFIG_DB", "INTERFACE", wait_for_all_deps=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bgpcfgd Directory notifications")
+    parser.add_argument("-n", "--neighbors", type=int, default=10000, help="number of BGP neighbors")
+    parser.add_argument("-b", "--batch", type=int, default=128,
+                        help="number of events processed by the Runner at once. 0 - replay the queues on every event")
+    args = parser.parse_args()
+
+    common_objs = {
+        'directory': Directory(),
+        'cfg_mgr': MagicMock(),
+        'constants': {},
+    }
+    directory = common_objs['directory']
+    if args.batch:
+        directory.enable_deferred()
+    neighbor_mgr = NeighborMgr(common_objs)
+    InterfaceMgr(common_objs, args.neighbors)
+
+    set_command = sys.modules["swsscommon"].swsscommon.SET_COMMAND
+    for i in range(args.neighbors):
+        neighbor_mgr.handler("10.%d.%d.1" % (i // 256, i % 256), set_command, {"interface": "Ethernet%d" % i})
+
+    start = time.monotonic()
+    directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"bgp_asn": "65100", "type": "LeafRouter"})
+    directory.put("CONFIG_DB", "LOOPBACK_INTERFACE", "Loopback0", {})
+    directory.put("LOCAL", "local_addresses", "10.0.0.0", {})
+    for i in range(args.neighbors):
+        directory.put("CONFIG_DB", "INTERFACE", "Ethernet%d" % i, {})
+        directory.put("LOCAL", "interfaces", "Ethernet%d" % i, {})
+        if args.batch and (i + 1) % args.batch == 0:
+            directory.run_deferred()
+    directory.run_deferred()
+    elapsed = time.monotonic() - start
+
+    print("neighbors:           %d" % args.neighbors)
+    print("startup time:        %.3fs" % elapsed)
+    print("set_handler calls:   %d" % neighbor_mgr.calls)
+    print("neighbors left:      %d" % len(neighbor_mgr.set_queue))
+
+
+if __name__ == "__main__":
+    main()
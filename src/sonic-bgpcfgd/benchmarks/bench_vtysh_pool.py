@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Compare the latency of FRR show commands executed by a new vtysh process per
+command against the same commands executed through the persistent VTY
+sessions of bgpcfgd.vtysh.VtyshPool. Run it inside of the bgp container.
+
+Example:
+    ./benchmarks/bench_vtysh_pool.py -n 100 -d bgpd -c 'show bgp summary json'
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bgpcfgd.vtysh import FRR_VTY_DIR, VtyshPool
+
+
+def percentile(samples, pct):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+
+def measure(func, count):
+    samples = []
+    for _ in range(count):
+        start = time.monotonic()
+        func()
+        samples.append(time.monotonic() - start)
+    return samples
+
+
+def report(name, samples):
+    print("{:<12} total {:8.3f}s  avg {:7.2f}ms  p50 {:7.2f}ms  p99 {:7.2f}ms".format(
+        name, sum(samples), sum(samples) * 1000 / len(samples),
+        percentile(samples, 50) * 1000, percentile(samples, 99) * 1000))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark persistent vtysh sessions")
+    parser.add_argument("-n", "--count", type=int, default=50, help="number of commands")
+    parser.add_argument("-d", "--daemon", default="bgpd", help="FRR daemon which owns the command")
+    parser.add_argument("-c", "--command", default="show bgp summary json", help="FRR show command")
+    parser.add_argument("-s", "--socket-dir", default=FRR_VTY_DIR, help="directory with FRR VTY sockets")
+    args = parser.parse_args()
+
+    def fork():
+        subprocess.check_output(["vtysh", "-c", args.command])
+
+    def not_reachable(cmd):
+        raise RuntimeError("%s VTY socket can't be connected" % args.daemon)
+
+    pool = VtyshPool(socket_dir=args.socket_dir)
+
+    def session():
+        rc, _, err = pool.run(args.daemon, args.command, fallback=not_reachable)
+        if rc != 0:
+            raise RuntimeError(err)
+
+    session()  # connect outside of the measurement
+    forked = measure(fork, args.count)
+    persistent = measure(session, args.count)
+    pool.close()
+
+    report("fork", forked)
+    report("persistent", persistent)
+    print("speedup: {:.1f}x".format(sum(forked) / sum(persistent)))
+
+
+if __name__ == "__main__":
+    main()
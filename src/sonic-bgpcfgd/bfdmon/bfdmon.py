@@ -6,6 +6,14 @@ from datetime import datetime, timezone
 from swsscommon import swsscommon
 from sonic_py_common import device_info
 from sonic_py_common.general import getstatusoutput_noshell
+from bgpcfgd.vtysh import get_vtysh_pool
+
+
+def run_vtysh(cmd):
+    """ Run a vtysh command line, when bfdd can't be reached through its VTY socket """
+    rc, output = getstatusoutput_noshell(cmd)
+    return rc, output, ""
+
 
 class BfdFrrMon:
     def __init__(self):
@@ -19,6 +27,7 @@ class BfdFrrMon:
         self.bfdd_running = False
         self.init_done = False
         self.MAX_RETRY_ATTEMPTS = 3
+        self.vtysh_pool = get_vtysh_pool()
 
         self.remote_status_table = "DASH_BFD_PROBE_STATE"
         switch_type = device_info.get_localhost_info("switch_type")
@@ -64,10 +73,10 @@ class BfdFrrMon:
             return False
     
         retry_attempt = 0
-        cmd = ['vtysh', '-c', 'show bfd peers json']
+        cmd = 'show bfd peers json'
         while retry_attempt < self.MAX_RETRY_ATTEMPTS:
             try:
-                rc, output = getstatusoutput_noshell(cmd)
+                rc, output, _ = self.vtysh_pool.run("bfdd", cmd, fallback=run_vtysh)
                 if rc:
                     syslog.syslog(syslog.LOG_ERR, "*ERROR* Failed with rc:{} when execute: {}".format(rc, cmd))
                     return False
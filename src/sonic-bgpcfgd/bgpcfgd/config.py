@@ -1,21 +1,59 @@
+import time
+
+from .running_config import RunningConfig
+
+
 class ConfigMgr(object):
     """ The class represents frr configuration """
-    def __init__(self, frr):
+    def __init__(self, frr, coalesce_window=0.0, max_batch_lines=0, max_config_age=0.0):
+        """
+        Constructor
+        :param frr: FRR object
+        :param coalesce_window: seconds to wait for more changes before committing the pending ones
+        :param max_batch_lines: commit the pending changes as soon as they have that many lines. 0 - no limit
+        :param max_config_age: seconds the running config read from FRR is reused by update(),
+                               until the next push or commit. 0 - read it on every update()
+        """
         self.frr = frr
+        self.coalesce_window = coalesce_window
+        self.max_batch_lines = max_batch_lines
+        self.max_config_age = max_config_age
         self.current_config = None
         self.current_config_raw = None
+        self.running_config = None
+        self.config_read_time = None
         self.changes = ""
         self.peer_groups_to_restart = []
+        self.pending_lines = 0
+        self.pending_since = None
+        self.stats = {
+            'batches': 0,
+            'lines': 0,
+            'peer_groups': 0,
+            'failures': 0,
+            'vtysh_time': 0.0,
+            'last_vtysh_time': 0.0,
+            'max_vtysh_time': 0.0,
+        }
 
     def reset(self):
         """ Reset stored config """
         self.current_config = None
         self.current_config_raw = None
+        self.running_config = None
+        self.config_read_time = None
         self.changes = ""
         self.peer_groups_to_restart = []
+        self.pending_lines = 0
+        self.pending_since = None
 
     def update(self):
-        """ Read current config from FRR """
+        """
+        Read current config from FRR. The config read since the last push or commit is reused
+        for max_config_age seconds
+        """
+        if self.config_read_time is not None and time.monotonic() - self.config_read_time < self.max_config_age:
+            return
         self.current_config = None
         self.current_config_raw = None
         out = self.frr.get_config()
@@ -27,6 +65,9 @@ class ConfigMgr(object):
         text += ["     "]  # Add empty line to have something to work on, if there is no text
         self.current_config_raw = text
         self.current_config = self.to_canonical(out)  # FIXME: use text as an input
+        self.config_read_time = time.monotonic()
+        self.running_config = RunningConfig(text)
+        self.running_config.apply(self.changes.split("\n"))
 
     def push_list(self, cmdlist):
         """
@@ -34,6 +75,10 @@ class ConfigMgr(object):
         :param cmdlist: configuration change for FRR. Type: List of Strings
         """
         self.changes += "\n".join(cmdlist) + "\n"
+        self.add_pending_lines(len(cmdlist))
+        self.config_read_time = None
+        if self.running_config is not None:
+            self.running_config.apply(cmdlist)
 
     def push(self, cmd):
         """
@@ -41,8 +86,40 @@ class ConfigMgr(object):
         :param cmd: configuration change for FRR. Type: String
         """
         self.changes += cmd + "\n"
+        self.add_pending_lines(cmd.count("\n") + 1)
+        self.config_read_time = None
+        if self.running_config is not None:
+            self.running_config.apply(cmd.split("\n"))
         return True
 
+    def add_pending_lines(self, n_lines):
+        """ Account n_lines new lines of pending changes """
+        if self.pending_since is None:
+            self.pending_since = time.monotonic()
+        self.pending_lines += n_lines
+
+    def batch_full(self):
+        """ Check if the pending changes reached the maximum batch size """
+        return self.max_batch_lines > 0 and self.pending_lines >= self.max_batch_lines
+
+    def time_to_commit(self):
+        """
+        Get the time left before the pending changes have to be committed
+        :return: number of seconds, or None if there is nothing to commit
+        """
+        if self.changes.strip() == "":
+            return None
+        if self.batch_full():
+            return 0.0
+        return max(0.0, self.pending_since + self.coalesce_window - time.monotonic())
+
+    def commit_due(self):
+        """
+        Check if the pending changes have to be committed now: the coalescing window
+        is over, or the batch is full
+        """
+        return self.time_to_commit() == 0.0
+
     def restart_peer_groups(self, peer_groups):
         """
         Schedule peer_groups for restart on commit
@@ -56,15 +133,40 @@ class ConfigMgr(object):
         :return: True if change was applied successfully, False otherwise
         """
         if self.changes.strip() == "":
+            self.config_read_time = None
             return True
+        start = time.monotonic()
         rc_write = self.frr.write(self.changes)
         rc_restart = self.frr.restart_peer_groups(self.peer_groups_to_restart)
+        elapsed = time.monotonic() - start
+        self.stats['batches'] += 1
+        self.stats['lines'] += self.pending_lines
+        self.stats['peer_groups'] += len(set(self.peer_groups_to_restart))
+        self.stats['failures'] += 0 if rc_write and rc_restart else 1
+        self.stats['vtysh_time'] += elapsed
+        self.stats['last_vtysh_time'] = elapsed
+        self.stats['max_vtysh_time'] = max(self.stats['max_vtysh_time'], elapsed)
         self.reset()
         return rc_write and rc_restart
 
     def get_text(self):
+        """
+        Get the text of the config read by update(). It doesn't have the pending changes,
+        callers which diff against it have to commit() before update()
+        :return: list of lines
+        """
         return self.current_config_raw
 
+    def get_running_config(self):
+        """
+        Get the indexed model of the config read by update(), with the pending changes applied.
+        The config is read from FRR first if update() wasn't called since the last commit
+        :return: RunningConfig object
+        """
+        if self.running_config is None:
+            self.update()
+        return self.running_config
+
     @staticmethod
     def to_canonical(raw_config):
         """
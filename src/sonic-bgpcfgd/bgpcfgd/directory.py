@@ -9,6 +9,10 @@ class Directory(object):
     def __init__(self):
         self.data = defaultdict(dict)  # storage. A key is a slot name, a value is a dictionary with data
         self.notify = defaultdict(lambda: defaultdict(list))  # registered callbacks: slot -> path -> handlers[]
+        self.notify_index = {}  # index of registered paths: slot -> path prefix -> registered paths
+        self.notify_order = {}  # slot -> path -> registration sequence number. Handlers are run in that order
+        self.notify_seq = 0
+        self.deferred = None  # handlers postponed until run_deferred(). None - handlers are run right away
 
     @staticmethod
     def get_slot_name(db, table):
@@ -24,7 +28,8 @@ class Directory(object):
             self.data["key_1"] = { "abc": { "cde": { "fgh": "val_1", "ijk": "val_2" } } }
             self.path_traverse("key_1", "abc/cde") will return True, { "fgh": "val_1", "ijk": "val_2" }
         :param slot: storage key
-        :param path: storage path as a string where each internal key is separated by '/'
+        :param path: storage path as a string where each internal key is separated by '/'.
+                     A key could contain '/' itself, e.g. "10.0.0.0/24". The longest matching key is used
         :return: a pair: True if the path was found, object if it was found
         """
         if slot not in self.data:
@@ -32,10 +37,17 @@ class Directory(object):
         elif path == '':
             return True, self.data[slot]
         d = self.data[slot]
-        for p in path.split("/"):
-            if p not in d:
+        components = path.split("/")
+        start = 0
+        while start < len(components):
+            for end in range(len(components), start, -1):
+                p = "/".join(components[start:end])
+                if p in d:
+                    break
+            else:
                 return False, None
             d = d[p]
+            start = end
         return True, d
 
     def path_exist(self, db, table, path):
@@ -71,16 +83,67 @@ class Directory(object):
         """
         slot = self.get_slot_name(db, table)
         self.data[slot][key] = value
-        if slot in self.notify:
+        if slot in self.notify_index:
             handlers_to_run = []
-
-            for path in self.notify[slot].keys():
-                if self.path_exist(db, table, path):
-                    handlers_to_run += self.notify[slot][path]
+            for path in self.get_affected_paths(slot, key):
+                if self.path_traverse(slot, path)[0]:
+                    for handler in self.notify[slot][path]:
+                        if handler not in handlers_to_run:
+                            handlers_to_run.append(handler)
 
             for handler in handlers_to_run:
                 handler()
 
+    def get_affected_paths(self, slot, key):
+        """
+        Find registered paths which could be changed by a put of the key into the slot:
+        the path of the whole slot and the paths starting with the key
+        :param slot: slot name
+        :param key: changed key
+        :return: list of registered paths in the registration order
+        """
+        index = self.notify_index[slot]
+        paths = index.get('', set()) | index.get(key, set())
+        order = self.notify_order[slot]
+        return sorted(paths, key=order.get)
+
+    @staticmethod
+    def get_path_prefixes(path):
+        """
+        Get all prefixes of the path which end on a path delimiter, and the path itself.
+        A key put into the slot could change the path only if the key is one of them
+        Example:
+            self.get_path_prefixes("10.0.0.0/24/nexthop") will return ["10.0.0.0", "10.0.0.0/24", "10.0.0.0/24/nexthop"]
+        :param path: registered path
+        :return: list of prefixes. [''] for the path of the whole slot
+        """
+        if path == '':
+            return ['']
+        components = path.split("/")
+        return ["/".join(components[:i]) for i in range(1, len(components) + 1)]
+
+    def enable_deferred(self):
+        """ Postpone the handlers passed to run_or_defer() until run_deferred() is called """
+        if self.deferred is None:
+            self.deferred = []
+
+    def run_or_defer(self, handler):
+        """
+        Run the handler, or postpone it if deferring is enabled. A postponed handler is run once,
+        however many times it was postponed
+        :param handler: handler to run
+        """
+        if self.deferred is None:
+            handler()
+        elif handler not in self.deferred:
+            self.deferred.append(handler)
+
+    def run_deferred(self):
+        """ Run the postponed handlers, including the handlers postponed by them """
+        while self.deferred:
+            handler = self.deferred.pop(0)
+            handler()
+
     def get(self, db, table, key):
         """
         Get a value from the storage
@@ -160,6 +223,12 @@ class Directory(object):
         """
         for db, table, path in deps:
             slot = self.get_slot_name(db, table)
+            if path not in self.notify[slot]:
+                index = self.notify_index.setdefault(slot, {})
+                for prefix in self.get_path_prefixes(path):
+                    index.setdefault(prefix, set()).add(path)
+                self.notify_seq += 1
+                self.notify_order.setdefault(slot, {})[path] = self.notify_seq
             self.notify[slot][path].append(handler)
 
     def unsubscribe(self, deps):
@@ -167,4 +236,18 @@ class Directory(object):
             slot = self.get_slot_name(db, table)
             if slot in self.notify:
                 if path in self.notify[slot]:
-                    del self.notify[slot][path]
\ No newline at end of file
+                    del self.notify[slot][path]
+                    self.remove_from_index(slot, path)
+
+    def remove_from_index(self, slot, path):
+        """
+        Remove a path from the index of registered paths. Empty prefixes are removed too
+        :param slot: slot name
+        :param path: registered path
+        """
+        index = self.notify_index[slot]
+        for prefix in self.get_path_prefixes(path):
+            index[prefix].discard(path)
+            if not index[prefix]:
+                del index[prefix]
+        del self.notify_order[slot][path]
\ No newline at end of file
@@ -57,14 +57,27 @@ class FRR(object):
     @staticmethod
     def restart_peer_groups(peer_groups):
         """ Restart peer-groups which support BBR
+        All the peer-groups are cleared with a single vtysh call. vtysh stops at the first
+        command which fails, so the commands are echoed to find out which peer-group failed.
+        It is reported and only the peer-groups after it are cleared again
         :param peer_groups: List of peer_groups to restart
         :return: True if restart of all peer-groups was successful, False otherwise
         """
+        peer_groups = sorted(set(peer_groups))
         res = True
-        for peer_group in sorted(peer_groups):
-            rc, out, err = run_command(["vtysh", "-c", "clear bgp peer-group %s soft in" % peer_group])
-            if rc != 0:
-                log_value = peer_group, rc, out, err
-                log_crit("Can't restart bgp peer-group '%s'. rc='%d', out='%s', err='%s'" % log_value)
-            res = res and (rc == 0)
+        while peer_groups:
+            commands = ["clear bgp peer-group %s soft in" % peer_group for peer_group in peer_groups]
+            command = ["vtysh", "-E"] if len(commands) > 1 else ["vtysh"]
+            for cmd in commands:
+                command += ["-c", cmd]
+            rc, out, err = run_command(command, hide_errors=True)
+            if rc == 0:
+                break
+            echoed = set(line.split("# ", 1)[-1].strip() for line in out.split("\n"))
+            executed = [idx for idx, cmd in enumerate(commands) if cmd in echoed]
+            failed = executed[-1] if executed else 0
+            log_value = peer_groups[failed], rc, out, err
+            log_crit("Can't restart bgp peer-group '%s'. rc='%d', out='%s', err='%s'" % log_value)
+            res = False
+            peer_groups = peer_groups[failed + 1:]
         return res
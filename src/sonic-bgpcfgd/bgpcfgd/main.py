@@ -44,11 +44,17 @@ def do_work():
     frr = FRR(["bgpd", "zebra", "staticd"])
     frr.wait_for_daemons(seconds=20)
     #
+    constants = read_constants()
+    commit_cfg = constants.get('bgp', {}).get('commit', {})
+    cfg_mgr = ConfigMgr(frr,
+                        coalesce_window=commit_cfg.get('coalesce_window_ms', 0) / 1000.0,
+                        max_batch_lines=commit_cfg.get('max_batch_lines', 0),
+                        max_config_age=commit_cfg.get('max_config_age_ms', 0) / 1000.0)
     common_objs = {
         'directory': Directory(),
-        'cfg_mgr':   ConfigMgr(frr),
+        'cfg_mgr':   cfg_mgr,
         'tf':        TemplateFabric(),
-        'constants': read_constants(),
+        'constants': constants,
         'state_db_conn': swsscommon.DBConnector("STATE_DB", 0)
     }
     managers = [
@@ -112,7 +118,7 @@ def do_work():
         managers.append(AsPathMgr(common_objs, "CONFIG_DB", "DEVICE_METADATA"))
         log_notice("Prefix List Manager and AsPath Manager are enabled for UpperSpineRouter/UpstreamLC")
 
-    runner = Runner(common_objs['cfg_mgr'])
+    runner = Runner(common_objs['cfg_mgr'], common_objs['state_db_conn'], common_objs['directory'])
     for mgr in managers:
         runner.add_manager(mgr)
     runner.run()
@@ -20,7 +20,11 @@ class Manager(object):
         self.db_name = database
         self.table_name = table_name
         self.wait_for_all_deps = wait_for_all_deps  # control whether the manager should wait for all dependencies to be set before processing any 'SET' command
-        self.set_queue = []
+        self.set_queue = []  # SET commands which the set_handler couldn't process yet
+        self.deps_queue = []  # SET commands which wait for all dependencies to be set
+        self.replaying = False
+        self.deps_changed = False
+        self.replay_pending = False  # the queue was deferred to the end of the batch, see on_deps_change()
         self.directory.subscribe(deps, self.on_deps_change)  # subscribe this class method on directory changes
 
     def get_database(self):
@@ -38,6 +42,9 @@ class Manager(object):
         :param op: operation on the table entry. Could be either 'SET' or 'DEL'
         :param data: associated data of the event. Empty for 'DEL' operation.
         """
+        if self.replay_pending:
+            # The queued commands are older than this event, replay them first to keep the order
+            self.replay_queue()
         if op == swsscommon.SET_COMMAND:
             if (not self.wait_for_all_deps) or self.directory.available_deps(self.deps):  # all required dependencies are set in the Directory?
                 res = self.set_handler(key, data)
@@ -46,22 +53,51 @@ class Manager(object):
                     self.set_queue.append((key, data))
             else:
                 log_debug("Not all dependencies are met for the Manager: %s" % self.__class__)
-                self.set_queue.append((key, data))
+                self.deps_queue.append((key, data))
         elif op == swsscommon.DEL_COMMAND:
             self.del_handler(key)
         else:
             log_err("Invalid operation '%s' for key '%s'" % (op, key))
 
     def on_deps_change(self):
-        """ This method is being executed on every dependency change """
+        """
+        This method is being executed on every dependency change.
+        The queued commands are replayed right away, or once at the end of the batch of events
+        processed by the Runner, see Directory.run_or_defer()
+        """
+        if self.set_queue or self.deps_queue:
+            self.replay_pending = True
+            self.directory.run_or_defer(self.replay_queue)
+
+    def replay_queue(self):
+        """
+        Replay the queued commands once all dependencies are set.
+        The commands, which were waiting for the dependencies, are replayed once.
+        The commands, which the set_handler couldn't process, are left in the queue.
+        A dependency change made by the replayed commands doesn't replay the queue recursively,
+        the queue is retried after the current replay instead
+        """
+        if self.replaying:
+            self.deps_changed = True
+            return
+        self.replay_pending = False
         if self.wait_for_all_deps and not self.directory.available_deps(self.deps):
             return
-        new_queue = []
-        for key, data in self.set_queue:
-            res = self.set_handler(key, data)
-            if not res:
-                new_queue.append((key, data))
-        self.set_queue = new_queue
+        self.replaying = True
+        try:
+            while True:
+                self.deps_changed = False
+                queue = self.set_queue + self.deps_queue
+                self.set_queue = []
+                self.deps_queue = []
+                for key, data in queue:
+                    res = self.set_handler(key, data)
+                    if not res:
+                        self.set_queue.append((key, data))
+                if not self.deps_changed or not self.set_queue or len(self.set_queue) == len(queue):
+                    break
+        finally:
+            self.replaying = False
 
     def set_handler(self, key, data):
         """ Placeholder for 'SET' command """
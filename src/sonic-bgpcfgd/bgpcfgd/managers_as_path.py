@@ -42,6 +42,7 @@ class AsPathMgr(Manager):
         old_asns = {}
         regex = re.compile(r"bgp as-path access-list T2_GROUP_ASNS seq \d+ permit _(\d+)_")
         # Read current FRR configuration and get as-path already configured
+        self.cfg_mgr.commit()
         self.cfg_mgr.update()
         for line in self.cfg_mgr.get_text():
             match = regex.match(line)
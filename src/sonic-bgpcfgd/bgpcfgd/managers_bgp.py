@@ -9,6 +9,7 @@ from .log import log_warn, log_err, log_info, log_debug, log_crit
 from .manager import Manager
 from .template import TemplateFabric
 from .utils import run_command
+from .vtysh import get_vtysh_pool
 from .managers_device_global import DeviceGlobalCfgMgr
 
 
@@ -368,11 +369,11 @@ class BGPPeerMgrBase(Manager):
         ipv4_ranges = []
         ipv6_ranges = []
         if vrf == 'default':
-            command = ["vtysh", "-c", "show bgp peer-group %s json" % (nbr)]
+            command = "show bgp peer-group %s json" % (nbr)
         else:
-            command = ["vtysh", "-c", "show bgp vrf %s peer-group %s json" % (vrf, nbr)]
+            command = "show bgp vrf %s peer-group %s json" % (vrf, nbr)
         try:
-            ret_code, out, err = run_command(command)
+            ret_code, out, err = get_vtysh_pool().run("bgpd", command, fallback=run_command)
             if ret_code == 0:
                 js_bgp = json.loads(out)
                 if nbr in js_bgp and 'dynamicRanges' in js_bgp[nbr] and 'IPv4' in js_bgp[nbr]['dynamicRanges'] and 'ranges' in js_bgp[nbr]['dynamicRanges']['IPv4']:
@@ -547,8 +548,8 @@ class BGPPeerMgrBase(Manager):
         Load peers from FRR.
         :return: set of peers, which are already installed in FRR
         """
-        command = ["vtysh", "-H", "/dev/null", "-c", "show bgp vrfs json"]
-        ret_code, out, err = run_command(command)
+        vtysh_pool = get_vtysh_pool()
+        ret_code, out, err = vtysh_pool.run("bgpd", "show bgp vrfs json", fallback=run_command, vtysh_options=["-H", "/dev/null"])
         if ret_code == 0:
             js_vrf = json.loads(out)
             vrfs = js_vrf['vrfs'].keys()
@@ -557,8 +558,8 @@ class BGPPeerMgrBase(Manager):
             raise Exception("Can't read bgp vrfs: %s" % err)
         peers = set()
         for vrf in vrfs:
-            command = ["vtysh", "-c", 'show bgp vrf %s neighbors json' % str(vrf)]
-            ret_code, out, err = run_command(command)
+            command = 'show bgp vrf %s neighbors json' % str(vrf)
+            ret_code, out, err = vtysh_pool.run("bgpd", command, fallback=run_command)
             if ret_code == 0:
                 js_bgp = json.loads(out)
                 for nbr in js_bgp.keys():
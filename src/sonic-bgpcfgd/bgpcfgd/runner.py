@@ -1,7 +1,9 @@
+import math
+
 from collections import defaultdict
 from swsscommon import swsscommon
 
-from .log import log_debug, log_crit
+from .log import log_debug, log_crit, log_err
 
 
 g_run = True
@@ -19,10 +21,23 @@ class Runner(object):
         when corresponding db/table is updated
     """
     SELECT_TIMEOUT = 1000
+    COMMIT_STATS_TABLE = "BGPCFGD_STATS"
+    COMMIT_STATS_KEY = "commit"
 
-    def __init__(self, cfg_manager):
-        """ Constructor """
+    def __init__(self, cfg_manager, state_db_conn=None, directory=None):
+        """
+        Constructor
+        :param cfg_manager: ConfigMgr object, which changes are committed by the Runner
+        :param state_db_conn: connection to STATE_DB to export the commit counters to. None - don't export them
+        :param directory: Directory object. The managers replay their queues once per batch of events
+        """
         self.cfg_manager = cfg_manager
+        self.directory = directory
+        if directory is not None:
+            directory.enable_deferred()
+        self.stats_table = None
+        if state_db_conn is not None:
+            self.stats_table = swsscommon.Table(state_db_conn, Runner.COMMIT_STATS_TABLE)
         self.db_connectors = {}
         self.selector = swsscommon.Select()
         self.callbacks = defaultdict(lambda: defaultdict(list))  # db -> table -> handlers[]
@@ -54,8 +69,9 @@ class Runner(object):
     def run(self):
         """ Main loop """
         while g_run:
-            state, _ = self.selector.select(Runner.SELECT_TIMEOUT)
+            state, _ = self.selector.select(self.get_select_timeout())
             if state == self.selector.TIMEOUT:
+                self.commit()
                 continue
             elif state == self.selector.ERROR:
                 raise Exception("Received error from select")
@@ -68,6 +84,43 @@ class Runner(object):
                     log_debug("Received message : '%s'" % str((key, op, fvs)))
                     for callback in self.callbacks[subscriber.getDbConnector().getDbId()][subscriber.getTableName()]:
                         callback(key, op, dict(fvs))
-            rc = self.cfg_manager.commit()
-            if not rc:
-                log_crit("Runner::commit was unsuccessful")
+                    if self.cfg_manager.batch_full():
+                        self.commit()
+            if self.directory is not None:
+                self.directory.run_deferred()
+            self.commit()
+
+    def get_select_timeout(self):
+        """ Wait for new events at most until the pending changes have to be committed """
+        time_to_commit = self.cfg_manager.time_to_commit()
+        if time_to_commit is None:
+            return Runner.SELECT_TIMEOUT
+        return min(Runner.SELECT_TIMEOUT, int(math.ceil(time_to_commit * 1000)))
+
+    def commit(self):
+        """ Commit the pending changes once they are due, and export the commit counters """
+        if not self.cfg_manager.commit_due():
+            return
+        rc = self.cfg_manager.commit()
+        if not rc:
+            log_crit("Runner::commit was unsuccessful")
+        self.export_stats()
+
+    def export_stats(self):
+        """ Export the commit counters of the ConfigMgr to STATE_DB """
+        if self.stats_table is None:
+            return
+        stats = self.cfg_manager.stats
+        fvs = [
+            ("batches", str(stats['batches'])),
+            ("lines", str(stats['lines'])),
+            ("peer_groups", str(stats['peer_groups'])),
+            ("failures", str(stats['failures'])),
+            ("vtysh_time_ms", "%.3f" % (stats['vtysh_time'] * 1000)),
+            ("last_vtysh_time_ms", "%.3f" % (stats['last_vtysh_time'] * 1000)),
+            ("max_vtysh_time_ms", "%.3f" % (stats['max_vtysh_time'] * 1000)),
+        ]
+        try:
+            self.stats_table.set(Runner.COMMIT_STATS_KEY, fvs)
+        except Exception as e:
+            log_err("Runner::can't export the commit counters to STATE_DB: %s" % str(e))
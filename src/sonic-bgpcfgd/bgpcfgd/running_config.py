@@ -0,0 +1,197 @@
+import re
+from collections import OrderedDict
+
+
+class RunningConfig(object):
+    """
+    Indexed model of the FRR running configuration.
+    Prefix-lists, community-lists, route-maps and peer-groups are indexed by name,
+    so that the managers don't need to scan the whole configuration text for every lookup.
+    The model can be patched with the commands pushed to FRR by bgpcfgd, so that it
+    reflects the changes which haven't been committed yet.
+    """
+    re_prefix_list = re.compile(r'^(ip|ipv6) prefix-list (\S+) seq (\d+) (.+)$')
+    re_community_list = re.compile(r'^bgp community-list standard (\S+) permit (.+)$')
+    re_route_map = re.compile(r'^route-map (\S+) (permit|deny) (\d+)$')
+    re_peer_group = re.compile(r'^neighbor (\S+) peer-group$')
+    re_neighbor_rm_in = re.compile(r'^neighbor (\S+) route-map (\S+) in$')
+    default_address_family = 'ipv4 unicast'
+    route_map_commands = ('match', 'set', 'call', 'on-match', 'continue', 'description')
+
+    def __init__(self, text=None):
+        """
+        Constructor
+        :param text: FRR running configuration. Type: List of Strings
+        """
+        self.prefix_lists = {}      # (family, name) -> OrderedDict(seq -> rule)
+        self.community_lists = {}   # name -> list of permitted values
+        self.route_maps = {}        # name -> OrderedDict(seq -> {'action': action, 'lines': [lines]})
+        self.peer_groups = []       # peer-group names
+        self.neighbor_rm_in = {}    # neighbor or peer-group name -> OrderedDict(address-family -> route-map name)
+        if text:
+            self.apply(text)
+
+    def get_prefix_list(self, family, name):
+        """
+        Get prefix-list entries
+        :param family: 'ip' or 'ipv6'
+        :param name: name of the prefix-list
+        :return: OrderedDict with rules by sequence number, or None if the prefix-list doesn't exist
+        """
+        return self.prefix_lists.get((family, name))
+
+    def get_community_list(self, name):
+        """
+        Get permitted values of a standard community-list
+        :param name: name of the community-list
+        :return: list of values, empty if the community-list doesn't exist
+        """
+        return self.community_lists.get(name, [])
+
+    def get_route_map(self, name):
+        """
+        Get route-map entries
+        :param name: name of the route-map
+        :return: OrderedDict of {'action': action, 'lines': [lines]} by sequence number, empty if the route-map doesn't exist
+        """
+        return self.route_maps.get(name, OrderedDict())
+
+    def get_peer_groups(self):
+        """ Get names of the configured peer-groups """
+        return list(self.peer_groups)
+
+    def get_neighbor_route_map_in(self, name, address_family=None):
+        """
+        Get the inbound route-map of a neighbor or a peer-group
+        :param name: neighbor or peer-group name
+        :param address_family: address-family, such as 'ipv6 unicast'. None - the first address-family
+                               the neighbor has an inbound route-map in
+        :return: route-map name or None if it doesn't have any
+        """
+        route_maps = self.neighbor_rm_in.get(name, {})
+        if address_family is None:
+            return next(iter(route_maps.values()), None)
+        return route_maps.get(self.__normalize_address_family(address_family.split()))
+
+    def apply(self, lines):
+        """
+        Update the model with FRR configuration commands, in the same way FRR would apply them.
+        The running configuration text itself is applied that way on construction
+        :param lines: configuration commands. Type: List of Strings
+        """
+        route_map_entry = None
+        address_family = None
+        for line in lines:
+            s_line = line.strip()
+            if s_line == "":
+                continue
+            negate = s_line.startswith("no ")
+            cmd = s_line[3:] if negate else s_line
+            if self.__apply_top_level(cmd, negate):
+                route_map_entry = None
+                address_family = None
+                matched = self.re_route_map.match(cmd)
+                if matched and not negate:
+                    route_map_entry = self.__get_route_map_entry(matched.group(1), int(matched.group(3)), matched.group(2))
+            elif cmd.startswith("address-family "):
+                route_map_entry = None
+                address_family = self.__normalize_address_family(cmd.split()[1:])
+            elif cmd in ("exit-address-family", "router bgp") or cmd.startswith("router bgp "):
+                route_map_entry = None
+                address_family = None
+            elif self.__apply_bgp(cmd, negate, address_family or self.default_address_family):
+                route_map_entry = None
+            elif route_map_entry is not None and (line[0].isspace() or cmd.split()[0] in self.route_map_commands):
+                self.__apply_route_map_line(route_map_entry, cmd, negate)
+            else:
+                route_map_entry = None
+            if s_line in ("exit", "end"):
+                route_map_entry = None
+
+    def __apply_top_level(self, cmd, negate):
+        """ Apply a prefix-list, community-list or route-map command. Return True if cmd is one of them """
+        tokens = cmd.split()
+        if len(tokens) >= 3 and tokens[0] in ('ip', 'ipv6') and tokens[1] == 'prefix-list':
+            key = tokens[0], tokens[2]
+            matched = self.re_prefix_list.match(cmd)
+            if not negate and matched:
+                self.prefix_lists.setdefault(key, OrderedDict())[int(matched.group(3))] = matched.group(4)
+            elif negate and matched:
+                self.prefix_lists.get(key, {}).pop(int(matched.group(3)), None)
+            elif negate and len(tokens) == 3:
+                self.prefix_lists.pop(key, None)
+            return True
+        if len(tokens) >= 4 and tokens[:3] == ['bgp', 'community-list', 'standard']:
+            matched = self.re_community_list.match(cmd)
+            if not negate and matched:
+                values = self.community_lists.setdefault(tokens[3], [])
+                if matched.group(2) not in values:
+                    values.append(matched.group(2))
+            elif negate and matched:
+                values = self.community_lists.get(tokens[3], [])
+                if matched.group(2) in values:
+                    values.remove(matched.group(2))
+            elif negate:
+                self.community_lists.pop(tokens[3], None)
+            return True
+        if len(tokens) >= 2 and tokens[0] == 'route-map':
+            matched = self.re_route_map.match(cmd)
+            if negate and matched:
+                self.route_maps.get(tokens[1], {}).pop(int(matched.group(3)), None)
+            elif negate and len(tokens) == 2:
+                self.route_maps.pop(tokens[1], None)
+            return True
+        return False
+
+    @staticmethod
+    def __normalize_address_family(tokens):
+        """ Get the address-family name of 'address-family' command arguments, with the default 'unicast' """
+        return ' '.join(tokens[:2]) if len(tokens) > 1 else tokens[0] + ' unicast'
+
+    def __apply_bgp(self, cmd, negate, address_family):
+        """ Apply a peer-group command of the router bgp node. Return True if cmd is one of them """
+        matched = self.re_peer_group.match(cmd)
+        if matched:
+            name = matched.group(1)
+            if negate:
+                if name in self.peer_groups:
+                    self.peer_groups.remove(name)
+                self.neighbor_rm_in.pop(name, None)
+            elif name not in self.peer_groups:
+                self.peer_groups.append(name)
+            return True
+        matched = self.re_neighbor_rm_in.match(cmd)
+        if matched:
+            name = matched.group(1)
+            route_maps = self.neighbor_rm_in.setdefault(name, OrderedDict())
+            if negate:
+                route_maps.pop(address_family, None)
+            else:
+                route_maps[address_family] = matched.group(2)
+            if not route_maps:
+                del self.neighbor_rm_in[name]
+            return True
+        return cmd.startswith("neighbor ")
+
+    def __get_route_map_entry(self, name, seq, action):
+        """ Get a route-map entry, create it if it doesn't exist. Like FRR, an entry whose action changes is recreated """
+        entries = self.route_maps.setdefault(name, OrderedDict())
+        if seq in entries and entries[seq]['action'] != action:
+            del entries[seq]
+        if seq not in entries:
+            entries[seq] = {'action': action, 'lines': []}
+        return entries[seq]
+
+    @staticmethod
+    def __apply_route_map_line(entry, cmd, negate):
+        """ Apply a command inside of a route-map entry: it replaces the command of the same kind """
+        tokens = cmd.split()
+        if tokens[:2] in (['match', 'ip'], ['match', 'ipv6']):
+            kind = tokens[:4]
+        elif tokens[0] in ('match', 'set'):
+            kind = tokens[:2]
+        else:
+            kind = tokens[:1]
+        entry['lines'] = [line for line in entry['lines'] if line.split()[:len(kind)] != kind]
+        if not negate:
+            entry['lines'].append(cmd)
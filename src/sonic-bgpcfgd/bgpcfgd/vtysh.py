@@ -0,0 +1,203 @@
+import os
+import socket
+import threading
+import time
+
+from .log import log_err, log_warn
+from .utils import run_command
+
+
+FRR_VTY_DIR = "/var/run/frr"
+CMD_SUCCESS = 0
+CMD_WARNING = 1
+
+
+class VtyUnavailable(Exception):
+    """ The VTY socket of the daemon can't be connected """
+    pass
+
+
+class VtySession(object):
+    """
+    Long-lived connection to the VTY socket of one FRR daemon.
+    vtysh talks to the daemons with the same protocol: a command is sent as a NUL-terminated string,
+    the daemon replies with the command output followed by three NUL bytes and the command status
+    """
+    END_MARKER = b"\0\0\0"
+
+    def __init__(self, daemon, socket_dir=FRR_VTY_DIR, timeout=30.0):
+        """
+        Constructor
+        :param daemon: name of FRR daemon, e.g. 'bgpd'
+        :param socket_dir: directory with the VTY sockets of FRR daemons
+        :param timeout: seconds to wait for the daemon reply
+        """
+        self.daemon = daemon
+        self.path = os.path.join(socket_dir, "%s.vty" % daemon)
+        self.timeout = timeout
+        self.sock = None
+        self.lock = threading.Lock()
+
+    def connect(self):
+        """ Connect to the daemon and enter the enable node, as vtysh does """
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.path)
+        except socket.error:
+            sock.close()
+            raise
+        self.sock = sock
+        status, output = self.__execute("enable")
+        if status != CMD_SUCCESS:
+            self.close()
+            raise socket.error("can't enter enable node of %s: %s" % (self.daemon, output))
+
+    def close(self):
+        """ Close the connection. The next command reconnects """
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            except socket.error:
+                pass
+            self.sock = None
+
+    def execute(self, command):
+        """
+        Execute a command in the daemon. Connect to the daemon if the session isn't connected.
+        The session is closed on any error, because the stream could be in the middle of a reply
+        :param command: FRR command. Type: String
+        :return: Tuple: command status, command output as a string
+        """
+        with self.lock:
+            if self.sock is None:
+                try:
+                    self.connect()
+                except socket.error as e:
+                    raise VtyUnavailable(str(e))
+            try:
+                return self.__execute(command)
+            except socket.error:
+                self.close()
+                raise
+
+    def __execute(self, command):
+        self.sock.sendall(command.encode('utf-8') + b"\0")
+        chunks = []
+        tail = b""
+        while True:
+            chunk = self.sock.recv(65536)
+            if not chunk:
+                raise socket.error("connection to %s was closed" % self.daemon)
+            chunks.append(chunk)
+            tail = (tail + chunk)[-4:]
+            if len(tail) == 4 and tail[:3] == self.END_MARKER:
+                break
+        reply = b"".join(chunks)
+        return reply[-1], reply[:-4].decode('utf-8', errors='replace')
+
+
+class VtyshPool(object):
+    """
+    Pool of persistent VTY sessions with FRR daemons, one session per daemon.
+    It replaces running a new vtysh process for every show command. When the daemon socket
+    can't be reached, the command is executed by a vtysh process as before
+    """
+    def __init__(self, socket_dir=FRR_VTY_DIR, timeout=30.0, reconnect_interval=1.0):
+        """
+        Constructor
+        :param socket_dir: directory with the VTY sockets of FRR daemons
+        :param timeout: seconds to wait for a daemon reply
+        :param reconnect_interval: seconds to use vtysh processes after a daemon couldn't be connected
+        """
+        self.socket_dir = socket_dir
+        self.timeout = timeout
+        self.reconnect_interval = reconnect_interval
+        self.sessions = {}
+        self.unavailable_until = {}
+        self.lock = threading.Lock()
+        self.stats_lock = threading.Lock()
+        self.stats = {
+            'queries': 0,
+            'fallbacks': 0,
+            'reconnects': 0,
+            'errors': 0,
+        }
+
+    def run(self, daemon, command, fallback=None, vtysh_options=None):
+        """
+        Run a show command in a FRR daemon
+        :param daemon: name of FRR daemon which owns the command, e.g. 'bgpd'
+        :param command: FRR command. Type: String
+        :param fallback: function used to run the vtysh command line when the daemon can't be reached.
+                         It has the same signature as run_command(), which is used by default
+        :param vtysh_options: options of the vtysh command line used by the fallback, e.g. ['-H', '/dev/null']
+        :return: Tuple: integer exit code, stdout as a string, stderr as a string
+        """
+        self.__count('queries')
+        session = self.__get_session(daemon)
+        if session is not None:
+            for attempt in range(2):
+                try:
+                    status, output = session.execute(command)
+                except VtyUnavailable:
+                    # vtysh reports the errors, if the daemon can't be reached by it either
+                    self.unavailable_until[daemon] = time.monotonic() + self.reconnect_interval
+                    break
+                except socket.timeout:
+                    log_err("vtysh: command '%s' timed out in %s" % (command, daemon))
+                    self.__count('errors')
+                    return 1, "", "command '%s' timed out" % command
+                except socket.error as e:
+                    if attempt == 0:
+                        # The daemon could have been restarted. Reconnect once
+                        log_warn("vtysh: session with %s was lost: %s. Reconnecting" % (daemon, str(e)))
+                        self.__count('reconnects')
+                        continue
+                    log_err("vtysh: command '%s' failed in %s: %s" % (command, daemon, str(e)))
+                    self.__count('errors')
+                    return 1, "", str(e)
+                if status in (CMD_SUCCESS, CMD_WARNING):
+                    return 0, output, ""
+                self.__count('errors')
+                return status, output, output
+        self.__count('fallbacks')
+        if fallback is None:
+            fallback = run_command
+        return fallback(["vtysh"] + list(vtysh_options or []) + ["-c", command])
+
+    def get_stats(self):
+        """ Get a copy of the pool counters """
+        with self.stats_lock:
+            return dict(self.stats)
+
+    def close(self):
+        """ Close all sessions """
+        with self.lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions = {}
+
+    def __count(self, name):
+        """ Increment a pool counter. The pool is shared by all the threads of the process """
+        with self.stats_lock:
+            self.stats[name] += 1
+
+    def __get_session(self, daemon):
+        with self.lock:
+            if time.monotonic() < self.unavailable_until.get(daemon, 0.0):
+                return None
+            if daemon not in self.sessions:
+                self.sessions[daemon] = VtySession(daemon, self.socket_dir, self.timeout)
+            return self.sessions[daemon]
+
+
+g_vtysh_pool = None
+
+
+def get_vtysh_pool():
+    """ Get the pool of VTY sessions, which is shared by everything in the process """
+    global g_vtysh_pool
+    if g_vtysh_pool is None:
+        g_vtysh_pool = VtyshPool()
+    return g_vtysh_pool
@@ -31,9 +31,17 @@ import syslog
 from swsscommon import swsscommon
 import time
 from sonic_py_common.general import getstatusoutput_noshell
+from bgpcfgd.vtysh import get_vtysh_pool
 
 PIPE_BATCH_MAX_COUNT = 50
 
+
+def run_vtysh(cmd):
+    """ Run a vtysh command line, when bgpd can't be reached through its VTY socket """
+    rc, output = getstatusoutput_noshell(cmd)
+    return rc, output, ""
+
+
 class BgpStateGet:
     def __init__(self):
         # set peer_l stores the Neighbor peer Ip address
@@ -50,6 +58,7 @@ class BgpStateGet:
         self.pipe = swsscommon.RedisPipeline(self.db.get_redis_client(self.db.STATE_DB))
         self.db.delete_all_by_pattern(self.db.STATE_DB, "NEIGH_STATE_TABLE|*" )
         self.MAX_RETRY_ATTEMPTS = 3
+        self.vtysh_pool = get_vtysh_pool()
 
     # A quick way to check if there are anything happening within BGP is to
     # check its log file has any activities. This is by checking its modified
@@ -77,12 +86,12 @@ class BgpStateGet:
 
     # Get a new snapshot of BGP neighbors and store them in the "new" location
     def get_all_neigh_states(self):
-        cmd = ["vtysh", "-H", "/dev/null",  "-c", 'show bgp summary json']
+        cmd = 'show bgp summary json'
         retry_attempt = 0
 
         while retry_attempt < self.MAX_RETRY_ATTEMPTS:
             try:
-                rc, output = getstatusoutput_noshell(cmd)
+                rc, output, _ = self.vtysh_pool.run("bgpd", cmd, fallback=run_vtysh, vtysh_options=["-H", "/dev/null"])
                 if rc:
                     syslog.syslog(syslog.LOG_ERR, "*ERROR* Failed with rc:{} when execute: {}".format(rc, cmd))
                     return
@@ -72,6 +72,8 @@ def test_metadata_with_asns_update():
     actual_calls = m.cfg_mgr.push.mock_calls
     assert (actual_calls[0] == call("no bgp as-path access-list T2_GROUP_ASNS seq 5 permit _64128_"),
             "Didn't find call to clear previous ASN")
+    # Pending changes are committed before the running config is read
+    assert m.cfg_mgr.method_calls[:3] == [call.commit(), call.update(), call.get_text()]
 
 
 # test if T2_GROUP_ASNS has been cleared
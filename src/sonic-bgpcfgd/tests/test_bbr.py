@@ -1,6 +1,7 @@
 from unittest.mock import MagicMock, patch
 
 from bgpcfgd.directory import Directory
+from bgpcfgd.running_config import RunningConfig
 from bgpcfgd.template import TemplateFabric
 from copy import deepcopy
 from . import swsscommon_test
@@ -434,5 +435,6 @@ def test__get_available_peer_groups():
         '  exit-address-family',
         '     ',
     ])
+    m.cfg_mgr.get_running_config = lambda: RunningConfig(m.cfg_mgr.get_text())
     res = m._BBRMgr__get_available_peer_groups()
     assert res == {"PEER_V4", "PEER_V6"}
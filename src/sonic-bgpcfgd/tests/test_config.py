@@ -101,6 +101,110 @@ def test_commit_changes_restart_error():
 def test_commit_changes_both_errors():
     commit_changes_common(False, False, False)
 
+def test_coalesce_window():
+    frr = MagicMock()
+    c = ConfigMgr(frr, coalesce_window=10.0)
+    assert c.time_to_commit() is None
+    assert not c.commit_due()
+    c.push("change1")
+    assert 9.0 < c.time_to_commit() <= 10.0
+    assert not c.commit_due()
+    c.pending_since -= 10.0
+    assert c.time_to_commit() == 0.0
+    assert c.commit_due()
+
+def test_no_coalesce_window():
+    frr = MagicMock()
+    c = ConfigMgr(frr)
+    c.push("change1")
+    assert c.commit_due()
+
+def test_max_batch_lines():
+    frr = MagicMock()
+    c = ConfigMgr(frr, coalesce_window=10.0, max_batch_lines=4)
+    c.push_list(["change1", "change2"])
+    c.push("change3")
+    assert not c.batch_full()
+    assert not c.commit_due()
+    c.push("change4\nchange5")
+    assert c.pending_lines == 5
+    assert c.batch_full()
+    assert c.commit_due()
+
+def test_commit_stats():
+    frr = MagicMock()
+    frr.write = MagicMock(return_value = True)
+    frr.restart_peer_groups = MagicMock(return_value = False)
+    c = ConfigMgr(frr)
+    c.push_list(["change1", "change2"])
+    c.restart_peer_groups(["pg1", "pg2", "pg1"])
+    c.commit()
+    c.push("change3")
+    c.commit()
+    assert c.stats['batches'] == 2
+    assert c.stats['lines'] == 3
+    assert c.stats['peer_groups'] == 2
+    assert c.stats['failures'] == 2
+    assert c.stats['vtysh_time'] >= c.stats['max_vtysh_time'] >= c.stats['last_vtysh_time']
+    assert c.pending_lines == 0
+    assert c.pending_since is None
+
+def test_running_config_cache():
+    frr = MagicMock()
+    frr.get_config = MagicMock(return_value="router bgp 64601\n neighbor PEER_V4 peer-group\n")
+    c = ConfigMgr(frr, max_config_age=10.0)
+    c.update()
+    c.update()
+    assert frr.get_config.call_count == 1
+    assert c.get_running_config().get_peer_groups() == ['PEER_V4']
+    c.config_read_time -= 10.0
+    c.update()
+    assert frr.get_config.call_count == 2
+    c.push("router bgp 64601")
+    c.commit()
+    assert c.running_config is None
+    c.update()
+    assert frr.get_config.call_count == 3
+
+def test_running_config_lazy_update():
+    frr = MagicMock()
+    frr.get_config = MagicMock(return_value="router bgp 64601\n neighbor PEER_V4 peer-group\n")
+    c = ConfigMgr(frr, coalesce_window=10.0)
+    c.push("router bgp 64601\n neighbor PEER_V6 peer-group")
+    # Read from FRR on first use, with the pending changes applied
+    assert c.get_running_config().get_peer_groups() == ['PEER_V4', 'PEER_V6']
+    assert frr.get_config.call_count == 1
+    c.get_running_config()
+    assert frr.get_config.call_count == 1
+
+def test_config_cache_invalidated_on_push():
+    frr = MagicMock()
+    frr.get_config = MagicMock(return_value="ip prefix-list PL_1 seq 10 permit 10.0.0.0/8\n")
+    c = ConfigMgr(frr, coalesce_window=10.0, max_config_age=10.0)
+    c.update()
+    c.push("ip prefix-list PL_1 seq 20 permit 20.0.0.0/8")
+    c.update()
+    assert frr.get_config.call_count == 2
+    assert list(c.get_running_config().get_prefix_list('ip', 'PL_1').keys()) == [10, 20]
+    # Nothing pending: the text is read again after the commit
+    frr.get_config.return_value = "ip prefix-list PL_1 seq 10 permit 10.0.0.0/8\nip prefix-list PL_1 seq 20 permit 20.0.0.0/8\n"
+    c.commit()
+    c.update()
+    c.commit()
+    c.update()
+    assert frr.get_config.call_count == 4
+    assert "ip prefix-list PL_1 seq 20 permit 20.0.0.0/8" in c.get_text()
+
+def test_running_config_pending_changes():
+    frr = MagicMock()
+    frr.get_config = MagicMock(return_value="ip prefix-list PL_1 seq 10 permit 10.0.0.0/8\n")
+    c = ConfigMgr(frr, coalesce_window=10.0, max_config_age=10.0)
+    c.push_list(["ip prefix-list PL_1 seq 20 permit 20.0.0.0/8"])
+    c.update()
+    c.push("ip prefix-list PL_1 seq 30 permit 30.0.0.0/8")
+    assert list(c.get_running_config().get_prefix_list('ip', 'PL_1').keys()) == [10, 20, 30]
+    assert "ip prefix-list PL_1 seq 20 permit 20.0.0.0/8" not in c.get_text()
+
 def test_restart_get_text():
     frr = MagicMock()
     frr.get_config = MagicMock(return_value = """!
@@ -55,3 +55,58 @@ def test_directory(mocked_log_err):
     # Test remove_slot() with nonexist table
     directory.remove_slot("db_name", "table_nonexist")
     mocked_log_err.assert_called_with("Directory: Can't remove slot 'db_name__table_nonexist'. The slot doesn't exist")
+
+def test_notify_affected_paths():
+    calls = []
+    directory = Directory()
+    asn_handler = lambda: calls.append("asn")
+    slot_handler = lambda: calls.append("slot")
+    lo_handler = lambda: calls.append("lo")
+    directory.subscribe([("CONFIG_DB", "DEVICE_METADATA", "localhost/bgp_asn"), ("CONFIG_DB", "DEVICE_METADATA", "localhost/type")], asn_handler)
+    directory.subscribe([("CONFIG_DB", "DEVICE_METADATA", "")], slot_handler)
+    directory.subscribe([("CONFIG_DB", "LOOPBACK_INTERFACE", "Loopback0")], lo_handler)
+
+    directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"bgp_asn": "65100", "type": "ToRRouter"})
+    assert calls == ["asn", "slot"]  # the handler subscribed to two changed paths is run once
+    calls.clear()
+    directory.put("CONFIG_DB", "DEVICE_METADATA", "other", {})
+    assert calls == ["slot"]  # the paths of another key are not affected
+    calls.clear()
+    directory.put("CONFIG_DB", "LOOPBACK_INTERFACE", "Loopback1", {})
+    assert calls == []
+    directory.put("CONFIG_DB", "LOOPBACK_INTERFACE", "Loopback0", {})
+    assert calls == ["lo"]
+    calls.clear()
+
+    directory.unsubscribe([("CONFIG_DB", "DEVICE_METADATA", "localhost/bgp_asn"), ("CONFIG_DB", "DEVICE_METADATA", "localhost/type")])
+    assert list(directory.notify_index["CONFIG_DB__DEVICE_METADATA"]) == ['']
+    directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"bgp_asn": "65100"})
+    assert calls == ["slot"]
+
+
+def test_notify_prefix_key():
+    calls = []
+    directory = Directory()
+    prefix_handler = lambda: calls.append("prefix")
+    nexthop_handler = lambda: calls.append("nexthop")
+    other_handler = lambda: calls.append("other")
+    directory.subscribe([("CONFIG_DB", "STATIC_ROUTE", "10.0.0.0/24")], prefix_handler)
+    directory.subscribe([("CONFIG_DB", "STATIC_ROUTE", "10.0.0.0/24/nexthop")], nexthop_handler)
+    directory.subscribe([("CONFIG_DB", "STATIC_ROUTE", "10.0.0.0/25")], other_handler)
+
+    directory.put("CONFIG_DB", "STATIC_ROUTE", "10.0.0.0/24", {"nexthop": "10.0.1.1"})
+    assert calls == ["prefix", "nexthop"]
+    assert directory.get_path("CONFIG_DB", "STATIC_ROUTE", "10.0.0.0/24/nexthop") == "10.0.1.1"
+    assert not directory.path_exist("CONFIG_DB", "STATIC_ROUTE", "10.0.0.0/25")
+    calls.clear()
+    directory.put("CONFIG_DB", "STATIC_ROUTE", "10.0.1.0/24", {})
+    assert calls == []
+
+    directory.unsubscribe([("CONFIG_DB", "STATIC_ROUTE", "10.0.0.0/24/nexthop")])
+    assert directory.notify_index["CONFIG_DB__STATIC_ROUTE"] == {
+        "10.0.0.0": {"10.0.0.0/24", "10.0.0.0/25"},
+        "10.0.0.0/24": {"10.0.0.0/24"},
+        "10.0.0.0/25": {"10.0.0.0/25"},
+    }
+    directory.put("CONFIG_DB", "STATIC_ROUTE", "10.0.0.0/24", {})
+    assert calls == ["prefix"]
@@ -1,4 +1,4 @@
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 import bgpcfgd.frr
 import pytest
 
@@ -50,19 +50,48 @@ def test_write_fail():
     assert not res, "Expect False return value"
 
 def test_restart_peer_groups():
-    bgpcfgd.frr.run_command = lambda cmd: (0, "some output", "")
+    commands = []
+    def run_command(cmd, **kwargs):
+        commands.append(cmd)
+        return 0, "some output", ""
+    bgpcfgd.frr.run_command = run_command
     f = bgpcfgd.frr.FRR(["abc", "cde"])
-    res = f.restart_peer_groups(["pg_1", "pg_2"])
+    res = f.restart_peer_groups(["pg_2", "pg_1", "pg_2"])
     assert res, "Expect True return value"
+    assert commands == [['vtysh', '-E', '-c', 'clear bgp peer-group pg_1 soft in', '-c', 'clear bgp peer-group pg_2 soft in']]
+
+def test_restart_peer_groups_empty():
+    bgpcfgd.frr.run_command = MagicMock()
+    f = bgpcfgd.frr.FRR(["abc", "cde"])
+    assert f.restart_peer_groups([])
+    assert not bgpcfgd.frr.run_command.called
 
 @patch('bgpcfgd.frr.log_crit')
 def test_restart_peer_groups_fail(mocked_log_crit):
     return_value_map = {
-        "['vtysh', '-c', 'clear bgp peer-group pg_1 soft in']": (0, "", ""),
-        "['vtysh', '-c', 'clear bgp peer-group pg_2 soft in']": (1, "some output", "some error")
+        "['vtysh', '-E', '-c', 'clear bgp peer-group pg_1 soft in', '-c', 'clear bgp peer-group pg_2 soft in']":
+            (1, "sonic# clear bgp peer-group pg_1 soft in\nsonic# clear bgp peer-group pg_2 soft in\n% some output", "some error"),
     }
-    bgpcfgd.frr.run_command = lambda cmd: return_value_map[str(cmd)]
+    bgpcfgd.frr.run_command = lambda cmd, **kwargs: return_value_map[str(cmd)]
     f = bgpcfgd.frr.FRR(["abc", "cde"])
     res = f.restart_peer_groups(["pg_1", "pg_2"])
     assert not res, "Expect False return value"
-    mocked_log_crit.assert_called_with("Can't restart bgp peer-group 'pg_2'. rc='1', out='some output', err='some error'")
+    mocked_log_crit.assert_called_once_with("Can't restart bgp peer-group 'pg_2'. rc='1', out='sonic# clear bgp peer-group pg_1 soft in\nsonic# clear bgp peer-group pg_2 soft in\n% some output', err='some error'")
+
+@patch('bgpcfgd.frr.log_crit')
+def test_restart_peer_groups_fail_retry_rest(mocked_log_crit):
+    commands = []
+    def run_command(cmd, **kwargs):
+        commands.append(cmd)
+        if len(commands) == 1:
+            # vtysh stops at the first failing command
+            return 1, "sonic# clear bgp peer-group pg_1 soft in\nsonic# clear bgp peer-group pg_2 soft in\n% no such peer-group", ""
+        return 0, "", ""
+    bgpcfgd.frr.run_command = run_command
+    f = bgpcfgd.frr.FRR(["abc", "cde"])
+    res = f.restart_peer_groups(["pg_1", "pg_2", "pg_3", "pg_4"])
+    assert not res, "Expect False return value"
+    # pg_1 was cleared, pg_2 failed: only the peer-groups after it are cleared again
+    assert commands[1:] == [['vtysh', '-E', '-c', 'clear bgp peer-group pg_3 soft in', '-c', 'clear bgp peer-group pg_4 soft in']]
+    assert mocked_log_crit.call_count == 1
+    assert "'pg_2'" in mocked_log_crit.call_args[0][0]
@@ -0,0 +1,88 @@
+from unittest.mock import MagicMock
+
+from bgpcfgd.directory import Directory
+from . import swsscommon_test
+
+import sys
+sys.modules["swsscommon"] = swsscommon_test
+
+import bgpcfgd.manager
+from bgpcfgd.manager import Manager
+
+
+class QueueMgr(Manager):
+    def __init__(self, common_objs, ready_keys):
+        super(QueueMgr, self).__init__(common_objs, [("CONFIG_DB", "DEVICE_METADATA", "localhost/bgp_asn")], "CONFIG_DB", "TEST")
+        self.ready_keys = ready_keys
+        self.processed = []
+
+    def set_handler(self, key, data):
+        if key not in self.ready_keys:
+            return False
+        self.processed.append(key)
+        # the handler changes a dependency of its manager
+        self.directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"bgp_asn": "65100"})
+        return True
+
+def test_replay_queue_once():
+    common_objs = {
+        'directory': Directory(),
+        'cfg_mgr': MagicMock(),
+        'constants': {},
+    }
+    m = QueueMgr(common_objs, {"key1", "key2"})
+    SET_COMMAND = bgpcfgd.manager.swsscommon.SET_COMMAND
+    m.handler("key1", SET_COMMAND, {})
+    m.handler("key2", SET_COMMAND, {})
+    m.handler("key3", SET_COMMAND, {})
+    assert m.deps_queue == [("key1", {}), ("key2", {}), ("key3", {})]
+    assert m.processed == []
+
+    m.directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"bgp_asn": "65100"})
+    assert m.processed == ["key1", "key2"]
+    assert m.deps_queue == []
+    assert m.set_queue == [("key3", {})]
+
+    m.ready_keys.add("key3")
+    m.on_deps_change()
+    assert m.processed == ["key1", "key2", "key3"]
+    assert m.set_queue == []
+
+def test_replay_queue_deferred():
+    common_objs = {
+        'directory': Directory(),
+        'cfg_mgr': MagicMock(),
+        'constants': {},
+    }
+    common_objs['directory'].enable_deferred()
+    m = QueueMgr(common_objs, {"key1"})
+    SET_COMMAND = bgpcfgd.manager.swsscommon.SET_COMMAND
+    m.handler("key1", SET_COMMAND, {})
+    m.handler("key2", SET_COMMAND, {})
+    m.directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"bgp_asn": "65100"})
+    m.directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"bgp_asn": "65100"})
+    assert m.processed == []
+    assert m.directory.deferred == [m.replay_queue]
+    m.directory.run_deferred()
+    assert m.processed == ["key1"]
+    assert m.set_queue == [("key2", {})]
+    assert m.directory.deferred == []
+
+def test_replay_queue_deferred_set_del_order():
+    common_objs = {
+        'directory': Directory(),
+        'cfg_mgr': MagicMock(),
+        'constants': {},
+    }
+    common_objs['directory'].enable_deferred()
+    m = QueueMgr(common_objs, {"10.0.0.1"})
+    m.del_handler = lambda key: m.processed.remove(key)
+    SET_COMMAND = bgpcfgd.manager.swsscommon.SET_COMMAND
+    DEL_COMMAND = bgpcfgd.manager.swsscommon.DEL_COMMAND
+    m.handler("10.0.0.1", SET_COMMAND, {})
+    m.directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"bgp_asn": "65100"})
+    m.handler("10.0.0.1", DEL_COMMAND, {})
+    m.directory.run_deferred()
+    assert m.processed == []
+    assert m.deps_queue == []
+    assert m.set_queue == []
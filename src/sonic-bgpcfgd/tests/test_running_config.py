@@ -0,0 +1,141 @@
+from bgpcfgd.running_config import RunningConfig
+
+
+running_config_text = [
+    'ip prefix-list PL_ALLOW_LIST_DEPLOYMENT_ID_0_COMMUNITY_empty_V4 seq 10 deny 0.0.0.0/0 le 17',
+    'ip prefix-list PL_ALLOW_LIST_DEPLOYMENT_ID_0_COMMUNITY_empty_V4 seq 20 permit 10.20.30.0/24 le 32',
+    'ipv6 prefix-list PL_ALLOW_LIST_DEPLOYMENT_ID_0_COMMUNITY_empty_V6 seq 10 deny ::/0 le 59',
+    '!',
+    'bgp community-list standard COMMUNITY_ALLOW_LIST_DEPLOYMENT_ID_0 permit 1010:2020',
+    '!',
+    'route-map ALLOW_LIST_DEPLOYMENT_ID_0_V4 permit 10',
+    ' match ip address prefix-list PL_ALLOW_LIST_DEPLOYMENT_ID_0_COMMUNITY_empty_V4',
+    ' set community 123:123 additive',
+    '!',
+    'route-map ALLOW_LIST_DEPLOYMENT_ID_0_V4 permit 65535',
+    ' set community 5060:12345 additive',
+    '!',
+    'route-map FROM_BGP_PEER_V4 permit 2',
+    ' call ALLOW_LIST_DEPLOYMENT_ID_0_V4',
+    ' on-match next',
+    '!',
+    'router bgp 64601',
+    ' neighbor PEER_V4 peer-group',
+    ' neighbor PEER_V6 peer-group',
+    ' neighbor PEER_V4 remote-as 65432',
+    ' address-family ipv4',
+    '  neighbor PEER_V4 route-map FROM_BGP_PEER_V4 in',
+    '  neighbor PEER_V4 route-map TO_BGP_PEER_V4 out',
+    ' exit-address-family',
+    '!',
+]
+
+def test_parse():
+    rc = RunningConfig(running_config_text)
+    assert list(rc.get_prefix_list('ip', 'PL_ALLOW_LIST_DEPLOYMENT_ID_0_COMMUNITY_empty_V4').items()) == [
+        (10, 'deny 0.0.0.0/0 le 17'),
+        (20, 'permit 10.20.30.0/24 le 32'),
+    ]
+    assert list(rc.get_prefix_list('ipv6', 'PL_ALLOW_LIST_DEPLOYMENT_ID_0_COMMUNITY_empty_V6').values()) == ['deny ::/0 le 59']
+    assert rc.get_prefix_list('ipv6', 'PL_ALLOW_LIST_DEPLOYMENT_ID_0_COMMUNITY_empty_V4') is None
+    assert rc.get_community_list('COMMUNITY_ALLOW_LIST_DEPLOYMENT_ID_0') == ['1010:2020']
+    assert rc.get_community_list('COMMUNITY_NOT_PRESENT') == []
+    rm = rc.get_route_map('ALLOW_LIST_DEPLOYMENT_ID_0_V4')
+    assert list(rm.keys()) == [10, 65535]
+    assert rm[10] == {
+        'action': 'permit',
+        'lines': [
+            'match ip address prefix-list PL_ALLOW_LIST_DEPLOYMENT_ID_0_COMMUNITY_empty_V4',
+            'set community 123:123 additive',
+        ],
+    }
+    assert rm[65535]['lines'] == ['set community 5060:12345 additive']
+    assert rc.get_route_map('FROM_BGP_PEER_V4')[2]['lines'] == ['call ALLOW_LIST_DEPLOYMENT_ID_0_V4', 'on-match next']
+    assert rc.get_route_map('ROUTE_MAP_NOT_PRESENT') == {}
+    assert rc.get_peer_groups() == ['PEER_V4', 'PEER_V6']
+    assert rc.get_neighbor_route_map_in('PEER_V4') == 'FROM_BGP_PEER_V4'
+    assert rc.get_neighbor_route_map_in('PEER_V6') is None
+
+def test_apply_changes():
+    rc = RunningConfig(running_config_text)
+    rc.apply([
+        'ip prefix-list PL_ALLOW_LIST_DEPLOYMENT_ID_0_COMMUNITY_empty_V4 seq 30 permit 10.20.40.0/24 le 32',
+        'no ip prefix-list PL_ALLOW_LIST_DEPLOYMENT_ID_0_COMMUNITY_empty_V4 seq 10 deny 0.0.0.0/0 le 17',
+        'no ipv6 prefix-list PL_ALLOW_LIST_DEPLOYMENT_ID_0_COMMUNITY_empty_V6',
+        'no bgp community-list standard COMMUNITY_ALLOW_LIST_DEPLOYMENT_ID_0 permit 1010:2020',
+        'bgp community-list standard COMMUNITY_ALLOW_LIST_DEPLOYMENT_ID_0 permit 1010:3030',
+        'route-map ALLOW_LIST_DEPLOYMENT_ID_0_V4 permit 20',
+        ' match ip address prefix-list PL_ALLOW_LIST_DEPLOYMENT_ID_1_COMMUNITY_empty_V4',
+        'route-map ALLOW_LIST_DEPLOYMENT_ID_0_V4 permit 65535',
+        ' set community 5060:54321 additive',
+        'exit',
+        'no route-map FROM_BGP_PEER_V4',
+        'router bgp 64601',
+        ' no neighbor PEER_V6 peer-group',
+        ' neighbor PEER_V8 peer-group',
+    ])
+    assert list(rc.get_prefix_list('ip', 'PL_ALLOW_LIST_DEPLOYMENT_ID_0_COMMUNITY_empty_V4').items()) == [
+        (20, 'permit 10.20.30.0/24 le 32'),
+        (30, 'permit 10.20.40.0/24 le 32'),
+    ]
+    assert rc.get_prefix_list('ipv6', 'PL_ALLOW_LIST_DEPLOYMENT_ID_0_COMMUNITY_empty_V6') is None
+    assert rc.get_community_list('COMMUNITY_ALLOW_LIST_DEPLOYMENT_ID_0') == ['1010:3030']
+    rm = rc.get_route_map('ALLOW_LIST_DEPLOYMENT_ID_0_V4')
+    assert list(rm.keys()) == [10, 65535, 20]
+    assert rm[20]['lines'] == ['match ip address prefix-list PL_ALLOW_LIST_DEPLOYMENT_ID_1_COMMUNITY_empty_V4']
+    assert rm[65535]['lines'] == ['set community 5060:54321 additive']
+    assert rc.get_route_map('FROM_BGP_PEER_V4') == {}
+    assert rc.get_peer_groups() == ['PEER_V4', 'PEER_V8']
+
+def test_apply_route_map_entry_delete():
+    rc = RunningConfig(running_config_text)
+    rc.apply(['no route-map ALLOW_LIST_DEPLOYMENT_ID_0_V4 permit 10'])
+    assert list(rc.get_route_map('ALLOW_LIST_DEPLOYMENT_ID_0_V4').keys()) == [65535]
+
+def test_neighbor_route_map_in_per_address_family():
+    rc = RunningConfig(running_config_text + [
+        'router bgp 64601',
+        ' address-family ipv6 unicast',
+        '  neighbor PEER_V4 route-map FROM_BGP_PEER_V6 in',
+        '  neighbor PEER_V6 route-map FROM_BGP_PEER_V6 in',
+        ' exit-address-family',
+    ])
+    assert rc.get_neighbor_route_map_in('PEER_V4') == 'FROM_BGP_PEER_V4'
+    assert rc.get_neighbor_route_map_in('PEER_V4', 'ipv4') == 'FROM_BGP_PEER_V4'
+    assert rc.get_neighbor_route_map_in('PEER_V4', 'ipv6 unicast') == 'FROM_BGP_PEER_V6'
+    assert rc.get_neighbor_route_map_in('PEER_V6') == 'FROM_BGP_PEER_V6'
+    assert rc.get_neighbor_route_map_in('PEER_V6', 'ipv4 unicast') is None
+    # A later route-map of the same neighbor and address-family overrides the previous one
+    rc.apply([
+        'router bgp 64601',
+        ' address-family ipv4',
+        '  neighbor PEER_V4 route-map FROM_BGP_PEER_V4_NEW in',
+        ' exit-address-family',
+        ' neighbor PEER_V6 route-map FROM_BGP_PEER_V6_V4 in',
+    ])
+    assert rc.get_neighbor_route_map_in('PEER_V4') == 'FROM_BGP_PEER_V4_NEW'
+    assert rc.get_neighbor_route_map_in('PEER_V4', 'ipv6') == 'FROM_BGP_PEER_V6'
+    assert rc.get_neighbor_route_map_in('PEER_V6', 'ipv4') == 'FROM_BGP_PEER_V6_V4'
+    rc.apply([
+        'router bgp 64601',
+        ' address-family ipv6',
+        '  no neighbor PEER_V6 route-map FROM_BGP_PEER_V6 in',
+    ])
+    assert rc.get_neighbor_route_map_in('PEER_V6', 'ipv6') is None
+    assert rc.get_neighbor_route_map_in('PEER_V6') == 'FROM_BGP_PEER_V6_V4'
+    rc.apply(['router bgp 64601', ' no neighbor PEER_V4 peer-group'])
+    assert rc.get_neighbor_route_map_in('PEER_V4') is None
+
+def test_apply_route_map_entry_action_change():
+    rc = RunningConfig(running_config_text)
+    rc.apply([
+        'route-map ALLOW_LIST_DEPLOYMENT_ID_0_V4 deny 10',
+        ' match ip address prefix-list PL_DENY',
+    ])
+    rm = rc.get_route_map('ALLOW_LIST_DEPLOYMENT_ID_0_V4')
+    # FRR recreates the entry when its action changes
+    assert rm[10] == {'action': 'deny', 'lines': ['match ip address prefix-list PL_DENY']}
+    rc.apply(['route-map ALLOW_LIST_DEPLOYMENT_ID_0_V4 deny 10', ' set community 1:1 additive'])
+    assert rm[10]['lines'] == ['match ip address prefix-list PL_DENY', 'set community 1:1 additive']
+    rc.apply(['route-map ALLOW_LIST_DEPLOYMENT_ID_0_V4 permit 10'])
+    assert rm[10] == {'action': 'permit', 'lines': []}
@@ -0,0 +1,108 @@
+import os
+import shutil
+import socket
+import tempfile
+import threading
+
+from bgpcfgd.vtysh import VtyshPool
+
+
+class FakeDaemon(object):
+    """ Serve the VTY protocol on a unix socket, like a FRR daemon """
+    def __init__(self, socket_dir, name, replies):
+        self.replies = replies
+        self.commands = []
+        self.connections = 0
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(os.path.join(socket_dir, "%s.vty" % name))
+        self.server.listen(5)
+        self.thread = threading.Thread(target=self.serve)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def serve(self):
+        while True:
+            try:
+                conn, _ = self.server.accept()
+            except OSError:
+                return
+            self.connections += 1
+            buf = b""
+            while True:
+                data = conn.recv(4096)
+                if not data:
+                    break
+                buf += data
+                while b"\0" in buf:
+                    command, buf = buf.split(b"\0", 1)
+                    command = command.decode()
+                    self.commands.append(command)
+                    if command == "drop":
+                        conn.close()
+                        break
+                    output, status = self.replies.get(command, ("% Unknown command", 2))
+                    conn.sendall(output.encode() + b"\0\0\0" + bytes([status]))
+                if conn.fileno() == -1:
+                    break
+            conn.close()
+
+    def stop(self):
+        self.server.close()
+
+
+def fallback_not_expected(cmd):
+    assert False, "vtysh process is not expected: %s" % cmd
+
+def test_run():
+    socket_dir = tempfile.mkdtemp()
+    try:
+        daemon = FakeDaemon(socket_dir, "bgpd", {
+            "enable": ("", 0),
+            "show bgp vrfs json": ('{"vrfs": {"default": {}}}\n' * 10000, 0),
+            "show bgp peer-group PEER json": ("% No such peer-group", 1),
+        })
+        pool = VtyshPool(socket_dir=socket_dir, timeout=5.0)
+        assert pool.run("bgpd", "show bgp vrfs json", fallback_not_expected) == (0, '{"vrfs": {"default": {}}}\n' * 10000, "")
+        assert pool.run("bgpd", "show bgp peer-group PEER json", fallback_not_expected) == (0, "% No such peer-group", "")
+        assert pool.run("bgpd", "show something", fallback_not_expected) == (2, "% Unknown command", "% Unknown command")
+        assert daemon.connections == 1
+        assert daemon.commands == ["enable", "show bgp vrfs json", "show bgp peer-group PEER json", "show something"]
+        assert pool.get_stats() == {'queries': 3, 'fallbacks': 0, 'reconnects': 0, 'errors': 1}
+        pool.close()
+        daemon.stop()
+    finally:
+        shutil.rmtree(socket_dir)
+
+def test_reconnect():
+    socket_dir = tempfile.mkdtemp()
+    try:
+        daemon = FakeDaemon(socket_dir, "bgpd", {"enable": ("", 0), "show version": ("FRRouting", 0)})
+        pool = VtyshPool(socket_dir=socket_dir, timeout=5.0)
+        assert pool.run("bgpd", "show version", fallback_not_expected) == (0, "FRRouting", "")
+        # the daemon closes the session, e.g. it was restarted
+        assert pool.run("bgpd", "drop", fallback_not_expected)[0] == 1
+        assert pool.run("bgpd", "show version", fallback_not_expected) == (0, "FRRouting", "")
+        assert daemon.connections == 3
+        assert pool.get_stats()['reconnects'] == 1
+        assert pool.get_stats()['errors'] == 1
+        pool.close()
+        daemon.stop()
+    finally:
+        shutil.rmtree(socket_dir)
+
+def test_fallback():
+    socket_dir = tempfile.mkdtemp()
+    try:
+        commands = []
+        def fallback(cmd):
+            commands.append(cmd)
+            return 0, "output", ""
+        pool = VtyshPool(socket_dir=socket_dir, timeout=5.0, reconnect_interval=60.0)
+        assert pool.run("bfdd", "show bfd peers json", fallback) == (0, "output", "")
+        assert pool.run("bfdd", "show bfd peers json", fallback) == (0, "output", "")
+        assert commands == [["vtysh", "-c", "show bfd peers json"]] * 2
+        assert pool.run("bgpd", "show bgp summary json", fallback, vtysh_options=["-H", "/dev/null"]) == (0, "output", "")
+        assert commands[-1] == ["vtysh", "-H", "/dev/null", "-c", "show bgp summary json"]
+        assert pool.get_stats()['fallbacks'] == 3
+    finally:
+        shutil.rmtree(socket_dir)
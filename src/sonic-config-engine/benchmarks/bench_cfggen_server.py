@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Compare N cold sonic-cfggen runs against N requests served by a persistent
+render server (sonic-cfggen --serve) through sonic-cfggen-client.
+
+Example:
+    ./benchmarks/bench_cfggen_server.py -n 20 -- -m tests/sample_graph.xml \\
+        -p tests/t0-sample-port-config.ini -t tests/sample-template-1.json.j2
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ENGINE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+CFGGEN = [sys.executable, os.path.join(ENGINE_DIR, 'sonic-cfggen')]
+CLIENT = [sys.executable, os.path.join(ENGINE_DIR, 'sonic-cfggen-client')]
+# Seconds to wait for the server to create its socket
+SERVER_START_TIMEOUT = 30
+
+
+def run_n(cmd, count):
+    start = time.time()
+    for _ in range(count):
+        subprocess.check_call(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sonic-cfggen render server")
+    parser.add_argument("-n", "--count", type=int, default=10, help="number of invocations")
+    parser.add_argument("cfggen_args", nargs=argparse.REMAINDER, help="arguments passed to sonic-cfggen")
+    args = parser.parse_args()
+    cfggen_args = [a for a in args.cfggen_args if a != '--']
+    if not cfggen_args:
+        parser.error("sonic-cfggen arguments are required")
+
+    cold = run_n(CFGGEN + cfggen_args, args.count)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        socket_path = os.path.join(tmp_dir, 'sonic-cfggen.sock')
+        os.environ['SONIC_CFGGEN_SOCKET'] = socket_path
+        server = subprocess.Popen(CFGGEN + ['--serve', socket_path], stderr=subprocess.DEVNULL)
+        try:
+            deadline = time.time() + SERVER_START_TIMEOUT
+            while not os.path.exists(socket_path):
+                if server.poll() is not None or time.time() > deadline:
+                    sys.exit("sonic-cfggen --serve did not start listening on {}".format(socket_path))
+                time.sleep(0.05)
+            served = run_n(CLIENT + cfggen_args, args.count)
+        finally:
+            server.terminate()
+            server.wait()
+
+    print("{} cold runs:      {:8.3f}s ({:7.1f}ms per run)".format(args.count, cold, cold * 1000 / args.count))
+    print("{} served requests: {:8.3f}s ({:7.1f}ms per request)".format(args.count, served, served * 1000 / args.count))
+    print("speedup: {:.1f}x".format(cold / served))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Compare peak RSS and latency of parse_xml with the whole document loaded by
+ET.parse against the streaming iterparse parser, on a synthetic minigraph
+with a large number of links between remote devices (as a VOQ chassis
+supervisor minigraph describing every linecard).
+
+Example:
+    ./benchmarks/bench_minigraph_streaming.py --links 100000
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+ENGINE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+BASE_GRAPH = os.path.join(ENGINE_DIR, 'tests', 't0-sample-graph.xml')
+PORT_CONFIG = os.path.join(ENGINE_DIR, 'tests', 't0-sample-port-config.ini')
+
+LINK = """      <DeviceLinkBase>
+        <ElementType>DeviceInterfaceLink</ElementType>
+        <EndDevice>REMOTE{0:06d}T1</EndDevice>
+        <EndPort>Ethernet{1}</EndPort>
+        <StartDevice>REMOTE{0:06d}LC</StartDevice>
+        <StartPort>Ethernet{1}</StartPort>
+      </DeviceLinkBase>
+"""
+
+# Parse in a fresh process so that ru_maxrss only covers one parser
+PARSE = """
+import io, contextlib, resource, sys, time
+sys.path.insert(0, {engine_dir!r})
+import minigraph
+start = time.time()
+with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+    minigraph.parse_xml({graph!r}, port_config_file={port_config!r}, streaming={streaming})
+print(time.time() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def generate_graph(filename, links):
+    with open(BASE_GRAPH) as f:
+        content = f.read()
+    marker = '<DeviceInterfaceLinks>\n'
+    head, tail = content.split(marker, 1)
+    with open(filename, 'w') as f:
+        f.write(head + marker)
+        for i in range(links):
+            f.write(LINK.format(i // 64, i % 64))
+        f.write(tail)
+
+
+def run_parser(graph, streaming):
+    code = PARSE.format(engine_dir=ENGINE_DIR, graph=graph, port_config=PORT_CONFIG, streaming=streaming)
+    elapsed, maxrss = subprocess.check_output([sys.executable, '-c', code], universal_newlines=True).split()
+    return float(elapsed), int(maxrss)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the streaming minigraph parser")
+    parser.add_argument("--links", type=int, default=100000, help="number of synthetic links")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        graph = os.path.join(tmp_dir, 'minigraph.xml')
+        generate_graph(graph, args.links)
+        print("minigraph with {} extra links: {:.1f} MB".format(args.links, os.path.getsize(graph) / 1e6))
+        for name, streaming in [('ET.parse', False), ('iterparse', True)]:
+            elapsed, maxrss = run_parser(graph, streaming)
+            print("{:10s} {:8.3f}s  peak RSS {:8.1f} MB".format(name, elapsed, maxrss / 1024.0))
+
+
+if __name__ == "__main__":
+    main()
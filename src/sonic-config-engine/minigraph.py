@@ -1,12 +1,17 @@
 from __future__ import print_function
 
+import copy
+import hashlib
 import ipaddress
 import math
 import os
+import pickle
+import stat
 import sys
 import json
 import jinja2
 import subprocess
+import tempfile
 from collections import defaultdict
 
 
@@ -605,8 +610,33 @@ def parse_png(png, hname, dpg_ecmp_content = None):
 
     for child in png:
         if child.tag == str(QName(ns, "DeviceInterfaceLinks")):
+            # All the link attributes are collected in a single pass, as the
+            # links of a streamed minigraph can only be iterated once
             for link in child.findall(str(QName(ns, "DeviceLinkBase"))):
+                if str(QName(ns3, "type")) in link.attrib:
+                    link_type = link.attrib[str(QName(ns3, "type"))]
+                    if link_type == 'DeviceSerialLink':
+                        for node in link:
+                            if node.tag == str(QName(ns, "EndPort")):
+                                console_port = node.text.split()[-1]
+                            elif node.tag == str(QName(ns, "EndDevice")):
+                                console_dev = node.text
+                    elif link_type == 'DeviceMgmtLink':
+                        for node in link:
+                            if node.tag == str(QName(ns, "EndPort")):
+                                mgmt_port = node.text.split()[-1]
+                            elif node.tag == str(QName(ns, "EndDevice")):
+                                mgmt_dev = node.text
+
                 linktype = link.find(str(QName(ns, "ElementType"))).text
+                if linktype == "LogicalLink":
+                    intf_name = link.find(str(QName(ns, "EndPort"))).text
+                    start_device = link.find(str(QName(ns, "StartDevice"))).text
+                    if intf_name in port_alias_map:
+                        intf_name = port_alias_map[intf_name]
+
+                    mux_cable_ports[intf_name] = start_device
+
                 if linktype == "DeviceSerialLink":
                     enddevice = link.find(str(QName(ns, "EndDevice"))).text
                     endport = link.find(str(QName(ns, "EndPort"))).text
@@ -684,34 +714,6 @@ def parse_png(png, hname, dpg_ecmp_content = None):
                     device_data['slice_type'] = slice_type
                 devices[name] = device_data
 
-        if child.tag == str(QName(ns, "DeviceInterfaceLinks")):
-            for if_link in child.findall(str(QName(ns, 'DeviceLinkBase'))):
-                if str(QName(ns3, "type")) in if_link.attrib:
-                    link_type = if_link.attrib[str(QName(ns3, "type"))]
-                    if link_type == 'DeviceSerialLink':
-                        for node in if_link:
-                            if node.tag == str(QName(ns, "EndPort")):
-                                console_port = node.text.split()[-1]
-                            elif node.tag == str(QName(ns, "EndDevice")):
-                                console_dev = node.text
-                    elif link_type == 'DeviceMgmtLink':
-                        for node in if_link:
-                            if node.tag == str(QName(ns, "EndPort")):
-                                mgmt_port = node.text.split()[-1]
-                            elif node.tag == str(QName(ns, "EndDevice")):
-                                mgmt_dev = node.text
-
-
-        if child.tag == str(QName(ns, "DeviceInterfaceLinks")):
-            for link in child.findall(str(QName(ns, 'DeviceLinkBase'))):
-                if link.find(str(QName(ns, "ElementType"))).text == "LogicalLink":
-                    intf_name = link.find(str(QName(ns, "EndPort"))).text
-                    start_device = link.find(str(QName(ns, "StartDevice"))).text
-                    if intf_name in port_alias_map:
-                        intf_name = port_alias_map[intf_name]
-
-                    mux_cable_ports[intf_name] = start_device
-
         if dpg_ecmp_content and (len(dpg_ecmp_content)):
             for version, content in dpg_ecmp_content.items():  # version is ipv4 or ipv6
                 fine_grained_content = formulate_fine_grained_ecmp(version, content, port_device_map, port_alias_map)  # port_alias_map
@@ -1959,12 +1961,284 @@ def update_forced_mgmt_route(mgmt_intf, mgmt_routes):
         if len(forced_mgmt_routes) > 0:
             mgmt_intf[mgmt_intf_key]['forced_mgmt_routes'] = forced_mgmt_routes
 
+# Top level sections that are built one at a time by the streaming parser
+streamed_sections = ['CpgDec', 'PngDec', 'UngDec', 'LinkMetadataDeclaration', 'DeviceInfos']
+# Sections whose children are streamed one by one, and those children whose
+# own children (the links) are streamed one by one too
+streamed_children_sections = ['PngDec', 'UngDec']
+streamed_children = ['DeviceInterfaceLinks']
+
+_streamed_section_tags = set(str(QName(ns, name)) for name in streamed_sections)
+_streamed_children_section_tags = set(str(QName(ns, name)) for name in streamed_children_sections)
+_streamed_children_tags = set(str(QName(ns, name)) for name in streamed_children)
+
+# The streaming parser reads the file twice and is slower than ET.parse, it
+# only pays off when peak memory matters more than latency, so it is opt-in
+STREAMING_PARSE = os.environ.get("MINIGRAPH_STREAMING_PARSE", "0") == "1"
+
+def _free_element(elem):
+    """ Free a completely parsed element and its already processed siblings """
+    elem.clear()
+    while elem.getprevious() is not None:
+        del elem.getparent()[0]
+
+def _iterparse_with_depth(filename):
+    """ iterparse events with the depth of the element, 1 being the root """
+    depth = 0
+    for event, elem in ET.iterparse(filename, events=('start', 'end'), huge_tree=True):
+        if event == 'start':
+            depth += 1
+            yield event, elem, depth
+        else:
+            yield event, elem, depth
+            depth -= 1
+
+class StreamedElement(object):
+    """ Element of a minigraph section that is read on demand from iterparse
+    events, to be handed to the section parsers in place of an lxml element.
+
+    Iterating it yields its children one at a time, each one freed once the
+    caller moves on to the next. Children listed in streamed_children are
+    handed out as StreamedElement too, so that findall() on them yields the
+    links one at a time. A StreamedElement can only be iterated once.
+    """
+    def __init__(self, elem, events, depth):
+        self.tag = elem.tag
+        self.sourceline = elem.sourceline
+        self.attrib = elem.attrib
+        self._events = events
+        self._depth = depth
+        self._done = False
+
+    def __iter__(self):
+        if self._done:
+            return
+        child_depth = self._depth + 1
+        for event, elem, depth in self._events:
+            if depth == self._depth:
+                # End of this element
+                break
+            if depth != child_depth:
+                continue
+            if event == 'start':
+                if elem.tag in _streamed_children_tags:
+                    child = StreamedElement(elem, self._events, depth)
+                    yield child
+                    child.drain()
+                    _free_element(elem)
+            elif elem.tag not in _streamed_children_tags:
+                yield elem
+                _free_element(elem)
+        self._done = True
+
+    def findall(self, tag):
+        return (child for child in self if child.tag == tag)
+
+    def drain(self):
+        for _ in self:
+            pass
+
+def load_minigraph_skeleton(filename):
+    """ Load a minigraph with iterparse, leaving the streamed sections empty.
+
+    Only the Devices of PngDec are kept, as the chassis helpers need them.
+    Everything else the helpers working on the root (global info, metadata,
+    DpgDec) look at is kept as is. Streamed sections are dropped element by
+    element while the file is read, so they never sit in memory as a whole.
+    """
+    png_tag = str(QName(ns, "PngDec"))
+    devices_tag = str(QName(ns, "Devices"))
+    root = None
+    section = None
+    kept = None
+    depth = 0
+    for event, elem in ET.iterparse(filename, events=('start', 'end'), huge_tree=True):
+        if event == 'start':
+            depth += 1
+            if depth == 1:
+                root = elem
+            elif depth == 2:
+                section = elem if elem.tag in _streamed_section_tags else None
+            elif depth == 3 and section is not None:
+                kept = elem if section.tag == png_tag and elem.tag == devices_tag else None
+            continue
+
+        depth -= 1
+        if section is None or kept is not None:
+            continue
+        if depth == 2:
+            # A direct child of a streamed section
+            elem.clear()
+            section.remove(elem)
+        elif depth == 3:
+            # Deeper elements are freed along with their parent
+            _free_element(elem)
+    return root
+
+def iter_minigraph_sections(filename, skeleton):
+    """ Iterate the top level elements of a minigraph in document order.
+
+    Streamed sections are built one at a time by iterparse and freed once the
+    caller moves on to the next element; the PNG sections are handed out as
+    StreamedElement so that their links are never all in memory. Other
+    elements come from skeleton.
+    """
+    skeleton_children = [child for child in skeleton if isinstance(child.tag, str)]
+    index = 0
+    events = _iterparse_with_depth(filename)
+    for event, elem, depth in events:
+        if depth != 2:
+            continue
+        if event == 'start':
+            if elem.tag in _streamed_children_section_tags:
+                section = StreamedElement(elem, events, depth)
+                yield section
+                section.drain()
+                _free_element(elem)
+                index += 1
+            continue
+        if elem.tag in _streamed_children_section_tags:
+            continue
+        if elem.tag in _streamed_section_tags:
+            yield elem
+        else:
+            yield skeleton_children[index]
+        index += 1
+        _free_element(elem)
+
+class MinigraphParseCache(object):
+    """ Memoize parsed minigraph trees and the results of the section parsers
+    (PNG, DPG, CPG, meta, linkmeta, ...) within the process and, optionally,
+    on disk.
+
+    A file is identified by its path, size, mtime and sha256 of its content.
+    Section results are keyed by the file content, the section, the arguments
+    of the section parser and the port maps it depends on, so the helpers of
+    a single sonic-cfggen run and the per-namespace parses of a multi-asic
+    minigraph all share one parse of the xml.
+
+    The on-disk cache holds pickles, which run code when loaded. It is only
+    read from and written to a directory owned by the current user and not
+    writable by group or others, and only files with the same ownership and
+    permissions are loaded.
+    """
+    VERSION = 1
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+        self._digests = {}
+        self._path_digests = {}
+        self._trees = {}
+        self._results = {}
+
+    def file_digest(self, filename):
+        st = os.stat(filename)
+        path = os.path.abspath(filename)
+        stamp = (path, st.st_size, st.st_mtime)
+        digest = self._digests.get(stamp)
+        if digest is None:
+            with open(filename, 'rb') as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+            self._digests[stamp] = digest
+
+        old_digest = self._path_digests.get(path)
+        if old_digest is not None and old_digest != digest:
+            self._evict(old_digest)
+        self._path_digests[path] = digest
+        return digest
+
+    def _evict(self, digest):
+        if digest in self._path_digests.values():
+            return
+        self._trees.pop((digest, False), None)
+        self._trees.pop((digest, True), None)
+        for key in [k for k in self._results if k[0] == digest]:
+            del self._results[key]
+
+    def get_root(self, filename, streaming=False):
+        """ Parsed tree of filename, or its skeleton for the streaming parser """
+        key = (self.file_digest(filename), streaming)
+        if key not in self._trees:
+            if streaming:
+                self._trees[key] = load_minigraph_skeleton(filename)
+            else:
+                self._trees[key] = ET.parse(filename).getroot()
+        return self._trees[key]
+
+    def _disk_path(self, key):
+        key_digest = hashlib.sha256(repr((self.VERSION,) + key).encode()).hexdigest()
+        return os.path.join(self.cache_dir, key_digest + '.pickle')
+
+    @staticmethod
+    def _is_trusted(st):
+        return st.st_uid == os.geteuid() and not st.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+    def _load(self, key):
+        try:
+            if not self._is_trusted(os.stat(self.cache_dir)):
+                return False, None
+            fd = os.open(self._disk_path(key), os.O_RDONLY | os.O_NOFOLLOW)
+            with os.fdopen(fd, 'rb') as f:
+                if not self._is_trusted(os.fstat(f.fileno())):
+                    print("Warning: ignoring minigraph parse cache file {} not owned by the current user or writable by others".format(
+                          self._disk_path(key)), file=sys.stderr)
+                    return False, None
+                return True, pickle.load(f)
+        except Exception:
+            return False, None
+
+    def _store(self, key, result):
+        try:
+            if not os.path.isdir(self.cache_dir):
+                os.makedirs(self.cache_dir, 0o700)
+            if not self._is_trusted(os.stat(self.cache_dir)):
+                print("Warning: minigraph parse cache directory {} is not owned by the current user or is writable by others, not caching".format(
+                      self.cache_dir), file=sys.stderr)
+                return
+            fd, tmp_filename = tempfile.mkstemp(dir=self.cache_dir)
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(result, f, pickle.HIGHEST_PROTOCOL)
+            os.rename(tmp_filename, self._disk_path(key))
+        except Exception as e:
+            print("Warning: failed to store minigraph parse cache: {}".format(e), file=sys.stderr)
+
+    def memoize(self, key, parser_func, *args):
+        """ Return a copy of parser_func(*args), computed once per key """
+        if key not in self._results:
+            found = False
+            if self.cache_dir:
+                found, result = self._load(key)
+            if not found:
+                result = parser_func(*args)
+                if self.cache_dir:
+                    self._store(key, result)
+            self._results[key] = result
+        # Callers are free to modify the results they get
+        return copy.deepcopy(self._results[key])
+
+    def clear(self):
+        self._digests.clear()
+        self._path_digests.clear()
+        self._trees.clear()
+        self._results.clear()
+
+_parse_cache = MinigraphParseCache(os.environ.get("MINIGRAPH_PARSE_CACHE_DIR"))
+
+def _port_maps_digest():
+    port_maps = (port_names_map, port_alias_map, port_alias_asic_map)
+    return hashlib.sha256(json.dumps(port_maps, sort_keys=True, default=str).encode()).hexdigest()
+
+def _parse_section(parser_func, filename, section, *args):
+    """ Memoized parser_func(section, *args) for a top level section of filename """
+    key = (_parse_cache.file_digest(filename), parser_func.__name__, section.tag, section.sourceline, repr(args), _port_maps_digest())
+    return _parse_cache.memoize(key, parser_func, section, *args)
+
 ###############################################################################
 #
 # Main functions
 #
 ###############################################################################
-def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hwsku_config_file=None, fabric_port_config_file=None ):
+def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hwsku_config_file=None, fabric_port_config_file=None, streaming=None):
     """ Parse minigraph xml file.
 
     Keyword arguments:
@@ -1974,9 +2248,14 @@ def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hw
     asic_name -- asic name; to parse multi-asic device minigraph to
     generate asic specific configuration.
     fabric_port_config_file -- fabric port config file name
+    streaming -- parse the heavy sections one at a time with iterparse instead
+    of loading the whole document, to lower peak memory at the cost of
+    latency; by default only if MINIGRAPH_STREAMING_PARSE=1 is set
      """
 
-    root = ET.parse(filename).getroot()
+    if streaming is None:
+        streaming = STREAMING_PARSE
+    root = _parse_cache.get_root(filename, streaming)
 
     u_neighbors = None
     u_devices = None
@@ -2080,45 +2359,46 @@ def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hw
     # Get the local device node from DeviceMetadata
     local_devices = parse_asic_meta_get_devices(root)
 
-    for child in root:
+    sections = iter_minigraph_sections(filename, root) if streaming else root
+    for child in sections:
         if asic_hostname is None:
             if child.tag == str(QName(ns, "DpgDec")):
-                (intfs, lo_intfs, mvrf, mgmt_intf, voq_inband_intfs, vlans, vlan_members, dhcp_relay_table, pcs, pc_members, acls, acl_table_types, vni, tunnel_intfs, dpg_ecmp_content, static_routes, tunnel_intfs_qos_remap_config) = parse_dpg(child, hostname)
+                (intfs, lo_intfs, mvrf, mgmt_intf, voq_inband_intfs, vlans, vlan_members, dhcp_relay_table, pcs, pc_members, acls, acl_table_types, vni, tunnel_intfs, dpg_ecmp_content, static_routes, tunnel_intfs_qos_remap_config) = _parse_section(parse_dpg, filename, child, hostname)
             elif child.tag == str(QName(ns, "CpgDec")):
-                (bgp_sessions, bgp_internal_sessions, bgp_voq_chassis_sessions, bgp_asn, bgp_peers_with_range, bgp_monitors, bgp_sentinel_sessions) = parse_cpg(child, hostname)
+                (bgp_sessions, bgp_internal_sessions, bgp_voq_chassis_sessions, bgp_asn, bgp_peers_with_range, bgp_monitors, bgp_sentinel_sessions) = _parse_section(parse_cpg, filename, child, hostname)
             elif child.tag == str(QName(ns, "PngDec")):
-                (neighbors, devices, console_dev, console_port, mgmt_dev, mgmt_port, port_speed_png, console_ports, mux_cable_ports, png_ecmp_content) = parse_png(child, hostname, dpg_ecmp_content)
+                (neighbors, devices, console_dev, console_port, mgmt_dev, mgmt_port, port_speed_png, console_ports, mux_cable_ports, png_ecmp_content) = _parse_section(parse_png, filename, child, hostname, dpg_ecmp_content)
             elif child.tag == str(QName(ns, "UngDec")):
-                (u_neighbors, u_devices, _, _, _, _, _, _) = parse_png(child, hostname, None)
+                (u_neighbors, u_devices, _, _, _, _, _, _) = _parse_section(parse_png, filename, child, hostname, None)
             elif child.tag == str(QName(ns, "MetadataDeclaration")):
-                (syslog_servers, dhcp_servers, dhcpv6_servers, ntp_servers, tacacs_servers, mgmt_routes, erspan_dst, deployment_id, region, cloudtype, resource_type, downstream_subrole, switch_id, switch_type, max_cores, kube_data, macsec_profile, downstream_redundancy_types, redundancy_type, qos_profile, rack_mgmt_map) = parse_meta(child, hostname)
+                (syslog_servers, dhcp_servers, dhcpv6_servers, ntp_servers, tacacs_servers, mgmt_routes, erspan_dst, deployment_id, region, cloudtype, resource_type, downstream_subrole, switch_id, switch_type, max_cores, kube_data, macsec_profile, downstream_redundancy_types, redundancy_type, qos_profile, rack_mgmt_map) = _parse_section(parse_meta, filename, child, hostname)
             elif child.tag == str(QName(ns, "LinkMetadataDeclaration")):
-                linkmetas = parse_linkmeta(child, hostname)
+                linkmetas = _parse_section(parse_linkmeta, filename, child, hostname)
             elif child.tag == str(QName(ns, "DeviceInfos")):
-                (port_speeds_default, port_descriptions, sys_ports) = parse_deviceinfo(child, hwsku)
+                (port_speeds_default, port_descriptions, sys_ports) = _parse_section(parse_deviceinfo, filename, child, hwsku)
         else:
             if child.tag == str(QName(ns, "DpgDec")):
-                (intfs, lo_intfs, mvrf, mgmt_intf, voq_inband_intfs, vlans, vlan_members, dhcp_relay_table, pcs, pc_members, acls, acl_table_types, vni, tunnel_intfs, dpg_ecmp_content, static_routes, tunnel_intfs_qos_remap_config) = parse_dpg(child, asic_hostname)
-                host_lo_intfs = parse_host_loopback(child, hostname)
+                (intfs, lo_intfs, mvrf, mgmt_intf, voq_inband_intfs, vlans, vlan_members, dhcp_relay_table, pcs, pc_members, acls, acl_table_types, vni, tunnel_intfs, dpg_ecmp_content, static_routes, tunnel_intfs_qos_remap_config) = _parse_section(parse_dpg, filename, child, asic_hostname)
+                host_lo_intfs = _parse_section(parse_host_loopback, filename, child, hostname)
             elif child.tag == str(QName(ns, "CpgDec")):
-                (bgp_sessions, bgp_internal_sessions, bgp_voq_chassis_sessions, bgp_asn, bgp_peers_with_range, bgp_monitors, bgp_sentinel_sessions) = parse_cpg(child, asic_hostname, local_devices)
+                (bgp_sessions, bgp_internal_sessions, bgp_voq_chassis_sessions, bgp_asn, bgp_peers_with_range, bgp_monitors, bgp_sentinel_sessions) = _parse_section(parse_cpg, filename, child, asic_hostname, local_devices)
             elif child.tag == str(QName(ns, "PngDec")):
-                (neighbors, devices, port_speed_png) = parse_asic_png(child, asic_hostname, hostname)
+                (neighbors, devices, port_speed_png) = _parse_section(parse_asic_png, filename, child, asic_hostname, hostname)
             elif child.tag == str(QName(ns, "MetadataDeclaration")):
-                (sub_role, switch_id, switch_type, max_cores, deployment_id, macsec_profile) = parse_asic_meta(child, asic_hostname)
+                (sub_role, switch_id, switch_type, max_cores, deployment_id, macsec_profile) = _parse_section(parse_asic_meta, filename, child, asic_hostname)
             elif child.tag == str(QName(ns, "LinkMetadataDeclaration")):
-                linkmetas = parse_linkmeta(child, hostname)
+                linkmetas = _parse_section(parse_linkmeta, filename, child, hostname)
             elif child.tag == str(QName(ns, "DeviceInfos")):
-                (port_speeds_default, port_descriptions, sys_ports) = parse_deviceinfo(child, hwsku)
+                (port_speeds_default, port_descriptions, sys_ports) = _parse_section(parse_deviceinfo, filename, child, hwsku)
 
         if chassis_hostname:
             if child.tag == str(QName(ns, "DeviceInfos")):
                 if asic_hostname is not None:
                     (sys_ports, chassis_port_alias, port_speeds_default) = parse_chassis_deviceinfo(child, chassis_linecards_info, chassis_hwsku, num_voq, chassis_type, voq_intf_attributes)
             elif child.tag == str(QName(ns, "MetadataDeclaration")):
-                (syslog_servers, ntp_servers, tacacs_servers, mgmt_routes, erspan_dst, deployment_id, region, macsec_profile) = parse_chassis_meta(child, chassis_hostname)
+                (syslog_servers, ntp_servers, tacacs_servers, mgmt_routes, erspan_dst, deployment_id, region, macsec_profile) = _parse_section(parse_chassis_meta, filename, child, chassis_hostname)
             elif child.tag == str(QName(ns, "LinkMetadataDeclaration")):
-                linkmetas = parse_linkmeta(child, chassis_hostname)
+                linkmetas = _parse_section(parse_linkmeta, filename, child, chassis_hostname)
 
     select_mmu_profiles(qos_profile, platform, hwsku)
     
@@ -2853,7 +3133,7 @@ def get_mux_cable_entries(ports, mux_cable_ports, active_active_ports, neighbors
 
 
 def parse_device_desc_xml(filename):
-    root = ET.parse(filename).getroot()
+    root = _parse_cache.get_root(filename)
     (lo_prefix, lo_prefix_v6, mgmt_prefix, mgmt_prefix_v6, hostname, hwsku, d_type, _, _, _, _) = parse_device(root)
 
     results = {}
@@ -2885,7 +3165,7 @@ def parse_hostname(filename):
     hostName = None
     if not os.path.isfile(filename):
         return None
-    root = ET.parse(filename).getroot()
+    root = _parse_cache.get_root(filename)
     hostname_qn = QName(ns, "Hostname")
     for child in root:
         if child.tag == str(hostname_qn):
@@ -2897,7 +3177,7 @@ def parse_hostname(filename):
 def parse_asic_sub_role(filename, asic_name):
     if not os.path.isfile(filename):
         return None
-    root = ET.parse(filename).getroot()
+    root = _parse_cache.get_root(filename)
     for child in root:
         if child.tag == str(QName(ns, "MetadataDeclaration")):
             sub_role, _, _, _, _, _= parse_asic_meta(child, asic_name)
@@ -2905,7 +3185,7 @@ def parse_asic_sub_role(filename, asic_name):
 
 def parse_asic_switch_type(filename, asic_name, hostname):
     if os.path.isfile(filename):
-        root = ET.parse(filename).getroot()
+        root = _parse_cache.get_root(filename)
         switch_type, _ = get_chassis_type_and_hostname(root, hostname)
         if switch_type:
             return switch_type
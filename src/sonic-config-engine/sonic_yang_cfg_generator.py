@@ -25,7 +25,8 @@ class SonicYangCfgDbGenerator:
 
     def __init__(self, yang_models_dir=YANG_MODELS_DIR):
         self.yang_models_dir = yang_models_dir
-        self.yang_parser = sonic_yang.SonicYang(self.yang_models_dir)
+        self.yang_parser = sonic_yang.SonicYang(self.yang_models_dir,
+                                                cache_dir=sonic_yang.YANG_CACHE_DIR or sonic_yang.SYSTEM_YANG_CACHE_DIR)
         self.yang_parser.loadYangModel()
 
     def get_config_db_from_yang_data(self,
@@ -1,5 +1,7 @@
 import json
 import filecmp
+import importlib.machinery
+import importlib.util
 import os
 import re
 import sys
@@ -36,6 +38,14 @@ def liststr_to_dict(liststr):
 
     return list_obj
 
+def load_sonic_cfggen():
+    """ Import the sonic-cfggen script as a module, to test its functions in process """
+    loader = importlib.machinery.SourceFileLoader('sonic_cfggen', os.path.join(os.path.dirname(__file__), '..', 'sonic-cfggen'))
+    spec = importlib.util.spec_from_loader(loader.name, loader)
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    return module
+
 class YangWrapper(object):
     def __init__(self, path=YANG_MODELS_DIR):
         """
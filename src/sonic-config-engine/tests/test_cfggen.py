@@ -203,6 +203,38 @@ class TestCfgGen(TestCase):
         with open(self.output2_file) as tf:
             self.assertEqual(tf.read().strip(), 'value')
 
+    def test_template_manifest(self):
+        manifest_file = os.path.join(self.test_dir, 'manifest.yml')
+        manifest = {'templates': [
+            {'template': os.path.join(self.test_dir, 'sample-template-1.json.j2'), 'dest': 'config-db',
+             'vars': {'key1_2': 'manifest_value'}},
+            {'template': os.path.join(self.test_dir, 'test.j2'), 'dest': self.output_file},
+            {'template': os.path.join(self.test_dir, 'test2.j2'), 'dest': self.output2_file,
+             'vars': {'key1': 'per_template_value'}},
+            os.path.join(self.test_dir, 'test2.j2'),
+        ]}
+        with open(manifest_file, 'w') as f:
+            json.dump(manifest, f)
+        try:
+            for jobs in ['1', '4']:
+                argument = ['-y', os.path.join(self.test_dir, 'test.yml')]
+                argument += ['-a', '{"key1":"value", "key1_1":"value1_1"}']
+                argument += ['--manifest', manifest_file, '-J', jobs, '--print-data']
+                output = self.run_script(argument)
+                with open(self.output_file) as tf:
+                    self.assertEqual(tf.read().strip(), 'value1\nvalue2')
+                with open(self.output2_file) as tf:
+                    self.assertEqual(tf.read().strip(), 'per_template_value')
+                stdout_template, print_data = output.split('\n', 1)
+                self.assertEqual(stdout_template, 'value')
+                output_data = json.loads(print_data)
+                self.assertEqual(output_data['jk1_1'], 'value1_1')
+                self.assertEqual(output_data['jk1_2'], 'manifest_value')
+                os.remove(self.output_file)
+                os.remove(self.output2_file)
+        finally:
+            os.remove(manifest_file)
+
     def test_template_json_batch_mode(self):
         data = {"key1_1":"value1_1", "key1_2":"value1_2", "key2_1":"value2_1", "key2_2":"value2_2"}
         argument = ["-a", '{0}'.format(repr(data).replace('\'', '"'))]
@@ -0,0 +1,169 @@
+import copy
+
+import tests.common_utils as utils
+
+from unittest import TestCase
+
+
+class FakeConfigDB(object):
+    """ Config DB holding typed entries, with the key and field conversions of ConfigDBConnector """
+    TABLE_NAME_SEPARATOR = '|'
+    KEY_SEPARATOR = '|'
+
+    def __init__(self, config):
+        self.config = copy.deepcopy(config)
+        self.mod_config_calls = []
+
+    def serialize_key(self, key):
+        if isinstance(key, tuple):
+            return self.KEY_SEPARATOR.join(key)
+        return str(key)
+
+    def typed_to_raw(self, typed_data):
+        raw = {}
+        for field, value in typed_data.items():
+            if isinstance(value, list):
+                raw[field + '@'] = ','.join(value)
+            else:
+                raw[field] = str(value)
+        return raw
+
+    def raw_to_typed(self, raw_data):
+        typed = {}
+        for field, value in raw_data.items():
+            if field.endswith('@'):
+                typed[field[:-1]] = value.split(',')
+            else:
+                typed[field] = value
+        return typed
+
+    def get_config(self):
+        return copy.deepcopy(self.config)
+
+    def mod_config(self, data):
+        self.mod_config_calls.append(copy.deepcopy(data))
+        for table, table_data in data.items():
+            if table_data is None:
+                self.config.pop(table, None)
+                continue
+            for key, entry in table_data.items():
+                if entry is None:
+                    self.config.get(table, {}).pop(key, None)
+                else:
+                    self.config.setdefault(table, {}).setdefault(key, {}).update(entry)
+
+
+CURRENT = {
+    'DEVICE_METADATA': {'localhost': {'hostname': 'switch-t0', 'hwsku': 'Force10-S6000'}},
+    'PORT': {
+        'Ethernet0': {'alias': 'fortyGigE0/0', 'lanes': '29,30,31,32', 'mtu': '9100'},
+        'Ethernet4': {'alias': 'fortyGigE0/4', 'lanes': '25,26,27,28', 'mtu': '9100'},
+    },
+    'VLAN': {'Vlan1000': {'vlanid': '1000', 'dhcp_servers': ['192.0.0.1', '192.0.0.2']}},
+    'VLAN_MEMBER': {('Vlan1000', 'Ethernet4'): {'tagging_mode': 'untagged'}},
+    'SYSLOG_SERVER': {'10.0.0.5': {}},
+}
+
+
+class TestConfigDiff(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cfggen = utils.load_sonic_cfggen()
+
+    def setUp(self):
+        self.configdb = FakeConfigDB(CURRENT)
+
+    def get_delta(self, data):
+        return self.cfggen.get_config_delta(self.configdb, self.configdb.get_config(), data)
+
+    def test_empty_diff(self):
+        delta, summary = self.get_delta(copy.deepcopy(CURRENT))
+        self.assertEqual(delta, {})
+        self.assertEqual(summary, {'added': [], 'modified': [], 'deleted': [], 'unchanged': 6})
+
+        summary = self.cfggen.write_config_diff(self.configdb, copy.deepcopy(CURRENT))
+        self.assertEqual(self.configdb.mod_config_calls, [])
+        self.assertEqual(self.cfggen.format_diff_summary(summary),
+                         '0 keys added, 0 keys modified, 0 keys deleted, 6 keys unchanged')
+
+    def test_added(self):
+        delta, summary = self.get_delta({
+            'PORT': {'Ethernet8': {'alias': 'fortyGigE0/8', 'lanes': '37,38,39,40'}},
+            'VLAN_MEMBER': {('Vlan1000', 'Ethernet0'): {'tagging_mode': 'untagged'}},
+            'LOOPBACK_INTERFACE': {'Loopback0': {}},
+        })
+        self.assertEqual(delta, {
+            'PORT': {'Ethernet8': {'alias': 'fortyGigE0/8', 'lanes': '37,38,39,40'}},
+            'VLAN_MEMBER': {('Vlan1000', 'Ethernet0'): {'tagging_mode': 'untagged'}},
+            'LOOPBACK_INTERFACE': {'Loopback0': {}},
+        })
+        self.assertEqual(summary['added'], ['PORT|Ethernet8', 'VLAN_MEMBER|Vlan1000|Ethernet0', 'LOOPBACK_INTERFACE|Loopback0'])
+        self.assertEqual(summary['modified'], [])
+        self.assertEqual(summary['deleted'], [])
+
+    def test_deleted(self):
+        delta, summary = self.get_delta({
+            'PORT': {'Ethernet4': None, 'Ethernet8': None},
+            'VLAN_MEMBER': None,
+            'ACL_TABLE': None,
+        })
+        # Keys and tables which don't exist are not deleted
+        self.assertEqual(delta, {'PORT': {'Ethernet4': None}, 'VLAN_MEMBER': None})
+        self.assertEqual(summary['deleted'], ['PORT|Ethernet4', 'VLAN_MEMBER|Vlan1000|Ethernet4'])
+        self.assertEqual(summary['added'], [])
+
+    def test_modified_fields(self):
+        delta, summary = self.get_delta({
+            'DEVICE_METADATA': {'localhost': {'hostname': 'switch-t1', 'hwsku': 'Force10-S6000'}},
+            'PORT': {
+                'Ethernet0': {'alias': 'fortyGigE0/0', 'lanes': '29,30,31,32', 'mtu': 9216},
+                'Ethernet4': {'admin_status': 'up'},
+            },
+            'VLAN': {'Vlan1000': {'vlanid': '1000', 'dhcp_servers': ['192.0.0.1', '192.0.0.3']}},
+            'SYSLOG_SERVER': {'10.0.0.5': {}},
+        })
+        # Only the fields whose value changes are kept, list fields are compared as a whole
+        self.assertEqual(delta, {
+            'DEVICE_METADATA': {'localhost': {'hostname': 'switch-t1'}},
+            'PORT': {'Ethernet0': {'mtu': '9216'}, 'Ethernet4': {'admin_status': 'up'}},
+            'VLAN': {'Vlan1000': {'dhcp_servers': ['192.0.0.1', '192.0.0.3']}},
+        })
+        self.assertEqual(summary['modified'], ['DEVICE_METADATA|localhost', 'PORT|Ethernet0', 'PORT|Ethernet4', 'VLAN|Vlan1000'])
+        self.assertEqual(summary['unchanged'], 1)
+
+    def test_write_config_diff(self):
+        data = copy.deepcopy(CURRENT)
+        data['PORT']['Ethernet0']['mtu'] = '9216'
+        data['PORT']['Ethernet8'] = {'alias': 'fortyGigE0/8'}
+        data['SYSLOG_SERVER'] = None
+        summary = self.cfggen.write_config_diff(self.configdb, data)
+        self.assertEqual(self.configdb.mod_config_calls, [{
+            'PORT': {'Ethernet0': {'mtu': '9216'}, 'Ethernet8': {'alias': 'fortyGigE0/8'}},
+            'SYSLOG_SERVER': None,
+        }])
+        self.assertEqual(self.configdb.config['PORT']['Ethernet0']['mtu'], '9216')
+        self.assertNotIn('SYSLOG_SERVER', self.configdb.config)
+
+        # Writing the same data again changes nothing
+        data['SYSLOG_SERVER'] = {}
+        summary = self.cfggen.write_config_diff(self.configdb, data)
+        self.assertEqual(len(self.configdb.mod_config_calls), 1)
+        self.assertEqual(summary['unchanged'], 6)
+
+    def test_format_diff_summary(self):
+        summary = {
+            'added': ['PORT|Ethernet8'],
+            'modified': ['PORT|Ethernet0', 'VLAN|Vlan1000'],
+            'deleted': ['VLAN_MEMBER|Vlan1000|Ethernet4'],
+            'unchanged': 3,
+        }
+        self.assertEqual(self.cfggen.format_diff_summary(summary), '\n'.join([
+            '1 keys added, 2 keys modified, 1 keys deleted, 3 keys unchanged',
+            '+ PORT|Ethernet8',
+            '~ PORT|Ethernet0',
+            '~ VLAN|Vlan1000',
+            '- VLAN_MEMBER|Vlan1000|Ethernet4',
+        ]))
+        self.assertEqual(self.cfggen.format_diff_summary(summary, 'asic0').splitlines()[0],
+                         'asic0: 1 keys added, 2 keys modified, 1 keys deleted, 3 keys unchanged')
@@ -0,0 +1,172 @@
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+import time
+
+import tests.common_utils as utils
+
+from unittest import TestCase, mock
+
+
+class TestCfgGenServer(TestCase):
+
+    def setUp(self):
+        self.test_dir = os.path.dirname(os.path.realpath(__file__))
+        self.script_file = [utils.PYTHON_INTERPRETTER, os.path.join(self.test_dir, '..', 'sonic-cfggen')]
+        self.client_file = [utils.PYTHON_INTERPRETTER, os.path.join(self.test_dir, '..', 'sonic-cfggen-client')]
+        self.sample_graph = os.path.join(self.test_dir, 'simple-sample-graph.xml')
+        self.port_config = os.path.join(self.test_dir, 't0-sample-port-config.ini')
+        self.tmp_dir = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.tmp_dir, 'sonic-cfggen.sock')
+        self.path = os.environ["PATH"]
+        os.environ["CFGGEN_UNIT_TESTING"] = "2"
+        os.environ["SONIC_CFGGEN_SOCKET"] = self.socket_path
+        self.server = subprocess.Popen(self.script_file + ['--serve', self.socket_path])
+        for _ in range(100):
+            if os.path.exists(self.socket_path):
+                break
+            time.sleep(0.1)
+
+    def tearDown(self):
+        self.server.terminate()
+        self.server.wait()
+        os.environ["CFGGEN_UNIT_TESTING"] = ""
+        os.environ.pop("SONIC_CFGGEN_SOCKET", None)
+        os.environ["PATH"] = self.path
+        shutil.rmtree(self.tmp_dir)
+
+    def run_client(self, argument):
+        return subprocess.check_output(self.client_file + argument, universal_newlines=True)
+
+    def run_script(self, argument):
+        return subprocess.check_output(self.script_file + argument, universal_newlines=True)
+
+    def test_server_matches_direct_run(self):
+        argument = ['-m', self.sample_graph, '-p', self.port_config, '-v', "DEVICE_METADATA['localhost']['hostname']"]
+        expected = self.run_script(argument)
+        # The second request is served from the warm cache
+        self.assertEqual(self.run_client(argument), expected)
+        self.assertEqual(self.run_client(argument), expected)
+
+    def test_server_invalidates_modified_template(self):
+        template = os.path.join(self.tmp_dir, 'test.j2')
+        with open(template, 'w') as f:
+            f.write("{{ DEVICE_METADATA['localhost']['hostname'] }}")
+        argument = ['-m', self.sample_graph, '-p', self.port_config, '-t', template]
+        self.assertEqual(self.run_client(argument).strip(), 'switch-t0')
+
+        # Make sure that the mtime changes even on coarse grained filesystems
+        time.sleep(1.1)
+        with open(template, 'w') as f:
+            f.write("{{ DEVICE_METADATA['localhost']['hwsku'] }}")
+        self.assertEqual(self.run_client(argument).strip(), 'Force10-S6000')
+
+    def test_server_invalidates_modified_minigraph(self):
+        graph = os.path.join(self.tmp_dir, 'minigraph.xml')
+        shutil.copy(self.sample_graph, graph)
+        argument = ['-m', graph, '-p', self.port_config, '-v', "DEVICE_METADATA['localhost']['hostname']"]
+        self.assertEqual(self.run_client(argument).strip(), 'switch-t0')
+
+        time.sleep(1.1)
+        with open(self.sample_graph) as f:
+            content = f.read()
+        with open(graph, 'w') as f:
+            f.write(content.replace('switch-t0', 'switch-t9'))
+        self.assertEqual(self.run_client(argument).strip(), 'switch-t9')
+
+    def test_server_error_exit_code(self):
+        proc = subprocess.Popen(self.client_file + ['--no-such-option'],
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+        _, err = proc.communicate()
+        self.assertEqual(proc.returncode, 2)
+        self.assertIn('unrecognized arguments', err)
+
+    def test_server_drops_stuck_client(self):
+        stuck = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stuck.connect(self.socket_path)
+        try:
+            # The request never completes, the server serves the next client
+            # once CFGGEN_CLIENT_TIMEOUT expires
+            self.assertEqual(self.run_client(['-a', '{"key": "value"}', '-v', 'key']).strip(), 'value')
+        finally:
+            stuck.close()
+
+    def test_client_fallback_without_server(self):
+        self.server.terminate()
+        self.server.wait()
+        os.environ["SONIC_CFGGEN_SOCKET"] = os.path.join(self.tmp_dir, 'no-such.sock')
+        os.environ["PATH"] = os.path.join(self.test_dir, '..') + os.pathsep + os.environ["PATH"]
+        argument = ['-m', self.sample_graph, '-p', self.port_config, '-v', "DEVICE_METADATA['localhost']['hostname']"]
+        self.assertEqual(self.run_client(argument).strip(), 'switch-t0')
+
+
+class TestRenderCache(TestCase):
+
+    def setUp(self):
+        self.cfggen = utils.load_sonic_cfggen()
+        self.platform_dir = tempfile.mkdtemp()
+        self.graph = os.path.join(self.platform_dir, 'minigraph.xml')
+        self.port_config = os.path.join(self.platform_dir, 'Force10-S6000', 'port_config.ini')
+        os.makedirs(os.path.dirname(self.port_config))
+        for filename in (self.graph, self.port_config):
+            with open(filename, 'w') as f:
+                f.write('# v1\n')
+        device_info = self.cfggen.device_info
+        self.patches = [
+            mock.patch.object(device_info, 'get_path_to_platform_dir', return_value=self.platform_dir),
+            mock.patch.object(device_info, 'get_asic_conf_file_path', return_value=None),
+        ]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        shutil.rmtree(self.platform_dir)
+
+    def test_implicit_input_files(self):
+        cache = self.cfggen.RenderCache()
+        parser = mock.MagicMock(__name__='parse_xml', side_effect=lambda filename, **kwargs: {'calls': parser.call_count})
+        self.assertEqual(cache.parse_file(parser, self.graph, platform='x86_64-dell_s6000_s1220-r0'), {'calls': 1})
+        self.assertEqual(cache.parse_file(parser, self.graph, platform='x86_64-dell_s6000_s1220-r0'), {'calls': 1})
+
+        # The port config of the hwsku is read by the parser without being passed to it
+        with open(self.port_config, 'w') as f:
+            f.write('# v2, a longer file\n')
+        self.assertEqual(cache.parse_file(parser, self.graph, platform='x86_64-dell_s6000_s1220-r0'), {'calls': 2})
+
+        with open(os.path.join(self.platform_dir, 'platform.json'), 'w') as f:
+            f.write('{}')
+        self.assertEqual(cache.parse_file(parser, self.graph, platform='x86_64-dell_s6000_s1220-r0'), {'calls': 3})
+        self.assertEqual(len(cache.parsed_files), 1)
+
+    def test_unknown_platform(self):
+        cache = self.cfggen.RenderCache()
+        with mock.patch.object(self.cfggen.device_info, 'get_path_to_platform_dir', side_effect=OSError):
+            self.assertEqual(cache.implicit_input_files(), [None])
+
+    def test_request_refreshes_device_info(self):
+        with mock.patch.object(self.cfggen.device_info, 'refresh_device_info') as refresh_mocked:
+            for _ in range(2):
+                response = self.cfggen._serve_request({'argv': ['-a', '{"key": "value"}', '-v', 'key']})
+                self.assertEqual(response, {'rc': 0, 'stdout': 'value\n', 'stderr': ''})
+        self.assertEqual(refresh_mocked.call_count, 2)
+
+    def test_db_config_reconnect(self):
+        cache = self.cfggen.RenderCache()
+        configdbs = [mock.MagicMock(), mock.MagicMock()]
+        configdbs[0].get_config.return_value = {'PORT': {'Ethernet0': {}}}
+        configdbs[1].get_config.return_value = {'PORT': {'Ethernet4': {}}}
+        with mock.patch.object(self.cfggen, '_connect_config_db', side_effect=configdbs) as connect_mocked:
+            self.assertEqual(cache.get_db_config(None, True, {}), {'PORT': {'Ethernet0': {}}})
+            self.assertEqual(cache.get_db_config(None, True, {}), {'PORT': {'Ethernet0': {}}})
+            # The connection is kept, the content is read by every request
+            self.assertEqual(connect_mocked.call_count, 1)
+            self.assertEqual(configdbs[0].get_config.call_count, 2)
+
+            # A broken connection is replaced within the same request
+            configdbs[0].get_config.side_effect = ConnectionError
+            self.assertEqual(cache.get_db_config(None, True, {}), {'PORT': {'Ethernet4': {}}})
+            self.assertEqual(connect_mocked.call_count, 2)
@@ -575,3 +575,100 @@ class TestCfgGenCaseInsensitive(TestCase):
         # TC2: For other minigraph, result should not contain FLEX_COUNTER_TABLE
         result = minigraph.parse_xml(self.sample_graph, port_config_file=self.port_config)
         self.assertNotIn('FLEX_COUNTER_TABLE', result)
+
+    def test_parse_cache_reuses_tree_and_sections(self):
+        minigraph._parse_cache.clear()
+        expected = minigraph.parse_xml(self.sample_graph, port_config_file=self.port_config)
+        root = minigraph._parse_cache.get_root(self.sample_graph)
+        self.assertIs(root, minigraph._parse_cache.get_root(self.sample_graph))
+        self.assertEqual(minigraph.parse_hostname(self.sample_graph), 'switch-t0')
+
+        # Results handed out by the cache must not alias each other
+        result = minigraph.parse_xml(self.sample_graph, port_config_file=self.port_config)
+        self.assertEqual(result, expected)
+        result['PORT'].clear()
+        self.assertEqual(minigraph.parse_xml(self.sample_graph, port_config_file=self.port_config), expected)
+
+    def test_parse_cache_invalidated_on_file_change(self):
+        graph = os.path.join(self.test_dir, 'parse-cache-graph.xml')
+        with open(self.sample_graph) as f:
+            content = f.read()
+        try:
+            with open(graph, 'w') as f:
+                f.write(content)
+            self.assertEqual(minigraph.parse_hostname(graph), 'switch-t0')
+            with open(graph, 'w') as f:
+                f.write(content.replace('switch-t0', 'switch-t9') + ' ')
+            self.assertEqual(minigraph.parse_hostname(graph), 'switch-t9')
+            result = minigraph.parse_xml(graph, port_config_file=self.port_config)
+            self.assertEqual(result['DEVICE_METADATA']['localhost']['hostname'], 'switch-t9')
+        finally:
+            os.remove(graph)
+
+    def test_parse_cache_same_tag_sections(self):
+        graph = os.path.join(self.test_dir, 'parse-cache-sections.xml')
+        def section_name(section):
+            return section.findtext('Name')
+        try:
+            with open(graph, 'w') as f:
+                f.write('<Root>\n<Section><Name>first</Name></Section>\n<Section><Name>second</Name></Section>\n</Root>\n')
+            root = minigraph._parse_cache.get_root(graph)
+            # Sections with the same tag must not share a cached result
+            names = [minigraph._parse_section(section_name, graph, child) for child in root]
+            self.assertEqual(names, ['first', 'second'])
+        finally:
+            os.remove(graph)
+
+    def test_parse_cache_on_disk(self):
+        cache_dir = os.path.join(self.test_dir, 'parse-cache')
+        saved_cache = minigraph._parse_cache
+        try:
+            minigraph._parse_cache = minigraph.MinigraphParseCache(cache_dir)
+            expected = minigraph.parse_xml(self.sample_graph, port_config_file=self.port_config)
+            self.assertTrue(len(os.listdir(cache_dir)) > 0)
+            # A new process only has the on-disk cache
+            minigraph._parse_cache = minigraph.MinigraphParseCache(cache_dir)
+            self.assertEqual(minigraph.parse_xml(self.sample_graph, port_config_file=self.port_config), expected)
+            key = next(iter(minigraph._parse_cache._results))
+            self.assertEqual(minigraph._parse_cache._load(key)[0], True)
+            # Pickles anybody else could have written are never loaded
+            os.chmod(minigraph._parse_cache._disk_path(key), 0o666)
+            self.assertEqual(minigraph._parse_cache._load(key), (False, None))
+            os.chmod(minigraph._parse_cache._disk_path(key), 0o600)
+            os.chmod(cache_dir, 0o777)
+            self.assertEqual(minigraph._parse_cache._load(key), (False, None))
+            os.chmod(cache_dir, 0o700)
+        finally:
+            minigraph._parse_cache = saved_cache
+            for f in os.listdir(cache_dir):
+                os.remove(os.path.join(cache_dir, f))
+            os.rmdir(cache_dir)
+
+    def test_streaming_parse_matches_tree_parse(self):
+        minigraph._parse_cache.clear()
+        expected = minigraph.parse_xml(self.sample_graph, port_config_file=self.port_config, streaming=False)
+        minigraph._parse_cache.clear()
+        result = minigraph.parse_xml(self.sample_graph, port_config_file=self.port_config, streaming=True)
+        self.assertEqual(result, expected)
+
+    def test_streaming_parse_matches_tree_parse_multi_section(self):
+        device_dir = os.path.join(self.test_dir, '..', '..', '..', 'device')
+        multi_npu_dir = os.path.join(self.test_dir, 'multi_npu_data')
+        cases = [
+            # SmartSwitch, the switch hosting DPUs
+            ('sample-mellanox-4700-t1-minigraph-smartswitch.xml',
+             os.path.join(device_dir, 'mellanox', 'x86_64-mlnx_msn4700-r0', 'Mellanox-SN4700-O28', 'port_config.ini'), None),
+            ('sample-voq-graph.xml', os.path.join(self.test_dir, 'voq-sample-port-config.ini'), None),
+            ('sample-chassis-packet-lc-graph.xml', os.path.join(self.test_dir, 'sample-chassis-packet-lc-port-config.ini'), None),
+            (os.path.join(multi_npu_dir, 'sample-minigraph.xml'), os.path.join(multi_npu_dir, 'sample_port_config.ini'), None),
+            (os.path.join(multi_npu_dir, 'sample-minigraph.xml'), os.path.join(multi_npu_dir, 'sample_port_config-0.ini'), 'asic0'),
+            (os.path.join(multi_npu_dir, 'sample-minigraph.xml'), os.path.join(multi_npu_dir, 'sample_port_config-3.ini'), 'asic3'),
+        ]
+        for graph, port_config, asic_name in cases:
+            with self.subTest(graph=graph, asic_name=asic_name):
+                graph = os.path.join(self.test_dir, graph)
+                minigraph._parse_cache.clear()
+                expected = minigraph.parse_xml(graph, port_config_file=port_config, asic_name=asic_name, streaming=False)
+                minigraph._parse_cache.clear()
+                result = minigraph.parse_xml(graph, port_config_file=port_config, asic_name=asic_name, streaming=True)
+                self.assertEqual(result, expected)
@@ -580,6 +580,17 @@ class TestMultiNpuCfgGen(TestCase):
         output = json.loads(self.run_script(argument, check_stderr=False, validateYang=False))
         self.assertDictEqual(output, {})
 
+    def test_all_namespaces(self):
+        argument = ["-m", self.sample_graph, "-p", self.sample_port_config, "--print-data"]
+        namespaces = ["asic{}".format(asic) for asic in range(NUM_ASIC)]
+        for jobs in ["1", "4"]:
+            output = json.loads(self.run_script(argument + ["--all-namespaces", ",".join(namespaces), "-J", jobs], validateYang=False))
+            self.assertEqual(list(output.keys()), ["localhost"] + namespaces)
+            self.assertDictEqual(output["localhost"], json.loads(self.run_script(argument, validateYang=False)))
+            for asic in range(NUM_ASIC):
+                expected = json.loads(self.run_script(argument + ["-n", namespaces[asic]], validateYang=False))
+                self.assertDictEqual(output[namespaces[asic]], expected)
+
     def tearDown(self):
         os.environ["CFGGEN_UNIT_TESTING"] = ""
         os.environ["CFGGEN_UNIT_TESTING_TOPOLOGY"] = ""
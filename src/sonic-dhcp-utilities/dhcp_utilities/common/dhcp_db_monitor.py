@@ -21,6 +21,7 @@ class ConfigDbEventChecker(object):
     table_name = ""
     subscriber_state_table = None
     enabled = False
+    updated = False
 
     def __init__(self, sel, db):
         """
@@ -33,6 +34,8 @@ class ConfigDbEventChecker(object):
         self.db = db
         self.subscriber_state_table = None
         self.enabled = False
+        # Whether table may have changed since the flag was cleared, changes before subscribing are unknown
+        self.updated = False
 
     @classmethod
     def get_parameter_by_name(cls, db_snapshot, param_name):
@@ -69,6 +72,7 @@ class ConfigDbEventChecker(object):
         self.subscriber_state_table = swsscommon.SubscriberStateTable(self.db, self.table_name)
         self.sel.addSelectable(self.subscriber_state_table)
         self.enabled = True
+        self.updated = True
 
     def disable(self):
         """
@@ -91,6 +95,7 @@ class ConfigDbEventChecker(object):
             sys.exit(1)
         while self.subscriber_state_table.hasData():
             _, _, _ = self.subscriber_state_table.pop()
+            self.updated = True
 
     @abstractmethod
     def _get_parameter(self, db_snapshot):
@@ -125,10 +130,12 @@ class ConfigDbEventChecker(object):
         """
         res, parameter = self._get_parameter(db_snapshot)
         if not res:
+            self.updated = True
             return True
         need_refresh = False
         while self.subscriber_state_table.hasData():
             key, op, entry = self.subscriber_state_table.pop()
+            self.updated = True
             need_refresh |= self._process_check(key, op, entry, parameter)
             if need_refresh:
                 self.clear_event()
@@ -532,3 +539,22 @@ class DhcpServdDbMonitor(object):
             else:
                 need_refresh |= checker.check_update_event(db_snapshot)
         return need_refresh
+
+    def get_unchanged_tables(self):
+        """
+        Get tables which haven't changed since the last call, they are monitored by enabled checkers which have
+        received no event. Tables which aren't monitored are never reported as unchanged
+        Returns:
+            Set of table names
+        """
+        unchanged_tables = set()
+        changed_tables = set()
+        for checker in self.checker_dict.values():
+            if not checker.is_enabled():
+                continue
+            if checker.updated:
+                changed_tables.add(checker.table_name)
+            else:
+                unchanged_tables.add(checker.table_name)
+            checker.updated = False
+        return unchanged_tables - changed_tables
@@ -17,6 +17,10 @@ VLAN_MEMBER = "VLAN_MEMBER"
 DPUS = "DPUS"
 MID_PLANE_BRIDGE = "MID_PLANE_BRIDGE"
 MID_PLANE_BRIDGE_SUBNET_ID = 10000
+DEVICE_METADATA = "DEVICE_METADATA"
+# Tables which result of parsing DHCP_SERVER_IPV4_PORT depends on
+PORT_SOURCE_TABLES = [DHCP_SERVER_IPV4_PORT, VLAN_INTERFACE, VLAN_MEMBER, DHCP_SERVER_IPV4_RANGE, DPUS,
+                      MID_PLANE_BRIDGE, DEVICE_METADATA]
 PORT_MODE_CHECKER = ["DhcpServerTableCfgChangeEventChecker", "DhcpPortTableEventChecker", "DhcpRangeTableEventChecker",
                      "DhcpOptionTableEventChecker", "VlanTableEventChecker", "VlanIntfTableEventChecker",
                      "VlanMemberTableEventChecker"]
@@ -44,15 +48,26 @@ class DhcpServCfgGenerator(object):
         self.lease_path = lease_path
         self.lease_update_script_path = lease_update_script_path
         self.hook_lib_path = hook_lib_path
+        # Tables read in last generation, reused for tables which are known to be unchanged
+        self.table_cache = {}
+        # Tables whose content differ from last generation
+        self.changed_tables = set()
+        # Parsed results of last generation, key is stage name, value is (result, source tables)
+        self.parse_cache = {}
+        self.last_render_obj = None
+        self.last_config = None
         # Read port alias map file, this file is render after container start, so it would not change any more
         self._parse_port_map_alias()
         # Get kea config template
         self._get_render_template(kea_conf_template_path)
         self._read_dhcp_option(dhcp_option_path)
 
-    def generate(self):
+    def generate(self, unchanged_tables=None):
         """
         Generate dhcp server config
+        Args:
+            unchanged_tables: Set of tables which haven't changed since last generation, they would be taken from
+                              cache instead of config_db. None means all tables need to be read
         Returns:
             config string
             set of ranges used
@@ -61,26 +76,29 @@ class DhcpServCfgGenerator(object):
             set of db table need to be monitored
         """
         # Generate from running config_db
+        self.changed_tables = set()
         # Get host name
-        device_metadata = self.db_connector.get_config_db_table("DEVICE_METADATA")
+        device_metadata = self._get_config_db_table(DEVICE_METADATA, unchanged_tables)
         hostname = self._parse_hostname(device_metadata)
         smart_switch = is_smart_switch(device_metadata)
         # Get ip information of vlan
-        vlan_interface = self.db_connector.get_config_db_table(VLAN_INTERFACE)
-        vlan_member_table = self.db_connector.get_config_db_table(VLAN_MEMBER)
-        vlan_interfaces, vlan_members = self._parse_vlan(vlan_interface, vlan_member_table)
+        vlan_interface = self._get_config_db_table(VLAN_INTERFACE, unchanged_tables)
+        vlan_member_table = self._get_config_db_table(VLAN_MEMBER, unchanged_tables)
+        vlan_interfaces, vlan_members = self._get_parsed("vlan", [VLAN_INTERFACE, VLAN_MEMBER], self._parse_vlan,
+                                                         vlan_interface, vlan_member_table)
 
         # Parse dpu
-        dpus_table = self.db_connector.get_config_db_table(DPUS)
-        mid_plane_table = self.db_connector.get_config_db_table(MID_PLANE_BRIDGE)
+        dpus_table = self._get_config_db_table(DPUS, unchanged_tables)
+        mid_plane_table = self._get_config_db_table(MID_PLANE_BRIDGE, unchanged_tables)
         mid_plane, dpus = self._parse_dpu(dpus_table, mid_plane_table) if smart_switch else ({}, {})
 
-        dhcp_server_ipv4, customized_options_ipv4, range_ipv4, port_ipv4 = self._get_dhcp_ipv4_tables_from_db()
+        dhcp_server_ipv4, customized_options_ipv4, range_ipv4, port_ipv4 = \
+            self._get_dhcp_ipv4_tables_from_db(unchanged_tables)
         # Parse range table
-        ranges = self._parse_range(range_ipv4)
+        ranges = self._get_parsed("range", [DHCP_SERVER_IPV4_RANGE], self._parse_range, range_ipv4)
 
-        # Parse port table
-        dhcp_interfaces = vlan_interfaces
+        # Parse port table, vlan_interfaces is cached, copy it before adding mid plane
+        dhcp_interfaces = dict(vlan_interfaces)
         if smart_switch and "bridge" in mid_plane and "ip_prefix" in mid_plane:
             mid_plane_name = mid_plane["bridge"]
             dhcp_interfaces[mid_plane_name] = [{
@@ -89,15 +107,55 @@ class DhcpServCfgGenerator(object):
             }]
             dpus = ["{}|{}".format(mid_plane_name, dpu) for dpu in dpus]
         dhcp_members = vlan_members | set(dpus)
-        port_ips, used_ranges = self._parse_port(port_ipv4, dhcp_interfaces, dhcp_members, ranges)
-        customized_options = self._parse_customized_options(customized_options_ipv4)
+        port_ips, used_ranges = self._get_parsed("port", PORT_SOURCE_TABLES, self._parse_port, port_ipv4,
+                                                 dhcp_interfaces, dhcp_members, ranges)
+        customized_options = self._get_parsed("customized_options", [DHCP_SERVER_IPV4_CUSTOMIZED_OPTIONS],
+                                              self._parse_customized_options, customized_options_ipv4)
         render_obj, enabled_dhcp_interfaces, used_options, subscribe_table = \
             self._construct_obj_for_template(dhcp_server_ipv4, port_ips, hostname, customized_options, smart_switch)
 
         if smart_switch:
             subscribe_table |= set(SMART_SWITCH_CHECKER)
 
-        return self._render_config(render_obj), used_ranges, enabled_dhcp_interfaces, used_options, subscribe_table
+        # Rendering template is the most expensive part, skip it if nothing changes
+        if self.last_config is None or render_obj != self.last_render_obj:
+            self.last_config = self._render_config(render_obj)
+            self.last_render_obj = render_obj
+        return self.last_config, used_ranges, enabled_dhcp_interfaces, used_options, subscribe_table
+
+    def _get_config_db_table(self, table_name, unchanged_tables=None):
+        """
+        Get table from cache if it is known to be unchanged, else read it from config_db and record whether it changed
+        Args:
+            table_name: Name of table
+            unchanged_tables: Set of tables which haven't changed since last generation
+        Returns:
+            Table object
+        """
+        if unchanged_tables and table_name in unchanged_tables and table_name in self.table_cache:
+            return self.table_cache[table_name]
+        table = self.db_connector.get_config_db_table(table_name)
+        if table_name not in self.table_cache or self.table_cache[table_name] != table:
+            self.changed_tables.add(table_name)
+        self.table_cache[table_name] = table
+        return table
+
+    def _get_parsed(self, stage, source_tables, parse_func, *args):
+        """
+        Get parsed result of stage, only parse again when any of source tables changed
+        Args:
+            stage: Name of parse stage
+            source_tables: Tables which parse result depends on
+            parse_func: Function to parse
+            args: Args to pass to parse_func
+        Returns:
+            Parsed result
+        """
+        if stage in self.parse_cache and not self.changed_tables.intersection(source_tables):
+            return self.parse_cache[stage]
+        result = parse_func(*args)
+        self.parse_cache[stage] = result
+        return result
 
     def _parse_dpu(self, dpus_table, mid_plane_table):
         """
@@ -269,16 +327,18 @@ class DhcpServCfgGenerator(object):
         }
         return render_obj, enabled_dhcp_interfaces, used_options, subscribe_table
 
-    def _get_dhcp_ipv4_tables_from_db(self):
+    def _get_dhcp_ipv4_tables_from_db(self, unchanged_tables=None):
         """
         Get DHCP Server IPv4 related table from config_db.
+        Args:
+            unchanged_tables: Set of tables which could be taken from cache
         Returns:
             Four table objects.
         """
-        dhcp_server_ipv4 = self.db_connector.get_config_db_table(DHCP_SERVER_IPV4)
-        customized_options_ipv4 = self.db_connector.get_config_db_table(DHCP_SERVER_IPV4_CUSTOMIZED_OPTIONS)
-        range_ipv4 = self.db_connector.get_config_db_table(DHCP_SERVER_IPV4_RANGE)
-        port_ipv4 = self.db_connector.get_config_db_table(DHCP_SERVER_IPV4_PORT)
+        dhcp_server_ipv4 = self._get_config_db_table(DHCP_SERVER_IPV4, unchanged_tables)
+        customized_options_ipv4 = self._get_config_db_table(DHCP_SERVER_IPV4_CUSTOMIZED_OPTIONS, unchanged_tables)
+        range_ipv4 = self._get_config_db_table(DHCP_SERVER_IPV4_RANGE, unchanged_tables)
+        port_ipv4 = self._get_config_db_table(DHCP_SERVER_IPV4_PORT, unchanged_tables)
         return dhcp_server_ipv4, customized_options_ipv4, range_ipv4, port_ipv4
 
     def _get_vlan_ipv4_interface(self, vlan_interface_keys):
@@ -1,15 +1,19 @@
+import heapq
+import os
 import signal
 import syslog
 import threading
 import time
 from abc import abstractmethod
-from collections import deque
 from datetime import datetime
 from dhcp_utilities.common.utils import is_smart_switch
+from swsscommon import swsscommon
 
 DHCP_SERVER_IPV4_LEASE = "DHCP_SERVER_IPV4_LEASE"
 KEA_LEASE_FILE_PATH = "/tmp/kea-lease.csv"
 DEFAULE_LEASE_UPDATE_INTERVAL = 2  # unit: sec
+# Columns up to subnet_id are used, a row which is being written is parsed once it has all of them
+KEA_LEASE_MIN_COLUMNS = 7
 
 
 class LeaseManager(object):
@@ -30,6 +34,12 @@ class LeaseHanlder(object):
         self.lease_update_interval = lease_update_interval
         self.last_update_time = None
         self.lock = threading.Lock()
+        self.update_event = threading.Event()
+        # Leases stored in STATE_DB, None until STATE_DB is synced with the lease file
+        self.synced_lease = None
+        # Heap of (lease_end, key) of the stored leases, to delete them when they expire
+        self.expire_heap = []
+        self.pipe = None
         device_metadata = self.db_connector.get_config_db_table("DEVICE_METADATA")
         self.is_smart_switch = is_smart_switch(device_metadata)
 
@@ -41,7 +51,7 @@ class LeaseHanlder(object):
     @abstractmethod
     def _read(self):
         """
-        Read lease file to get newest lease information
+        Read lease file to get lease information which changed since the last read
         """
         raise NotImplementedError
 
@@ -52,9 +62,38 @@ class LeaseHanlder(object):
         """
         raise NotImplementedError
 
+    def _reset(self):
+        """
+        Forget the read position and the leases stored in STATE_DB, the next update reads the whole lease file
+        """
+        self.synced_lease = None
+        self.expire_heap = []
+
+    def start_worker(self):
+        """
+        Start the thread which updates the lease table when it is notified
+        """
+        thread = threading.Thread(target=self._worker, name="lease_update", daemon=True)
+        thread.start()
+
+    def notify(self):
+        """
+        Notify the worker that the lease file has changed. It's safe to be called in a signal handler
+        """
+        self.update_event.set()
+
+    def _worker(self):
+        while True:
+            self.update_event.wait()
+            try:
+                self.update_lease()
+            except Exception as err:
+                syslog.syslog(syslog.LOG_ERR, "Failed to update lease table: {}".format(err))
+                self._reset()
+
     def update_lease(self):
         """
-        Update lease table in STATE_DB
+        Update lease table in STATE_DB with the leases changed since the last update
         """
         last_update_time = self.last_update_time
         curr_time = datetime.now()
@@ -67,42 +106,83 @@ class LeaseHanlder(object):
                 return
         if not self.lock.acquire(False):
             return
-        new_lease = self._read()
-        # Store old lease key
-        old_lease_table = self.db_connector.get_state_db_table(DHCP_SERVER_IPV4_LEASE)
-        old_lease_key = set(old_lease_table.keys())
+        try:
+            # Notifications received until now are handled by this update
+            self.update_event.clear()
+            self._sync_lease(self._read())
+            self.last_update_time = datetime.now()
+        finally:
+            self.lock.release()
+
+    def _sync_lease(self, new_lease):
+        """
+        Write the changed leases to STATE_DB through one pipeline
+        Args:
+            new_lease: Leases changed since the last update, {key: {"lease_start": .., "lease_end": .., "ip": ..}}
+        """
+        data = {}
+        if self.synced_lease is None:
+            # First update, remove the leases which were stored before
+            self.synced_lease = {}
+            old_lease_table = self.db_connector.get_state_db_table(DHCP_SERVER_IPV4_LEASE)
+            for key in old_lease_table.keys():
+                if key not in new_lease:
+                    data[key] = None
+                else:
+                    self.synced_lease[key] = None
 
         # 1.1 If start time equal to end time or lease expired, means lease has been released
         #     1.1.1 If current lease table has this old lease, delete it
         #     1.1.2 Else skip
-        # 1.2 Else, means lease valid, save it.
+        # 1.2 Else, means lease valid, save it if it changed.
+        unix_time = datetime.now().timestamp()
         for key, value in new_lease.items():
-            unix_time = datetime.now().timestamp()
             if value["lease_start"] == value["lease_end"] or unix_time >= int(value["lease_end"]):
-                if key in old_lease_key:
-                    self.db_connector.state_db.delete("{}|{}".format(DHCP_SERVER_IPV4_LEASE, key))
+                if key in self.synced_lease:
+                    del self.synced_lease[key]
+                    data[key] = None
                 continue
-            new_key = "{}|{}".format(DHCP_SERVER_IPV4_LEASE, key)
-            for k, v in new_lease[key].items():
-                self.db_connector.state_db.hset(new_key, k, v)
-        # Delete old lease not in new lease set
-        for key in old_lease_key:
-            if key not in new_lease.keys():
-                # Delete entry
-                self.db_connector.state_db.delete("{}|{}".format(DHCP_SERVER_IPV4_LEASE, key))
-        self.last_update_time = datetime.now()
-        self.lock.release()
+            if self.synced_lease.get(key) != value:
+                self.synced_lease[key] = value
+                data[key] = value
+                heapq.heappush(self.expire_heap, (int(value["lease_end"]), key))
+
+        # Delete the leases which expired without being renewed
+        while self.expire_heap and unix_time >= self.expire_heap[0][0]:
+            lease_end, key = heapq.heappop(self.expire_heap)
+            value = self.synced_lease.get(key)
+            if value is not None and int(value["lease_end"]) == lease_end:
+                del self.synced_lease[key]
+                data[key] = None
+
+        if not data:
+            return
+        if self.pipe is None:
+            self.pipe = swsscommon.RedisPipeline(self.db_connector.state_db)
+        for key, value in data.items():
+            command = swsscommon.RedisCommand()
+            if value is None:
+                command.formatDEL("{}|{}".format(DHCP_SERVER_IPV4_LEASE, key))
+            else:
+                command.formatHSET("{}|{}".format(DHCP_SERVER_IPV4_LEASE, key), value)
+            self.pipe.push(command)
+        self.pipe.flush()
 
 
 class KeaDhcp4LeaseHandler(LeaseHanlder):
     def __init__(self, db_connector, lease_file=KEA_LEASE_FILE_PATH):
         LeaseHanlder.__init__(self, db_connector)
         self.lease_file = lease_file
+        # Lease file kept open across the reads, so that the rows appended before kea-lfc rotates it can still be
+        # read from the rotated file, and offset of the first line which hasn't been read
+        self.lease_fb = None
+        self.lease_file_offset = 0
 
     def register(self):
         """
         Register callback function of signal
         """
+        self.start_worker()
         signal.signal(signal.SIGUSR1, self._update_lease)
 
     def _lease_key(self, subnet_id, mac_address):
@@ -111,23 +191,64 @@ class KeaDhcp4LeaseHandler(LeaseHanlder):
         else:
             return f"Vlan{subnet_id}|{mac_address}"
 
+    def _reset(self):
+        LeaseHanlder._reset(self)
+        self._close_lease_file()
+
+    def _close_lease_file(self):
+        if self.lease_fb is not None:
+            self.lease_fb.close()
+            self.lease_fb = None
+        self.lease_file_offset = 0
+
+    def _read_rows(self, rotated=False):
+        """
+        Read the rows appended to the open lease file since the last read
+        Args:
+            rotated: Whether kea-dhcp4 has stopped writing the file, then its last row is complete
+        """
+        self.lease_fb.seek(self.lease_file_offset)
+        content = self.lease_fb.read()
+        end = len(content) if rotated else content.rfind(b"\n") + 1
+        rows = content[:end].decode("utf-8", errors="replace").splitlines()
+        if end < len(content):
+            # The last row is being written by kea-dhcp4, it is read again by the next read
+            partial_row = content[end:].decode("utf-8", errors="replace")
+            if len(partial_row.split(",")) >= KEA_LEASE_MIN_COLUMNS:
+                rows.append(partial_row)
+        self.lease_file_offset += end
+        return rows
+
     def _read(self):
-        # Read lease file generated by kea-dhcp4
+        # Read the rows appended to lease file generated by kea-dhcp4 since the last read
         try:
-            with open(self.lease_file, "r", encoding="utf-8") as fb:
-                dq = deque(fb)
+            stat = os.stat(self.lease_file)
         except FileNotFoundError as err:
             syslog.syslog(syslog.LOG_ERR, "Cannot find lease file: {}".format(self.lease_file))
             raise err
 
+        rows = []
+        if self.lease_fb is not None:
+            open_stat = os.fstat(self.lease_fb.fileno())
+            if open_stat.st_ino != stat.st_ino:
+                # kea-lfc has rotated the lease file, read the rows appended to the rotated file before it switched,
+                # the new file only has the leases written after the rotation
+                rows = self._read_rows(rotated=True)
+                self._close_lease_file()
+            elif open_stat.st_size < self.lease_file_offset:
+                # The lease file has been truncated
+                self.lease_file_offset = 0
+        if self.lease_fb is None:
+            self.lease_fb = open(self.lease_file, "rb")
+        rows += self._read_rows()
+
+        # Get newest lease information of each client, later rows override earlier rows
         new_lease = {}
-        # Get newest lease information of each client
-        while dq:
-            last_row = dq.pop()
-            splits = last_row.split(",")
+        for row in rows:
+            splits = row.split(",")
             # Skip header
-            if splits[0] == "address":
-                break
+            if splits[0] == "address" or len(splits) < KEA_LEASE_MIN_COLUMNS - 1:
+                continue
             ip_str = splits[0]
             mac_address = splits[1]
             valid_lifetime = splits[3]
@@ -135,8 +256,6 @@ class KeaDhcp4LeaseHandler(LeaseHanlder):
             subnet_id = splits[5]
 
             new_key = self._lease_key(subnet_id, mac_address)
-            if new_key in new_lease:
-                continue
             new_lease[new_key] = {
                 "lease_start": str(int(lease_end) - int(valid_lifetime)),
                 "lease_end": lease_end,
@@ -145,4 +264,4 @@ class KeaDhcp4LeaseHandler(LeaseHanlder):
         return new_lease
 
     def _update_lease(self, signum, frame):
-        self.update_lease()
+        self.notify()
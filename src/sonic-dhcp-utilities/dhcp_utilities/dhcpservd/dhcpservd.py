@@ -33,6 +33,8 @@ class DhcpServd(object):
         self.kea_dhcp4_config_path = kea_dhcp4_config_path
         self.dhcp_servd_monitor = monitor
         self.enabled_checker = None
+        # Content of kea-dhcp4 config file written last time
+        self.kea_dhcp4_config = None
 
     def _notify_kea_dhcp4_proc(self):
         """
@@ -46,12 +48,14 @@ class DhcpServd(object):
             except psutil.NoSuchProcess:
                 continue
 
-    def dump_dhcp4_config(self):
+    def dump_dhcp4_config(self, unchanged_tables=None):
         """
         Generate kea-dhcp4 config file and dump it to config folder
+        Args:
+            unchanged_tables: Set of tables which haven't changed since last generation, None to read all tables
         """
         kea_dhcp4_config, used_ranges, enabled_dhcp_interfaces, used_options, enable_checker = \
-            self.dhcp_cfg_generator.generate()
+            self.dhcp_cfg_generator.generate(unchanged_tables)
         if self.enabled_checker is not None and self.enabled_checker != enable_checker:
             # Has subcribe table and no equal, need to resubscribe
             self.dhcp_servd_monitor.disable_checkers(self.enabled_checker - enable_checker)
@@ -60,8 +64,12 @@ class DhcpServd(object):
         self.used_range = used_ranges
         self.enabled_dhcp_interfaces = enabled_dhcp_interfaces
         self.used_options = used_options
+        if kea_dhcp4_config == self.kea_dhcp4_config:
+            # Config doesn't change, no need to reload kea-dhcp4
+            return
         with open(self.kea_dhcp4_config_path, "w") as write_file:
             write_file.write(kea_dhcp4_config)
+        self.kea_dhcp4_config = kea_dhcp4_config
         # After refresh kea-config, we need to SIGHUP kea-dhcp4 process to read new config
         self._notify_kea_dhcp4_proc()
 
@@ -99,7 +107,7 @@ class DhcpServd(object):
             }
             res = self.dhcp_servd_monitor.check_db_update(db_snapshot)
             if res:
-                self.dump_dhcp4_config()
+                self.dump_dhcp4_config(self.dhcp_servd_monitor.get_unchanged_tables())
 
 
 def main():
@@ -426,6 +426,41 @@ def test_generate(mock_swsscommon_dbconnector_init, mock_parse_port_map_alias, m
         assert subscribe_table == expected_tables
 
 
+def test_generate_unchanged_tables(mock_swsscommon_dbconnector_init, mock_parse_port_map_alias):
+    with patch.object(DhcpDbConnector, "get_config_db_table", side_effect=mock_get_config_db_table) as mock_get_table:
+        dhcp_db_connector = DhcpDbConnector()
+        dhcp_cfg_generator = DhcpServCfgGenerator(dhcp_db_connector, "/usr/local/lib/kea/hooks/libdhcp_run_script.so",
+                                                  kea_conf_template_path="tests/test_data/kea-dhcp4.conf.j2")
+        expected_res = dhcp_cfg_generator.generate()
+        all_tables = set(call.args[0] for call in mock_get_table.call_args_list)
+        assert dhcp_cfg_generator.changed_tables == all_tables
+        with patch.object(DhcpServCfgGenerator, "_parse_port", wraps=dhcp_cfg_generator._parse_port) \
+            as mock_parse_port, \
+             patch.object(DhcpServCfgGenerator, "_render_config") as mock_render:
+            # Unchanged tables are taken from cache
+            mock_get_table.reset_mock()
+            unchanged_tables = all_tables - set(["DEVICE_METADATA", "DHCP_SERVER_IPV4_PORT"])
+            assert dhcp_cfg_generator.generate(unchanged_tables) == expected_res
+            assert set(call.args[0] for call in mock_get_table.call_args_list) == \
+                set(["DEVICE_METADATA", "DHCP_SERVER_IPV4_PORT"])
+            # Content of tables read again doesn't change, hence no parsing and rendering
+            assert dhcp_cfg_generator.changed_tables == set()
+            mock_parse_port.assert_not_called()
+            mock_render.assert_not_called()
+
+            # Content of port table changed, parse it again
+            mock_port_table = mock_get_config_db_table("DHCP_SERVER_IPV4_PORT")
+            mock_port_table.pop(list(mock_port_table.keys())[0])
+            mock_get_table.side_effect = lambda table_name: mock_port_table \
+                if table_name == "DHCP_SERVER_IPV4_PORT" else mock_get_config_db_table(table_name)
+            mock_render.return_value = "dummy_config"
+            kea_dhcp4_config, _, _, _, _ = dhcp_cfg_generator.generate(unchanged_tables)
+            assert dhcp_cfg_generator.changed_tables == set(["DHCP_SERVER_IPV4_PORT"])
+            mock_parse_port.assert_called_once()
+            mock_render.assert_called_once()
+            assert kea_dhcp4_config == "dummy_config"
+
+
 def test_construct_obj_for_template(mock_swsscommon_dbconnector_init, mock_parse_port_map_alias,
                                     mock_get_render_template):
     mock_config_db = MockConfigDb(config_db_path="tests/test_data/mock_config_db.json")
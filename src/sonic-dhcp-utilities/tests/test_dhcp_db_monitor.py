@@ -102,6 +102,21 @@ def test_dhcp_servd_monitor_check_db_update(mock_swsscommon_dbconnector_init, se
             mock_clear.assert_not_called()
 
 
+def test_dhcp_servd_monitor_get_unchanged_tables(mock_swsscommon_dbconnector_init):
+    db_connector = DhcpDbConnector()
+    dhcp_checker = DhcpServerTableCfgChangeEventChecker(None, None)
+    vlan_checker = VlanIntfTableEventChecker(None, None)
+    port_checker = DhcpPortTableEventChecker(None, None)
+    db_monitor = DhcpServdDbMonitor(db_connector, None, [dhcp_checker, vlan_checker, port_checker])
+    dhcp_checker.enabled = True
+    vlan_checker.enabled = True
+    vlan_checker.updated = True
+    # Disabled checker's table is never unchanged
+    assert db_monitor.get_unchanged_tables() == set(["DHCP_SERVER_IPV4"])
+    # Updated flag is cleared after getting
+    assert db_monitor.get_unchanged_tables() == set(["DHCP_SERVER_IPV4", "VLAN_INTERFACE"])
+
+
 @pytest.mark.parametrize("tables", [set(["VlanIntfTableEventChecker"]), set(["dummy1"])])
 def test_dhcp_servd_monitor_enable_checkers(mock_swsscommon_dbconnector_init, tables):
     with patch.object(ConfigDbEventChecker, "enable") as mock_enable:
@@ -156,6 +171,7 @@ def test_db_event_checker_clear_event(mock_swsscommon_dbconnector_init, tested_d
         assert db_event_checker.subscriber_state_table.hasData()
         db_event_checker.clear_event()
         assert not db_event_checker.subscriber_state_table.hasData()
+        assert db_event_checker.updated
 
 
 @pytest.mark.parametrize("is_enabled", [True, False])
@@ -1,3 +1,6 @@
+import os
+import signal
+import threading
 from dhcp_utilities.common.utils import DhcpDbConnector
 from dhcp_utilities.dhcpservd.dhcp_lease import KeaDhcp4LeaseHandler, LeaseHanlder
 from freezegun import freeze_time
@@ -64,30 +67,129 @@ def test_update_kea_lease(mock_swsscommon_dbconnector_init, mock_swsscommon_tabl
         "Vlan1000|10:70:fd:b6:13:18": {}
     }
     with patch.object(swsscommon.Table, "getKeys"), \
-         patch.object(swsscommon.DBConnector, "hset") as mock_hset, \
+         patch.object(swsscommon, "RedisPipeline") as mock_pipeline, \
+         patch.object(swsscommon, "RedisCommand") as mock_command, \
          patch.object(KeaDhcp4LeaseHandler, "_read", MagicMock(return_value=tested_lease)), \
          patch.object(DhcpDbConnector, "get_state_db_table",
                       return_value=mock_lease_table), \
-         patch.object(swsscommon.DBConnector, "delete") as mock_delete, \
          patch("time.sleep", return_value=None) as mock_sleep:
         db_connector = DhcpDbConnector()
         kea_lease_handler = KeaDhcp4LeaseHandler(db_connector)
         kea_lease_handler.update_lease()
         # Verify that old key was deleted
-        mock_delete.assert_has_calls([
+        mock_command.return_value.formatDEL.assert_has_calls([
+            call("DHCP_SERVER_IPV4_LEASE|Vlan1000|aa:bb:cc:dd:ee:ff"),
             call("DHCP_SERVER_IPV4_LEASE|Vlan1000|10:70:fd:b6:13:00"),
-            call("DHCP_SERVER_IPV4_LEASE|Vlan1000|10:70:fd:b6:13:17"),
-            call("DHCP_SERVER_IPV4_LEASE|Vlan1000|aa:bb:cc:dd:ee:ff")
-        ])
+            call("DHCP_SERVER_IPV4_LEASE|Vlan1000|10:70:fd:b6:13:17")
+        ], any_order=True)
+        assert mock_command.return_value.formatDEL.call_count == 3
         # Verify that lease has been updated, to be noted that lease for "192.168.0.2" didn't been updated because
         # lease_start equals to lease_end
-        mock_hset.assert_has_calls([
-            call("DHCP_SERVER_IPV4_LEASE|Vlan1000|10:70:fd:b6:13:18", "lease_start", "1697607205"),
-            call("DHCP_SERVER_IPV4_LEASE|Vlan1000|10:70:fd:b6:13:18", "lease_end", "1697610805"),
-            call("DHCP_SERVER_IPV4_LEASE|Vlan1000|10:70:fd:b6:13:18", "ip", "193.168.0.132")
-        ])
+        mock_command.return_value.formatHSET.assert_called_once_with(
+            "DHCP_SERVER_IPV4_LEASE|Vlan1000|10:70:fd:b6:13:18",
+            {"lease_start": "1697607205", "lease_end": "1697610805", "ip": "193.168.0.132"})
+        # All changes are written by one pipeline flush
+        assert mock_pipeline.return_value.push.call_count == 4
+        mock_pipeline.return_value.flush.assert_called_once_with()
+
+        # Leases which didn't change aren't written again
+        mock_command.reset_mock()
         kea_lease_handler.update_lease()
         mock_sleep.assert_called_once_with(2)
+        mock_command.return_value.formatHSET.assert_not_called()
+        mock_command.return_value.formatDEL.assert_not_called()
+        mock_pipeline.return_value.flush.assert_called_once_with()
+
+
+def test_update_kea_lease_incremental(mock_swsscommon_dbconnector_init, tmp_path):
+    lease_file = tmp_path / "kea-lease.csv"
+    header = "address,hwaddr,client_id,valid_lifetime,expire,subnet_id,fqdn_fwd,fqdn_rev,hostname,state," \
+             "user_context,pool_id\n"
+    row = "{},{},,3600,{},1000,0,0,host,0,,0\n"
+    lease_file.write_text(header + row.format("192.168.0.2", "10:70:fd:b6:13:00", 1694000905) +
+                          row.format("192.168.0.3", "10:70:fd:b6:13:01", 1694000905))
+    with patch.object(DhcpDbConnector, "get_config_db_table", side_effect=mock_get_config_db_table), \
+         patch.object(DhcpDbConnector, "get_state_db_table", return_value={}), \
+         patch.object(swsscommon, "RedisPipeline") as mock_pipeline, \
+         patch.object(swsscommon, "RedisCommand") as mock_command, \
+         freeze_time("2023-09-06 11:00:00") as frozen_time:
+        db_connector = DhcpDbConnector()
+        kea_lease_handler = KeaDhcp4LeaseHandler(db_connector, lease_file=str(lease_file))
+        kea_lease_handler.lease_update_interval = 0
+        kea_lease_handler.update_lease()
+        assert mock_command.return_value.formatHSET.call_count == 2
+
+        # Only the appended rows are read, a row which is being written is read again with the next update
+        mock_command.reset_mock()
+        with open(lease_file, "a") as f:
+            f.write(row.format("192.168.0.4", "10:70:fd:b6:13:02", 1694000905))
+            f.write("192.168.0.5,10:70:fd:b6:13:03,,36")
+        kea_lease_handler.update_lease()
+        mock_command.return_value.formatHSET.assert_called_once_with(
+            "DHCP_SERVER_IPV4_LEASE|Vlan1000|10:70:fd:b6:13:02",
+            {"lease_start": "1693997305", "lease_end": "1694000905", "ip": "192.168.0.4"})
+        mock_command.reset_mock()
+        with open(lease_file, "a") as f:
+            f.write("00,1694000905,1000,0,0,host,0,,0\n")
+        kea_lease_handler.update_lease()
+        mock_command.return_value.formatHSET.assert_called_once_with(
+            "DHCP_SERVER_IPV4_LEASE|Vlan1000|10:70:fd:b6:13:03",
+            {"lease_start": "1693997305", "lease_end": "1694000905", "ip": "192.168.0.5"})
+
+        # kea-lfc rotates the lease file, the new file has the leases written after the rotation. The rows appended
+        # to the old file before the rotation are read from the rotated file
+        mock_command.reset_mock()
+        with open(lease_file, "a") as f:
+            f.write(row.format("192.168.0.6", "10:70:fd:b6:13:04", 1694000905))
+        rotated_file = tmp_path / "kea-lease.csv.2"
+        os.rename(lease_file, rotated_file)
+        lease_file.write_text(header + row.format("192.168.0.2", "10:70:fd:b6:13:00", 1694004505))
+        kea_lease_handler.update_lease()
+        mock_command.return_value.formatHSET.assert_has_calls([
+            call("DHCP_SERVER_IPV4_LEASE|Vlan1000|10:70:fd:b6:13:04",
+                 {"lease_start": "1693997305", "lease_end": "1694000905", "ip": "192.168.0.6"}),
+            call("DHCP_SERVER_IPV4_LEASE|Vlan1000|10:70:fd:b6:13:00",
+                 {"lease_start": "1694000905", "lease_end": "1694004505", "ip": "192.168.0.2"})
+        ], any_order=True)
+        assert mock_command.return_value.formatHSET.call_count == 2
+        mock_command.return_value.formatDEL.assert_not_called()
+
+        # Only the rows appended to the new file are read from now on
+        mock_command.reset_mock()
+        with open(rotated_file, "a") as f:
+            f.write(row.format("192.168.0.9", "10:70:fd:b6:13:09", 1694004505))
+        kea_lease_handler.update_lease()
+        mock_command.return_value.formatHSET.assert_not_called()
+
+        # The leases which weren't renewed are deleted when they expire
+        mock_command.reset_mock()
+        frozen_time.move_to("2023-09-06 12:00:00")
+        kea_lease_handler.update_lease()
+        mock_command.return_value.formatHSET.assert_not_called()
+        mock_command.return_value.formatDEL.assert_has_calls([
+            call("DHCP_SERVER_IPV4_LEASE|Vlan1000|10:70:fd:b6:13:01"),
+            call("DHCP_SERVER_IPV4_LEASE|Vlan1000|10:70:fd:b6:13:02"),
+            call("DHCP_SERVER_IPV4_LEASE|Vlan1000|10:70:fd:b6:13:03"),
+            call("DHCP_SERVER_IPV4_LEASE|Vlan1000|10:70:fd:b6:13:04")
+        ], any_order=True)
+        assert mock_command.return_value.formatDEL.call_count == 4
+        assert list(kea_lease_handler.synced_lease.keys()) == ["Vlan1000|10:70:fd:b6:13:00"]
+
+
+def test_lease_update_worker(mock_swsscommon_dbconnector_init):
+    with patch.object(DhcpDbConnector, "get_config_db_table", side_effect=mock_get_config_db_table), \
+         patch("signal.signal") as mock_signal, \
+         patch.object(KeaDhcp4LeaseHandler, "update_lease") as mock_update:
+        db_connector = DhcpDbConnector()
+        kea_lease_handler = KeaDhcp4LeaseHandler(db_connector)
+        updated = threading.Event()
+        mock_update.side_effect = lambda: (kea_lease_handler.update_event.clear(), updated.set())
+        kea_lease_handler.register()
+        mock_signal.assert_called_once_with(signal.SIGUSR1, kea_lease_handler._update_lease)
+        # The signal handler only notifies the worker thread
+        kea_lease_handler._update_lease(signal.SIGUSR1, None)
+        assert updated.wait(5)
+        mock_update.assert_called_once_with()
 
 
 def test_no_implement(mock_swsscommon_dbconnector_init):
@@ -46,7 +46,7 @@ def test_dump_dhcp4_config(mock_swsscommon_dbconnector_init, enabled_checker):
                               kea_dhcp4_config_path="/tmp/kea-dhcp4.conf")
         dhcpservd.dump_dhcp4_config()
         # Verfiy whether generate() func of dhcp_cfggen is called
-        mock_generate.assert_called_once_with()
+        mock_generate.assert_called_once_with(None)
         with open("tests/test_data/test_kea_config.conf", "r") as file, \
              open("/tmp/kea-dhcp4.conf", "r") as output:
             expected_content = file.read()
@@ -62,6 +62,26 @@ def test_dump_dhcp4_config(mock_swsscommon_dbconnector_init, enabled_checker):
             mock_subscribe.assert_called_once_with(new_enabled_checker - enabled_checker)
 
 
+def test_dump_dhcp4_config_unchanged(mock_swsscommon_dbconnector_init, mock_parse_port_map_alias,
+                                     mock_get_render_template):
+    with patch("dhcp_utilities.dhcpservd.dhcp_cfggen.DhcpServCfgGenerator.generate",
+               return_value=(tested_config, set(), set(), set(), set())) as mock_generate, \
+         patch("dhcp_utilities.dhcpservd.dhcpservd.DhcpServd._notify_kea_dhcp4_proc",
+               MagicMock()) as mock_notify_kea_dhcp4_proc:
+        dhcp_db_connector = DhcpDbConnector()
+        dhcp_cfg_generator = DhcpServCfgGenerator(dhcp_db_connector, "/usr/local/lib/kea/hooks/libdhcp_run_script.so")
+        dhcpservd = DhcpServd(dhcp_cfg_generator, dhcp_db_connector, MagicMock(),
+                              kea_dhcp4_config_path="/tmp/kea-dhcp4.conf")
+        dhcpservd.dump_dhcp4_config()
+        mock_notify_kea_dhcp4_proc.assert_called_once_with()
+        # Same config is generated, kea-dhcp4 doesn't need to reload
+        with patch("builtins.open") as mock_open:
+            dhcpservd.dump_dhcp4_config(set(["VLAN_INTERFACE"]))
+            mock_generate.assert_called_with(set(["VLAN_INTERFACE"]))
+            mock_open.assert_not_called()
+            mock_notify_kea_dhcp4_proc.assert_called_once_with()
+
+
 @pytest.mark.parametrize("process_list", [["proc1", "proc2", "kea-dhcp4"], ["proc1", "proc2"]])
 def test_notify_kea_dhcp4_proc(process_list, mock_swsscommon_dbconnector_init, mock_get_render_template,
                                mock_parse_port_map_alias):
@@ -1497,10 +1497,15 @@ def hdl_admin_status_shutdown_msg(daemon, cmd_str, op, st_idx, args, data):
     return cmd_list
 
 class ExtConfigDBConnector(ConfigDBConnector):
+    # max number of keyspace notifications handled in one batch
+    MAX_BATCH_SIZE = 1000
     def __init__(self, ns_attrs = None):
         super(ExtConfigDBConnector, self).__init__()
         self.nosort_attrs = ns_attrs if ns_attrs is not None else {}
         self.__listen_thread_running = False
+        self.__stats_lock = threading.Lock()
+        self.__listen_stats = {'batches': 0, 'events': 0, 'coalesced': 0, 'fetched': 0,
+                               'last_batch_size': 0, 'max_batch_size': 0, 'last_batch_time': 0.0}
     def raw_to_typed(self, raw_data, table = ''):
         if len(raw_data) == 0:
             raw_data = None
@@ -1511,20 +1516,82 @@ class ExtConfigDBConnector(ConfigDBConnector):
             if type(val) is list and key not in self.nosort_attrs.get(table, set()):
                 val.sort()
         return data
-    def sub_msg_handler(self, msg_item):
-        if msg_item['type'] == 'pmessage':
+    def get_listen_stats(self):
+        """Return counters of keyspace notification batches handled by listen thread. Size of a batch is the number
+           of notifications queued when listen thread picked them up, coalesced is the number of notifications merged
+           into another one and fetched the number of keys read from config DB.
+        """
+        with self.__stats_lock:
+            return dict(self.__listen_stats)
+    def __coalesce_msgs(self, msg_list):
+        # list of (table, row, deleted) in order of notification. Only consecutive set notifications of the same key
+        # are merged, a delete is never merged with the sets around it so that del followed by set re-creates the
+        # entry and updates of dependent tables keep their place relative to it
+        pending = []
+        coalesced = 0
+        for msg_item in msg_list:
+            if msg_item['type'] != 'pmessage':
+                continue
             key = msg_item['channel'].split(':', 1)[1]
             try:
                 (table, row) = key.split(self.TABLE_NAME_SEPARATOR, 1)
-                if table in self.handlers:
-                    client = self.get_redis_client(self.db_name)
-                    data = self.raw_to_typed(client.hgetall(key), table)
-                    super(ExtConfigDBConnector, self)._ConfigDBConnector__fire(table, row, data)
             except ValueError:
-                pass    #Ignore non table-formated redis entries
+                continue    #Ignore non table-formated redis entries
+            if table not in self.handlers:
+                continue
+            deleted = msg_item.get('data') in ('del', 'expired', 'evicted')
+            if not deleted and len(pending) > 0 and pending[-1] == (table, row, False):
+                # current content of key will be read for the merged sets
+                coalesced += 1
+                continue
+            pending.append((table, row, deleted))
+        return pending, coalesced
+    def __fetch_entries(self, pending):
+        client = self.get_redis_client(self.db_name)
+        entries = []
+        fetched = 0
+        for table, row, deleted in pending:
+            key = table + self.TABLE_NAME_SEPARATOR + row
+            try:
+                if deleted:
+                    data = None
+                else:
+                    data = self.raw_to_typed(client.hgetall(key), table)
+                    fetched += 1
+            except Exception as e:
+                syslog.syslog(syslog.LOG_ERR, '[bgp cfgd] Failed reading config DB key {} with exception: {}'.format(key, str(e)))
+                logging.exception(e)
+                continue
+            entries.append((table, row, data))
+        return entries, fetched
+    def __dispatch_entries(self, entries):
+        for table, row, data in entries:
+            try:
+                super(ExtConfigDBConnector, self)._ConfigDBConnector__fire(table, row, data)
             except Exception as e:
                 syslog.syslog(syslog.LOG_ERR, '[bgp cfgd] Failed handling config DB update with exception:' + str(e))
                 logging.exception(e)
+    def sub_msg_batch_handler(self, msg_list):
+        """Handle a batch of keyspace notifications. Consecutive set notifications of the same key are merged, content
+           of the key is read once for them and handlers are called in order of notification.
+        """
+        start_time = time.monotonic()
+        pending, coalesced = self.__coalesce_msgs(msg_list)
+        entries, fetched = self.__fetch_entries(pending)
+        self.__dispatch_entries(entries)
+        with self.__stats_lock:
+            stats = self.__listen_stats
+            stats['batches'] += 1
+            stats['events'] += len(msg_list)
+            stats['coalesced'] += coalesced
+            stats['fetched'] += fetched
+            stats['last_batch_size'] = len(msg_list)
+            stats['max_batch_size'] = max(stats['max_batch_size'], len(msg_list))
+            stats['last_batch_time'] = time.monotonic() - start_time
+        syslog.syslog(syslog.LOG_DEBUG, '[bgp cfgd] handled {} notifications with {} updates in {:.3f}s'.format(
+                      len(msg_list), len(entries), stats['last_batch_time']))
+    def sub_msg_handler(self, msg_item):
+        self.sub_msg_batch_handler([msg_item])
 
     def listen_thread(self, timeout):
         self.__listen_thread_running = True
@@ -1532,8 +1599,16 @@ class ExtConfigDBConnector(ConfigDBConnector):
         self.pubsub.psubscribe(sub_key_space)
         while self.__listen_thread_running:
             msg = self.pubsub.get_message(timeout, True)
-            if msg:
-                self.sub_msg_handler(msg)
+            if not msg:
+                continue
+            # drain notifications already pending, a bulk config push is handled in few batches
+            msg_list = [msg]
+            while len(msg_list) < self.MAX_BATCH_SIZE:
+                msg = self.pubsub.get_message(0, True)
+                if not msg:
+                    break
+                msg_list.append(msg)
+            self.sub_msg_batch_handler(msg_list)
 
         self.pubsub.punsubscribe(sub_key_space)
 
@@ -19,6 +19,89 @@ def test_contructor():
     daemon.config_db.pubsub.punsubscribe.assert_called_once()
     assert(daemon.config_db.sub_thread.is_alive() == False)
 
+@patch.dict('sys.modules', **mockmapping)
+def test_listen_batch():
+    from frrcfgd.frrcfgd import ExtConfigDBConnector
+    config_db = ExtConfigDBConnector()
+    config_db.TABLE_NAME_SEPARATOR = '|'
+    config_db.handlers = {'BGP_GLOBALS': None, 'BGP_NEIGHBOR': None}
+    db_data = {'BGP_GLOBALS|default': {'local_asn': '100'},
+               'BGP_NEIGHBOR|default|10.0.0.1': {'asn': '200'},
+               'BGP_NEIGHBOR|default|10.0.0.2': {'asn': '300'}}
+    client = config_db.get_redis_client.return_value
+    client.hgetall.side_effect = lambda key: db_data.get(key, {})
+    config_db.raw_to_typed = lambda raw_data, table = '': raw_data if raw_data else None
+    def keyspace_msg(key, op = 'hset'):
+        return {'type': 'pmessage', 'channel': '__keyspace@4__:' + key, 'data': op}
+    msg_list = [keyspace_msg('BGP_GLOBALS|default'),
+                keyspace_msg('BGP_NEIGHBOR|default|10.0.0.1'),
+                keyspace_msg('BGP_NEIGHBOR|default|10.0.0.1'),
+                keyspace_msg('BGP_NEIGHBOR|default|10.0.0.2'),
+                keyspace_msg('BGP_NEIGHBOR|default|10.0.0.2', 'del'),
+                keyspace_msg('PORT|Ethernet0'),
+                keyspace_msg('no_separator'),
+                {'type': 'psubscribe', 'channel': '__keyspace@4__:*', 'data': 1}]
+    with patch.object(NonCallableMagicMock, '_ConfigDBConnector__fire', create = True) as mock_fire:
+        config_db.sub_msg_batch_handler(msg_list)
+        # consecutive sets of one key are merged, deleted key is not read
+        assert mock_fire.call_args_list == [
+            ((('BGP_GLOBALS', 'default', {'local_asn': '100'}),)),
+            ((('BGP_NEIGHBOR', 'default|10.0.0.1', {'asn': '200'}),)),
+            ((('BGP_NEIGHBOR', 'default|10.0.0.2', {'asn': '300'}),)),
+            ((('BGP_NEIGHBOR', 'default|10.0.0.2', None),))]
+        assert client.hgetall.call_count == 3
+        stats = config_db.get_listen_stats()
+        assert stats['batches'] == 1
+        assert stats['events'] == len(msg_list)
+        assert stats['coalesced'] == 1
+        assert stats['fetched'] == 3
+        assert stats['last_batch_size'] == stats['max_batch_size'] == len(msg_list)
+        # failure of one handler doesn't stop the others
+        mock_fire.reset_mock()
+        mock_fire.side_effect = [Exception('test'), None]
+        config_db.sub_msg_batch_handler(msg_list[:2])
+        assert mock_fire.call_count == 2
+        stats = config_db.get_listen_stats()
+        assert stats['batches'] == 2
+        assert stats['events'] == len(msg_list) + 2
+        assert stats['fetched'] == 5
+        assert stats['last_batch_size'] == 2
+        assert stats['max_batch_size'] == len(msg_list)
+
+@patch.dict('sys.modules', **mockmapping)
+def test_listen_batch_order():
+    from frrcfgd.frrcfgd import ExtConfigDBConnector
+    config_db = ExtConfigDBConnector()
+    config_db.TABLE_NAME_SEPARATOR = '|'
+    config_db.handlers = {'BGP_GLOBALS': None, 'BGP_NEIGHBOR': None}
+    db_data = {'BGP_GLOBALS|Vrf1': {'local_asn': '100'},
+               'BGP_NEIGHBOR|Vrf1|10.0.0.1': {'asn': '200'}}
+    client = config_db.get_redis_client.return_value
+    client.hgetall.side_effect = lambda key: db_data.get(key, {})
+    config_db.raw_to_typed = lambda raw_data, table = '': raw_data if raw_data else None
+    def keyspace_msg(key, op = 'hset'):
+        return {'type': 'pmessage', 'channel': '__keyspace@4__:' + key, 'data': op}
+    with patch.object(NonCallableMagicMock, '_ConfigDBConnector__fire', create = True) as mock_fire:
+        # del followed by set of the same key is not merged into a single set
+        config_db.sub_msg_batch_handler([keyspace_msg('BGP_GLOBALS|Vrf1', 'del'),
+                                         keyspace_msg('BGP_GLOBALS|Vrf1')])
+        assert mock_fire.call_args_list == [
+            ((('BGP_GLOBALS', 'Vrf1', None),)),
+            ((('BGP_GLOBALS', 'Vrf1', {'local_asn': '100'}),))]
+        # child is not dispatched ahead of its re-created parent
+        mock_fire.reset_mock()
+        config_db.sub_msg_batch_handler([keyspace_msg('BGP_GLOBALS|Vrf1'),
+                                         keyspace_msg('BGP_NEIGHBOR|Vrf1|10.0.0.1', 'del'),
+                                         keyspace_msg('BGP_GLOBALS|Vrf1', 'del'),
+                                         keyspace_msg('BGP_GLOBALS|Vrf1'),
+                                         keyspace_msg('BGP_NEIGHBOR|Vrf1|10.0.0.1')])
+        assert mock_fire.call_args_list == [
+            ((('BGP_GLOBALS', 'Vrf1', {'local_asn': '100'}),)),
+            ((('BGP_NEIGHBOR', 'Vrf1|10.0.0.1', None),)),
+            ((('BGP_GLOBALS', 'Vrf1', None),)),
+            ((('BGP_GLOBALS', 'Vrf1', {'local_asn': '100'}),)),
+            ((('BGP_NEIGHBOR', 'Vrf1|10.0.0.1', {'asn': '200'}),))]
+
 class CmdMapTestInfo:
     data_buf = {}
     def __init__(self, table, key, data, exp_cmd, no_del = False, neg_cmd = None,
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Measure the per-call cost of the device_info helpers which are called on every
+CLI invocation and daemon poll: get_platform(), get_num_npus(), is_chassis(),
+is_supervisor(), get_platform_json_data()...
+The device files are created in a temporary directory. Every helper is measured
+with the cached facts, and with refresh_device_info() before each call, which
+reads and parses the files as before the cache.
+
+Example:
+    ./benchmarks/bench_device_info.py -n 10000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sonic_py_common import device_info
+
+PLATFORM = "x86_64-mlnx_msn2700-r0"
+
+HELPERS = [
+    ("get_platform", device_info.get_platform),
+    ("get_machine_info", device_info.get_machine_info),
+    ("get_num_npus", device_info.get_num_npus),
+    ("is_multi_npu", device_info.is_multi_npu),
+    ("is_supervisor", device_info.is_supervisor),
+    ("is_disaggregated_chassis", device_info.is_disaggregated_chassis),
+    ("is_macsec_supported", device_info.is_macsec_supported),
+    ("get_platform_json_data", device_info.get_platform_json_data),
+    ("is_smartswitch", device_info.is_smartswitch),
+]
+
+
+def create_device_files(root):
+    machine_conf = os.path.join(root, "machine.conf")
+    with open(machine_conf, "w") as f:
+        f.write("onie_platform={}\nonie_machine=mlnx_msn2700\nonie_arch=x86_64\n".format(PLATFORM))
+    platform_dir = os.path.join(root, "device", PLATFORM)
+    os.makedirs(platform_dir)
+    with open(os.path.join(platform_dir, device_info.ASIC_CONF_FILENAME), "w") as f:
+        f.write("NUM_ASIC=1\n")
+    with open(os.path.join(platform_dir, device_info.PLATFORM_ENV_CONF_FILENAME), "w") as f:
+        f.write("SYNCD_SHM_SIZE=256m\nsupervisor=0\nmacsec_enabled=1\n")
+    ports = {"Ethernet{}".format(i * 4): {"index": str(i), "lanes": ",".join(str(i * 4 + l) for l in range(4))}
+             for i in range(64)}
+    with open(os.path.join(platform_dir, device_info.PLATFORM_JSON_FILE), "w") as f:
+        json.dump({"chassis": {"name": "MSN2700", "fans": [{"name": "fan{}".format(i)} for i in range(8)]},
+                   "interfaces": ports}, f)
+    return machine_conf
+
+
+def measure(func, count, refresh):
+    start = time.perf_counter()
+    for _ in range(count):
+        if refresh:
+            device_info.refresh_device_info()
+        func()
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark device_info helpers")
+    parser.add_argument("-n", "--count", type=int, default=10000, help="number of calls of each helper")
+    args = parser.parse_args()
+
+    os.environ.pop("PLATFORM", None)
+    with tempfile.TemporaryDirectory() as root:
+        machine_conf = create_device_files(root)
+        with mock.patch.object(device_info, "MACHINE_CONF_PATH", machine_conf), \
+                mock.patch.object(device_info, "HOST_DEVICE_PATH", os.path.join(root, "device")), \
+                mock.patch.object(device_info, "CONTAINER_PLATFORM_PATH", os.path.join(root, "platform")):
+            print("{:<26} {:>12} {:>12} {:>8}".format("helper", "uncached us", "cached us", "speedup"))
+            for name, func in HELPERS:
+                uncached = measure(func, args.count, refresh=True)
+                device_info.refresh_device_info()
+                cached = measure(func, args.count, refresh=False)
+                print("{:<26} {:>12.2f} {:>12.2f} {:>7.1f}x".format(name, uncached, cached, uncached / cached))
+
+
+if __name__ == "__main__":
+    main()
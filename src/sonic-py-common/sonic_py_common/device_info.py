@@ -55,17 +55,126 @@ DPU_NAME_PREFIX = "dpu"
 sonic_ver_info = {}
 hw_info_dict = {}
 
+
+class DeviceInfoCache(object):
+    """
+    Process-wide cache of the device facts used by the helpers of this module.
+
+    The content of machine.conf, asic.conf, platform_env.conf and platform.json
+    is read once and re-read only when the file mtime, size or inode changes.
+    platform.json is kept as text and decoded for every caller.
+    DEVICE_METADATA|localhost, which is read from ConfigDB when the caller doesn't
+    provide a connector, is cached as long as a keyspace subscription reports
+    no changes of the key. When the subscription can't be set up, ConfigDB is
+    read on every call, as before.
+
+    The cached values are shared by the helpers of this module, which only read
+    them. The public getters return a copy, so that a caller can't change them.
+    """
+    def __init__(self):
+        self.files = {}  # path -> (file signature, parsed content)
+        self.localhost = None  # DEVICE_METADATA|localhost, None if it isn't cached
+        self.pubsub = None
+        self.pid = os.getpid()
+
+    def read_file(self, path, parser):
+        """
+        Return the content of the file parsed by parser(path), from the cache
+        if the file wasn't changed since it was parsed
+        """
+        try:
+            st = os.stat(path)
+        except OSError:
+            self.files.pop(path, None)
+            return parser(path)
+        signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+        cached = self.files.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        content = parser(path)
+        self.files[path] = (signature, content)
+        return content
+
+    def get_localhost_metadata(self):
+        """
+        Return DEVICE_METADATA|localhost from ConfigDB of the default namespace
+        """
+        if self.pid != os.getpid():
+            # The subscription belongs to the parent process
+            self.pubsub = None
+            self.localhost = None
+            self.pid = os.getpid()
+        if self.localhost is not None and not self._localhost_changed():
+            return self.localhost
+        self.localhost = None
+
+        config_db = ConfigDBConnector()
+        config_db.connect()
+        # Subscribe before reading the table, so that no change is missed
+        self._subscribe(config_db)
+        metadata = config_db.get_table('DEVICE_METADATA').get('localhost', {})
+        if self.pubsub is not None:
+            self.localhost = metadata
+        return metadata
+
+    def _subscribe(self, config_db):
+        if self.pubsub is not None:
+            return
+        try:
+            pubsub = config_db.get_redis_client(config_db.db_name).pubsub()
+            pubsub.psubscribe("__keyspace@{}__:DEVICE_METADATA{}localhost".format(
+                config_db.get_dbid(config_db.db_name), config_db.TABLE_NAME_SEPARATOR))
+            self.pubsub = pubsub
+        except Exception:
+            self.pubsub = None
+
+    def _localhost_changed(self):
+        try:
+            changed = False
+            while True:
+                message = self.pubsub.get_message()
+                if not message:
+                    return changed
+                if not isinstance(message, dict):
+                    raise ValueError("unexpected message {}".format(message))
+                if message.get('type') == 'pmessage':
+                    changed = True
+        except Exception:
+            self.pubsub = None
+            return True
+
+    def refresh(self):
+        """ Drop all the cached facts """
+        global sonic_ver_info
+        global hw_info_dict
+        self.files = {}
+        self.localhost = None
+        sonic_ver_info = {}
+        hw_info_dict = {}
+
+
+device_info_cache = DeviceInfoCache()
+
+
+def refresh_device_info():
+    """
+    Drop the cached device facts, so that they are read again on the next call.
+    Changes of the files and of DEVICE_METADATA|localhost are detected without it,
+    this is needed only to re-read the version and hardware info
+    """
+    device_info_cache.refresh()
+
+
 def get_localhost_info(field, config_db=None):
     try:
         # TODO: enforce caller to provide config_db explicitly and remove its default value
         if not config_db:
-            config_db = ConfigDBConnector()
-            config_db.connect()
-
-        metadata = config_db.get_table('DEVICE_METADATA')
+            localhost = device_info_cache.get_localhost_metadata()
+        else:
+            localhost = config_db.get_table('DEVICE_METADATA').get('localhost', {})
 
-        if 'localhost' in metadata and field in metadata['localhost']:
-            return metadata['localhost'][field]
+        if field in localhost:
+            return localhost[field]
     except Exception:
         pass
 
@@ -87,8 +196,12 @@ def get_machine_info():
     if not os.path.isfile(MACHINE_CONF_PATH):
         return None
 
+    return dict(device_info_cache.read_file(MACHINE_CONF_PATH, _parse_machine_conf))
+
+
+def _parse_machine_conf(path):
     machine_vars = {}
-    with open(MACHINE_CONF_PATH) as machine_conf_file:
+    with open(path) as machine_conf_file:
         for line in machine_conf_file:
             tokens = line.split('=')
             if len(tokens) < 2:
@@ -97,6 +210,24 @@ def get_machine_info():
 
     return machine_vars
 
+
+def _parse_conf_lines(path):
+    """ Parse a key=value file into the list of (key, value) pairs in the file order """
+    pairs = []
+    with open(path) as conf_file:
+        for line in conf_file:
+            tokens = line.split('=')
+            if len(tokens) < 2:
+                continue
+            pairs.append((tokens[0], tokens[1].strip()))
+    return pairs
+
+
+def _read_text(path):
+    with open(path) as text_file:
+        return text_file.read()
+
+
 def get_platform(**kwargs):
     """
     Retrieve the device's platform identifier
@@ -188,9 +319,7 @@ def get_platform_json_data():
         return None
 
     try:
-        with open(platform_json, 'r') as f:
-            platform_data = json.loads(f.read())
-            return platform_data
+        return json.loads(device_info_cache.read_file(platform_json, _read_text))
     except (json.JSONDecodeError, IOError, TypeError, ValueError):
         # Handle any file reading and JSON parsing errors
         return None
@@ -463,7 +592,7 @@ def get_path_to_port_config_file(hwsku=None, asic=None):
     if os.path.isfile(hwsku_json_file):
         if os.path.isfile(os.path.join(platform_path, PLATFORM_JSON_FILE)):
             json_file = os.path.join(platform_path, PLATFORM_JSON_FILE)
-            platform_data = json.loads(open(json_file).read())
+            platform_data = json.loads(device_info_cache.read_file(json_file, _read_text))
             interfaces = platform_data.get('interfaces', None)
             if interfaces is not None and len(interfaces) > 0:
                 port_config_candidates.append(os.path.join(platform_path, PLATFORM_JSON_FILE))
@@ -575,14 +704,10 @@ def get_num_npus():
     asic_conf_file_path = get_asic_conf_file_path()
     if asic_conf_file_path is None:
         return 1
-    with open(asic_conf_file_path) as asic_conf_file:
-        for line in asic_conf_file:
-            tokens = line.split('=')
-            if len(tokens) < 2:
-               continue
-            if tokens[0].lower() == 'num_asic':
-                num_npus = tokens[1].strip()
-        return int(num_npus)
+    for key, value in device_info_cache.read_file(asic_conf_file_path, _parse_conf_lines):
+        if key.lower() == 'num_asic':
+            num_npus = value
+    return int(num_npus)
 
 
 def is_multi_npu():
@@ -604,16 +729,10 @@ def is_disaggregated_chassis():
     platform_env_conf_file_path = get_platform_env_conf_file_path()
     if platform_env_conf_file_path is None:
         return False
-    with open(platform_env_conf_file_path) as platform_env_conf_file:
-        for line in platform_env_conf_file:
-            tokens = line.split('=')
-            if len(tokens) < 2:
-               continue
-            if tokens[0] == 'disaggregated_chassis':
-                val = tokens[1].strip()
-                if val == '1':
-                    return True
-        return False
+    for key, value in device_info_cache.read_file(platform_env_conf_file_path, _parse_conf_lines):
+        if key == 'disaggregated_chassis' and value == '1':
+            return True
+    return False
 
 
 def is_virtual_chassis():
@@ -661,16 +780,10 @@ def is_supervisor():
     platform_env_conf_file_path = get_platform_env_conf_file_path()
     if platform_env_conf_file_path is None:
         return False
-    with open(platform_env_conf_file_path) as platform_env_conf_file:
-        for line in platform_env_conf_file:
-            tokens = line.split('=')
-            if len(tokens) < 2:
-               continue
-            if tokens[0].lower() == 'supervisor':
-                val = tokens[1].strip()
-                if val == '1':
-                    return True
-        return False
+    for key, value in device_info_cache.read_file(platform_env_conf_file_path, _parse_conf_lines):
+        if key.lower() == 'supervisor' and value == '1':
+            return True
+    return False
 
 # Check if this platform has macsec capability.
 def is_macsec_supported():
@@ -681,15 +794,11 @@ def is_macsec_supported():
     if platform_env_conf_file_path is None:
         return supported
 
-    # Else open the file check for keyword - macsec_enabled -
-    with open(platform_env_conf_file_path) as platform_env_conf_file:
-        for line in platform_env_conf_file:
-            tokens = line.split('=')
-            if len(tokens) < 2:
-               continue
-            if tokens[0].lower() == 'macsec_enabled':
-                supported = tokens[1].strip()
-                break
+    # Else check the file for keyword - macsec_enabled -
+    for key, value in device_info_cache.read_file(platform_env_conf_file_path, _parse_conf_lines):
+        if key.lower() == 'macsec_enabled':
+            supported = value
+            break
     return int(supported)
 
 
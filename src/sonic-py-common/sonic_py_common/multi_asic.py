@@ -1,10 +1,18 @@
 import glob
 import os
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 
 from natsort import natsorted
 from swsscommon import swsscommon
 
+try:
+    from redis.exceptions import ConnectionError as RedisConnectionError
+    from redis.exceptions import TimeoutError as RedisTimeoutError
+    DB_CONNECTION_ERRORS = (ConnectionError, RedisConnectionError, RedisTimeoutError)
+except ImportError:
+    DB_CONNECTION_ERRORS = (ConnectionError,)
+
 from .device_info import get_asic_conf_file_path
 from .device_info import is_supervisor, is_chassis
 from .interface import inband_prefix, backplane_prefix, recirc_prefix, front_panel_prefix
@@ -33,6 +41,15 @@ CHASSIS_FABRIC_ASIC_INFO_TABLE='CHASSIS_FABRIC_ASIC_TABLE'
 # Dictionary to cache config_db connection handle per namespace
 # to prevent duplicate connections from being opened
 config_db_handle = {}
+# pid of the process which opened the cached connections. A forked child
+# must not share the connections of its parent
+config_db_handle_pid = None
+
+# Reverse indexes of the config_db entries which are looked up by name
+# across all namespaces. They are built on the first lookup and rebuilt
+# when a lookup misses or finds a stale entry
+port_namespace_index = {}           # port name -> namespace
+port_channel_member_index = {}      # PortChannel name -> (namespace, first member)
 
 def connect_config_db_for_ns(namespace=DEFAULT_NAMESPACE):
     """
@@ -51,6 +68,65 @@ def connect_config_db_for_ns(namespace=DEFAULT_NAMESPACE):
     return config_db
 
 
+def get_config_db_for_ns(namespace=DEFAULT_NAMESPACE):
+    """
+    The function returns the config DB handle for a given namespace
+    from the per-process pool of connections. The connection is opened
+    on the first use and reused by all the later calls.
+
+    Returns:
+      handle to the config_db for a namespace
+    """
+    global config_db_handle_pid
+
+    if config_db_handle_pid != os.getpid():
+        config_db_handle.clear()
+        config_db_handle_pid = os.getpid()
+
+    if namespace not in config_db_handle:
+        config_db_handle[namespace] = connect_config_db_for_ns(namespace)
+    return config_db_handle[namespace]
+
+
+def clear_config_db_handles():
+    """
+    Drop the pooled config DB connections and the reverse indexes built
+    from them. They are re-created on the next use
+    """
+    config_db_handle.clear()
+    port_namespace_index.clear()
+    port_channel_member_index.clear()
+
+
+def is_db_connection_error(error):
+    """
+    Check if the exception reports a broken connection to the database.
+    swsscommon reports redis errors as RuntimeError with the redis error message
+    """
+    if isinstance(error, DB_CONNECTION_ERRORS):
+        return True
+    return isinstance(error, RuntimeError) and 'redis' in str(error).lower()
+
+
+def run_for_ns(namespace, func):
+    """
+    Run func with the pooled config DB handle of a namespace. If the connection
+    is broken, e.g. by a restart of the database, it is run once more with a new
+    connection. Other errors are raised to the caller
+
+    Returns:
+      the value returned by func
+    """
+    config_db = get_config_db_for_ns(namespace)
+    try:
+        return func(config_db)
+    except Exception as e:
+        if not is_db_connection_error(e):
+            raise
+        config_db_handle.pop(namespace, None)
+        return func(get_config_db_for_ns(namespace))
+
+
 def connect_to_all_dbs_for_ns(namespace=DEFAULT_NAMESPACE):
     """
     The function connects to the DBs for a given namespace and
@@ -218,11 +294,7 @@ def get_all_namespaces():
     if is_multi_asic():
         for asic in range(num_asics):
             namespace = "{}{}".format(ASIC_NAME_PREFIX, asic)
-            if namespace not in config_db_handle:
-                config_db_handle[namespace] =  connect_config_db_for_ns(namespace)
-            config_db = config_db_handle[namespace]
-
-            metadata = config_db.get_table('DEVICE_METADATA')
+            metadata = run_for_ns(namespace, lambda config_db: config_db.get_table('DEVICE_METADATA'))
             if metadata['localhost']['sub_role'] == FRONTEND_ASIC_SUB_ROLE:
                 front_ns.append(namespace)
             elif metadata['localhost']['sub_role'] == BACKEND_ASIC_SUB_ROLE:
@@ -283,14 +355,47 @@ def get_table(table, namespace=None):
     Returns:
         a dict of all entries of table across namespaces
     """
-    merged_table = {}
+    return get_tables([table], namespace)[table]
+
+
+def get_tables(tables, namespace=None):
+    """
+    Retrieves several tables at once, each one merged across specified namespaces
+
+    Returns:
+        a dict of table name -> dict of all entries of table across namespaces
+    """
+    merged_tables = {table: {} for table in tables}
+
+    for ns_tables in get_tables_by_namespace(tables, namespace).values():
+        for table, ns_table in ns_tables.items():
+            merged_tables[table].update(ns_table)
+
+    return merged_tables
+
+
+def get_tables_by_namespace(tables, namespace=None):
+    """
+    Retrieves several tables from each of specified namespaces.
+    The namespaces are read concurrently, each one over its pooled connection
+
+    Returns:
+        a dict of namespace -> dict of table name -> dict of entries,
+        ordered as the namespace list
+    """
     ns_list = get_namespace_list(namespace)
 
-    for ns in ns_list:
-        ns_table = get_table_for_asic(table, ns)
-        merged_table.update(ns_table)
+    def get_ns_tables(ns):
+        return run_for_ns(ns, lambda config_db: {table: config_db.get_table(table) for table in tables})
+
+    if len(ns_list) == 1:
+        return {ns_list[0]: get_ns_tables(ns_list[0])}
 
-    return merged_table
+    # Open the connections here, so that the worker threads only use them
+    for ns in ns_list:
+        get_config_db_for_ns(ns)
+    with ThreadPoolExecutor(max_workers=len(ns_list)) as executor:
+        return dict(zip(ns_list, executor.map(get_ns_tables, ns_list)))
 
 
 def get_port_entry_for_asic(port, namespace):
@@ -300,8 +405,19 @@ def get_port_entry_for_asic(port, namespace):
 
 def get_table_entry_for_asic(table, entry, namespace):
 
-    config_db = connect_config_db_for_ns(namespace)
-    return config_db.get_entry(table, entry)
+    return run_for_ns(namespace, lambda config_db: config_db.get_entry(table, entry))
+
+def table_entry_exists_for_asic(table, entry, namespace):
+    """
+    Checks if the entry is in the table. Unlike get_table_entry_for_asic(),
+    it also finds the entries without fields, e.g. PORTCHANNEL_MEMBER entries
+    """
+    def entry_exists(config_db):
+        client = config_db.get_redis_client(config_db.db_name)
+        return bool(client.exists('{}{}{}'.format(
+            table, config_db.TABLE_NAME_SEPARATOR, config_db.serialize_key(entry))))
+
+    return run_for_ns(namespace, entry_exists)
 
 def get_port_table_for_asic(namespace):
 
@@ -310,8 +426,7 @@ def get_port_table_for_asic(namespace):
 
 def get_table_for_asic(table, namespace):
 
-    config_db = connect_config_db_for_ns(namespace)
-    return config_db.get_table(table)
+    return run_for_ns(namespace, lambda config_db: config_db.get_table(table))
 
 
 def mod_entry(table, key, value, namespace=None, modIfExists=False):
@@ -325,20 +440,45 @@ def mod_entry(table, key, value, namespace=None, modIfExists=False):
 
     for ns in ns_list:
         if not modIfExists or get_table_entry_for_asic(table, key, ns):
-            config_db = connect_config_db_for_ns(ns)
-            config_db.mod_entry(table, key, value)
+            run_for_ns(ns, lambda config_db: config_db.mod_entry(table, key, value))
 
 
-def get_namespace_for_port(port_name):
+def build_namespace_index():
+    """
+    Rebuild the reverse indexes of ports and PortChannel members
+    from the PORT and PORTCHANNEL_MEMBER tables of all the namespaces
+    """
+    ns_tables = get_tables_by_namespace([PORT_CFG_DB_TABLE, PORT_CHANNEL_MEMBER_CFG_DB_TABLE])
 
-    ns_list = get_namespace_list()
-    port_namespace = None
+    port_namespace_index.clear()
+    port_channel_member_index.clear()
+    # The first namespace which has the entry wins, as with the lookups in namespace order
+    for ns, tables in reversed(list(ns_tables.items())):
+        for port in tables[PORT_CFG_DB_TABLE]:
+            port_namespace_index[port] = ns
+        for port_channel, member in reversed(list(tables[PORT_CHANNEL_MEMBER_CFG_DB_TABLE])):
+            port_channel_member_index[port_channel] = (ns, member)
 
-    for ns in ns_list:
-        ports = get_port_table_for_asic(ns)
-        if port_name in ports:
-            port_namespace = ns
-            break
+
+def lookup_namespace_index(index, name, is_valid):
+    """
+    Look up a name in a reverse index. The entry is validated with a
+    single read in its namespace; a stale or missing entry rebuilds the index
+
+    Returns:
+        the index entry or None if the name isn't in config_db
+    """
+    if name in index and is_valid(index[name]):
+        return index[name]
+    build_namespace_index()
+    return index.get(name)
+
+
+def get_namespace_for_port(port_name):
+
+    port_namespace = lookup_namespace_index(
+        port_namespace_index, port_name,
+        lambda ns: get_table_entry_for_asic(PORT_CFG_DB_TABLE, port_name, ns))
 
     if port_namespace is None:
         raise ValueError('Unknown port name {}'.format(port_name))
@@ -388,18 +528,24 @@ def is_port_channel_internal(port_channel, namespace=None):
     if not is_multi_asic():
         return False
 
-    ns_list = get_namespace_list(namespace)
-
-    for ns in ns_list:
-        config_db = connect_config_db_for_ns(ns)
-        port_channel_members = config_db.get_keys(PORT_CHANNEL_MEMBER_CFG_DB_TABLE)
-
+    if namespace is not None:
+        # PortChannels of different namespaces can have the same name,
+        # the index has only the first one
+        port_channel_members = get_table_for_asic(PORT_CHANNEL_MEMBER_CFG_DB_TABLE, namespace)
         for port_channel_member in port_channel_members:
             if port_channel_member[0] != port_channel:
                 continue
             return is_port_internal(port_channel_member[1], namespace)
+        return False
 
-    return False
+    entry = lookup_namespace_index(
+        port_channel_member_index, port_channel,
+        lambda entry: table_entry_exists_for_asic(PORT_CHANNEL_MEMBER_CFG_DB_TABLE, (port_channel, entry[1]), entry[0]))
+    if entry is None:
+        return False
+
+    # The member is in the namespace of the PortChannel
+    return is_port_internal(entry[1], entry[0])
 
 # Allow user to get a set() of back-end interface and back-end LAG per namespace
 # default is getting it for all name spaces if no namespace is specified
@@ -408,23 +554,21 @@ def get_back_end_interface_set(namespace=None):
     if not is_multi_asic():
         return None
 
-    port_table = get_port_table(namespace)
+    tables = get_tables([PORT_CFG_DB_TABLE, PORT_CHANNEL_MEMBER_CFG_DB_TABLE], namespace)
+    port_table = tables[PORT_CFG_DB_TABLE]
     for port, info in port_table.items():
         if PORT_ROLE in info and info[PORT_ROLE] == INTERNAL_PORT:
             bk_end_intf_list.append(port)
 
     if len(bk_end_intf_list):
-        ns_list = get_namespace_list(namespace)
-        for ns in ns_list:
-            config_db = connect_config_db_for_ns(ns)
-            port_channel_members = config_db.get_keys(PORT_CHANNEL_MEMBER_CFG_DB_TABLE)
-            # a back-end LAG must be configured with all of its member from back-end interfaces.
-            # mixing back-end and front-end interfaces is miss configuration and not allowed.
-            # To determine if a LAG is back-end LAG, just need to check its first member is back-end or not
-            # is sufficient. Note that a user defined LAG may have empty members so the list expansion logic
-            # need to ensure there are members before inspecting member[0].
-            bk_end_intf_list.extend(set([port_channel_member[0] for port_channel_member in port_channel_members\
-                                if port_channel_member[1] in bk_end_intf_list]))
+        port_channel_members = tables[PORT_CHANNEL_MEMBER_CFG_DB_TABLE]
+        # a back-end LAG must be configured with all of its member from back-end interfaces.
+        # mixing back-end and front-end interfaces is miss configuration and not allowed.
+        # To determine if a LAG is back-end LAG, just need to check its first member is back-end or not
+        # is sufficient. Note that a user defined LAG may have empty members so the list expansion logic
+        # need to ensure there are members before inspecting member[0].
+        bk_end_intf_list.extend(set([port_channel_member[0] for port_channel_member in port_channel_members\
+                            if port_channel_member[1] in bk_end_intf_list]))
     a = set()
     a.update(bk_end_intf_list)
     return a
@@ -438,15 +582,14 @@ def is_bgp_session_internal(bgp_neigh_ip, namespace=None):
 
     for ns in ns_list:
 
-        config_db = connect_config_db_for_ns(ns)
-        bgp_sessions = config_db.get_entry(
-            BGP_INTERNAL_NEIGH_CFG_DB_TABLE, bgp_neigh_ip
+        bgp_sessions = get_table_entry_for_asic(
+            BGP_INTERNAL_NEIGH_CFG_DB_TABLE, bgp_neigh_ip, ns
         )
         if bgp_sessions:
             return True
 
-        bgp_sessions = config_db.get_entry(
-            'BGP_VOQ_CHASSIS_NEIGHBOR', bgp_neigh_ip
+        bgp_sessions = get_table_entry_for_asic(
+            'BGP_VOQ_CHASSIS_NEIGHBOR', bgp_neigh_ip, ns
         )
         if bgp_sessions:
             return True
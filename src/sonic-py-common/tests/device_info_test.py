@@ -352,6 +352,74 @@ class TestDeviceInfo(object):
         mock_get_platform_json_data.return_value = {"DPUS": {"dpu0": {}, "dpu1": {}}}
         assert device_info.get_dpu_list() == ["dpu0", "dpu1"]
 
+    def test_cached_machine_info(self, tmpdir):
+        machine_conf = tmpdir.join("machine.conf")
+        machine_conf.write(MACHINE_CONF_CONTENTS)
+        device_info.refresh_device_info()
+        with mock.patch("sonic_py_common.device_info.MACHINE_CONF_PATH", str(machine_conf)), \
+                mock.patch("sonic_py_common.device_info._parse_machine_conf",
+                           side_effect=device_info._parse_machine_conf) as parse_mocked:
+            for _ in range(0, 5):
+                assert device_info.get_machine_info() == EXPECTED_GET_MACHINE_INFO_RESULT
+            assert parse_mocked.call_count == 1
+
+            # A modified file is parsed again
+            machine_conf.write(MACHINE_CONF_CONTENTS.replace("x86_64-mlnx_msn2700-r0", "x86_64-mlnx_msn2100-r0"))
+            os.utime(str(machine_conf), ns=(0, 0))
+            assert device_info.get_platform() == "x86_64-mlnx_msn2100-r0"
+            assert parse_mocked.call_count == 2
+
+            device_info.refresh_device_info()
+            assert device_info.get_platform() == "x86_64-mlnx_msn2100-r0"
+            assert parse_mocked.call_count == 3
+
+            # The caller gets a copy of the cached content
+            device_info.get_machine_info()["onie_platform"] = "modified"
+            assert device_info.get_platform() == "x86_64-mlnx_msn2100-r0"
+            assert parse_mocked.call_count == 3
+
+    def test_cached_platform_json_data(self, tmpdir):
+        platform_json = tmpdir.join("platform.json")
+        platform_json.write(json.dumps({"DPUS": {"dpu0": {}}}))
+        device_info.refresh_device_info()
+        with mock.patch("sonic_py_common.device_info.get_platform", return_value="x86_64-mlnx_msn2700-r0"), \
+                mock.patch("sonic_py_common.device_info.get_path_to_platform_dir", return_value=str(tmpdir)), \
+                mock.patch("sonic_py_common.device_info._read_text",
+                           side_effect=device_info._read_text) as read_mocked:
+            device_info.get_platform_json_data()["DPUS"]["dpu1"] = {}
+            assert device_info.get_platform_json_data() == {"DPUS": {"dpu0": {}}}
+            assert device_info.get_dpu_list() == ["dpu0"]
+            assert read_mocked.call_count == 1
+
+    def test_cached_localhost_info(self):
+        device_info.refresh_device_info()
+        device_info.device_info_cache.pubsub = None
+        messages = []
+        mock_cfg_inst = mock.MagicMock(db_name="CONFIG_DB", TABLE_NAME_SEPARATOR="|")
+        mock_cfg_inst.get_dbid.return_value = 4
+        mock_cfg_inst.get_table.return_value = {"localhost": {"hwsku": "Mellanox-SN2700"}}
+        pubsub = mock_cfg_inst.get_redis_client.return_value.pubsub.return_value
+        pubsub.get_message.side_effect = lambda: messages.pop(0) if messages else {}
+        with mock.patch("sonic_py_common.device_info.ConfigDBConnector", return_value=mock_cfg_inst) as mock_cfg_db:
+            for _ in range(0, 5):
+                assert device_info.get_hwsku() == "Mellanox-SN2700"
+            assert mock_cfg_db.call_count == 1
+            pubsub.psubscribe.assert_called_once_with("__keyspace@4__:DEVICE_METADATA|localhost")
+
+            # DEVICE_METADATA|localhost was changed
+            mock_cfg_inst.get_table.return_value = {"localhost": {"hwsku": "Mellanox-SN2100"}}
+            messages.append({"type": "pmessage", "channel": "__keyspace@4__:DEVICE_METADATA|localhost", "data": "hset"})
+            assert device_info.get_hwsku() == "Mellanox-SN2100"
+            assert device_info.get_hwsku() == "Mellanox-SN2100"
+            assert mock_cfg_db.call_count == 2
+
+            # The subscription is broken, ConfigDB is read again
+            pubsub.get_message.side_effect = Exception("connection lost")
+            assert device_info.get_hwsku() == "Mellanox-SN2100"
+            assert mock_cfg_db.call_count == 3
+        device_info.refresh_device_info()
+        device_info.device_info_cache.pubsub = None
+
     @classmethod
     def teardown_class(cls):
         print("TEARDOWN")
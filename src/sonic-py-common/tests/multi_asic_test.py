@@ -1,6 +1,117 @@
+from unittest import mock
+
 from sonic_py_common import multi_asic
 
 
+class FakeConfigDB:
+    TABLE_NAME_SEPARATOR = '|'
+    KEY_SEPARATOR = '|'
+    db_name = 'CONFIG_DB'
+
+    def __init__(self, tables):
+        self.tables = tables
+
+    def get_table(self, table):
+        return dict(self.tables.get(table, {}))
+
+    def get_entry(self, table, key):
+        return dict(self.tables.get(table, {}).get(key, {}))
+
+    def serialize_key(self, key):
+        return self.KEY_SEPARATOR.join(key) if isinstance(key, tuple) else key
+
+    def get_redis_client(self, db_name):
+        client = mock.MagicMock()
+        client.exists.side_effect = lambda key: any(
+            '{}|{}'.format(table, self.serialize_key(entry)) == key
+            for table, entries in self.tables.items() for entry in entries)
+        return client
+
+
+ASIC_TABLES = {
+    'asic0': {
+        'PORT': {'Ethernet0': {'lanes': '0'}, 'Ethernet-BP0': {'lanes': '8', 'role': 'Int'}},
+        'PORTCHANNEL_MEMBER': {('PortChannel0001', 'Ethernet0'): {},
+                               ('PortChannel4001', 'Ethernet-BP0'): {}},
+    },
+    'asic1': {
+        'PORT': {'Ethernet4': {'lanes': '4'}, 'Ethernet-BP4': {'lanes': '12', 'role': 'Int'}},
+        'PORTCHANNEL_MEMBER': {('PortChannel4002', 'Ethernet-BP4'): {}},
+    },
+}
+
+
 class TestMultiAsic:
+    def setup_method(self):
+        multi_asic.clear_config_db_handles()
+        self.connect = mock.patch.object(
+            multi_asic, 'connect_config_db_for_ns', side_effect=lambda ns: FakeConfigDB(ASIC_TABLES[ns]))
+        self.connect_mocked = self.connect.start()
+        self.patches = [
+            self.connect,
+            mock.patch.object(multi_asic, 'is_multi_asic', return_value=True),
+            mock.patch.object(multi_asic, 'get_namespaces_from_linux', return_value=['asic0', 'asic1']),
+        ]
+        for patch in self.patches[1:]:
+            patch.start()
+
+    def teardown_method(self):
+        for patch in self.patches:
+            patch.stop()
+        multi_asic.clear_config_db_handles()
+
     def test_get_container_name_from_asic_id(self):
         assert multi_asic.get_container_name_from_asic_id('database', 0) == 'database0'
+
+    def test_get_tables(self):
+        tables = multi_asic.get_tables(['PORT', 'PORTCHANNEL_MEMBER'])
+        assert set(tables['PORT']) == {'Ethernet0', 'Ethernet-BP0', 'Ethernet4', 'Ethernet-BP4'}
+        assert len(tables['PORTCHANNEL_MEMBER']) == 3
+        assert multi_asic.get_table('PORT', 'asic1') == ASIC_TABLES['asic1']['PORT']
+        # One pooled connection per namespace
+        assert self.connect_mocked.call_count == 2
+
+    def test_reverse_index(self):
+        for _ in range(3):
+            assert multi_asic.get_namespace_for_port('Ethernet4') == 'asic1'
+            assert multi_asic.is_port_channel_internal('PortChannel4002')
+            assert not multi_asic.is_port_channel_internal('PortChannel0001')
+        assert multi_asic.get_back_end_interface_set() == \
+            {'Ethernet-BP0', 'Ethernet-BP4', 'PortChannel4001', 'PortChannel4002'}
+        assert self.connect_mocked.call_count == 2
+
+        # A port moved to another namespace is found again
+        with mock.patch.dict(ASIC_TABLES['asic1']['PORT'], clear=True), \
+                mock.patch.dict(ASIC_TABLES['asic0']['PORT'], {'Ethernet4': {'lanes': '4'}}):
+            assert multi_asic.get_namespace_for_port('Ethernet4') == 'asic0'
+        # An unknown port rebuilds the index before failing
+        with mock.patch.object(multi_asic, 'build_namespace_index',
+                               side_effect=multi_asic.build_namespace_index) as build_mocked:
+            try:
+                multi_asic.get_namespace_for_port('Ethernet8')
+                assert False
+            except ValueError:
+                pass
+            assert build_mocked.call_count == 1
+
+    def test_broken_connection(self):
+        assert multi_asic.get_table_entry_for_asic('PORT', 'Ethernet0', 'asic0') == {'lanes': '0'}
+        multi_asic.config_db_handle['asic0'].get_entry = mock.MagicMock(
+            side_effect=RuntimeError('Unable to connect to redis: Connection refused'))
+        assert multi_asic.get_table_entry_for_asic('PORT', 'Ethernet0', 'asic0') == {'lanes': '0'}
+        assert self.connect_mocked.call_count == 2
+
+        multi_asic.config_db_handle['asic0'].get_entry = mock.MagicMock(side_effect=ConnectionError())
+        assert multi_asic.get_table_entry_for_asic('PORT', 'Ethernet0', 'asic0') == {'lanes': '0'}
+        assert self.connect_mocked.call_count == 3
+
+    def test_failure_not_retried(self):
+        assert multi_asic.get_table_entry_for_asic('PORT', 'Ethernet0', 'asic0') == {'lanes': '0'}
+        multi_asic.config_db_handle['asic0'].get_entry = mock.MagicMock(side_effect=ValueError('bad key'))
+        try:
+            multi_asic.get_table_entry_for_asic('PORT', 'Ethernet0', 'asic0')
+            assert False
+        except ValueError:
+            pass
+        assert self.connect_mocked.call_count == 1
+        assert multi_asic.config_db_handle['asic0'].get_entry.call_count == 1
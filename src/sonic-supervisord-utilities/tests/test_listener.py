@@ -135,3 +135,72 @@ def test_main_snmp(mock_time, mock_os_kill):
             with pytest.raises(StopTestLoop):
                 main(["--container-name", "snmp"])
     mock_os_kill.assert_not_called()
+
+
+class MockSubscriber:
+    def __init__(self, events):
+        self.events = list(events)
+
+    def hasData(self):
+        return len(self.events) > 0
+
+    def pop(self):
+        return self.events.pop(0)
+
+    def getFd(self):
+        return 0
+
+
+@mock.patch('supervisor_proc_exit_listener.swsscommon.ConfigDBConnector', ConfigDBConnector)
+def test_config_cache():
+    with mock.patch('supervisor_proc_exit_listener.swsscommon.DBConnector', side_effect=RuntimeError("no db")):
+        config_cache = ConfigCache(False)
+    assert config_cache.fds == []
+    assert get_autorestart_state("swss", config_cache) == "enabled"
+
+    subscribers = {
+        FEATURE_TABLE_NAME: MockSubscriber([("swss", "SET", (("auto_restart", "disabled"),)), ("snmp", "DEL", ())]),
+        HEARTBEAT_TABLE_NAME: MockSubscriber([("orchagent", "SET", (("alert_interval", "30000"),))])
+    }
+    with mock.patch('supervisor_proc_exit_listener.swsscommon.DBConnector'), \
+            mock.patch('supervisor_proc_exit_listener.swsscommon.Select') as mock_select, \
+            mock.patch('supervisor_proc_exit_listener.swsscommon.SubscriberStateTable',
+                       side_effect=lambda db, table_name: subscribers[table_name]):
+        mock_select.OBJECT = 0
+        mock_select.TIMEOUT = 1
+        mock_select.return_value.select.side_effect = [(0, None), (1, None)]
+        config_cache = ConfigCache(False)
+        assert config_cache.fds == [0, 0]
+        # Tables are read once
+        with mock.patch.object(config_cache, 'read_table', wraps=config_cache.read_table) as mock_read_table:
+            assert get_autorestart_state("swss", config_cache) == "enabled"
+            assert get_heartbeat_alert_interval("orchagent", config_cache) == 60
+            assert get_autorestart_state("swss", config_cache) == "enabled"
+            assert mock_read_table.call_count == 2
+        assert config_cache.process_updates() == {FEATURE_TABLE_NAME, HEARTBEAT_TABLE_NAME}
+        assert get_autorestart_state("swss", config_cache) == "disabled"
+        assert "snmp" not in config_cache.get_table(FEATURE_TABLE_NAME)
+        assert get_heartbeat_alert_interval("orchagent", config_cache) == 30
+
+
+@mock.patch('supervisor_proc_exit_listener.generate_alerting_message')
+@mock.patch('supervisor_proc_exit_listener.time.time')
+def test_check_heartbeat_deadlines(mock_time, mock_generate_alerting_message):
+    config_cache = MagicMock()
+    config_cache.get_table.return_value = {"orchagent": {"alert_interval": "30000"}, "snmpd": {"alert_interval": "0"}}
+    process_heart_beat_info = defaultdict(dict)
+    heartbeat_deadlines = []
+    for process, last_heart_beat in [("orchagent", 100), ("orchagent", 110), ("snmpd", 100)]:
+        process_heart_beat_info[process]["last_heart_beat"] = last_heart_beat
+        schedule_heartbeat_check(heartbeat_deadlines, process, last_heart_beat, config_cache)
+    # Alerting of snmpd is disabled
+    assert len(heartbeat_deadlines) == 2
+
+    mock_time.return_value = 135
+    check_heartbeat_deadlines(heartbeat_deadlines, process_heart_beat_info)
+    mock_generate_alerting_message.assert_not_called()
+
+    mock_time.return_value = 200
+    check_heartbeat_deadlines(heartbeat_deadlines, process_heart_beat_info)
+    mock_generate_alerting_message.assert_called_once_with("orchagent", "stuck", 1, syslog.LOG_WARNING)
+    assert heartbeat_deadlines == [(200 + SELECT_TIMEOUT_SECS, "orchagent", 110)]
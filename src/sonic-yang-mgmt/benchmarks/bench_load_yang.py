@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Measure SonicYang.loadYangModel() without the yang model cache, and with a
+cache which is warmed up by the first load.
+
+Example:
+    ./benchmarks/bench_load_yang.py -d /usr/local/yang-models -n 5
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import sonic_yang
+
+
+def load(yang_dir, cache_dir, count):
+    times = []
+    for _ in range(count):
+        start = time.perf_counter()
+        sy = sonic_yang.SonicYang(yang_dir, print_log_enabled=False, cache_dir=cache_dir)
+        sy.loadYangModel()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark yang model loading")
+    parser.add_argument("-d", "--yang-dir", default="/usr/local/yang-models", help="directory of yang models")
+    parser.add_argument("-n", "--count", type=int, default=5, help="number of loads")
+    args = parser.parse_args()
+
+    cache_dir = tempfile.mkdtemp()
+    try:
+        cold = load(args.yang_dir, None, args.count)
+        # the first load writes the cache
+        load(args.yang_dir, cache_dir, 1)
+        warm = load(args.yang_dir, cache_dir, args.count)
+    finally:
+        shutil.rmtree(cache_dir)
+
+    print("no cache:   min {:.3f}s avg {:.3f}s".format(min(cold), sum(cold) / len(cold)))
+    print("warm cache: min {:.3f}s avg {:.3f}s".format(min(warm), sum(warm) / len(warm)))
+
+
+if __name__ == "__main__":
+    main()
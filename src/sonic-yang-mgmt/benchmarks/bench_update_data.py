@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Compare validation of a one-port change by loading the whole changed config
+with SonicYang.loadData() against SonicYang.updateData() of the loaded config.
+
+Example:
+    ./benchmarks/bench_update_data.py -d /usr/local/yang-models -c config_db.json -n 10
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import sonic_yang
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark incremental validation")
+    parser.add_argument("-d", "--yang-dir", default="/usr/local/yang-models", help="directory of yang models")
+    parser.add_argument("-c", "--config", required=True, help="config DB json file")
+    parser.add_argument("-n", "--count", type=int, default=10, help="number of changes")
+    args = parser.parse_args()
+
+    with open(args.config) as f:
+        config = json.load(f)
+    port = next(iter(config['PORT']))
+
+    sy = sonic_yang.SonicYang(args.yang_dir, print_log_enabled=False)
+    sy.loadYangModel()
+
+    start = time.perf_counter()
+    for i in range(args.count):
+        changed = dict(config, PORT=dict(config['PORT']))
+        changed['PORT'][port] = dict(config['PORT'][port], description="change {}".format(i))
+        sy.loadData(changed)
+        sy.validate_data_tree()
+    full = (time.perf_counter() - start) / args.count
+
+    sy.loadData(config)
+    start = time.perf_counter()
+    for i in range(args.count):
+        sy.updateData({'PORT': {port: dict(config['PORT'][port], description="change {}".format(i))}})
+    incremental = (time.perf_counter() - start) / args.count
+
+    print("tables: {} entries: {}".format(len(config), sum(len(t) for t in config.values() if isinstance(t, dict))))
+    print("loadData + validate: {:.3f}s per change".format(full))
+    print("updateData:          {:.3f}s per change".format(incremental))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,10 @@
 import yang as ly
 import syslog
 
+from collections import OrderedDict
 from json import dump
 from glob import glob
-from sonic_yang_ext import SonicYangExtMixin, SonicYangException
+from sonic_yang_ext import SonicYangExtMixin, SonicYangException, YANG_CACHE_DIR, SYSTEM_YANG_CACHE_DIR
 from sonic_yang_path import SonicYangPathMixin
 
 """
@@ -13,8 +14,14 @@ i.e. it is mixin not parent class.
 """
 class SonicYang(SonicYangExtMixin, SonicYangPathMixin):
 
-    def __init__(self, yang_dir, debug=False, print_log_enabled=True, sonic_yang_options=0):
+    def __init__(self, yang_dir, debug=False, print_log_enabled=True, sonic_yang_options=0,
+                 cache_dir=YANG_CACHE_DIR):
         self.yang_dir = yang_dir
+        # directory of the yang model cache, None disables the cache
+        self.cache_dir = cache_dir
+        # cache file and digest of the yang models, which is the key of the cache
+        self.yangCacheFile = None
+        self.yangCacheDigest = None
         self.ctx = None
         self.module = None
         self.root = None
@@ -48,8 +55,12 @@ class SonicYang(SonicYangExtMixin, SonicYangPathMixin):
         self.backlinkCache = dict()
         # Lazy caching for must counts
         self.mustCache = dict()
-        # Lazy caching for configdb to xpath
-        self.configPathCache = dict()
+        # LRU cache of configdb path to xpath conversions and back
+        self.configPathCache = OrderedDict()
+        # Lazy index of yang models by name, used by the path conversions
+        self.schemaIndex = dict()
+        # True if the last configdb path conversion used the configdb value
+        self.configdbValueUsed = False
         # element path for CONFIG DB. An example for this list could be:
         # ['PORT', 'Ethernet0', 'speed']
         self.elementPath = []
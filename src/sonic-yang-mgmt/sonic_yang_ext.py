@@ -8,8 +8,23 @@ from json import dump, dumps, loads
 from xmltodict import parse
 from glob import glob
 import copy
+import hashlib
+import os
+import pickle
+import stat
+import tempfile
 from sonic_yang_path import SonicYangPathMixin
 
+# Directory of the cache of python structures derived from YANG models, see
+# loadYangModel(). The cache is disabled unless SONIC_YANG_CACHE_DIR is set,
+# and it isn't used if the directory can't be written.
+YANG_CACHE_DIR = os.environ.get('SONIC_YANG_CACHE_DIR') or None
+# Cache directory of the yang models installed on the switch, used by the
+# tools which load them (sonic-cfggen -Y, sonic-cfg-help)
+SYSTEM_YANG_CACHE_DIR = '/var/cache/sonic-yang-mgmt'
+# Must be bumped when the derived structures change
+YANG_CACHE_VERSION = 1
+
 Type_1_list_maps_model = [
     'DSCP_TO_TC_MAP_LIST',
     'DOT1P_TO_TC_MAP_LIST',
@@ -68,12 +83,23 @@ class SonicYangExtMixin(SonicYangPathMixin):
             self.sysLog(syslog.LOG_DEBUG,'Loaded below Yang Models')
             self.sysLog(syslog.LOG_DEBUG,str(self.yangFiles))
 
+            # path conversions refer to the models, which are loaded again
+            self.schemaIndex = dict()
+            self.configPathCache.clear()
+
+            # json of yang models, config DB table map and groupings
+            # are the same as the last time these yang models were loaded
+            if self._loadYangModelCache():
+                return True
+
             # load json for each yang model
             self._loadJsonYangModel()
             # create a map from config DB table to yang container
             self._createDBTableToModuleMap()
             # compile uses clause (embed into schema)
             self._compileUsesClause()
+            # save it for the next load
+            self._storeYangModelCache()
         except Exception as e:
             self.sysLog(msg="Yang Models Load failed:{}".format(str(e)), \
                 debug=syslog.LOG_ERR, doPrint=True)
@@ -81,6 +107,75 @@ class SonicYangExtMixin(SonicYangPathMixin):
 
         return True
 
+    """
+    Get path of the cache file and digest of yang models in self.yang_dir.
+    The digest covers names and content of all yang files, so the cache is
+    rebuilt when any yang model is added, removed or changed.
+    """
+    def _yangModelCacheKey(self):
+        digest = hashlib.sha256(str(YANG_CACHE_VERSION).encode())
+        for file in sorted(glob(self.yang_dir + "/*.yang")):
+            digest.update(os.path.basename(file).encode())
+            with open(file, 'rb') as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+        dirName = hashlib.sha1(os.path.abspath(self.yang_dir).encode()).hexdigest()
+        return os.path.join(self.cache_dir, "yang-{}.pickle".format(dirName)), digest.hexdigest()
+
+    """
+    Load yJson, confDbYangMap and preProcessedYang from the cache, if it is
+    valid for the yang models. Returns True if they were loaded.
+    """
+    def _loadYangModelCache(self):
+        if not self.cache_dir:
+            return False
+        try:
+            cacheFile, digest = self._yangModelCacheKey()
+            self.yangCacheFile, self.yangCacheDigest = cacheFile, digest
+            st = os.stat(cacheFile)
+            # the cache is unpickled, use it only if nobody else could write it
+            if st.st_uid not in (0, os.getuid()) or st.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+                return False
+            with open(cacheFile, 'rb') as f:
+                cache = pickle.load(f)
+            if cache.get('digest') != digest:
+                return False
+        except Exception as e:
+            self.sysLog(syslog.LOG_DEBUG, "Yang model cache is not used: {}".format(str(e)))
+            return False
+
+        self.yJson = cache['yJson']
+        self.confDbYangMap = cache['confDbYangMap']
+        self.preProcessedYang = cache['preProcessedYang']
+        self.sysLog(msg="Loaded yang models from cache {}".format(cacheFile))
+        return True
+
+    """
+    Store yJson, confDbYangMap and preProcessedYang in the cache. They are
+    pickled together, so the references between them are kept.
+    """
+    def _storeYangModelCache(self):
+        if not self.cache_dir or self.yangCacheDigest is None:
+            return
+        tmpFile = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmpFile = tempfile.mkstemp(dir=self.cache_dir, prefix=".yang-")
+            os.fchmod(fd, 0o644)
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump({
+                    'digest': self.yangCacheDigest,
+                    'yJson': self.yJson,
+                    'confDbYangMap': self.confDbYangMap,
+                    'preProcessedYang': self.preProcessedYang,
+                }, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmpFile, self.yangCacheFile)
+            tmpFile = None
+        except Exception as e:
+            self.sysLog(syslog.LOG_DEBUG, "Yang model cache is not stored: {}".format(str(e)))
+        finally:
+            if tmpFile is not None:
+                os.unlink(tmpFile)
+
     """
     load JSON schema format from yang models
     """
@@ -1255,6 +1350,103 @@ class SonicYangExtMixin(SonicYangPathMixin):
 
        return True
 
+    """
+    update_data: apply changes of config DB tables to the loaded data tree and
+    validate it. Only the changed tables are xlated and replaced in the data
+    tree, the rest of the tree is kept as it was loaded. (Public)
+    input:    changes - dict of {table: {key: entry}}, where entry replaces
+              the entry of the key, or is None to delete the key. A table
+              which is None is deleted. changes will NOT be modified
+    returns:  True - success, SonicYangException on failure. After a failure
+              the data loaded before this call is kept, and the next call
+              reloads the whole data tree.
+    """
+    def updateData(self, changes):
+
+        # without a data tree, load the whole config
+        if self.root is None:
+            return self.loadData(self._applyTableChanges(self.jIn, changes, self.tablesWithOutYang))
+
+        jIn = dict(self.jIn)
+        xlateJson = {key: dict(value) for key, value in self.xlateJson.items()}
+        try:
+            for table in changes:
+                if table not in self.confDbYangMap:
+                    continue
+                cmap = self.confDbYangMap[table]
+                key = cmap['module']+":"+cmap['topLevelContainer']
+                subkey = cmap['topLevelContainer']+":"+cmap['container']['@name']
+                newTable = self._applyTableChanges(jIn, {table: changes[table]}).get(table)
+
+                # remove the table from data tree
+                if table in jIn:
+                    xpath = "/{}:{}/{}".format(cmap['module'], cmap['topLevelContainer'], table)
+                    node = self._find_data_node(xpath)
+                    if node is not None and self._deleteNode(xpath=xpath, node=node) == False:
+                        raise Exception('Failed to delete {}'.format(xpath))
+                    del jIn[table]
+                    xlateJson.get(key, {}).pop(subkey, None)
+
+                if not newTable:
+                    continue
+                # xlate only this table and merge it in data tree. The table
+                # alone may not be valid, so it is validated with the tree.
+                yangJ = {key: {subkey: dict()}}
+                self.elementPath = [table]
+                try:
+                    self._xlateContainer(cmap['container'], yangJ[key][subkey], newTable, table)
+                finally:
+                    self.elementPath = []
+                node = self.ctx.parse_data_mem(dumps(yangJ), ly.LYD_JSON, \
+                    ly.LYD_OPT_CONFIG|ly.LYD_OPT_STRICT|ly.LYD_OPT_TRUSTED)
+                self.root.merge(node, 0)
+                jIn[table] = newTable
+                xlateJson.setdefault(key, dict())[subkey] = yangJ[key][subkey]
+
+            self.sysLog(msg="Validate updated data tree")
+            self.root.validate(ly.LYD_OPT_CONFIG, self.ctx)
+        except Exception as e:
+            # the data tree may be changed partially, it is reloaded next time
+            self.root = None
+            self.sysLog(msg="Data Update Failed:{}".format(str(e)), \
+                debug=syslog.LOG_ERR, doPrint=True)
+            raise SonicYangException("Data Update Failed\n{}".format(str(e)))
+
+        self.jIn = jIn
+        self.xlateJson = xlateJson
+        # keep tables without yang models as loadData() does
+        self.tablesWithOutYang = self._applyTableChanges(self.tablesWithOutYang, \
+            {table: changes[table] for table in changes if table not in self.confDbYangMap})
+
+        return True
+
+    """
+    Apply changes in the format of updateData() to a config DB json.
+    Return updated copy of the config, unchanged tables are not copied.
+    If tablesWithOutYang is given, it is merged in the config as well.
+    """
+    def _applyTableChanges(self, config, changes, tablesWithOutYang=None):
+
+        config = dict(config)
+        if tablesWithOutYang:
+            config.update(tablesWithOutYang)
+        for table, tableChanges in changes.items():
+            if tableChanges is None:
+                config.pop(table, None)
+                continue
+            newTable = dict(config.get(table, dict()))
+            for key, entry in tableChanges.items():
+                if entry is None:
+                    newTable.pop(key, None)
+                else:
+                    newTable[key] = entry
+            if newTable:
+                config[table] = newTable
+            else:
+                config.pop(table, None)
+
+        return config
+
     """
     Get data from Data tree, data tree will be assigned in self.xlateJson. (Public)
     """
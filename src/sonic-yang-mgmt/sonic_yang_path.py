@@ -8,6 +8,9 @@ import re
 from jsonpointer import JsonPointer
 from typing import List
 
+# Max number of converted paths kept in configPathCache
+PATH_CACHE_SIZE = 65536
+
 # class sonic_yang methods related to path handling, use mixin to extend sonic_yang
 class SonicYangPathMixin:
     """
@@ -85,9 +88,10 @@ class SonicYangPathMixin:
             return "/"
 
         # Fetch from cache if available
-        key = (configdb_path, schema_xpath)
+        key = ('xpath', configdb_path, schema_xpath)
         result = self.configPathCache.get(key)
         if result is not None:
+            self.configPathCache.move_to_end(key)
             return result
 
         # Not available, go through conversion
@@ -103,12 +107,14 @@ class SonicYangPathMixin:
         # getting the top level element <module>:<topLevelContainer>
         xpath_tokens.append(cmap['module']+":"+cmap['topLevelContainer'])
 
+        self.configdbValueUsed = False
         xpath_tokens.extend(self.__get_xpath_tokens_from_container(cmap['container'], tokens, 0, schema_xpath, configdb))
 
         xpath = self.xpath_join(xpath_tokens, schema_xpath)
 
-        # Save to cache
-        self.configPathCache[key] = xpath
+        # Save to cache, unless it points to a leaf-list value found in configdb
+        if not self.configdbValueUsed:
+            self.__path_cache_put(key, xpath)
 
         return xpath
 
@@ -122,6 +128,15 @@ class SonicYangPathMixin:
           xpath: /sonic-vlan:sonic-vlan/VLAN_MEMBER/VLAN_MEMBER_LIST[name='Vlan1000'][port='Ethernet8']/tagging_mode
           path: /VLAN_MEMBER/Vlan1000|Ethernet8/tagging_mode
         """
+        # Only the index of a leaf-list value depends on the content of configdb
+        cacheable = configdb is None or "[.=" not in xpath
+        key = ('configdb_path', xpath, configdb is not None)
+        if cacheable:
+            result = self.configPathCache.get(key)
+            if result is not None:
+                self.configPathCache.move_to_end(key)
+                return result
+
         tokens = self.xpath_split(xpath)
         if len(tokens) == 0:
             return ""
@@ -133,7 +148,51 @@ class SonicYangPathMixin:
         cmap = self.confDbYangMap[table]
 
         configdb_path_tokens = self.__get_configdb_path_tokens_from_container(cmap['container'], tokens, 1, configdb)
-        return self.configdb_path_join(configdb_path_tokens)
+        configdb_path = self.configdb_path_join(configdb_path_tokens)
+        if cacheable:
+            self.__path_cache_put(key, configdb_path)
+        return configdb_path
+
+
+    def __path_cache_put(self, key, path):
+        self.configPathCache[key] = path
+        if len(self.configPathCache) > PATH_CACHE_SIZE:
+            self.configPathCache.popitem(last=False)
+
+
+    # Index of the child nodes of a container or list model, so that they are
+    # found by name instead of scanning the model. It is built on first use of
+    # the model, and dropped with the models by loadYangModel().
+    def __get_model_index(self, model: dict) -> dict:
+        index = self.schemaIndex.get(id(model))
+        if index is not None:
+            return index
+
+        def as_list(node):
+            if node is None:
+                return []
+            return node if isinstance(node, list) else [node]
+
+        index = {'leaf': set(), 'leaf-list': dict(), 'container': dict(), 'list': dict(), 'list_by_key_count': dict()}
+        # leaves of choices are indexed as leaves, they are handled the same way
+        leaves = as_list(model.get('leaf'))
+        for choice in as_list(model.get('choice')):
+            for case in as_list(choice.get('case')):
+                leaves.extend(as_list(case.get('leaf')))
+        index['leaf'] = set(leaf['@name'] for leaf in leaves)
+        for kind in ['leaf-list', 'container', 'list']:
+            for child in as_list(model.get(kind)):
+                # first model with the name wins, as with the scans of the model
+                index[kind].setdefault(child['@name'], child)
+        clist = model.get('list')
+        if isinstance(clist, list):
+            for list_model in clist:
+                index['list_by_key_count'].setdefault(len(list_model['key']['@value'].split()), list_model)
+        if model.get('key') is not None:
+            index['keys'] = model['key']['@value'].split()
+
+        self.schemaIndex[id(model)] = index
+        return index
 
 
     def __get_xpath_tokens_from_container(self, model: dict, configdb_path_tokens: List[str], token_index: int, schema_xpath: bool, configdb: dict) -> List[str]:
@@ -151,7 +210,7 @@ class SonicYangPathMixin:
             return xpath_tokens
 
         # check if it is targetting a child container
-        child_container_model = self.__get_model(model.get('container'), configdb_path_tokens[token_index+1])
+        child_container_model = self.__get_model_index(model)['container'].get(configdb_path_tokens[token_index+1])
         if child_container_model:
             new_xpath_tokens = self.__get_xpath_tokens_from_container(child_container_model, configdb_path_tokens, token_index+1, schema_xpath, configdb)
             xpath_tokens.extend(new_xpath_tokens)
@@ -163,21 +222,6 @@ class SonicYangPathMixin:
         return xpath_tokens
 
 
-    # Locate a model matching the given name.  If the model provided is a dict,
-    # it simply ensures the name matches and returns self.  If the model
-    # provided is a list it scans the list for a matching name and returns that
-    # model.
-    def __get_model(self, model, name: str) -> dict:
-        if isinstance(model, dict) and model['@name'] == name:
-            return model
-        if isinstance(model, list):
-            for submodel in model:
-                if submodel['@name'] == name:
-                    return submodel
-
-        return None
-
-
     # A configdb list specifies the container name, plus the keys separated by |.  We are 
     # scanning the model for a list with a matching *number* of keys and returning the
     # reference to the model with the definition.  It is not valid to have 2 lists in
@@ -194,14 +238,11 @@ class SonicYangPathMixin:
             configdb_values_str = configdb_path_tokens[token_index+1]
             # Format: "value1|value2|value|..."
             configdb_values = configdb_values_str.split("|")
-            for list_model in clist:
-                yang_keys_str = list_model['key']['@value']
-                # Format: "key1 key2 key3 ..."
-                yang_keys = yang_keys_str.split()
-                # if same number of values and keys, this is the intended list-model
-                # TODO: Match also on types and not only the length of the keys/values
-                if len(yang_keys) == len(configdb_values):
-                    return list_model
+            # if same number of values and keys, this is the intended list-model
+            # TODO: Match also on types and not only the length of the keys/values
+            list_model = self.__get_model_index(model)['list_by_key_count'].get(len(configdb_values))
+            if list_model is not None:
+                return list_model
             raise ValueError(f"Container {parent_container_name} has multiple lists, "
                              f"but none of them match the config_db value {configdb_values_str}")
 
@@ -212,7 +253,7 @@ class SonicYangPathMixin:
         if schema_xpath:
             item_token = model['@name']
         else:
-            keyDict = self.__parse_configdb_key_to_dict(model['key']['@value'], configdb_path_tokens[token_index])
+            keyDict = self.__parse_configdb_key_to_dict(self.__get_model_index(model)['keys'], configdb_path_tokens[token_index])
             keyTokens = [f"[{key}='{keyDict[key]}']" for key in keyDict]
             item_token = f"{model['@name']}{''.join(keyTokens)}"
 
@@ -236,12 +277,11 @@ class SonicYangPathMixin:
 
     # Parse configdb key like Vlan1000|Ethernet8 (such as a key might be under /VLAN_MEMBER/)
     # into its key/value dictionary form: { "name": "VLAN1000", "port": "Ethernet8" }
-    def __parse_configdb_key_to_dict(self, listKeys: str, configDbKey: str) -> dict:
-        xpath_list_keys = listKeys.split()
+    def __parse_configdb_key_to_dict(self, xpath_list_keys: List[str], configDbKey: str) -> dict:
         configdb_values = configDbKey.split("|")
         # match lens
         if len(xpath_list_keys) != len(configdb_values):
-            raise ValueError("Value not found for {} in {}".format(listKeys, configDbKey))
+            raise ValueError("Value not found for {} in {}".format(" ".join(xpath_list_keys), configDbKey))
         # create the keyDict
         rv = dict()
         for i in range(len(xpath_list_keys)):
@@ -274,31 +314,25 @@ class SonicYangPathMixin:
     # This function outputs the xpath token for leaf, choice, and leaf-list entries.
     def __get_xpath_token_from_leaf(self, model: dict, configdb_path_tokens: List[str], token_index: int, schema_xpath: bool, configdb: dict) -> str:
         token = configdb_path_tokens[token_index]
+        index = self.__get_model_index(model)
 
-        # checking all leaves
-        leaf_model = self.__get_model(model.get('leaf'), token)
-        if leaf_model:
+        # checking all leaves, including the leaves of choices
+        if token in index['leaf']:
             return token
 
-        # checking choice
-        choices = model.get('choice')
-        if choices:
-            for choice in choices:
-                cases = choice['case']
-                for case in cases:
-                    leaf_model = self.__get_model(case.get('leaf'), token)
-                    if leaf_model:
-                        return token
-
         # checking leaf-list (i.e. arrays of string, number or bool)
-        leaf_list_model = self.__get_model(model.get('leaf-list'), token)
+        leaf_list_model = index['leaf-list'].get(token)
         if leaf_list_model:
             # If there are no more tokens, just return the current token.
             if len(configdb_path_tokens)-1 == token_index:
                 return token
 
+            if schema_xpath:
+                return token
+            # the xpath depends on configdb, it isn't cached
+            self.configdbValueUsed = True
             value = self.__get_configdb_value(configdb_path_tokens, configdb)
-            if value is None or schema_xpath:
+            if value is None:
                 return token
 
             # Reference an explicit leaf list value
@@ -371,16 +405,17 @@ class SonicYangPathMixin:
         if configdb is not None:
             configdb = configdb[token]
 
+        index = self.__get_model_index(model)
         # check child list
         list_name = xpath_tokens[token_index+1].split("[")[0]
-        list_model = self.__get_model(model.get('list'), list_name)
+        list_model = index['list'].get(list_name)
         if list_model:
             new_path_tokens = self.__get_configdb_path_tokens_from_list(list_model, xpath_tokens, token_index+1, configdb)
             configdb_path_tokens.extend(new_path_tokens)
             return configdb_path_tokens
 
         container_name = xpath_tokens[token_index+1]
-        container_model = self.__get_model(model.get('container'), container_name)
+        container_model = index['container'].get(container_name)
         if container_model:
             new_path_tokens = self.__get_configdb_path_tokens_from_container(container_model, xpath_tokens, token_index+1, configdb)
             configdb_path_tokens.extend(new_path_tokens)
@@ -426,8 +461,7 @@ class SonicYangPathMixin:
         if not(key_dict):
             return []
 
-        listKeys = model['key']['@value']
-        key_list = listKeys.split()
+        key_list = self.__get_model_index(model)['keys']
 
         if len(key_list) != len(key_dict):
             raise ValueError(f"Keys in configDb not matching keys in SonicYang. ConfigDb keys: {key_dict.keys()}. SonicYang keys: {key_list}")
@@ -468,26 +502,16 @@ class SonicYangPathMixin:
 
     def __get_configdb_path_tokens_from_leaf(self, model: dict, xpath_tokens: List[str], token_index: int, configdb: dict) -> List[str]:
         token = xpath_tokens[token_index]
+        index = self.__get_model_index(model)
 
-        # checking all leaves
-        leaf_model = self.__get_model(model.get('leaf'), token)
-        if leaf_model:
+        # checking all leaves, including the leaves of choices
+        if token in index['leaf']:
             return [token]
 
-        # checking choices
-        choices = model.get('choice')
-        if choices:
-            for choice in choices:
-                cases = choice['case']
-                for case in cases:
-                    leaf_model = self.__get_model(case.get('leaf'), token)
-                    if leaf_model:
-                        return [token]
-
         # checking leaf-list
         leaf_list_tokens = token.split("[", 1) # split once on the first '[', a regex is used later to fetch keys/values
         leaf_list_name = leaf_list_tokens[0]
-        leaf_list_model = self.__get_model(model.get('leaf-list'), leaf_list_name)
+        leaf_list_model = index['leaf-list'].get(leaf_list_name)
         if leaf_list_model:
             # if whole-list is to be returned, such as if there is no key, or if configdb is not provided,
             # Just return the list-name without checking the list items
@@ -566,8 +590,7 @@ class SonicYangPathMixin:
         #   xpath: /sonic-dot1p-tc-map:sonic-dot1p-tc-map/DOT1P_TO_TC_MAP/DOT1P_TO_TC_MAP_LIST[name='Dot1p_to_tc_map1']/DOT1P_TO_TC_MAP[dot1p='2']/tc
         #   path: /DOT1P_TO_TC_MAP/Dot1p_to_tc_map1/2
         next_token = xpath_tokens[token_index+1]
-        leaf_model = self.__get_model(model.get('leaf'), next_token)
-        if leaf_model:
+        if next_token in self.__get_model_index(model)['leaf']:
             return path_tokens
 
         raise ValueError(f"Type 1 inner list '{type_1_inner_list_name}' does not have a child leaf named '{next_token}'")
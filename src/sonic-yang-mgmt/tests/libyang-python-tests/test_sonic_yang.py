@@ -4,7 +4,9 @@ import pytest
 import sonic_yang as sy
 import json
 import glob
+import importlib.util
 import logging
+from unittest import mock
 from ijson import items as ijson_itmes
 
 test_path = os.path.dirname(os.path.abspath(__file__))
@@ -278,6 +280,22 @@ class Test_SonicYang(object):
             received = yang_s.xpath_to_configdb_path(xpath)
             assert received == expected
 
+    def test_configdb_path_leaf_list_cache(self, yang_s, data):
+        # the xpath of a leaf-list value depends on configdb, it must not be
+        # served from the cache of conversions without configdb
+        yang_s.loadYangModel()
+        configdb = {"VLAN": {"Vlan1000": {"dhcp_servers": ["10.0.0.1", "10.0.0.2"]}}}
+        path = "/VLAN/Vlan1000/dhcp_servers/1"
+        xpath = "/test-vlan:test-vlan/VLAN/VLAN_LIST[vlanid='Vlan1000']/dhcp_servers"
+        for _ in range(2):
+            assert yang_s.configdb_path_to_xpath(path) == xpath
+            assert yang_s.configdb_path_to_xpath(path, configdb=configdb) == xpath + "[.='10.0.0.2']"
+            assert yang_s.xpath_to_configdb_path(xpath + "[.='10.0.0.2']", configdb) == path
+        # conversions with and without configdb are cached apart
+        assert yang_s.xpath_to_configdb_path(xpath) == yang_s.xpath_to_configdb_path(xpath, configdb)
+        assert ('configdb_path', xpath, False) in yang_s.configPathCache
+        assert ('configdb_path', xpath, True) in yang_s.configPathCache
+
     def test_configdb_path_split(self, yang_s, data):
         def check(path, tokens):
             expected=tokens
@@ -431,5 +449,96 @@ class Test_SonicYang(object):
 
         return
 
+    def test_update_data(self, sonic_yang_data):
+        # in this test, changes of single tables and keys are applied to the
+        # loaded data tree, and the result must be the same as loading the
+        # changed config as a whole.
+        test_file = sonic_yang_data['test_file']
+        syc = sonic_yang_data['syc']
+
+        jIn = json.loads(self.readIjsonInput(test_file, 'SAMPLE_CONFIG_DB_JSON'))
+        syc.loadData(jIn)
+
+        port = dict(jIn['PORT']['Ethernet0'], description='uplink')
+        syc.updateData({'PORT': {'Ethernet0': port}, 'VLAN_MEMBER': {'Vlan111|Ethernet3': None}})
+        syc.validate_data_tree()
+        expected = syc._applyTableChanges(jIn, {'PORT': {'Ethernet0': port}, 'VLAN_MEMBER': {'Vlan111|Ethernet3': None}})
+        assert syc.getData() == expected
+        # the input config is not modified
+        assert jIn['PORT']['Ethernet0']['description'] == ''
+        assert 'Vlan111|Ethernet3' in jIn['VLAN_MEMBER']
+
+        # Ethernet1 is a PortChannel member, it can't be deleted
+        with pytest.raises(sy.SonicYangException):
+            syc.updateData({'PORT': {'Ethernet1': None}})
+        assert syc.root is None
+        # the data tree is reloaded with the last valid config
+        syc.updateData({'PORT': {'Ethernet0': dict(port, description='downlink')}})
+        data = syc.getData()
+        assert 'Ethernet1' in data['PORT']
+        assert data['PORT']['Ethernet0']['description'] == 'downlink'
+
+        return
+
+    def test_load_yang_model_cache(self, sonic_yang_data, tmp_path):
+        # in this test, yang models are loaded from the cache, which is
+        # written by the first load, and the cache is rebuilt when the
+        # yang models change.
+        yang_dir = sonic_yang_data['yang_dir']
+        test_file = sonic_yang_data['test_file']
+        cache_dir = str(tmp_path / "cache")
+
+        # the cache is disabled by default
+        syc_cold = sy.SonicYang(yang_dir)
+        assert syc_cold.cache_dir is None
+        syc_cold.loadYangModel()
+        assert syc_cold.yangCacheFile is None
+        syc = sy.SonicYang(yang_dir, cache_dir=cache_dir)
+        syc.loadYangModel()
+        assert len(os.listdir(cache_dir)) == 1
+
+        syc_warm = sy.SonicYang(yang_dir, cache_dir=cache_dir)
+        with mock.patch.object(syc_warm, '_loadJsonYangModel') as load_json:
+            syc_warm.loadYangModel()
+            load_json.assert_not_called()
+        assert syc_warm.yJson == syc_cold.yJson
+        assert syc_warm.confDbYangMap == syc_cold.confDbYangMap
+        assert syc_warm.preProcessedYang == syc_cold.preProcessedYang
+
+        jIn = json.loads(self.readIjsonInput(test_file, 'SAMPLE_CONFIG_DB_JSON'))
+        syc_warm.loadData(jIn)
+        syc_warm.validate_data_tree()
+
+        # a changed yang model invalidates the cache
+        yang_copy = tmp_path / "yang"
+        yang_copy.mkdir()
+        for file in glob.glob(yang_dir + "/*.yang"):
+            with open(file) as f:
+                (yang_copy / os.path.basename(file)).write_text(f.read())
+        syc = sy.SonicYang(str(yang_copy), cache_dir=cache_dir)
+        syc.loadYangModel()
+        with open(str(yang_copy / "sonic-types.yang"), "a") as f:
+            f.write("\n")
+        syc = sy.SonicYang(str(yang_copy), cache_dir=cache_dir)
+        with mock.patch.object(syc, '_loadJsonYangModel', wraps=syc._loadJsonYangModel) as load_json:
+            syc.loadYangModel()
+            load_json.assert_called_once()
+
+        return
+
+    def test_bench_load_yang(self, sonic_yang_data, capsys):
+        # the benchmark of the yang model cache keeps working
+        bench_file = os.path.join(os.path.dirname(modules_path), "benchmarks", "bench_load_yang.py")
+        spec = importlib.util.spec_from_file_location("bench_load_yang", bench_file)
+        bench = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(bench)
+        with mock.patch.object(sys, 'argv', ['bench_load_yang.py', '-d', sonic_yang_data['yang_dir'], '-n', '1']):
+            bench.main()
+        output = capsys.readouterr().out
+        assert "no cache:" in output
+        assert "warm cache:" in output
+
+        return
+
     def teardown_class(self):
         pass
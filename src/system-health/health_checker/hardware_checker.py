@@ -21,6 +21,19 @@ class HardwareChecker(HealthChecker):
     def get_category(self):
         return 'Hardware'
 
+    def get_trigger_tables(self):
+        # Only the state fields, the sensor readings are refreshed periodically by the platform daemons and their
+        # ranges are verified by polling the checker
+        return {
+            'TEMPERATURE_INFO': ('warning_status',),
+            HardwareChecker.FAN_TABLE_NAME: ('presence', 'status', 'direction', 'is_under_speed', 'is_over_speed'),
+            HardwareChecker.PSU_TABLE_NAME: ('presence', 'status')
+        }
+
+    def is_polled(self):
+        # PSU temperature and voltage, and ASIC temperature against its threshold are not covered by the triggers
+        return True
+
     def check(self, config):
         self.reset()
         self._check_asic_status(config)
@@ -45,6 +45,22 @@ class HealthChecker(object):
         """
         pass
 
+    def get_trigger_tables(self):
+        """
+        Get STATE_DB tables whose changes affect the check result. The checker is performed again when an entry of any
+        of them is created, deleted or changes one of the given fields.
+        :return: A dictionary {<table>:<fields>}, fields is a tuple of field names or None for all fields
+        """
+        return {}
+
+    def is_polled(self):
+        """
+        Check whether the checker is performed with the configured polling interval in between the full checks. A
+        checker whose result depends only on the trigger tables doesn't need to be polled.
+        :return: True if the checker is polled.
+        """
+        return not self.get_trigger_tables()
+
     def __str__(self):
         return self.__class__.__name__
 
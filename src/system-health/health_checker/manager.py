@@ -1,3 +1,5 @@
+import time
+
 from .config import Config
 from .health_checker import HealthChecker
 from .service_checker import ServiceChecker
@@ -13,6 +15,10 @@ class HealthCheckerManager(object):
     def __init__(self):
         self._checkers = []
         self.config = Config()
+        # Seconds spent by each checker in the last check {<checker>:<seconds>}
+        self.checker_elapsed = {}
+        # Result of the last check of each checker {<checker>:(<category>, <info>)}
+        self._results = {}
         self.initialize()
 
     def initialize(self):
@@ -23,54 +29,107 @@ class HealthCheckerManager(object):
         self._checkers.append(ServiceChecker())
         self._checkers.append(HardwareChecker())
 
-    def check(self, chassis):
+    def get_trigger_tables(self):
+        """
+        Get STATE_DB tables whose changes trigger any of the checkers.
+        :return: A dictionary {<table>:<fields>}, fields is a tuple of field names or None for all fields.
+        """
+        tables = {}
+        for checker in self._checkers:
+            for table, fields in checker.get_trigger_tables().items():
+                if table not in tables:
+                    tables[table] = fields
+                elif tables[table] is not None:
+                    tables[table] = None if fields is None else tuple(sorted(set(tables[table]) | set(fields)))
+        return tables
+
+    def check(self, chassis, changed_tables=None):
         """
         Load new configuration if any and perform the system health check for all existing checkers.
         :param chassis: A chassis object.
-        :return: A dictionary that contains the status for all objects that was checked.
+        :param changed_tables: Names of the changed STATE_DB tables. Only the checkers which are triggered by them are
+                               performed, the other checkers keep their last result. All checkers are performed if None.
+        :return: A dictionary that contains the status for all objects that was checked, None if no checker was
+                 performed.
         """
-        HealthChecker.summary = HealthChecker.STATUS_OK
-        stats = {}
         self.config.load_config()
+        if changed_tables is None:
+            self._results = {}
+            checkers = self._checkers + self._get_user_defined_checkers()
+        else:
+            checkers = [checker for checker in self._checkers
+                        if not changed_tables.isdisjoint(checker.get_trigger_tables())]
+        return self._check(chassis, checkers)
 
-        for checker in self._checkers:
-            self._do_check(checker, stats)
+    def poll(self, chassis):
+        """
+        Load new configuration if any and perform the checkers which are polled, see HealthChecker.is_polled(), the
+        other checkers keep their last result.
+        :param chassis: A chassis object.
+        :return: A dictionary that contains the status for all objects that was checked, None if no checker was
+                 performed.
+        """
+        self.config.load_config()
+        checkers = [checker for checker in self._checkers if checker.is_polled()]
+        # Drop the results of user defined checkers removed from the configuration
+        for name in set(self._results) - set(str(checker) for checker in self._checkers):
+            del self._results[name]
+        return self._check(chassis, checkers + self._get_user_defined_checkers())
 
-        if self.config.user_defined_checkers:
-            for udc in self.config.user_defined_checkers:
-                checker = UserDefinedChecker(udc)
-                self._do_check(checker, stats)
+    def _get_user_defined_checkers(self):
+        if not self.config.user_defined_checkers:
+            return []
+        return [UserDefinedChecker(udc) for udc in self.config.user_defined_checkers]
+
+    def _check(self, chassis, checkers):
+        """
+        Perform the given checkers and merge their results with the kept ones.
+        :param chassis: A chassis object.
+        :param checkers: Checkers to perform.
+        :return: A dictionary that contains the status for all objects that was checked, None if no checker was
+                 performed.
+        """
+        if not checkers:
+            return None
+
+        HealthChecker.summary = HealthChecker.STATUS_OK
+        self.checker_elapsed = {}
+        for checker in checkers:
+            self._results[str(checker)] = self._do_check(checker)
+
+        stats = {}
+        for category, info in self._results.values():
+            if category not in stats:
+                stats[category] = dict(info)
+            else:
+                stats[category].update(info)
+            for obj_data in info.values():
+                if obj_data.get(HealthChecker.INFO_FIELD_OBJECT_STATUS) == HealthChecker.STATUS_NOT_OK:
+                    HealthChecker.summary = HealthChecker.STATUS_NOT_OK
 
         self._set_system_led(chassis)
         return stats
 
-    def _do_check(self, checker, stats):
+    def _do_check(self, checker):
         """
         Do check for a particular checker and collect the check statistic.
         :param checker: A checker object.
-        :param stats: Check statistic.
-        :return:
+        :return: Tuple: category, a dictionary that contains the status of the objects that was checked.
         """
+        begin = time.monotonic()
         try:
             checker.check(self.config)
-            category = checker.get_category()
-            info = checker.get_info()
-            if category not in stats:
-                stats[category] = info
-            else:
-                stats[category].update(info)
+            return checker.get_category(), dict(checker.get_info())
         except Exception as e:
-            HealthChecker.summary = HealthChecker.STATUS_NOT_OK
             error_msg = 'Failed to perform health check for {} due to exception - {}'.format(checker, repr(e))
             entry = {str(checker): {
                 HealthChecker.INFO_FIELD_OBJECT_STATUS: HealthChecker.STATUS_NOT_OK,
                 HealthChecker.INFO_FIELD_OBJECT_MSG: error_msg,
                 HealthChecker.INFO_FIELD_OBJECT_TYPE: "Internal"
             }}
-            if 'Internal' not in stats:
-                stats['Internal'] = entry
-            else:
-                stats['Internal'].update(entry)
+            return 'Internal', entry
+        finally:
+            self.checker_elapsed[str(checker)] = time.monotonic() - begin
 
     def _set_system_led(self, chassis):
         try:
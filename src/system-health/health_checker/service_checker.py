@@ -1,7 +1,10 @@
+import concurrent.futures
 import docker
+import http.client
 import os
 import pickle
 import re
+import xmlrpc.client
 
 from swsscommon import swsscommon
 from sonic_py_common import multi_asic, device_info
@@ -38,6 +41,18 @@ class ServiceChecker(HealthChecker):
 
     CRITICAL_PROCESSES_PATH = 'etc/supervisor/critical_processes'
 
+    # supervisord XML-RPC socket, relative to the merged directory of a container
+    SUPERVISOR_SOCKET_PATH = 'var/run/supervisor.sock'
+
+    # Command to get the critical process status when the supervisord socket can't be used
+    SUPERVISORCTL_STATUS_CMD = 'docker exec {} bash -c "supervisorctl status"'
+
+    # Maximum number of containers which are probed at the same time
+    PROBE_MAX_WORKERS = 8
+
+    # Seconds to wait for the process status of one container
+    PROBE_TIMEOUT = 10
+
     # Command to get merged directory of a container
     GET_CONTAINER_FOLDER_CMD = 'docker inspect {} --format "{{{{.GraphDriver.Data.MergedDir}}}}"'
 
@@ -64,6 +79,9 @@ class ServiceChecker(HealthChecker):
 
         self.container_feature_dict = {}
 
+        # Merged directories of the running containers {<container_name>:<folder>}
+        self.container_folders = {}
+
         self.need_save_cache = False
 
         self.config_db = None
@@ -205,6 +223,7 @@ class ServiceChecker(HealthChecker):
         if not os.path.exists(container_folder):
             logger.log_warning('MergedDir {} of container {} not found in filesystem, was container stopped?'.format(container_folder, container))
             return
+        self.container_folders[container] = container_folder
 
         # Get critical_processes file path
         critical_processes_file = os.path.join(container_folder, ServiceChecker.CRITICAL_PROCESSES_PATH)
@@ -261,19 +280,28 @@ class ServiceChecker(HealthChecker):
     def get_category(self):
         return 'Services'
 
+    def get_trigger_tables(self):
+        # Container state of the features, and the processes started or stopped. procdockerstatsd rewrites the
+        # PROCESS_STATS entries with new CPU and memory usage on every refresh, so no field is compared there.
+        return {'FEATURE': None, 'PROCESS_STATS': ()}
+
+    def is_polled(self):
+        # The monit results and the critical processes of the containers are not stored in STATE_DB
+        return True
+
     def check_by_monit(self, config):
         """
         et and analyze the output of $CHECK_CMD, collect status for file system or customize checker if any.
         :param config: Health checker configuration.
         :return:
         """
-        output = utils.run_command(ServiceChecker.CHECK_MONIT_SERVICE_CMD)
+        output = utils.run_command(ServiceChecker.CHECK_MONIT_SERVICE_CMD, timeout=ServiceChecker.PROBE_TIMEOUT)
         if not output or output.strip() != 'active':
             self.set_object_not_ok('Service', 'monit', 'monit service is not running')
             return
 
-        output = utils.run_command(ServiceChecker.CHECK_CMD)
-        lines = output.splitlines()
+        output = utils.run_command(ServiceChecker.CHECK_CMD, timeout=ServiceChecker.PROBE_TIMEOUT)
+        lines = output.splitlines() if output else []
         if not lines or len(lines) < ServiceChecker.MIN_CHECK_CMD_LINES:
             self.set_object_not_ok('Service', 'monit', 'monit service is not ready')
             return
@@ -316,6 +344,9 @@ class ServiceChecker(HealthChecker):
         for newly_disabled_container in newly_disabled_containers:
             self.container_critical_processes.pop(newly_disabled_container)
 
+        for stopped_container in set(self.container_folders.keys()).difference(current_running_containers):
+            self.container_folders.pop(stopped_container)
+
         self.save_critical_process_cache()
 
         not_running_containers = expected_running_containers.difference(current_running_containers)
@@ -327,8 +358,15 @@ class ServiceChecker(HealthChecker):
             self.set_object_not_ok('Service', 'system', 'no critical process found')
             return
 
-        for container, critical_process_list in self.container_critical_processes.items():
-            self.check_process_existence(container, critical_process_list, config, feature_table)
+        containers = [container for container in self.container_critical_processes
+                      if self._is_container_enabled(container, feature_table)]
+        if containers:
+            # The containers are probed concurrently, the result is handled in the container order
+            max_workers = min(ServiceChecker.PROBE_MAX_WORKERS, len(containers))
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                process_status_list = list(executor.map(self.get_process_status, containers))
+            for container, process_status in zip(containers, process_status_list):
+                self._check_process_status(container, self.container_critical_processes[container], config, process_status)
 
         for bad_container in self.bad_containers:
             self.set_object_not_ok('Service', bad_container, 'Syntax of critical_processes file is incorrect')
@@ -370,6 +408,55 @@ class ServiceChecker(HealthChecker):
             params["process_name"] = process_name
             swsscommon.event_publish(self.events_handle, EVENTS_PUBLISHER_TAG, params)
 
+    def _is_container_enabled(self, container_name, feature_table):
+        """Check whether the feature of a container is enabled in the FEATURE table.
+
+        Args:
+            container_name (str): Container name
+            feature_table (object): Feature table
+        """
+        feature_name = self.container_feature_dict[container_name]
+        # We look into the 'FEATURE' table to verify whether the container is disabled or not.
+        return (feature_name in feature_table and "state" in feature_table[feature_name]
+                and feature_table[feature_name]["state"] not in ["disabled", "always_disabled"])
+
+    def get_process_status(self, container_name):
+        """Get the supervisor process status of a container. It is called from the probe threads.
+
+        supervisord of the container is queried through its XML-RPC socket, "supervisorctl status" is
+        executed in the container if the socket can't be used.
+
+        Args:
+            container_name (str): Container name
+
+        Returns:
+            A dictionary {<process_name>:<state_name>}, None if the status can't be retrieved
+        """
+        # We are using supervisor status to check the critical process status. We cannot leverage psutil here because
+        # it not always possible to get process cmdline in supervisor.conf. E.g, cmdline of orchagent is "/usr/bin/orchagent",
+        # however, in supervisor.conf it is "/usr/bin/orchagent.sh"
+        container_folder = self.container_folders.get(container_name)
+        if container_folder is None:
+            container_folder = self._get_container_folder(container_name)
+            if container_folder:
+                self.container_folders[container_name] = container_folder
+
+        if container_folder:
+            socket_path = os.path.join(container_folder, ServiceChecker.SUPERVISOR_SOCKET_PATH)
+            if os.path.exists(socket_path):
+                try:
+                    return utils.get_supervisor_process_status(socket_path, ServiceChecker.PROBE_TIMEOUT)
+                except (OSError, http.client.HTTPException, xmlrpc.client.Error, KeyError) as e:
+                    # The container could have been recreated with another MergedDir
+                    logger.log_debug('Failed to query supervisord of {} - {}'.format(container_name, repr(e)))
+                    self.container_folders.pop(container_name, None)
+
+        process_status = utils.run_command(ServiceChecker.SUPERVISORCTL_STATUS_CMD.format(container_name),
+                                           timeout=ServiceChecker.PROBE_TIMEOUT)
+        if process_status is None:
+            return None
+        return self._parse_supervisorctl_status(process_status.strip().splitlines())
+
     def check_process_existence(self, container_name, critical_process_list, config, feature_table):
         """Check whether the process in the specified container is running or not.
 
@@ -379,33 +466,33 @@ class ServiceChecker(HealthChecker):
             config (object): Health checker configuration.
             feature_table (object): Feature table
         """
-        feature_name = self.container_feature_dict[container_name]
-        if feature_name in feature_table:
-            # We look into the 'FEATURE' table to verify whether the container is disabled or not.
-            # If the container is diabled, we exit.
-            if ("state" in feature_table[feature_name]
-                    and feature_table[feature_name]["state"] not in ["disabled", "always_disabled"]):
-
-                # We are using supervisorctl status to check the critical process status. We cannot leverage psutil here because
-                # it not always possible to get process cmdline in supervisor.conf. E.g, cmdline of orchagent is "/usr/bin/orchagent",
-                # however, in supervisor.conf it is "/usr/bin/orchagent.sh"
-                cmd = 'docker exec {} bash -c "supervisorctl status"'.format(container_name)
-                process_status = utils.run_command(cmd)
-                if process_status is None:
-                    for process_name in critical_process_list:
-                        self.set_object_not_ok('Process', '{}:{}'.format(container_name, process_name), "Process '{}' in container '{}' is not running".format(process_name, container_name))
-                    self.publish_events(container_name, critical_process_list)
-                    return
-
-                process_status = self._parse_supervisorctl_status(process_status.strip().splitlines())
-                for process_name in critical_process_list:
-                    if config and config.ignore_services and process_name in config.ignore_services:
-                        continue
-
-                    # Sometimes process_name is in critical_processes file, but it is not in supervisor.conf, such process will not run in container.
-                    # and it is safe to ignore such process. E.g, radv. So here we only check those processes which are in process_status.
-                    if process_name in process_status:
-                        if process_status[process_name] != 'RUNNING':
-                            self.set_object_not_ok('Process', '{}:{}'.format(container_name, process_name), "Process '{}' in container '{}' is not running".format(process_name, container_name))
-                        else:
-                            self.set_object_ok('Process', '{}:{}'.format(container_name, process_name))
+        # If the container is diabled, we exit.
+        if self._is_container_enabled(container_name, feature_table):
+            self._check_process_status(container_name, critical_process_list, config, self.get_process_status(container_name))
+
+    def _check_process_status(self, container_name, critical_process_list, config, process_status):
+        """Set the status of the critical processes of a container.
+
+        Args:
+            container_name (str): Container name
+            critical_process_list (list): Critical processes
+            config (object): Health checker configuration.
+            process_status (dict): Result of get_process_status
+        """
+        if process_status is None:
+            for process_name in critical_process_list:
+                self.set_object_not_ok('Process', '{}:{}'.format(container_name, process_name), "Process '{}' in container '{}' is not running".format(process_name, container_name))
+            self.publish_events(container_name, critical_process_list)
+            return
+
+        for process_name in critical_process_list:
+            if config and config.ignore_services and process_name in config.ignore_services:
+                continue
+
+            # Sometimes process_name is in critical_processes file, but it is not in supervisor.conf, such process will not run in container.
+            # and it is safe to ignore such process. E.g, radv. So here we only check those processes which are in process_status.
+            if process_name in process_status:
+                if process_status[process_name] != 'RUNNING':
+                    self.set_object_not_ok('Process', '{}:{}'.format(container_name, process_name), "Process '{}' in container '{}' is not running".format(process_name, container_name))
+                else:
+                    self.set_object_ok('Process', '{}:{}'.format(container_name, process_name))
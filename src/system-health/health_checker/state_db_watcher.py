@@ -0,0 +1,76 @@
+import time
+
+from swsscommon import swsscommon
+
+REDIS_TIMEOUT_MS = 0
+
+# Seconds to keep collecting changes after the first one, so that a burst of updates triggers one check
+EVENT_HOLDOFF = 0.2
+
+
+class StateDbWatcher(object):
+    """
+    Subscribe to STATE_DB tables and report which of them changed.
+    """
+
+    def __init__(self, tables):
+        """
+        Constructor. Subscribe to the tables.
+        :param tables: A dictionary {<table>:<fields>} of STATE_DB tables. Creation and deletion of an entry is always
+                       reported, an update only if any of the fields changes. All fields are compared if None.
+        """
+        self._db = swsscommon.DBConnector("STATE_DB", REDIS_TIMEOUT_MS, False)
+        self._sel = swsscommon.Select()
+        self._subscribers = []
+        self._fields = dict(tables)
+        # Last seen value of the compared fields of each entry {(<table>, <key>):<values>}
+        self._entries = {}
+        for table in sorted(self._fields):
+            sst = swsscommon.SubscriberStateTable(self._db, table)
+            self._sel.addSelectable(sst)
+            self._subscribers.append((table, sst))
+
+    def _is_changed(self, table, key, op, fvs):
+        """
+        Check whether a notification changes an entry.
+        :return: True if the entry is created, deleted or any of the compared fields changes.
+        """
+        if op != 'SET':
+            self._entries.pop((table, key), None)
+            return True
+        fvs = dict(fvs)
+        fields = self._fields[table]
+        values = tuple(sorted(fvs.items())) if fields is None else tuple(fvs.get(field) for field in fields)
+        if self._entries.get((table, key)) == values:
+            return False
+        self._entries[(table, key)] = values
+        return True
+
+    def wait(self, timeout):
+        """
+        Wait for changes of the subscribed tables.
+        :param timeout: Seconds to wait for the first change.
+        :return: A set of changed table names, empty if nothing changed before the timeout.
+        """
+        changed = set()
+        deadline = time.monotonic() + timeout
+        while True:
+            select_timeout = deadline - time.monotonic()
+            if select_timeout <= 0:
+                return changed
+            state, _ = self._sel.select(int(select_timeout * 1000))
+            if state != swsscommon.Select.OBJECT:
+                if state != swsscommon.Select.TIMEOUT:
+                    raise RuntimeError('Failed to wait for STATE_DB changes, select returned {}'.format(state))
+                return changed
+
+            first_change = not changed
+            for table, sst in self._subscribers:
+                while True:
+                    key, op, fvs = sst.pop()
+                    if not key:
+                        break
+                    if self._is_changed(table, key, op, fvs):
+                        changed.add(table)
+            if first_change and changed:
+                deadline = time.monotonic() + EVENT_HOLDOFF
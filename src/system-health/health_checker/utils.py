@@ -1,15 +1,28 @@
+import http.client
+import os
+import signal
+import socket
 import subprocess
+import xmlrpc.client
 
 
-def run_command(command):
+def run_command(command, timeout=None):
     """
     Utility function to run an shell command and return the output.
     :param command: Shell command string.
-    :return: Output of the shell command.
+    :param timeout: Seconds to wait for the command. The command is killed when it doesn't finish in time.
+    :return: Output of the shell command, None if the command failed or timed out.
     """
     try:
-        process = subprocess.Popen(command, shell=True, universal_newlines=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        return process.communicate()[0]
+        process = subprocess.Popen(command, shell=True, universal_newlines=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                   start_new_session=timeout is not None)
+        try:
+            return process.communicate(timeout=timeout)[0]
+        except subprocess.TimeoutExpired:
+            # Kill the shell together with the command it started
+            os.killpg(process.pid, signal.SIGKILL)
+            process.communicate()
+            return None
     except Exception:
         return None
 
@@ -23,3 +36,46 @@ def get_uptime():
         uptime_seconds = float(f.readline().split()[0])
 
     return uptime_seconds
+
+
+class UnixStreamHTTPConnection(http.client.HTTPConnection):
+    """
+    HTTP connection over a unix socket, supervisord serves XML-RPC on such a socket.
+    """
+    def __init__(self, socket_path, timeout):
+        http.client.HTTPConnection.__init__(self, 'localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class UnixStreamTransport(xmlrpc.client.Transport):
+    def __init__(self, socket_path, timeout):
+        xmlrpc.client.Transport.__init__(self)
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    def make_connection(self, host):
+        return UnixStreamHTTPConnection(self.socket_path, self.timeout)
+
+
+def get_supervisor_process_status(socket_path, timeout):
+    """
+    Utility to get the process status from supervisord XML-RPC interface, it is what "supervisorctl status" shows.
+    :param socket_path: Path of the supervisord unix socket.
+    :param timeout: Seconds to wait for supervisord.
+    :return: A dictionary {<process_name>:<state_name>}, the process name is "<group>:<name>" for
+             processes of a group, as supervisorctl shows it.
+    """
+    server = xmlrpc.client.ServerProxy('http://localhost', transport=UnixStreamTransport(socket_path, timeout))
+    status = {}
+    for info in server.supervisor.getAllProcessInfo():
+        if info['group'] == info['name']:
+            name = info['name']
+        else:
+            name = '{}:{}'.format(info['group'], info['name'])
+        status[name] = info['statename']
+    return status
@@ -11,12 +11,16 @@
 """
 import copy
 import os
+import socketserver
 import sys
+import tempfile
+import threading
 import docker
 from imp import load_source
 from swsscommon import swsscommon
 
 from mock import Mock, MagicMock, patch
+from xmlrpc.server import SimpleXMLRPCDispatcher, SimpleXMLRPCRequestHandler
 from sonic_py_common import device_info
 
 from .mock_connector import MockConnector
@@ -40,6 +44,7 @@ from health_checker.user_defined_checker import UserDefinedChecker
 from health_checker.sysmonitor import Sysmonitor
 from health_checker.sysmonitor import MonitorStateDbTask
 from health_checker.sysmonitor import MonitorSystemBusTask
+from health_checker.state_db_watcher import StateDbWatcher
 
 load_source('healthd', os.path.join(scripts_path, 'healthd'))
 from healthd import HealthDaemon
@@ -617,6 +622,7 @@ def test_manager(mock_hw_info, mock_service_info, mock_udc_info):
     assert stat['Internal']['ServiceChecker']['status'] == 'Not OK'
     assert stat['Internal']['HardwareChecker']['status'] == 'Not OK'
     assert stat['Internal']['UserDefinedChecker - some check']['status'] == 'Not OK'
+    assert set(manager.checker_elapsed.keys()) == {'ServiceChecker', 'HardwareChecker', 'UserDefinedChecker - some check'}
 
     chassis.set_status_led.side_effect = NotImplementedError()
     manager._set_system_led(chassis)
@@ -624,6 +630,207 @@ def test_manager(mock_hw_info, mock_service_info, mock_udc_info):
     chassis.set_status_led.side_effect = RuntimeError()
     manager._set_system_led(chassis)
 
+@patch('swsscommon.swsscommon.ConfigDBConnector', MagicMock())
+@patch('health_checker.service_checker.ServiceChecker.check')
+@patch('health_checker.hardware_checker.HardwareChecker.check')
+@patch('health_checker.service_checker.ServiceChecker.get_info')
+@patch('health_checker.hardware_checker.HardwareChecker.get_info')
+def test_manager_changed_tables(mock_hw_info, mock_service_info, mock_hw_check, mock_service_check):
+    chassis = MagicMock()
+    manager = HealthCheckerManager()
+    trigger_tables = manager.get_trigger_tables()
+    assert set(trigger_tables.keys()) == {'TEMPERATURE_INFO', 'FAN_INFO', 'PSU_INFO', 'FEATURE', 'PROCESS_STATS'}
+    assert trigger_tables['FEATURE'] is None
+    assert trigger_tables['PROCESS_STATS'] == ()
+    assert 'temp' not in trigger_tables['PSU_INFO']
+
+    mock_hw_info.return_value = {'fan1': {'type': 'Fan', 'message': '', 'status': 'OK'}}
+    mock_service_info.return_value = {'snmp:snmpd': {'type': 'Process', 'message': '', 'status': 'OK'}}
+    stat = manager.check(chassis)
+    assert stat['Hardware']['fan1']['status'] == 'OK'
+    assert HealthChecker.summary == HealthChecker.STATUS_OK
+    assert mock_hw_check.call_count == 1
+    assert mock_service_check.call_count == 1
+
+    # Only the hardware checker is triggered by FAN_INFO, the service result is kept
+    mock_hw_info.return_value = {'fan1': {'type': 'Fan', 'message': 'fan1 is broken', 'status': 'Not OK'}}
+    stat = manager.check(chassis, {'FAN_INFO'})
+    assert mock_hw_check.call_count == 2
+    assert mock_service_check.call_count == 1
+    assert set(manager.checker_elapsed.keys()) == {'HardwareChecker'}
+    assert stat['Hardware']['fan1']['status'] == 'Not OK'
+    assert stat['Services']['snmp:snmpd']['status'] == 'OK'
+    assert HealthChecker.summary == HealthChecker.STATUS_NOT_OK
+
+    mock_hw_info.return_value = {'fan1': {'type': 'Fan', 'message': '', 'status': 'OK'}}
+    stat = manager.check(chassis, {'TEMPERATURE_INFO'})
+    assert stat['Hardware']['fan1']['status'] == 'OK'
+    assert HealthChecker.summary == HealthChecker.STATUS_OK
+
+    # Changes of other tables don't trigger any checker
+    assert manager.check(chassis, {'PORT_TABLE'}) is None
+    assert mock_hw_check.call_count == 3
+    assert mock_service_check.call_count == 1
+
+    # Both checkers are polled for the values which don't trigger them
+    manager.poll(chassis)
+    assert mock_hw_check.call_count == 4
+    assert mock_service_check.call_count == 2
+
+    mock_service_check.side_effect = RuntimeError()
+    stat = manager.check(chassis, {'FEATURE'})
+    assert stat['Internal']['ServiceChecker']['status'] == 'Not OK'
+    assert 'Services' not in stat
+    assert stat['Hardware']['fan1']['status'] == 'OK'
+    assert HealthChecker.summary == HealthChecker.STATUS_NOT_OK
+
+
+@patch('health_checker.state_db_watcher.EVENT_HOLDOFF', 0)
+@patch('swsscommon.swsscommon.DBConnector', MagicMock())
+@patch('swsscommon.swsscommon.SubscriberStateTable')
+@patch('swsscommon.swsscommon.Select')
+def test_state_db_watcher(mock_select, mock_subscriber):
+    mock_select.OBJECT = 1
+    mock_select.TIMEOUT = 2
+    mock_select.ERROR = 3
+    subscribers = {}
+    def create_subscriber(db, table):
+        subscribers[table] = MagicMock()
+        subscribers[table].pop.return_value = ('', '', ())
+        return subscribers[table]
+    mock_subscriber.side_effect = create_subscriber
+
+    watcher = StateDbWatcher({'FAN_INFO': None, 'PSU_INFO': ('presence', 'status')})
+    assert sorted(subscribers.keys()) == ['FAN_INFO', 'PSU_INFO']
+    sel = mock_select.return_value
+
+    sel.select.return_value = (mock_select.TIMEOUT, None)
+    assert watcher.wait(1) == set()
+
+    subscribers['FAN_INFO'].pop.side_effect = [('fan1', 'SET', ()), ('fan2', 'SET', ()), ('', '', ())]
+    sel.select.side_effect = [(mock_select.OBJECT, None), (mock_select.TIMEOUT, None)]
+    assert watcher.wait(1) == {'FAN_INFO'}
+    assert subscribers['FAN_INFO'].pop.call_count == 3
+
+    subscribers['FAN_INFO'].pop.side_effect = [('fan1', 'DEL', ()), ('', '', ())]
+    sel.select.side_effect = [(mock_select.OBJECT, None), (mock_select.TIMEOUT, None)]
+    assert watcher.wait(1) == {'FAN_INFO'}
+
+    sel.select.side_effect = [(mock_select.ERROR, None)]
+    try:
+        watcher.wait(1)
+        assert False
+    except RuntimeError:
+        pass
+
+
+@patch('health_checker.state_db_watcher.EVENT_HOLDOFF', 0)
+@patch('swsscommon.swsscommon.DBConnector', MagicMock())
+@patch('swsscommon.swsscommon.SubscriberStateTable')
+@patch('swsscommon.swsscommon.Select')
+def test_state_db_watcher_sensor_refresh(mock_select, mock_subscriber):
+    mock_select.OBJECT = 1
+    mock_select.TIMEOUT = 2
+    psu_table = MagicMock()
+    mock_subscriber.return_value = psu_table
+    sel = mock_select.return_value
+    watcher = StateDbWatcher({'PSU_INFO': HardwareChecker().get_trigger_tables()['PSU_INFO']})
+
+    def notify(fvs, op='SET'):
+        psu_table.pop.side_effect = [('PSU 1', op, fvs), ('', '', ())]
+        sel.select.side_effect = [(mock_select.OBJECT, None), (mock_select.TIMEOUT, None)]
+        return watcher.wait(1)
+
+    assert notify((('presence', 'true'), ('status', 'true'), ('temp', '30.0'), ('voltage', '12.01'))) == {'PSU_INFO'}
+    # Periodic refresh of the sensor readings doesn't trigger the checker
+    assert notify((('presence', 'true'), ('status', 'true'), ('temp', '31.5'), ('voltage', '11.98'))) == set()
+    assert notify((('presence', 'true'), ('status', 'true'), ('temp', '32.0'), ('voltage', '12.00'))) == set()
+    assert notify((('presence', 'true'), ('status', 'false'), ('temp', '32.0'), ('voltage', '0.00'))) == {'PSU_INFO'}
+    assert notify((), 'DEL') == {'PSU_INFO'}
+    assert notify((('presence', 'true'), ('status', 'false'), ('temp', '32.0'), ('voltage', '0.00'))) == {'PSU_INFO'}
+
+
+@patch('healthd.HealthDaemon.log_warning', MagicMock())
+def test_healthd_wait_for_changes():
+    daemon = HealthDaemon()
+    manager = MagicMock()
+    manager.config.interval = 60
+    manager.checker_elapsed = {}
+    chassis = MagicMock()
+    daemon._process_stat = MagicMock()
+    daemon._watcher = MagicMock()
+
+    def wait(timeout):
+        assert timeout <= 1
+        if daemon._watcher.wait.call_count == 3:
+            daemon.stop_event.set()
+        return {'FAN_INFO'} if daemon._watcher.wait.call_count == 2 else set()
+    daemon._watcher.wait.side_effect = wait
+    assert not daemon._wait_for_changes(manager, chassis, 30)
+    manager.check.assert_called_once_with(chassis, {'FAN_INFO'})
+    manager.poll.assert_not_called()
+    daemon._process_stat.assert_called_once()
+
+    daemon.stop_event.clear()
+    daemon._watcher.wait.side_effect = None
+    daemon._watcher.wait.return_value = set()
+    assert daemon._wait_for_changes(manager, chassis, 0.01)
+
+    # Checkers without trigger tables are polled with the polling interval
+    manager.reset_mock()
+    daemon._process_stat.reset_mock()
+    manager.config.interval = 0.01
+    manager.poll.return_value = None
+    assert daemon._wait_for_changes(manager, chassis, 0.1)
+    assert manager.poll.call_count >= 2
+    manager.check.assert_not_called()
+    daemon._process_stat.assert_not_called()
+    manager.config.interval = 60
+
+    # Fall back to the polling when the subscription is broken
+    daemon._watcher.wait.side_effect = RuntimeError()
+    daemon.stop_event = MagicMock()
+    daemon.stop_event.is_set.return_value = False
+    daemon.stop_event.wait.return_value = False
+    assert daemon._wait_for_changes(manager, chassis, 30)
+    assert daemon._watcher is None
+    assert 29 < daemon.stop_event.wait.call_args[0][0] <= 30
+
+
+@patch('swsscommon.swsscommon.ConfigDBConnector', MagicMock())
+@patch('health_checker.user_defined_checker.UserDefinedChecker.check')
+@patch('health_checker.user_defined_checker.UserDefinedChecker.get_category', MagicMock(return_value='UserDefine'))
+@patch('health_checker.user_defined_checker.UserDefinedChecker.get_info')
+@patch('health_checker.service_checker.ServiceChecker.check')
+@patch('health_checker.hardware_checker.HardwareChecker.check')
+@patch('health_checker.service_checker.ServiceChecker.get_info')
+@patch('health_checker.hardware_checker.HardwareChecker.get_info')
+def test_manager_poll(mock_hw_info, mock_service_info, mock_hw_check, mock_service_check, mock_udc_info, mock_udc_check):
+    chassis = MagicMock()
+    manager = HealthCheckerManager()
+    manager.config.load_config = MagicMock()
+    manager.config.user_defined_checkers = ['udc1', 'udc2']
+    mock_hw_info.return_value = {'fan1': {'type': 'Fan', 'message': '', 'status': 'OK'}}
+    mock_service_info.return_value = {'snmp:snmpd': {'type': 'Process', 'message': '', 'status': 'OK'}}
+    mock_udc_info.return_value = {'obj': {'type': 'Custom', 'message': '', 'status': 'OK'}}
+    manager.check(chassis)
+    assert mock_udc_check.call_count == 2
+
+    # Only the polled checkers are performed, results of the other checkers are kept
+    manager.config.user_defined_checkers = ['udc1']
+    mock_udc_info.return_value = {'obj': {'type': 'Custom', 'message': 'failed', 'status': 'Not OK'}}
+    with patch('health_checker.service_checker.ServiceChecker.is_polled', return_value=False):
+        stat = manager.poll(chassis)
+    assert mock_udc_check.call_count == 3
+    assert mock_hw_check.call_count == 2
+    assert mock_service_check.call_count == 1
+    assert set(manager.checker_elapsed.keys()) == {'HardwareChecker', 'UserDefinedChecker - udc1'}
+    assert stat['UserDefine']['obj']['status'] == 'Not OK'
+    assert stat['Hardware']['fan1']['status'] == 'OK'
+    assert 'UserDefinedChecker - udc2' not in manager._results
+    assert HealthChecker.summary == HealthChecker.STATUS_NOT_OK
+
+
 def test_utils():
     output = utils.run_command('some invalid command')
     assert not output
@@ -631,6 +838,99 @@ def test_utils():
     output = utils.run_command('ls')
     assert output
 
+    output = utils.run_command('sleep 10', timeout=0.1)
+    assert output is None
+
+
+def test_get_supervisor_process_status():
+    class RequestHandler(SimpleXMLRPCRequestHandler):
+        # TCP_NODELAY is not supported by unix sockets
+        disable_nagle_algorithm = False
+        log_request = no_op
+
+    class UnixXMLRPCServer(socketserver.UnixStreamServer, SimpleXMLRPCDispatcher):
+        def __init__(self, path):
+            SimpleXMLRPCDispatcher.__init__(self)
+            socketserver.UnixStreamServer.__init__(self, path, RequestHandler)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        socket_path = os.path.join(tmp_dir, 'supervisor.sock')
+        server = UnixXMLRPCServer(socket_path)
+        server.register_function(lambda: [
+            {'name': 'snmpd', 'group': 'snmpd', 'statename': 'RUNNING'},
+            {'name': 'snmp-subagent', 'group': 'snmp-subagent', 'statename': 'EXITED'},
+            {'name': 'bgpd', 'group': 'bgp', 'statename': 'RUNNING'},
+        ], 'supervisor.getAllProcessInfo')
+        thread = threading.Thread(target=server.handle_request)
+        thread.start()
+        status = utils.get_supervisor_process_status(socket_path, 5)
+        thread.join()
+        server.server_close()
+    assert status == {'snmpd': 'RUNNING', 'snmp-subagent': 'EXITED', 'bgp:bgpd': 'RUNNING'}
+
+
+@patch('swsscommon.swsscommon.ConfigDBConnector.connect', MagicMock())
+@patch('health_checker.service_checker.ServiceChecker.check_by_monit', MagicMock())
+@patch('sonic_py_common.multi_asic.is_multi_asic', MagicMock(return_value=False))
+@patch('docker.DockerClient')
+@patch('health_checker.utils.get_supervisor_process_status')
+@patch('health_checker.utils.run_command')
+@patch('swsscommon.swsscommon.ConfigDBConnector')
+def test_service_checker_supervisor_socket(mock_config_db, mock_run, mock_supervisor_status, mock_docker_client):
+    setup()
+    feature_table = {}
+    running_containers = []
+    for i in range(20):
+        name = 'ctr{}'.format(i)
+        feature_table[name] = {'state': 'enabled', 'has_global_scope': 'True', 'has_per_asic_scope': 'False'}
+        container = MagicMock()
+        container.name = name
+        running_containers.append(container)
+    mock_config_db.return_value.get_table = MagicMock(return_value=feature_table)
+    mock_docker_client.return_value.containers.list = MagicMock(return_value=running_containers)
+
+    with tempfile.TemporaryDirectory() as container_folder:
+        os.makedirs(os.path.join(container_folder, 'etc', 'supervisor'))
+        with open(os.path.join(container_folder, ServiceChecker.CRITICAL_PROCESSES_PATH), 'w') as f:
+            f.write('program:snmpd\nprogram:snmp-subagent\n')
+        os.makedirs(os.path.join(container_folder, 'var', 'run'))
+        open(os.path.join(container_folder, ServiceChecker.SUPERVISOR_SOCKET_PATH), 'w').close()
+
+        def supervisor_status(socket_path, timeout):
+            assert socket_path == os.path.join(container_folder, ServiceChecker.SUPERVISOR_SOCKET_PATH)
+            return {'snmpd': 'RUNNING', 'snmp-subagent': 'EXITED'}
+
+        mock_supervisor_status.side_effect = supervisor_status
+        with patch('health_checker.service_checker.ServiceChecker._get_container_folder', MagicMock(return_value=container_folder)):
+            checker = ServiceChecker()
+            checker.check(Config())
+
+        # The supervisord sockets are used instead of docker exec
+        assert mock_supervisor_status.call_count == 20
+        mock_run.assert_not_called()
+        assert len(checker.container_folders) == 20
+        for i in range(20):
+            assert checker._info['ctr{}:snmpd'.format(i)][HealthChecker.INFO_FIELD_OBJECT_STATUS] == HealthChecker.STATUS_OK
+            assert checker._info['ctr{}:snmp-subagent'.format(i)][HealthChecker.INFO_FIELD_OBJECT_STATUS] == HealthChecker.STATUS_NOT_OK
+
+        # supervisorctl is executed in the container when the socket fails
+        mock_supervisor_status.side_effect = ConnectionRefusedError()
+        mock_run.return_value = mock_supervisorctl_output
+        checker.check(Config())
+        assert mock_run.call_count == 20
+        mock_run.assert_any_call('docker exec ctr0 bash -c "supervisorctl status"', timeout=ServiceChecker.PROBE_TIMEOUT)
+        assert not checker.container_folders
+        assert checker._info['ctr0:snmpd'][HealthChecker.INFO_FIELD_OBJECT_STATUS] == HealthChecker.STATUS_OK
+        assert checker._info['ctr0:snmp-subagent'][HealthChecker.INFO_FIELD_OBJECT_STATUS] == HealthChecker.STATUS_NOT_OK
+
+        # Stopped containers are reported, their processes aren't probed
+        mock_run.reset_mock()
+        mock_docker_client.return_value.containers.list = MagicMock(return_value=running_containers[1:])
+        mock_run.return_value = None
+        checker.check(Config())
+        assert checker._info['ctr0'][HealthChecker.INFO_FIELD_OBJECT_STATUS] == HealthChecker.STATUS_NOT_OK
+        assert checker._info['ctr1:snmpd'][HealthChecker.INFO_FIELD_OBJECT_STATUS] == HealthChecker.STATUS_NOT_OK
+
 
 @patch('swsscommon.swsscommon.ConfigDBConnector.connect', MagicMock())
 @patch('sonic_py_common.multi_asic.is_multi_asic', MagicMock(return_value=False))